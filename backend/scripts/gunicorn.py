@@ -15,6 +15,9 @@ backlog = 2048
 # Workers — capped at 2 to keep memory under control in containerized environments
 # Each worker loads ~200MB (Django + boto3 + strawberry + graphql-core).
 # Uvicorn workers handle concurrency via async, so 2 workers is sufficient.
+# GraphQL requests run on the worker's event loop; their database work goes to a
+# per-worker thread pool of GRAPHQL_SYNC_THREADS threads (default 16), which also
+# bounds the GraphQL database connections per worker.
 workers = min(int(os.environ.get("GUNICORN_WORKERS", 2)), 4)
 worker_class = "uvicorn.workers.UvicornWorker"
 max_requests = 1000
@@ -0,0 +1,7 @@
+#!/bin/bash
+
+set -e
+
+# Set SCRAPING_ENGINE_ENABLED=true on the Celery workers so the beat fan-out
+# of scrape_all_stations_metadata is not scheduled alongside this process
+python manage.py run_scraping_engine
@@ -41,7 +41,7 @@ class BackupAdmin(SuperAppModelAdmin):
                 fields.insert(1, 'tenant')
             return fields
         # Editing an existing object
-        fields = ['name', 'type', 'file', 'done', 'started_at', 'finished_at', 'created_at', 'updated_at']
+        fields = ['name', 'type', 'file', 'done', 'parent', 'watermark', 'started_at', 'finished_at', 'created_at', 'updated_at']
         if MULTI_TENANT_ENABLED:
             fields.insert(1, 'tenant')
         return fields
@@ -54,7 +54,7 @@ class BackupAdmin(SuperAppModelAdmin):
         if obj is None:  # Adding a new object
             return []
         # Editing an existing object
-        readonly_fields = ['name', 'type', 'created_at', 'updated_at', 'file', 'done', 'started_at', 'finished_at']
+        readonly_fields = ['name', 'type', 'created_at', 'updated_at', 'file', 'done', 'parent', 'watermark', 'started_at', 'finished_at']
         if MULTI_TENANT_ENABLED:
             readonly_fields.insert(1, 'tenant')
         return readonly_fields
@@ -36,12 +36,12 @@ class RestoreAdmin(SuperAppModelAdmin):
         Show all fields when editing an existing restore.
         """
         if obj is None:  # Adding a new object
-            fields = ['name', 'file', 'backup', 'type', 'cleanup_existing_data']
+            fields = ['name', 'file', 'backup', 'type', 'cleanup_existing_data', 'fast_restore']
             if MULTI_TENANT_ENABLED:
                 fields.insert(1, 'tenant')
             return fields
         # Editing an existing object
-        fields = ['name', 'file', 'backup', 'done', 'started_at', 'finished_at', 'created_at', 'updated_at']
+        fields = ['name', 'file', 'backup', 'fast_restore', 'done', 'started_at', 'finished_at', 'created_at', 'updated_at']
         if MULTI_TENANT_ENABLED:
             fields.insert(1, 'tenant')
         return fields
@@ -53,7 +53,7 @@ class RestoreAdmin(SuperAppModelAdmin):
         if obj is None:  # Adding a new object
             return []
         # Editing an existing object
-        readonly_fields = ['name', 'type', 'file', 'backup', 'created_at', 'updated_at', 'done', 'started_at', 'finished_at', 'cleanup_existing_data']
+        readonly_fields = ['name', 'type', 'file', 'backup', 'created_at', 'updated_at', 'done', 'started_at', 'finished_at', 'cleanup_existing_data', 'fast_restore']
         if MULTI_TENANT_ENABLED:
             readonly_fields.insert(1, 'tenant')
         return readonly_fields
@@ -6,9 +6,7 @@ from django.conf import settings
 from superapp.apps.backups.models.backup import Backup
 from superapp.apps.backups.tasks.backup import (
     get_models_for_backup_type,
-    extract_media_files_from_fixture,
-    copy_media_files_to_backup,
-    create_backup_archive
+    write_backup_archive,
 )
 
 # Conditional imports for multi-tenant support
@@ -134,11 +132,8 @@ class Command(BaseCommand):
         """
         import tempfile
         import os
-        import json
         from pathlib import Path
         from django.core.files.base import File
-        from django.core.management import call_command
-        from django.apps import apps
 
         # Create target directory if it doesn't exist
         target_path = Path(target_file_path)
@@ -147,64 +142,18 @@ class Command(BaseCommand):
             target_dir.mkdir(parents=True, exist_ok=True)
             self.stdout.write(f'Created directory: {target_dir}')
 
-        # Get models to backup based on backup type
         models_to_backup = get_models_for_backup_type(backup.type)
-
-        # If models_to_backup is '*', backup all models
-        if models_to_backup == '*':
-            args = []
-            for app_config in apps.get_app_configs():
-                for model in app_config.get_models():
-                    model_name = f"{model._meta.app_label}.{model._meta.model_name}"
-                    args.append(model_name)
-        else:
-            args = models_to_backup
-
-        self.stdout.write(f'Backing up models: {", ".join(args)}')
+        self.stdout.write(f'Backing up models: {", ".join(models_to_backup) if models_to_backup != "*" else "all"}')
 
         # Create a temporary directory for the backup process
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_file_path = os.path.join(temp_dir, 'backup.json')
-
-            # Use direct DB connection (bypasses PgBouncer) when available
-            from django.db import connections
-            db_alias = 'direct' if 'direct' in connections.databases else 'default'
-
-            # Set up options for the dumpdata command
-            options = {
-                'output': temp_file_path,
-                'format': 'json',
-                'indent': 2,
-                'database': db_alias,
-            }
-
-            # If multi-tenant is enabled and we have a tenant, use tenant-specific commands
-            tenant = getattr(backup, 'tenant', None) if MULTI_TENANT_ENABLED else None
-            if MULTI_TENANT_ENABLED and tenant:
-                options['tenant_pk'] = tenant.pk
-                call_command('tenant_dumpdata', *args, **options)
-            else:
-                call_command('dumpdata', *args, **options)
-
-            # Read the generated JSON file to extract media file references
-            with open(temp_file_path, 'r') as f:
-                fixture_data = json.load(f)
-
-            # Extract media files referenced in the fixture
-            media_files = extract_media_files_from_fixture(fixture_data)
-            self.stdout.write(f'Found {len(media_files)} media files referenced in backup')
-
-            # Copy media files to backup directory
-            media_copy_result = copy_media_files_to_backup(media_files, temp_dir)
-            self.stdout.write(f'Copied {len(media_copy_result["copied"])} media files, '
-                            f'{len(media_copy_result["missing"])} files were missing')
-
-            # Create archive name based on target file path
-            target_path = Path(target_file_path)
             archive_name = target_path.stem
+            archive_path = os.path.join(temp_dir, f'{archive_name}.zip')
 
-            # Create zip archive with JSON data and media files
-            archive_path = create_backup_archive(temp_file_path, temp_dir, archive_name)
+            # Dump the data, media files and external URL resources into the archive
+            result = write_backup_archive(backup.type, archive_path, temp_dir)
+            media_copy_result = result['media']
+            self.stdout.write(f'Backed up {sum(result["objects"].values())} objects from {len(result["objects"])} models')
 
             # Copy the archive to the target location
             import shutil
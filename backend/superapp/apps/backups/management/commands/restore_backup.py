@@ -1,16 +1,18 @@
 import logging
 import os
 import tempfile
-import json
-from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from django.conf import settings
 
 from superapp.apps.backups.models.restore import Restore
+from superapp.apps.backups.services.copy_fixture_loader import CopyFixtureLoader
 from superapp.apps.backups.tasks.restore import (
-    extract_backup_archive,
+    BackupData,
+    _has_media_files,
+    delete_rows_removed_in_chain,
+    extract_backup_chain,
     restore_media_files_after_loaddata,
     determine_backup_type,
     _cleanup_existing_data_for_non_tenant_restore
@@ -66,6 +68,12 @@ class Command(BaseCommand):
             default=False,
             help='Clean up existing data before restoring (default: False)'
         )
+        parser.add_argument(
+            '--fast-restore',
+            action='store_true',
+            default=False,
+            help='PostgreSQL only: truncate the restored tables and bulk load them with COPY; needs --cleanup-existing-data (default: False)'
+        )
 
     def handle(self, *args, **options):
         file_path = options['file']
@@ -73,6 +81,7 @@ class Command(BaseCommand):
         restore_name = options.get('name')
         tenant_id = options.get('tenant_id')
         cleanup_existing_data = options['cleanup_existing_data']
+        fast_restore = options['fast_restore']
 
         # Validate file path
         if not os.path.exists(file_path):
@@ -112,12 +121,14 @@ class Command(BaseCommand):
             self.stdout.write(f'Backup type: {backup_type}')
             self.stdout.write(f'Source file: {file_path}')
             self.stdout.write(f'Cleanup existing data: {cleanup_existing_data}')
+            self.stdout.write(f'Fast restore: {fast_restore}')
 
             # Create restore record for tracking and upload the local file
             restore = Restore(
                 name=restore_name,
                 type=backup_type,
-                cleanup_existing_data=cleanup_existing_data
+                cleanup_existing_data=cleanup_existing_data,
+                fast_restore=fast_restore,
             )
             
             # Upload the local backup file to the restore record
@@ -161,10 +172,10 @@ class Command(BaseCommand):
         import shutil
 
         temp_dir = None
-        json_file_path = None
+        data_files = None
+        archives = []
         temp_source_path = None
         has_media_files = False
-        backup_data = None
 
         try:
             # Determine backup file type
@@ -176,27 +187,21 @@ class Command(BaseCommand):
                 temp_dir = tempfile.mkdtemp(prefix='restore_')
                 self.stdout.write(f'Created temporary directory: {temp_dir}')
 
-                # Extract the archive and get JSON file path
-                json_file_path = extract_backup_archive(source_file_path, temp_dir)
-                self.stdout.write(f'Extracted JSON file to: {json_file_path}')
+                # Extract the archive, and those of its parent backups if it is incremental
+                archives = extract_backup_chain(source_file_path, temp_dir)
+                data_files = [data_file for archive in archives for data_file in archive['data_files']]
+                self.stdout.write(f'Extracted {len(data_files)} data files from {len(archives)} archives to: {temp_dir}')
 
                 # Check if media directory exists
-                media_dir = Path(temp_dir) / 'media'
-                has_media_files = media_dir.exists() and any(media_dir.rglob('*'))
+                has_media_files = any(_has_media_files(archive['dir']) for archive in archives)
                 self.stdout.write(f'Archive contains media files: {has_media_files}')
 
             else:
                 # Handle direct JSON file - copy to temporary location for consistent handling
                 temp_source_path = tempfile.mktemp(suffix='.json')
                 shutil.copy2(source_file_path, temp_source_path)
-                json_file_path = temp_source_path
-                self.stdout.write(f'Using JSON file: {json_file_path}')
-
-            # Parse backup data for later use in media restoration if needed
-            if has_media_files:
-                self.stdout.write('Parsing backup data for media file restoration...')
-                with open(json_file_path, 'r') as f:
-                    backup_data = json.load(f)
+                data_files = [temp_source_path]
+                self.stdout.write(f'Using JSON file: {temp_source_path}')
 
             # Set up options for the loaddata command
             backup_config = settings.BACKUPS.get('BACKUP_TYPES', {}).get(backup_type, {})
@@ -209,49 +214,70 @@ class Command(BaseCommand):
 
             self.stdout.write(f'Exclude models: {exclude_models}')
 
+            tenant_restore = MULTI_TENANT_ENABLED and hasattr(restore, 'tenant') and restore.tenant
+            fast_restore = restore.fast_restore
+            if fast_restore:
+                if tenant_restore:
+                    reason = 'it does not support tenant restores'
+                else:
+                    reason = CopyFixtureLoader(
+                        using=options['database'], exclude_models=exclude_models
+                    ).unsupported_reason(data_files, cleanup_existing_data)
+                if reason:
+                    self.stdout.write(self.style.WARNING(f'Fast restore unavailable ({reason}), falling back to loaddata'))
+                    fast_restore = False
+
             # Handle tenant-specific vs non-tenant restore
-            if MULTI_TENANT_ENABLED and hasattr(restore, 'tenant') and restore.tenant:
+            if tenant_restore:
                 # Tenant-specific restore
                 options['no_cleanup'] = not cleanup_existing_data
                 options['tenant_pk'] = restore.tenant.pk
                 self.stdout.write(f'Running tenant_loaddata for tenant {restore.tenant.pk}')
-                call_command('tenant_loaddata', json_file_path, **options)
+                call_command('tenant_loaddata', *data_files, **options)
+            elif fast_restore:
+                # Truncates the restored tables in place of the cleanup
+                self.stdout.write('Running fast restore with COPY (no tenant)')
+                counts = CopyFixtureLoader(using=options['database'], exclude_models=exclude_models).load(data_files)
+                self.stdout.write(f'Loaded {sum(counts.values())} objects from {len(counts)} models')
             else:
                 # Non-tenant restore
                 self.stdout.write('Running loaddata (no tenant)')
                 if cleanup_existing_data:
                     self.stdout.write('Cleanup existing data is enabled, cleaning up existing data from fixture models')
                     _cleanup_existing_data_for_non_tenant_restore(
-                        file_path=json_file_path,
+                        data_files=data_files,
                         exclude_models=exclude_models,
                         using=options.get('database', 'default')
                     )
 
-                call_command('loaddata', json_file_path, **options)
-
-            # Restore media files AFTER loaddata commands are complete
-            if has_media_files and backup_data:
-                self.stdout.write('Starting media file restoration after successful data load...')
-                media_restore_result = restore_media_files_after_loaddata(temp_dir, backup_data)
-                self.stdout.write(f'Media restoration completed: {len(media_restore_result["restored"])} files restored, '
-                                f'{len(media_restore_result["failed"])} failed')
-                
-                if media_restore_result['failed']:
-                    self.stdout.write(
-                        self.style.WARNING(f'Failed to restore media files: {media_restore_result["failed"]}')
-                    )
+                call_command('loaddata', *data_files, **options)
+
+            # Rows the older archives of an incremental chain brought back but later deleted
+            deleted_count = delete_rows_removed_in_chain(archives, exclude_models=exclude_models, using=options['database'])
+            if deleted_count:
+                self.stdout.write(f'Deleted {deleted_count} rows removed before the last incremental backup')
+
+            # Restore media files AFTER loaddata commands are complete, oldest archive first
+            if has_media_files:
+                for archive in archives:
+                    if not _has_media_files(archive['dir']):
+                        continue
+                    backup_data = BackupData(archive['data_files'])
+
+                    self.stdout.write(f'Starting media file restoration from {archive["dir"]} after successful data load...')
+                    media_restore_result = restore_media_files_after_loaddata(archive['dir'], backup_data)
+                    self.stdout.write(f'Media restoration completed: {len(media_restore_result["restored"])} files restored, '
+                                    f'{len(media_restore_result["failed"])} failed')
+
+                    if media_restore_result['failed']:
+                        self.stdout.write(
+                            self.style.WARNING(f'Failed to restore media files: {media_restore_result["failed"]}')
+                        )
             else:
                 self.stdout.write('No media files to restore')
 
         finally:
             # Clean up temporary files and directories
-            if json_file_path and json_file_path != source_file_path and os.path.exists(json_file_path):
-                try:
-                    os.unlink(json_file_path)
-                    self.stdout.write(f'Cleaned up temporary JSON file: {json_file_path}')
-                except Exception as e:
-                    self.stdout.write(self.style.WARNING(f'Failed to clean up temporary JSON file: {e}'))
-
             if temp_source_path and os.path.exists(temp_source_path):
                 try:
                     os.unlink(temp_source_path)
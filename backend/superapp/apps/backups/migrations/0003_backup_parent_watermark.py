@@ -0,0 +1,22 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backups', '0002_alter_restore_cleanup_existing_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backup',
+            name='parent',
+            field=models.ForeignKey(blank=True, help_text='Set on incremental backups: the backup this one holds the changes since.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='deltas', to='backups.backup', verbose_name='Parent backup'),
+        ),
+        migrations.AddField(
+            model_name='backup',
+            name='watermark',
+            field=models.DateTimeField(blank=True, help_text='Time the data was dumped at; the next incremental backup starts from it.', null=True, verbose_name='Watermark'),
+        ),
+    ]
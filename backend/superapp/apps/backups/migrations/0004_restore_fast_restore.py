@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backups', '0003_backup_parent_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restore',
+            name='fast_restore',
+            field=models.BooleanField(default=False, help_text='PostgreSQL only: truncate the restored tables and bulk load them with COPY. Needs cleanup of existing data; falls back to loaddata for tenant restores, incremental backups and tables referenced from outside the restore.', verbose_name='Fast restore'),
+        ),
+    ]
@@ -44,6 +44,21 @@ class Backup(BaseModel):
         null=True,
     )
     done = models.BooleanField(_("Done"), default=False)
+    parent = models.ForeignKey(
+        'self',
+        verbose_name=_("Parent backup"),
+        on_delete=models.PROTECT,
+        related_name='deltas',
+        blank=True,
+        null=True,
+        help_text=_("Set on incremental backups: the backup this one holds the changes since."),
+    )
+    watermark = models.DateTimeField(
+        _("Watermark"),
+        blank=True,
+        null=True,
+        help_text=_("Time the data was dumped at; the next incremental backup starts from it."),
+    )
 
     started_at = models.DateTimeField(_("Started at"), blank=True, null=True)
     finished_at = models.DateTimeField(_("Finished at"), blank=True, null=True)
@@ -60,6 +75,13 @@ class Backup(BaseModel):
         verbose_name_plural = _("Backups")
         ordering = ['-created_at']
 
+    def get_chain(self):
+        """The backups a restore of this one applies, oldest (the full backup) first."""
+        chain = [self]
+        while chain[-1].parent_id:
+            chain.append(chain[-1].parent)
+        return chain[::-1]
+
     def __str__(self):
         if MULTI_TENANT_ENABLED and hasattr(self, 'tenant'):
             return f"{self.name} ({self.type} of {self.tenant} from {self.created_at.strftime('%Y-%m-%d %H:%M:%S')})"
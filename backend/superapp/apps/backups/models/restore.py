@@ -56,6 +56,15 @@ class Restore(BaseModel):
         default='all_models'
     )
     cleanup_existing_data = models.BooleanField(_("Cleanup existing data"), default=False)
+    fast_restore = models.BooleanField(
+        _("Fast restore"),
+        default=False,
+        help_text=_(
+            "PostgreSQL only: truncate the restored tables and bulk load them with COPY. Needs cleanup "
+            "of existing data; falls back to loaddata for tenant restores, incremental backups and "
+            "tables referenced from outside the restore."
+        ),
+    )
     done = models.BooleanField(_("Done"), default=False)
 
     started_at = models.DateTimeField(_("Started at"), blank=True, null=True)
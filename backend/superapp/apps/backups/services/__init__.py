@@ -0,0 +1,4 @@
+from .backup_archive_writer import BackupArchiveWriter
+from .copy_fixture_loader import CopyFixtureLoader
+
+__all__ = ['BackupArchiveWriter', 'CopyFixtureLoader']
@@ -0,0 +1,513 @@
+"""
+Streaming writer for backup archives.
+
+One pass over the database produces the whole archive:
+
+  - every model is read through a server-side cursor in chunks and
+    serialized into its own compact NDJSON entry,
+    data/<app_label>.<model_name>.jsonl (Django's jsonl fixture format, so
+    loaddata reads it as is), written straight into the zip
+  - the same pass collects the media files and external media URLs the
+    rows reference, and hands them to a bounded thread pool that fetches
+    them while the dump goes on
+  - external URLs are cached in the backup storage by URL hash, so later
+    backups reuse the files instead of downloading them again
+  - entries are compressed with zstd where zipfile supports it (Python
+    3.14+) and deflate otherwise; already compressed media is stored as is
+
+Memory stays flat as the catalog grows: rows are streamed in chunks and
+fetched files are staged on disk until they are added to the archive. The
+finished archive is a local file, which the storage uploads in chunks
+(multipart on S3) when it is saved to Backup.file.
+
+Incremental (delta) archives are written with `since`: models with an
+updated_at (or, failing that, created_at) field only dump the rows changed
+since then, other models are dumped whole. A delta also lists every primary
+key still present, pks/<app_label>.<model_name>.jsonl, so a restore can
+drop the rows deleted after its parent. With `media_store`, media files are
+not put in the archive but kept once in a content-addressed store in the
+backup storage (media_store/<sha256[:2]>/<sha256><ext>), shared by all
+backups; media_index.json maps the archive paths to the store.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.base import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.jsonl import Serializer as JSONLSerializer
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = '2.1'
+DATA_DIR = 'data'
+PKS_DIR = 'pks'
+MEDIA_DIR = 'media'
+EXTERNAL_URLS_DIR = 'media/external_urls'
+EXTERNAL_URLS_MANIFEST = 'media/external_urls_manifest.json'
+BACKUP_MANIFEST = 'backup_manifest.json'
+MEDIA_INDEX = 'media_index.json'
+# Content-addressed media files of incremental backups, in the backup storage
+MEDIA_STORE_DIR = 'media_store'
+# Where downloaded external URLs are kept in the backup storage for reuse
+EXTERNAL_URL_CACHE_DIR = 'external_url_cache'
+
+# URLField values with these extensions are downloaded into the backup
+MEDIA_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp', '.tiff',
+    '.mp3', '.wav', '.ogg', '.flac', '.aac',
+    '.mp4', '.webm', '.mov', '.avi',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot',
+    '.pdf',
+}
+# Formats that do not shrink any further: stored without compression
+COMPRESSED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.mp3', '.ogg', '.flac', '.aac',
+    '.mp4', '.webm', '.mov', '.avi',
+    '.woff', '.woff2', '.zip', '.gz',
+}
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Fields marking when a row last changed, in order of preference
+CHANGE_FIELDS = ('updated_at', 'created_at')
+
+
+def get_field_storage(field):
+    """
+    Get the storage instance for a FileField/ImageField.
+    Handles callable storage (e.g. get_public_storage) and direct instances.
+    """
+    storage = field.storage
+    if callable(storage) and not isinstance(storage, type):
+        storage = storage()
+    return storage
+
+
+def media_file_path(value) -> Optional[str]:
+    """The storage path of a FileField value, without URL or MEDIA_URL prefixes."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    if value.startswith('http'):
+        file_path = urlparse(value).path.lstrip('/')
+    else:
+        file_path = value.lstrip('/')
+
+    if getattr(settings, 'MEDIA_URL', None):
+        media_url = settings.MEDIA_URL.strip('/')
+        if file_path.startswith(media_url + '/'):
+            file_path = file_path[len(media_url) + 1:]
+    return file_path or None
+
+
+def external_media_url(value) -> Optional[str]:
+    """The URLField value if it points to an external media resource."""
+    if not isinstance(value, str):
+        return None
+    url = value.strip()
+    if not url.startswith('http'):
+        return None
+    if os.path.splitext(urlparse(url).path)[1].lower() not in MEDIA_EXTENSIONS:
+        return None
+    return url
+
+
+def external_url_filename(url: str) -> str:
+    """Deterministic file name of a downloaded URL: its hash plus the original extension."""
+    ext = os.path.splitext(urlparse(url).path)[1].lower() or '.bin'
+    return f"{hashlib.sha256(url.encode()).hexdigest()[:16]}{ext}"
+
+
+def resolve_models(model_labels, db_alias: str) -> List[type]:
+    """
+    Model classes to dump for a backup type's models setting ('*' or labels).
+    Proxy models and models not migrated on db_alias are skipped.
+    """
+    if model_labels == '*':
+        candidates = [
+            model
+            for app_config in apps.get_app_configs()
+            for model in app_config.get_models()
+        ]
+    else:
+        candidates = [apps.get_model(label) for label in model_labels]
+
+    return [
+        model for model in candidates
+        if not model._meta.proxy and router.allow_migrate_model(db_alias, model)
+    ]
+
+
+def get_change_field(model) -> Optional[str]:
+    """The DateTimeField an incremental backup filters the model's rows on, if any."""
+    for name in CHANGE_FIELDS:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, models.DateTimeField):
+            return name
+    return None
+
+
+def media_store_path(digest: str, ext: str) -> str:
+    return f'{MEDIA_STORE_DIR}/{digest[:2]}/{digest}{ext}'
+
+
+class _CollectingSerializer(JSONLSerializer):
+    """jsonl serializer with compact separators that reports each row's references."""
+
+    def __init__(self, writer: 'BackupArchiveWriter'):
+        self.writer = writer
+        self.count = 0
+
+    def _init_options(self):
+        super()._init_options()
+        self.json_kwargs['separators'] = (',', ':')
+
+    def end_object(self, obj):
+        # self._current holds the serialized values of the selected fields
+        self.writer.collect_references(obj, self._current)
+        self.count += 1
+        super().end_object(obj)
+
+
+class BackupArchiveWriter:
+    """
+    Writes one backup archive; see the module docstring for the layout.
+
+    Usage:
+        writer = BackupArchiveWriter(archive_path, work_dir, db_alias='direct')
+        stats = writer.write(resolve_models(labels, 'direct'), excluded_fields)
+
+    Pass since=parent watermark for a delta; stats['watermark'] is the one to
+    record for the next delta.
+    """
+
+    def __init__(
+        self,
+        archive_path,
+        work_dir,
+        db_alias: str = 'default',
+        chunk_size: Optional[int] = None,
+        download_workers: Optional[int] = None,
+        external_urls_timeout: Optional[int] = None,
+        media_store: bool = False,
+    ):
+        backups_settings = getattr(settings, 'BACKUPS', {})
+        self.archive_path = archive_path
+        self.staging_dir = Path(work_dir) / 'staging'
+        self.db_alias = db_alias
+        self.chunk_size = chunk_size or backups_settings.get('CHUNK_SIZE', 2000)
+        self.download_workers = download_workers or backups_settings.get('DOWNLOAD_WORKERS', 8)
+        self.external_urls_timeout = external_urls_timeout or backups_settings.get('EXTERNAL_URLS_TIMEOUT', 300)
+        self.url_timeout = 10
+        self.max_url_file_size = 10 * 1024 * 1024
+        self.compression, self.compresslevel = self._get_compression(backups_settings.get('COMPRESSION', 'zstd'))
+        self.media_store = media_store
+
+        from superapp.apps.backups.models.backup import Backup
+        self.cache_storage = get_field_storage(Backup._meta.get_field('file'))
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._fetches = []
+        self._media_paths = set()
+        self._external_urls: Dict[str, str] = {}
+        self._reference_fields: Dict[type, Tuple[list, list]] = {}
+        self._media_index: Dict[str, str] = {}
+        self._deadline = 0.0
+
+    @staticmethod
+    def _get_compression(name: str) -> Tuple[int, Optional[int]]:
+        if name == 'zstd':
+            if hasattr(zipfile, 'ZIP_ZSTANDARD'):
+                return zipfile.ZIP_ZSTANDARD, 3
+            logger.info("zipfile has no zstd support on this Python, using deflate")
+        return zipfile.ZIP_DEFLATED, 6
+
+    def write(
+        self,
+        model_classes,
+        excluded_fields: Optional[Dict[str, List[str]]] = None,
+        since=None,
+        manifest_extra: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Dump the models and the files they reference into the archive.
+
+        Args:
+            model_classes: Models to dump, in order (see resolve_models)
+            excluded_fields: Dict mapping model labels to field names left out of the dump
+            since: Only dump rows changed at or after this datetime (delta archive)
+            manifest_extra: Additional keys for the backup manifest
+
+        Returns:
+            Dict with per-model object counts, the media / external URL results
+            and the watermark of the dump
+        """
+        excluded_fields = excluded_fields or {}
+        # Taken before the snapshot: rows changed while dumping land in the next delta
+        watermark = timezone.now()
+        stats = {
+            'watermark': watermark,
+            'objects': {},
+            'media': {'copied': [], 'missing': []},
+            'external_urls': {'downloaded': [], 'reused': [], 'failed': []},
+        }
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self._deadline = time.monotonic() + self.external_urls_timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.download_workers, thread_name_prefix='backup-fetch')
+
+        try:
+            with zipfile.ZipFile(
+                self.archive_path, 'w',
+                compression=self.compression, compresslevel=self.compresslevel, allowZip64=True,
+            ) as zipf:
+                data_files, pk_files = self._dump_models(zipf, model_classes, excluded_fields, since, stats)
+                self._add_fetched_files(zipf, stats)
+
+                failed_urls = set(stats['external_urls']['failed'])
+                manifest = {url: filename for url, filename in self._external_urls.items() if url not in failed_urls}
+                zipf.writestr(EXTERNAL_URLS_MANIFEST, json.dumps(manifest, indent=2))
+                if self.media_store:
+                    zipf.writestr(MEDIA_INDEX, json.dumps(self._media_index, indent=2))
+                zipf.writestr(BACKUP_MANIFEST, json.dumps({
+                    'backup_type': 'data_with_media',
+                    'created_at': timezone.now().isoformat(),
+                    'data_files': data_files,
+                    'pk_files': pk_files,
+                    'objects': stats['objects'],
+                    'media_directory': f'{MEDIA_DIR}/',
+                    'media_index': MEDIA_INDEX if self.media_store else None,
+                    'incremental': since is not None,
+                    'since': since.isoformat() if since is not None else None,
+                    'watermark': watermark.isoformat(),
+                    'format_version': FORMAT_VERSION,
+                    **(manifest_extra or {}),
+                }, indent=2))
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+        logger.info(
+            f"Backup archive written: {sum(stats['objects'].values())} objects in {len(stats['objects'])} models, "
+            f"{len(stats['media']['copied'])} media files ({len(stats['media']['missing'])} missing), "
+            f"{len(stats['external_urls']['downloaded'])} external URLs downloaded, "
+            f"{len(stats['external_urls']['reused'])} reused, {len(stats['external_urls']['failed'])} failed"
+        )
+        return stats
+
+    @contextmanager
+    def _snapshot(self):
+        """One consistent, read-only snapshot for all models on PostgreSQL."""
+        connection = connections[self.db_alias]
+        if connection.vendor != 'postgresql' or connection.in_atomic_block:
+            yield
+            return
+        with transaction.atomic(using=self.db_alias):
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+            yield
+
+    def _dump_models(self, zipf, model_classes, excluded_fields, since, stats) -> Tuple[List[str], List[str]]:
+        data_files, pk_files = [], []
+        with self._snapshot():
+            for model in model_classes:
+                label = model._meta.label_lower
+                arcname = f'{DATA_DIR}/{label}.jsonl'
+                fields = self._selected_fields(model, excluded_fields.get(label))
+                serializer = _CollectingSerializer(self)
+                with io.TextIOWrapper(zipf.open(arcname, 'w', force_zip64=True), encoding='utf-8', newline='\n') as stream:
+                    serializer.serialize(
+                        self._queryset(model, fields, since).iterator(chunk_size=self.chunk_size),
+                        stream=stream,
+                        fields=fields,
+                    )
+                stats['objects'][label] = serializer.count
+                data_files.append(arcname)
+                if since is not None:
+                    pk_files.append(self._dump_pks(zipf, model))
+                logger.debug(f"Dumped {serializer.count} objects of {label}")
+        return data_files, pk_files
+
+    def _dump_pks(self, zipf, model) -> str:
+        """Write every primary key of the model, one JSON value per line."""
+        arcname = f'{PKS_DIR}/{model._meta.label_lower}.jsonl'
+        pks = (
+            model._default_manager.using(self.db_alias)
+            .order_by(model._meta.pk.name)
+            .values_list('pk', flat=True)
+            .iterator(chunk_size=self.chunk_size * 10)
+        )
+        with io.TextIOWrapper(zipf.open(arcname, 'w', force_zip64=True), encoding='utf-8', newline='\n') as stream:
+            for pk in pks:
+                stream.write(json.dumps(pk, cls=DjangoJSONEncoder))
+                stream.write('\n')
+        return arcname
+
+    @staticmethod
+    def _selected_fields(model, excluded: Optional[List[str]]) -> Optional[List[str]]:
+        if not excluded:
+            return None
+        opts = model._meta
+        return [
+            field.name for field in [*opts.local_fields, *opts.local_many_to_many]
+            if field.name not in excluded
+        ]
+
+    def _queryset(self, model, fields: Optional[List[str]], since=None):
+        queryset = model._default_manager.using(self.db_alias).order_by(model._meta.pk.name)
+        change_field = get_change_field(model) if since is not None else None
+        if change_field:
+            queryset = queryset.filter(**{f'{change_field}__gte': since})
+        # Serialized m2m fields: one query per chunk instead of one per row
+        m2m = [
+            field.name for field in model._meta.local_many_to_many
+            if field.remote_field.through._meta.auto_created and (fields is None or field.name in fields)
+        ]
+        if m2m:
+            queryset = queryset.prefetch_related(*m2m)
+        return queryset
+
+    def collect_references(self, obj, values: Dict[str, Any]) -> None:
+        """Queue fetches for the media files and external URLs a row references."""
+        file_fields, url_fields = self._get_reference_fields(type(obj))
+        for field in file_fields:
+            path = media_file_path(values.get(field.name))
+            if path and path not in self._media_paths:
+                self._media_paths.add(path)
+                self._fetches.append(self._executor.submit(self._fetch_media_file, path, get_field_storage(field)))
+        for field in url_fields:
+            url = external_media_url(values.get(field.name))
+            if url and url not in self._external_urls:
+                filename = external_url_filename(url)
+                self._external_urls[url] = filename
+                self._fetches.append(self._executor.submit(self._fetch_external_url, url, filename))
+
+    def _get_reference_fields(self, model) -> Tuple[list, list]:
+        if model not in self._reference_fields:
+            concrete_fields = model._meta.concrete_fields
+            self._reference_fields[model] = (
+                [f for f in concrete_fields if isinstance(f, models.FileField)],
+                [f for f in concrete_fields if isinstance(f, models.URLField)],
+            )
+        return self._reference_fields[model]
+
+    def _staging_path(self, arcname: str) -> Path:
+        return self.staging_dir / hashlib.sha256(arcname.encode()).hexdigest()
+
+    def _fetch_media_file(self, path: str, storage) -> Tuple[str, str, Optional[Path], str]:
+        staged = self._staging_path(f'{MEDIA_DIR}/{path}')
+        try:
+            if not storage.exists(path):
+                logger.warning(f"Media file not found in storage: {path}")
+                return 'media', path, None, 'missing'
+            with storage.open(path, 'rb') as source, open(staged, 'wb') as dest:
+                shutil.copyfileobj(source, dest, COPY_CHUNK_SIZE)
+            if self.media_store:
+                self._media_index[f'{MEDIA_DIR}/{path}'] = self._save_to_media_store(staged, path)
+                staged.unlink()
+                return 'media', path, None, 'copied'
+            return 'media', path, staged, 'copied'
+        except Exception as e:
+            logger.error(f"Error copying media file {path}: {e}")
+            staged.unlink(missing_ok=True)
+            return 'media', path, None, 'missing'
+
+    def _save_to_media_store(self, staged: Path, path: str) -> str:
+        """Save a staged file under its content hash unless an earlier backup did."""
+        digest = hashlib.sha256()
+        with open(staged, 'rb') as f:
+            for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        store_path = media_store_path(digest.hexdigest(), os.path.splitext(path)[1].lower())
+        if not self.cache_storage.exists(store_path):
+            with open(staged, 'rb') as f:
+                saved_path = self.cache_storage.save(store_path, File(f))
+            if saved_path != store_path:
+                # Another backup stored the same content concurrently
+                self.cache_storage.delete(saved_path)
+        return store_path
+
+    def _fetch_external_url(self, url: str, filename: str) -> Tuple[str, str, Optional[Path], str]:
+        staged = self._staging_path(f'{EXTERNAL_URLS_DIR}/{filename}')
+        cache_path = f'{EXTERNAL_URL_CACHE_DIR}/{filename}'
+
+        # Files downloaded by an earlier backup
+        try:
+            if self.cache_storage.exists(cache_path):
+                with self.cache_storage.open(cache_path, 'rb') as source, open(staged, 'wb') as dest:
+                    shutil.copyfileobj(source, dest, COPY_CHUNK_SIZE)
+                return 'url', url, staged, 'reused'
+        except Exception as e:
+            logger.warning(f"Could not read cached external URL {url}: {e}")
+
+        if time.monotonic() > self._deadline:
+            logger.warning(f"External URL download time budget exhausted, skipping {url}")
+            return 'url', url, None, 'failed'
+
+        try:
+            req = Request(url, headers={'User-Agent': 'RadioCrestin-Backup/1.0'})
+            bytes_read = 0
+            with urlopen(req, timeout=self.url_timeout) as response, open(staged, 'wb') as dest:
+                while True:
+                    chunk = response.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    bytes_read += len(chunk)
+                    if bytes_read > self.max_url_file_size:
+                        break
+                    dest.write(chunk)
+            if bytes_read > self.max_url_file_size:
+                logger.warning(f"Skipping {url}: exceeded max file size ({self.max_url_file_size} bytes)")
+                staged.unlink(missing_ok=True)
+                return 'url', url, None, 'failed'
+        except Exception as e:
+            logger.warning(f"Failed to download external URL {url}: {e}")
+            staged.unlink(missing_ok=True)
+            return 'url', url, None, 'failed'
+
+        try:
+            with open(staged, 'rb') as f:
+                self.cache_storage.save(cache_path, File(f))
+        except Exception as e:
+            logger.warning(f"Could not cache external URL {url}: {e}")
+        return 'url', url, staged, 'downloaded'
+
+    def _add_fetched_files(self, zipf, stats) -> None:
+        """Add the fetched files to the archive as their fetches complete."""
+        for future in as_completed(self._fetches):
+            kind, key, staged, status = future.result()
+            if kind == 'media':
+                stats['media'][status].append(key)
+                arcname = f'{MEDIA_DIR}/{key}'
+            else:
+                stats['external_urls'][status].append(key)
+                arcname = f'{EXTERNAL_URLS_DIR}/{self._external_urls[key]}'
+            if staged is None:
+                continue
+            compress_type = (
+                zipfile.ZIP_STORED
+                if os.path.splitext(arcname)[1].lower() in COMPRESSED_EXTENSIONS
+                else None
+            )
+            zipf.write(staged, arcname, compress_type=compress_type)
+            staged.unlink()
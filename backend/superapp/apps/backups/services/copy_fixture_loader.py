@@ -0,0 +1,288 @@
+"""
+Bulk loader for backup data files: the fast restore mode on PostgreSQL.
+
+loaddata builds and saves every object on its own. The fast mode instead:
+
+  - truncates the restored tables level by level, most dependent first
+    (refused when TRUNCATE ... CASCADE would also empty tables outside the
+    restore, see unsupported_reason)
+  - streams each per-model data file into its table with COPY FROM STDIN,
+    and the rows of its auto-created many-to-many tables after it
+  - runs in one transaction with all constraints deferred, so foreign keys
+    are checked once, at commit
+  - resets the primary key sequences at the end
+
+As with loaddata's raw saves, model save() methods do not run; neither do
+the pre/post_save signals. Only the per-model NDJSON data files of a single
+format 2.x archive can be streamed (see CopyFixtureLoader.supports).
+"""
+
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+logger = logging.getLogger(__name__)
+
+COPY_NULL = '\\N'
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def copy_text_value(field, value) -> str:
+    """A fixture value in COPY's text format."""
+    if value is None:
+        return COPY_NULL
+    if isinstance(field, models.JSONField):
+        value = json.dumps(value, cls=field.encoder or DjangoJSONEncoder)
+    elif isinstance(field, models.BinaryField) and isinstance(value, str):
+        # Serialized as base64
+        value = '\\x' + field.to_python(value).hex()
+    elif isinstance(value, bool):
+        value = 't' if value else 'f'
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, cls=DjangoJSONEncoder)
+    else:
+        value = str(value)
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class _LineStream:
+    """Read-only file object over an iterator of lines, for psycopg2's copy_expert."""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self._pending = ''
+
+    def read(self, size: int = -1) -> str:
+        parts, length = [self._pending], len(self._pending)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            self._pending = ''
+            return data
+        data, self._pending = data[:size], data[size:]
+        return data
+
+
+class CopyFixtureLoader:
+    """
+    Loads the data files of a backup archive with COPY; see the module docstring.
+
+    Usage:
+        loader = CopyFixtureLoader('default', exclude_models)
+        if loader.unsupported_reason(data_files, cleanup_existing_data) is None:
+            counts = loader.load(data_files)
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS, exclude_models=None):
+        self.using = using
+        self.exclude_models = {model_name.lower() for model_name in exclude_models or []}
+
+    @staticmethod
+    def supports(data_files, using: str = DEFAULT_DB_ALIAS) -> bool:
+        """
+        Whether the data files can be bulk loaded: PostgreSQL, and one
+        <app_label>.<model_name>.jsonl file per model (an incremental chain
+        has several per model, an old archive one backup.json).
+        """
+        names = [Path(data_file).name for data_file in data_files]
+        return (
+            connections[using].vendor == 'postgresql'
+            and all(name.endswith('.jsonl') for name in names)
+            and len(set(names)) == len(names)
+        )
+
+    def unsupported_reason(self, data_files, cleanup_existing_data: bool) -> Optional[str]:
+        """
+        Why the data files can't be fast restored, or None if they can.
+
+        The fast mode replaces the restored tables, so it only stands in for
+        loaddata with existing data cleaned up, and only when truncating them
+        empties no other table.
+        """
+        if not self.supports(data_files, self.using):
+            return "it needs PostgreSQL and a single archive with per-model data files"
+        if not cleanup_existing_data:
+            return "it replaces the restored tables, which needs cleanup of existing data"
+        cascaded = self.cascaded_models(data_files)
+        if cascaded:
+            return f"truncating the restored tables would also empty {', '.join(cascaded)}"
+        return None
+
+    def cascaded_models(self, data_files) -> List[str]:
+        """
+        Labels of the models outside the restore (excluded models included)
+        whose tables TRUNCATE ... CASCADE would empty along with the restored
+        ones: every table with a foreign key constraint to them, recursively.
+        """
+        restored = set()
+        for model, _ in self._model_files(data_files).values():
+            restored.add(model)
+            restored.update(field.remote_field.through for field in self._m2m_fields(model))
+
+        cascaded = set()
+        pending = list(restored)
+        while pending:
+            model = pending.pop()
+            for relation in model._meta.get_fields(include_hidden=True):
+                # Reverse side of a foreign key / one-to-one held by another table
+                if not relation.auto_created or relation.concrete:
+                    continue
+                if not (relation.one_to_many or relation.one_to_one) or not relation.field.db_constraint:
+                    continue
+                referencing = relation.related_model._meta.concrete_model
+                if referencing in restored or referencing in cascaded:
+                    continue
+                cascaded.add(referencing)
+                pending.append(referencing)
+        return sorted(model._meta.label_lower for model in cascaded)
+
+    def _model_files(self, data_files) -> Dict[str, Tuple[type, str]]:
+        model_files = {}
+        for data_file in data_files:
+            label = Path(data_file).stem.lower()
+            if label in self.exclude_models:
+                logger.info(f"Excluding model from fast restore: {label}")
+                continue
+            model_files[label] = (apps.get_model(label), data_file)
+        return model_files
+
+    def load(self, data_files) -> Dict[str, int]:
+        """
+        Replace the contents of the tables of the data files' models with the
+        rows of the data files.
+
+        Args:
+            data_files: Paths of the per-model .jsonl data files
+
+        Returns:
+            Dict mapping model labels to the number of rows loaded
+
+        Raises:
+            ValueError: if truncating the restored tables would empty others
+        """
+        from superapp.apps.backups.tasks.restore import _calculate_model_dependency_levels
+
+        cascaded = self.cascaded_models(data_files)
+        if cascaded:
+            raise ValueError(f"Fast restore would also empty the tables of {cascaded}")
+
+        model_files = self._model_files(data_files)
+        dependency_levels = _calculate_model_dependency_levels(
+            [(label, model) for label, (model, _) in model_files.items()], self.using
+        )
+
+        connection = connections[self.using]
+        counts = {}
+        with transaction.atomic(using=self.using), connection.cursor() as cursor:
+            # Foreign keys (DEFERRABLE on PostgreSQL) are checked at commit, after all tables are loaded
+            cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+            for level in sorted(dependency_levels.keys(), reverse=True):
+                tables = [
+                    table
+                    for _, model in dependency_levels[level]
+                    for table in self._model_tables(model)
+                ]
+                logger.info(f"Truncating {', '.join(tables)}")
+                cursor.execute(
+                    f"TRUNCATE TABLE {', '.join(connection.ops.quote_name(table) for table in tables)} CASCADE"
+                )
+
+            for level in sorted(dependency_levels.keys()):
+                for label, model in dependency_levels[level]:
+                    counts[label] = self._copy_model(cursor, model, model_files[label][1])
+                    logger.info(f"Loaded {counts[label]} rows of {label}")
+
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model for model, _ in model_files.values()]):
+                cursor.execute(sql)
+
+        logger.info(f"Fast restore loaded {sum(counts.values())} rows in {len(counts)} models")
+        return counts
+
+    @staticmethod
+    def _m2m_fields(model) -> List[models.ManyToManyField]:
+        # Explicit through models are dumped as models of their own
+        return [
+            field for field in model._meta.local_many_to_many
+            if field.remote_field.through._meta.auto_created
+        ]
+
+    def _model_tables(self, model) -> List[str]:
+        return [model._meta.db_table] + [
+            field.remote_field.through._meta.db_table for field in self._m2m_fields(model)
+        ]
+
+    def _copy_model(self, cursor, model, data_file) -> int:
+        opts = model._meta
+        fields = [field for field in opts.local_concrete_fields if not field.primary_key]
+        m2m_fields = self._m2m_fields(model)
+        m2m_buffers = {field.name: tempfile.TemporaryFile('w+', encoding='utf-8') for field in m2m_fields}
+        count = 0
+
+        def rows() -> Iterator[str]:
+            nonlocal count
+            with open(data_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    obj = json.loads(line)
+                    values = obj['fields']
+                    row = [copy_text_value(opts.pk, obj['pk'])]
+                    for field in fields:
+                        # Fields left out of the backup (exclude_fields) get their default
+                        value = values[field.name] if field.name in values else field.get_default()
+                        row.append(copy_text_value(field, value))
+                    yield '\t'.join(row) + '\n'
+
+                    for field in m2m_fields:
+                        for related_pk in values.get(field.name) or []:
+                            m2m_buffers[field.name].write(
+                                f"{copy_text_value(opts.pk, obj['pk'])}\t"
+                                f"{copy_text_value(field.target_field, related_pk)}\n"
+                            )
+                    count += 1
+
+        try:
+            self._copy(cursor, opts.db_table, [opts.pk.column] + [field.column for field in fields], rows())
+            for field in m2m_fields:
+                through = field.remote_field.through._meta
+                buffer = m2m_buffers[field.name]
+                buffer.seek(0)
+                self._copy(
+                    cursor,
+                    through.db_table,
+                    [
+                        through.get_field(field.m2m_field_name()).column,
+                        through.get_field(field.m2m_reverse_field_name()).column,
+                    ],
+                    buffer,
+                )
+        finally:
+            for buffer in m2m_buffers.values():
+                buffer.close()
+        return count
+
+    def _copy(self, cursor, table: str, columns: List[str], lines: Iterable[str]) -> None:
+        quote_name = connections[self.using].ops.quote_name
+        sql = f"COPY {quote_name(table)} ({', '.join(quote_name(column) for column in columns)}) FROM STDIN"
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy_expert'):
+            # psycopg2
+            raw_cursor.copy_expert(sql, _LineStream(lines), size=COPY_CHUNK_SIZE)
+        else:
+            # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                for line in lines:
+                    copy.write(line)
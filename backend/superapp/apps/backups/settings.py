@@ -49,6 +49,17 @@ def extend_superapp_settings(main_settings):
                     'RETENTION': {
                         'MAX_BACKUPS': 30,
                     },
+                    # Rows fetched per server-side cursor round trip while dumping
+                    'CHUNK_SIZE': 2000,
+                    # Threads fetching media files and external URLs into the archive
+                    'DOWNLOAD_WORKERS': 8,
+                    # Time budget in seconds for downloading external URLs
+                    'EXTERNAL_URLS_TIMEOUT': 300,
+                    # 'zstd' (Python 3.14+, deflate otherwise) or 'deflate'
+                    'COMPRESSION': 'zstd',
+                    # Seconds an incremental backup reaches back before its parent's watermark,
+                    # for rows committed after the parent's dump with an earlier updated_at
+                    'INCREMENTAL_OVERLAP': 300,
                 }
             },
             main_settings,
@@ -1,32 +1,36 @@
-import hashlib
+import json
 import logging
 from celery import shared_task
 import tempfile
 import os
-import json
 import zipfile
-import shutil
-from pathlib import Path
-from urllib.parse import urlparse
-from urllib.request import urlopen, Request
-from urllib.error import URLError
+from datetime import timedelta
 from django.conf import settings
 from django.core.files.base import File
-from django.core.management import call_command
+from django.db import connections
+from django.db.models import ProtectedError
 from django.utils import timezone
-from django.apps import apps
-from django.db import models
 
 from superapp.apps.backups.models.backup import Backup
+from superapp.apps.backups.services.backup_archive_writer import (
+    MEDIA_INDEX,
+    MEDIA_STORE_DIR,
+    BackupArchiveWriter,
+    get_field_storage,
+    resolve_models,
+)
 
 # Conditional imports for multi-tenant support
 try:
-    from django_multitenant.utils import unset_current_tenant
+    from django_multitenant.utils import get_current_tenant, unset_current_tenant
     from superapp.apps.multi_tenant.middleware import set_current_tenant
     MULTI_TENANT_ENABLED = True
 except ImportError:
     MULTI_TENANT_ENABLED = False
 
+    def get_current_tenant():
+        return None
+
     def unset_current_tenant():
         pass
 
@@ -35,367 +39,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-
-def _get_field_storage(field):
-    """
-    Get the storage instance for a FileField/ImageField.
-    Handles callable storage (e.g. get_public_storage) and direct instances.
-
-    Args:
-        field: A Django FileField or ImageField
-
-    Returns:
-        The resolved storage instance for the field
-    """
-    storage = field.storage
-    if callable(storage) and not isinstance(storage, type):
-        storage = storage()
-    return storage
-
-
-def extract_media_files_from_fixture(fixture_data):
-    """
-    Extract media file paths from fixture data by examining FileField and ImageField values.
-    Returns each file's path along with its storage backend so the correct storage is used
-    for reading/writing.
-
-    Args:
-        fixture_data: Parsed JSON fixture data
-
-    Returns:
-        List of dicts with 'path' and 'storage' keys for each media file referenced in the fixture
-    """
-    media_files = []
-    seen_paths = set()
-
-    if not isinstance(fixture_data, list):
-        return media_files
-
-    for obj in fixture_data:
-        if not isinstance(obj, dict) or 'model' not in obj or 'fields' not in obj:
-            continue
-
-        model_name = obj['model']
-        fields = obj['fields']
-
-        try:
-            # Get the actual model class
-            app_label, model_class_name = model_name.split('.')
-            model_class = apps.get_model(app_label, model_class_name)
-
-            # Check each field in the fixture
-            for field_name, field_value in fields.items():
-                if not field_value:
-                    continue
-
-                try:
-                    # Get the field from the model
-                    field = model_class._meta.get_field(field_name)
-
-                    # Check if it's a FileField or ImageField
-                    if isinstance(field, (models.FileField, models.ImageField)):
-                        # Extract the file path (remove any URL prefixes)
-                        if isinstance(field_value, str) and field_value.strip():
-                            # Handle both relative paths and full URLs
-                            if field_value.startswith('http'):
-                                parsed_url = urlparse(field_value)
-                                file_path = parsed_url.path.lstrip('/')
-                            else:
-                                file_path = field_value.lstrip('/')
-
-                            # Remove media URL prefix if present
-                            if hasattr(settings, 'MEDIA_URL') and settings.MEDIA_URL:
-                                media_url = settings.MEDIA_URL.strip('/')
-                                if file_path.startswith(media_url + '/'):
-                                    file_path = file_path[len(media_url) + 1:]
-
-                            if file_path and file_path not in seen_paths:
-                                seen_paths.add(file_path)
-                                storage = _get_field_storage(field)
-                                media_files.append({
-                                    'path': file_path,
-                                    'storage': storage,
-                                })
-
-                except Exception as e:
-                    # Field might not exist or be accessible, skip it
-                    logger.debug(f"Could not process field {field_name} in {model_name}: {e}")
-                    continue
-
-        except Exception as e:
-            logger.debug(f"Could not process model {model_name}: {e}")
-            continue
-
-    return media_files
-
-
-def copy_media_files_to_backup(media_files, backup_dir):
-    """
-    Copy media files to the backup directory, preserving the directory structure.
-    Uses each file's own storage backend (public, private, etc.) to read the file.
-
-    Args:
-        media_files: List of dicts with 'path' and 'storage' keys
-        backup_dir: Directory where media files should be copied
-
-    Returns:
-        Dict with 'copied' and 'missing' file lists
-    """
-    copied_files = []
-    missing_files = []
-
-    backup_media_dir = Path(backup_dir) / 'media'
-    backup_media_dir.mkdir(parents=True, exist_ok=True)
-
-    for media_file in media_files:
-        file_path = media_file['path']
-        storage = media_file['storage']
-        dest_path = backup_media_dir / file_path
-
-        try:
-            # Check if file exists in the field's storage backend
-            if storage.exists(file_path):
-                # Create destination directory if it doesn't exist
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Open the file from the field's storage (works with S3, local, etc.)
-                with storage.open(file_path, 'rb') as source_file:
-                    # Write to local backup directory
-                    with open(dest_path, 'wb') as dest_file:
-                        # Copy in chunks to handle large files efficiently
-                        for chunk in iter(lambda: source_file.read(8192), b''):
-                            dest_file.write(chunk)
-
-                copied_files.append(file_path)
-                logger.debug(f"Copied media file from storage: {file_path}")
-
-            else:
-                missing_files.append(file_path)
-                logger.warning(f"Media file not found in storage: {file_path}")
-
-        except Exception as e:
-            missing_files.append(file_path)
-            logger.error(f"Error copying media file {file_path}: {e}")
-
-    return {
-        'copied': copied_files,
-        'missing': missing_files
-    }
-
-
-def extract_external_url_fields_from_fixture(fixture_data):
-    """
-    Extract external URL values from URLField fields that look like media resources
-    (images, fonts, etc.). These are URLs stored in fields like thumbnail_url that
-    point to external servers and wouldn't be captured by FileField extraction.
-
-    Returns:
-        List of dicts with 'url', 'model', 'field', 'pk' keys
-    """
-    MEDIA_EXTENSIONS = {
-        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp', '.tiff',
-        '.mp3', '.wav', '.ogg', '.flac', '.aac',
-        '.mp4', '.webm', '.mov', '.avi',
-        '.woff', '.woff2', '.ttf', '.otf', '.eot',
-        '.pdf',
-    }
-    external_urls = []
-    seen_urls = set()
-
-    if not isinstance(fixture_data, list):
-        return external_urls
-
-    for obj in fixture_data:
-        if not isinstance(obj, dict) or 'model' not in obj or 'fields' not in obj:
-            continue
-
-        model_name = obj['model']
-        fields = obj['fields']
-        pk = obj.get('pk')
-
-        try:
-            app_label, model_class_name = model_name.split('.')
-            model_class = apps.get_model(app_label, model_class_name)
-
-            for field_name, field_value in fields.items():
-                if not field_value or not isinstance(field_value, str):
-                    continue
-
-                try:
-                    field = model_class._meta.get_field(field_name)
-                    if not isinstance(field, models.URLField):
-                        continue
-
-                    url = field_value.strip()
-                    if not url.startswith('http'):
-                        continue
-
-                    parsed = urlparse(url)
-                    ext = os.path.splitext(parsed.path)[1].lower()
-                    if ext not in MEDIA_EXTENSIONS:
-                        continue
-
-                    if url not in seen_urls:
-                        seen_urls.add(url)
-                        external_urls.append({
-                            'url': url,
-                            'model': model_name,
-                            'field': field_name,
-                            'pk': pk,
-                        })
-                except Exception:
-                    continue
-        except Exception:
-            continue
-
-    return external_urls
-
-
-def download_external_urls_to_backup(external_urls, backup_dir, timeout=10, max_file_size=10 * 1024 * 1024, total_timeout=300):
-    """
-    Download external URL resources and save them in the backup directory.
-    Files are stored under media/external_urls/ with a deterministic filename
-    derived from the URL hash, preserving the original extension.
-
-    Also creates an external_urls_manifest.json mapping URLs to local filenames.
-
-    Args:
-        external_urls: List of dicts with 'url', 'model', 'field', 'pk' keys
-        backup_dir: Directory where files should be saved
-        timeout: Per-URL socket timeout in seconds
-        max_file_size: Maximum file size per download (default 10MB)
-        total_timeout: Maximum total time for all downloads (default 5 minutes)
-
-    Returns:
-        Dict with 'downloaded', 'failed', and 'manifest' keys
-    """
-    import time
-
-    downloaded = []
-    failed = []
-    manifest = {}
-
-    if not external_urls:
-        return {'downloaded': downloaded, 'failed': failed, 'manifest': manifest}
-
-    ext_dir = Path(backup_dir) / 'media' / 'external_urls'
-    ext_dir.mkdir(parents=True, exist_ok=True)
-    total = len(external_urls)
-    start_time = time.monotonic()
-
-    for i, entry in enumerate(external_urls):
-        url = entry['url']
-
-        # Check total timeout
-        elapsed = time.monotonic() - start_time
-        if elapsed > total_timeout:
-            remaining = total - i
-            logger.warning(f"External URL download total timeout reached ({total_timeout}s). "
-                          f"Skipping remaining {remaining} URLs.")
-            for remaining_entry in external_urls[i:]:
-                failed.append(remaining_entry['url'])
-            break
-
-        try:
-            parsed = urlparse(url)
-            ext = os.path.splitext(parsed.path)[1].lower() or '.bin'
-            url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
-            filename = f"{url_hash}{ext}"
-            dest_path = ext_dir / filename
-
-            if dest_path.exists():
-                downloaded.append(url)
-                manifest[url] = filename
-                continue
-
-            req = Request(url, headers={'User-Agent': 'RadioCrestin-Backup/1.0'})
-            with urlopen(req, timeout=timeout) as response:
-                with open(dest_path, 'wb') as f:
-                    bytes_read = 0
-                    while True:
-                        chunk = response.read(8192)
-                        if not chunk:
-                            break
-                        bytes_read += len(chunk)
-                        if bytes_read > max_file_size:
-                            logger.warning(f"Skipping {url}: exceeded max file size ({max_file_size} bytes)")
-                            break
-                        f.write(chunk)
-
-                if bytes_read > max_file_size:
-                    dest_path.unlink(missing_ok=True)
-                    failed.append(url)
-                    continue
-
-            downloaded.append(url)
-            manifest[url] = filename
-
-            if (i + 1) % 10 == 0:
-                logger.info(f"External URL download progress: {i + 1}/{total}")
-
-        except Exception as e:
-            failed.append(url)
-            logger.warning(f"Failed to download external URL {url}: {e}")
-            # Clean up partial file
-            if dest_path.exists():
-                dest_path.unlink(missing_ok=True)
-
-    # Write manifest so restore knows which URL maps to which file
-    manifest_path = Path(backup_dir) / 'media' / 'external_urls_manifest.json'
-    with open(manifest_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
-
-    elapsed = time.monotonic() - start_time
-    logger.info(f"External URL downloads finished in {elapsed:.1f}s: "
-               f"{len(downloaded)} downloaded, {len(failed)} failed out of {total}")
-
-    return {'downloaded': downloaded, 'failed': failed, 'manifest': manifest}
-
-
-def create_backup_archive(json_file_path, backup_dir, archive_name):
-    """
-    Create a zip archive containing the JSON backup and media files.
-
-    Args:
-        json_file_path: Path to the JSON fixture file
-        backup_dir: Directory containing media files
-        archive_name: Name for the zip archive
-
-    Returns:
-        Path to the created zip archive
-    """
-    archive_path = Path(backup_dir) / f"{archive_name}.zip"
-
-    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add the JSON file to the root of the archive with standardized name
-        zipf.write(json_file_path, "backup.json")
-
-        # Add all media files in a "media" folder within the archive
-        media_dir = Path(backup_dir) / 'media'
-        if media_dir.exists():
-            for file_path in media_dir.rglob('*'):
-                if file_path.is_file():
-                    # Calculate relative path from media directory
-                    relative_path = file_path.relative_to(media_dir)
-                    # Ensure all media files are placed inside "media/" folder in the archive
-                    archive_media_path = f"media/{relative_path}"
-                    zipf.write(file_path, archive_media_path)
-                    logger.debug(f"Added to archive: {archive_media_path}")
-
-        # Add a manifest file with backup information
-        manifest = {
-            'backup_type': 'data_with_media',
-            'created_at': timezone.now().isoformat(),
-            'json_file': "backup.json",
-            'media_directory': 'media/',
-            'format_version': '1.0'
-        }
-
-        manifest_json = json.dumps(manifest, indent=2)
-        zipf.writestr('backup_manifest.json', manifest_json)
-
-    return archive_path
-
+# Media store entries are only swept while no backup started this recently is
+# still running: it may have saved files its archive doesn't list yet
+MEDIA_STORE_SWEEP_GRACE = timedelta(days=1)
 
 def get_models_for_backup_type(backup_type):
     """
@@ -441,48 +87,99 @@ def get_excluded_fields_for_backup_type(backup_type):
     return backup_type_config.get('exclude_fields', {})
 
 
-def filter_excluded_fields_from_fixture(fixture_data, excluded_fields):
+def get_incremental_config(backup_type):
     """
-    Remove excluded fields from fixture data.
+    Get the incremental backup configuration of a backup type.
 
     Args:
-        fixture_data: Parsed JSON fixture data (list of objects)
-        excluded_fields: Dict mapping model names to lists of excluded field names
+        backup_type: The backup type string
 
     Returns:
-        Filtered fixture data with excluded fields removed
+        Dict with 'full_every' (deltas between two full backups), or None when
+        the backup type only makes full backups
     """
-    if not isinstance(fixture_data, list) or not excluded_fields:
-        return fixture_data
-
-    filtered_data = []
-
-    for obj in fixture_data:
-        if not isinstance(obj, dict) or 'model' not in obj or 'fields' not in obj:
-            filtered_data.append(obj)
-            continue
-
-        model_name = obj['model']
-        
-        # Check if this model has excluded fields
-        if model_name in excluded_fields:
-            excluded_field_names = excluded_fields[model_name]
-            
-            # Create a copy of the object and remove excluded fields
-            filtered_obj = obj.copy()
-            filtered_obj['fields'] = {
-                field_name: field_value 
-                for field_name, field_value in obj['fields'].items()
-                if field_name not in excluded_field_names
-            }
-            
-            logger.debug(f"Excluded fields {excluded_field_names} from {model_name}")
-            filtered_data.append(filtered_obj)
-        else:
-            # No exclusions for this model, keep as is
-            filtered_data.append(obj)
+    backup_types = getattr(settings, 'BACKUPS', {}).get('BACKUP_TYPES', {})
+    incremental = backup_types.get(backup_type, {}).get('incremental', {})
+    if not incremental.get('enabled'):
+        return None
+    return {'full_every': incremental.get('full_every', 24)}
+
 
-    return filtered_data
+def get_parent_backup(backup):
+    """
+    Get the backup an incremental backup holds the changes since: the latest
+    finished backup of the same type, unless its chain already has
+    full_every deltas and a new full backup is due.
+
+    Args:
+        backup: The Backup being processed
+
+    Returns:
+        The parent Backup, or None for a full backup
+    """
+    incremental = get_incremental_config(backup.type)
+    if incremental is None:
+        return None
+
+    candidates = Backup.objects.filter(
+        type=backup.type,
+        done=True,
+        watermark__isnull=False,
+        created_at__lt=backup.created_at,
+    ).exclude(pk=backup.pk).exclude(file='')
+    if MULTI_TENANT_ENABLED:
+        candidates = candidates.filter(tenant_id=backup.tenant_id)
+
+    parent = candidates.order_by('-watermark').first()
+    if parent is None or len(parent.get_chain()) > incremental['full_every']:
+        return None
+    return parent
+
+
+def get_backup_db_alias():
+    """
+    Use the direct DB connection (bypasses PgBouncer) when available, because
+    the dump reads through server-side cursors, which are incompatible with
+    PgBouncer's transaction pooling mode.
+    """
+    return 'direct' if 'direct' in connections.databases else 'default'
+
+
+def write_backup_archive(backup_type, archive_path, work_dir, parent=None, media_store=False):
+    """
+    Write the archive of a backup type in one streaming pass (see
+    BackupArchiveWriter). Models are read within the current tenant context.
+
+    Args:
+        backup_type: The backup type string
+        archive_path: Path of the zip archive to create
+        work_dir: Directory for the files staged while the archive is written
+        parent: Backup to write a delta of; None for a full backup
+        media_store: Keep media files in the shared media store instead of the archive
+
+    Returns:
+        Dict with per-model object counts, the media / external URL results
+        and the watermark of the dump
+    """
+    db_alias = get_backup_db_alias()
+    model_classes = resolve_models(get_models_for_backup_type(backup_type), db_alias)
+    logger.debug(f"Models to backup: {[model._meta.label_lower for model in model_classes]}")
+
+    excluded_fields = get_excluded_fields_for_backup_type(backup_type)
+    if excluded_fields:
+        logger.info(f"Applying field exclusions: {excluded_fields}")
+
+    since = None
+    chain = []
+    if parent is not None:
+        # Overlap: rows committed late with an earlier updated_at still get in
+        overlap = getattr(settings, 'BACKUPS', {}).get('INCREMENTAL_OVERLAP', 300)
+        since = parent.watermark - timedelta(seconds=overlap)
+        chain = [backup.pk for backup in parent.get_chain()]
+        logger.info(f"Writing incremental backup of changes since {since} (parent backup {parent.pk})")
+
+    writer = BackupArchiveWriter(archive_path, work_dir, db_alias=db_alias, media_store=media_store)
+    return writer.write(model_classes, excluded_fields, since=since, manifest_extra={'chain': chain})
 
 @shared_task(
     bind=True,
@@ -518,78 +215,19 @@ def process_backup(self, backup_pk):
         backup.started_at = timezone.now()
         backup.save(update_fields=['started_at'])
 
-        # Get models to backup based on backup type
-        models_to_backup = get_models_for_backup_type(backup.type)
-
-        # If models_to_backup is '*', backup all models
-        if models_to_backup == '*':
-            # Get all installed models
-            args = []
-            for app_config in apps.get_app_configs():
-                for model in app_config.get_models():
-                    model_name = f"{model._meta.app_label}.{model._meta.model_name}"
-                    args.append(model_name)
-        else:
-            # Use the specific models defined in the backup type
-            args = models_to_backup
-
-        logger.debug(f"Models to backup: {args}")
+        # Incremental backup types write a delta of the latest backup until a full one is due
+        incremental = get_incremental_config(backup.type) is not None
+        backup.parent = get_parent_backup(backup)
 
         # Create a temporary directory for the backup process
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_file_path = os.path.join(temp_dir, 'backup.json')
-
-            # Use direct DB connection (bypasses PgBouncer) when available,
-            # because dumpdata uses server-side cursors which are incompatible
-            # with PgBouncer's transaction pooling mode.
-            from django.db import connections
-            db_alias = 'direct' if 'direct' in connections.databases else 'default'
-
-            # Set up options for the dumpdata command
-            options = {
-                'output': temp_file_path,
-                'format': 'json',
-                'indent': 2,
-                'database': db_alias,
-            }
+            archive_path = os.path.join(temp_dir, 'backup.zip')
 
-            # If multi-tenant is enabled and we have a tenant, use tenant-specific commands
-            if MULTI_TENANT_ENABLED and tenant:
-                options['tenant_pk'] = tenant.pk
-                call_command('tenant_dumpdata', *args, **options)
-            else:
-                call_command('dumpdata', *args, **options)
-
-            # Read the generated JSON file to extract media file references
-            with open(temp_file_path, 'r') as f:
-                fixture_data = json.load(f)
-
-            # Get excluded fields configuration and filter the fixture data
-            excluded_fields = get_excluded_fields_for_backup_type(backup.type)
-            if excluded_fields:
-                logger.info(f"Applying field exclusions: {excluded_fields}")
-                fixture_data = filter_excluded_fields_from_fixture(fixture_data, excluded_fields)
-
-                # Write the filtered data back to the file
-                with open(temp_file_path, 'w') as f:
-                    json.dump(fixture_data, f, indent=2)
-
-            # Extract media files referenced in the fixture
-            media_files = extract_media_files_from_fixture(fixture_data)
-            logger.info(f"Found {len(media_files)} media files referenced in backup")
-
-            # Copy media files to backup directory
-            media_copy_result = copy_media_files_to_backup(media_files, temp_dir)
-            logger.info(f"Copied {len(media_copy_result['copied'])} media files, "
-                       f"{len(media_copy_result['missing'])} files were missing")
-
-            # Download external URL resources (thumbnail_url, etc.)
-            external_urls = extract_external_url_fields_from_fixture(fixture_data)
-            logger.info(f"Found {len(external_urls)} external URL resources to download")
-            if external_urls:
-                ext_result = download_external_urls_to_backup(external_urls, temp_dir)
-                logger.info(f"Downloaded {len(ext_result['downloaded'])} external URLs, "
-                           f"{len(ext_result['failed'])} failed")
+            # Dump the data, media files and external URL resources into the archive
+            result = write_backup_archive(
+                backup.type, archive_path, temp_dir, parent=backup.parent, media_store=incremental
+            )
+            media_copy_result = result['media']
 
             # Create backup filename
             backup.finished_at = timezone.now()
@@ -598,9 +236,6 @@ def process_backup(self, backup_pk):
             else:
                 archive_name = f'backup_{backup.type}_{backup.finished_at.strftime("%Y%m%d_%H%M%S")}'
 
-            # Create zip archive with JSON data and media files
-            archive_path = create_backup_archive(temp_file_path, temp_dir, archive_name)
-
             # Save the zip archive as the backup file
             with open(archive_path, 'rb') as archive_file:
                 backup.file.save(
@@ -610,7 +245,8 @@ def process_backup(self, backup_pk):
                 )
 
             backup.done = True
-            backup.save(update_fields=['file', 'done', 'finished_at'])
+            backup.watermark = result['watermark']
+            backup.save(update_fields=['file', 'done', 'finished_at', 'parent', 'watermark'])
 
             # Log backup statistics
             logger.info(f"Backup completed: {archive_name}.zip")
@@ -706,14 +342,26 @@ def cleanup_old_backups_for_type(backup_type):
         total_backups = completed_backups.count()
 
         if total_backups > max_backups:
-            # Get backups to delete (everything beyond the retention limit)
-            backups_to_delete = completed_backups[max_backups:]
-            delete_count = backups_to_delete.count()
+            # The backups incremental backups within the retention limit build on are kept too
+            kept_pks = {
+                chain_backup.pk
+                for backup in completed_backups[:max_backups]
+                for chain_backup in backup.get_chain()
+            }
+            # Get backups to delete (everything beyond the retention limit), deltas before their parents
+            backups_to_delete = [backup for backup in completed_backups[max_backups:] if backup.pk not in kept_pks]
+            delete_count = 0
 
-            logger.info(f"Found {total_backups} backups, will delete {delete_count} old backups")
+            logger.info(f"Found {total_backups} backups, will delete {len(backups_to_delete)} old backups")
 
             # Delete old backup files and records
             for backup in backups_to_delete:
+                try:
+                    backup.delete()
+                except ProtectedError:
+                    logger.info(f"Keeping backup {backup.name}: another backup builds on it")
+                    continue
+
                 if backup.file:
                     try:
                         backup.file.delete(save=False)
@@ -721,10 +369,15 @@ def cleanup_old_backups_for_type(backup_type):
                     except Exception as e:
                         logger.warning(f"Could not delete backup file {backup.file.name}: {e}")
 
-                backup.delete()
+                delete_count += 1
                 logger.info(f"Deleted backup record: {backup.name}")
 
             logger.info(f"Cleanup completed. Deleted {delete_count} old backups")
+            if delete_count:
+                try:
+                    sweep_media_store()
+                except Exception as e:
+                    logger.warning(f"Failed to sweep the media store: {e}")
             return delete_count
         else:
             logger.info(f"No cleanup needed. Found {total_backups} backups, limit is {max_backups}")
@@ -735,6 +388,61 @@ def cleanup_old_backups_for_type(backup_type):
         raise
 
 
+def sweep_media_store():
+    """
+    Delete the media store files that no remaining backup's media index
+    references anymore. The store is shared by the backups of all types and
+    tenants, so every backup archive is read.
+
+    Returns:
+        Number of media store files deleted
+    """
+    tenant = get_current_tenant()
+    unset_current_tenant()
+    try:
+        running = Backup.objects.filter(
+            done=False, started_at__gte=timezone.now() - MEDIA_STORE_SWEEP_GRACE
+        )
+        if running.exists():
+            logger.info("Skipping the media store sweep while a backup is running")
+            return 0
+
+        referenced = set()
+        for backup in Backup.objects.exclude(file='').exclude(file__isnull=True).iterator():
+            try:
+                with backup.file.open('rb') as f, zipfile.ZipFile(f) as zipf:
+                    if MEDIA_INDEX in zipf.namelist():
+                        referenced.update(json.loads(zipf.read(MEDIA_INDEX)).values())
+            except Exception as e:
+                # Deleting what an unreadable archive may reference would break its restore
+                logger.warning(f"Skipping the media store sweep, could not read backup {backup.name}: {e}")
+                return 0
+    finally:
+        if tenant is not None:
+            set_current_tenant(tenant)
+
+    storage = get_field_storage(Backup._meta.get_field('file'))
+    deleted = 0
+    try:
+        prefixes, _ = storage.listdir(MEDIA_STORE_DIR)
+    except FileNotFoundError:
+        return 0
+    for prefix in prefixes:
+        _, files = storage.listdir(f'{MEDIA_STORE_DIR}/{prefix}')
+        for name in files:
+            store_path = f'{MEDIA_STORE_DIR}/{prefix}/{name}'
+            if store_path in referenced:
+                continue
+            try:
+                storage.delete(store_path)
+                deleted += 1
+            except Exception as e:
+                logger.warning(f"Could not delete media store file {store_path}: {e}")
+
+    logger.info(f"Media store sweep deleted {deleted} unreferenced files, {len(referenced)} are in use")
+    return deleted
+
+
 def create_backup_synchronously(backup_type, target_file_path=None, tenant=None):
     """
     Create a backup synchronously without using Celery.
@@ -771,74 +479,13 @@ def create_backup_synchronously(backup_type, target_file_path=None, tenant=None)
         backup.started_at = timezone.now()
         backup.save(update_fields=['started_at'])
 
-        # Get models to backup based on backup type
-        models_to_backup = get_models_for_backup_type(backup_type)
-
-        # If models_to_backup is '*', backup all models
-        if models_to_backup == '*':
-            args = []
-            for app_config in apps.get_app_configs():
-                for model in app_config.get_models():
-                    model_name = f"{model._meta.app_label}.{model._meta.model_name}"
-                    args.append(model_name)
-        else:
-            args = models_to_backup
-
-        logger.info(f"Backing up models: {args}")
-
         # Create a temporary directory for the backup process
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_file_path = os.path.join(temp_dir, 'backup.json')
-
-            # Use direct DB connection (bypasses PgBouncer) when available
-            from django.db import connections
-            db_alias = 'direct' if 'direct' in connections.databases else 'default'
-
-            # Set up options for the dumpdata command
-            options = {
-                'output': temp_file_path,
-                'format': 'json',
-                'indent': 2,
-                'database': db_alias,
-            }
+            archive_path = os.path.join(temp_dir, 'backup.zip')
 
-            # If multi-tenant is enabled and we have a tenant, use tenant-specific commands
-            if MULTI_TENANT_ENABLED and tenant:
-                options['tenant_pk'] = tenant.pk
-                call_command('tenant_dumpdata', *args, **options)
-            else:
-                call_command('dumpdata', *args, **options)
-
-            # Read the generated JSON file to extract media file references
-            with open(temp_file_path, 'r') as f:
-                fixture_data = json.load(f)
-
-            # Get excluded fields configuration and filter the fixture data
-            excluded_fields = get_excluded_fields_for_backup_type(backup_type)
-            if excluded_fields:
-                logger.info(f"Applying field exclusions: {excluded_fields}")
-                fixture_data = filter_excluded_fields_from_fixture(fixture_data, excluded_fields)
-                
-                # Write the filtered data back to the file
-                with open(temp_file_path, 'w') as f:
-                    json.dump(fixture_data, f, indent=2)
-
-            # Extract media files referenced in the fixture
-            media_files = extract_media_files_from_fixture(fixture_data)
-            logger.info(f"Found {len(media_files)} media files referenced in backup")
-
-            # Copy media files to backup directory
-            media_copy_result = copy_media_files_to_backup(media_files, temp_dir)
-            logger.info(f"Copied {len(media_copy_result['copied'])} media files, "
-                       f"{len(media_copy_result['missing'])} files were missing")
-
-            # Download external URL resources (thumbnail_url, etc.)
-            external_urls = extract_external_url_fields_from_fixture(fixture_data)
-            logger.info(f"Found {len(external_urls)} external URL resources to download")
-            if external_urls:
-                ext_result = download_external_urls_to_backup(external_urls, temp_dir)
-                logger.info(f"Downloaded {len(ext_result['downloaded'])} external URLs, "
-                           f"{len(ext_result['failed'])} failed")
+            # Dump the data, media files and external URL resources into the archive
+            result = write_backup_archive(backup_type, archive_path, temp_dir)
+            media_copy_result = result['media']
 
             # Create backup filename
             backup.finished_at = timezone.now()
@@ -847,9 +494,6 @@ def create_backup_synchronously(backup_type, target_file_path=None, tenant=None)
             else:
                 archive_name = f'backup_{backup.type}_{backup.finished_at.strftime("%Y%m%d_%H%M%S")}'
 
-            # Create zip archive with JSON data and media files
-            archive_path = create_backup_archive(temp_file_path, temp_dir, archive_name)
-
             # Save to target file path if specified
             final_file_path = None
             if target_file_path:
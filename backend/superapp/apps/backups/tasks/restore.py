@@ -17,7 +17,9 @@ from django.db import models, transaction, DEFAULT_DB_ALIAS
 from django.db.models import ForeignKey
 from django.utils import timezone
 
+from superapp.apps.backups.models.backup import Backup
 from superapp.apps.backups.models.restore import Restore
+from superapp.apps.backups.services.copy_fixture_loader import CopyFixtureLoader
 
 # Conditional imports for multi-tenant support
 try:
@@ -38,26 +40,188 @@ logger = logging.getLogger(__name__)
 
 def extract_backup_archive(archive_path, extract_dir):
     """
-    Extract a backup ZIP archive and return the path to the JSON file.
+    Extract a backup ZIP archive and return the paths of its data files.
+
+    Archives since format 2.0 hold one NDJSON file per model, listed in
+    backup_manifest.json; older ones a single backup.json.
 
     Args:
         archive_path: Path to the ZIP archive
         extract_dir: Directory to extract files to
 
     Returns:
-        Path to the extracted JSON backup file
+        List of paths to the extracted data files, in load order
     """
     with zipfile.ZipFile(archive_path, 'r') as zipf:
         # Extract all files
         zipf.extractall(extract_dir)
         logger.info(f"Extracted backup archive to {extract_dir}")
 
+    manifest_path = Path(extract_dir) / 'backup_manifest.json'
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            data_files = json.load(f).get('data_files')
+        if data_files:
+            return [str(Path(extract_dir) / name) for name in data_files]
+
     # Return path to the standardized JSON file
     json_file_path = Path(extract_dir) / "backup.json"
     if not json_file_path.exists():
         raise FileNotFoundError(f"backup.json not found in archive at {json_file_path}")
 
-    return str(json_file_path)
+    return [str(json_file_path)]
+
+
+def extract_backup_chain(archive_path, extract_dir):
+    """
+    Extract a backup archive along with the archives of the backups it is a
+    delta of, each into its own numbered subdirectory of extract_dir.
+
+    Media files kept in the media store (see BackupArchiveWriter) are copied
+    from the backup storage into the extracted media directories.
+
+    Args:
+        archive_path: Path to the ZIP archive
+        extract_dir: Directory to extract the archives to
+
+    Returns:
+        List of dicts with the 'dir', 'data_files' and 'pk_files' of each
+        archive, the full backup first
+    """
+    with zipfile.ZipFile(archive_path, 'r') as zipf:
+        try:
+            manifest = json.loads(zipf.read('backup_manifest.json'))
+        except KeyError:
+            manifest = {}
+
+    chain = manifest.get('chain') or []
+    archives = []
+    for index, backup_pk in enumerate(chain):
+        backup = Backup.objects.filter(pk=backup_pk).first()
+        if backup is None or not backup.file:
+            raise FileNotFoundError(f"Backup {backup_pk}, which this incremental backup builds on, is missing")
+
+        parent_archive_path = Path(extract_dir) / f'{index}.zip'
+        with backup.file.open('rb') as src, open(parent_archive_path, 'wb') as dest:
+            shutil.copyfileobj(src, dest)
+        logger.info(f"Fetched parent backup archive: {backup.file.name}")
+        archives.append(_extract_chain_archive(parent_archive_path, Path(extract_dir) / str(index)))
+        os.unlink(parent_archive_path)
+
+    archives.append(_extract_chain_archive(archive_path, Path(extract_dir) / str(len(chain))))
+    return archives
+
+
+def _extract_chain_archive(archive_path, archive_dir):
+    data_files = extract_backup_archive(archive_path, archive_dir)
+
+    manifest = {}
+    manifest_path = Path(archive_dir) / 'backup_manifest.json'
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+    if manifest.get('media_index'):
+        _fetch_media_store_files(archive_dir, manifest['media_index'])
+
+    return {
+        'dir': str(archive_dir),
+        'data_files': data_files,
+        'pk_files': [str(Path(archive_dir) / name) for name in manifest.get('pk_files') or []],
+    }
+
+
+def _fetch_media_store_files(archive_dir, media_index_name):
+    """Copy the media files an archive lists in its media index out of the media store."""
+    from superapp.apps.backups.services.backup_archive_writer import get_field_storage
+
+    with open(Path(archive_dir) / media_index_name, 'r') as f:
+        media_index = json.load(f)
+
+    storage = get_field_storage(Backup._meta.get_field('file'))
+    for arcname, store_path in media_index.items():
+        target = Path(archive_dir) / arcname
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with storage.open(store_path, 'rb') as src, open(target, 'wb') as dest:
+                shutil.copyfileobj(src, dest)
+        except Exception as e:
+            logger.warning(f"Media file {arcname} is missing from the media store ({store_path}): {e}")
+
+    logger.info(f"Fetched {len(media_index)} media files from the media store")
+
+
+def delete_rows_removed_in_chain(archives, exclude_models=None, using=DEFAULT_DB_ALIAS):
+    """
+    After loading a chain of archives, delete the rows an earlier archive
+    brought back although they were deleted before the last backup (they are
+    not in its primary key lists).
+
+    Args:
+        archives: Extracted archives, as returned by extract_backup_chain
+        exclude_models: List of model names left alone (format: 'app_label.model_name')
+        using: Database alias to use
+
+    Returns:
+        Number of deleted rows
+    """
+    if len(archives) < 2:
+        return 0
+
+    excluded = {model_name.lower() for model_name in exclude_models or []}
+    kept_pks = {}
+    for pk_file in archives[-1]['pk_files']:
+        model_name = Path(pk_file).stem
+        if model_name in excluded:
+            continue
+        with open(pk_file, 'r', encoding='utf-8') as f:
+            kept_pks[model_name] = {json.loads(line) for line in f if line.strip()}
+
+    removed_pks = defaultdict(set)
+    for archive in archives[:-1]:
+        for obj in BackupData(archive['data_files']):
+            model_name = obj['model'].lower()
+            if model_name in kept_pks and obj['pk'] not in kept_pks[model_name]:
+                removed_pks[model_name].add(obj['pk'])
+
+    models_to_clean = [(model_name, apps.get_model(model_name)) for model_name in removed_pks]
+    dependency_levels = _calculate_model_dependency_levels(models_to_clean, using)
+
+    deleted_total = 0
+    with transaction.atomic(using=using):
+        for level in sorted(dependency_levels.keys(), reverse=True):
+            for model_name, model_class in dependency_levels[level]:
+                pks = list(removed_pks[model_name])
+                for start in range(0, len(pks), 1000):
+                    deleted_count, _ = model_class.objects.using(using).filter(pk__in=pks[start:start + 1000]).delete()
+                    deleted_total += deleted_count
+                logger.info(f"Deleted {len(pks)} rows of {model_name} removed before the last backup")
+    return deleted_total
+
+
+def _has_media_files(extract_dir):
+    media_dir = Path(extract_dir) / 'media'
+    return media_dir.exists() and any(media_dir.rglob('*'))
+
+
+class BackupData:
+    """
+    The objects of a backup's data files (backup.json or per-model .jsonl
+    files), read from disk on every iteration instead of held in memory.
+    """
+
+    def __init__(self, data_files):
+        self.data_files = list(data_files)
+
+    def __iter__(self):
+        for path in self.data_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                if path.endswith('.jsonl'):
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+                else:
+                    yield from json.load(f)
 
 
 def _build_storage_map_from_backup_data(backup_data):
@@ -66,12 +230,12 @@ def _build_storage_map_from_backup_data(backup_data):
     by inspecting model FileField/ImageField definitions in the backup data.
 
     Args:
-        backup_data: Parsed JSON backup data
+        backup_data: Backup objects (BackupData)
 
     Returns:
         Dict mapping storage_path -> storage instance
     """
-    from superapp.apps.backups.tasks.backup import _get_field_storage
+    from superapp.apps.backups.services.backup_archive_writer import get_field_storage
 
     storage_map = {}
 
@@ -95,7 +259,7 @@ def _build_storage_map_from_backup_data(backup_data):
                     if isinstance(field, (models.FileField, models.ImageField)):
                         file_path = field_value.lstrip('/')
                         if file_path and file_path not in storage_map:
-                            storage_map[file_path] = _get_field_storage(field)
+                            storage_map[file_path] = get_field_storage(field)
                 except Exception:
                     continue
         except Exception:
@@ -114,7 +278,7 @@ def restore_media_files_after_loaddata(extract_dir, backup_data):
 
     Args:
         extract_dir: Directory where archive was extracted
-        backup_data: Parsed JSON backup data to identify file fields
+        backup_data: Backup objects (BackupData) to identify file fields
 
     Returns:
         Dict with 'restored' and 'failed' file lists
@@ -177,7 +341,7 @@ def restore_external_url_files(extract_dir, backup_data):
 
     Args:
         extract_dir: Directory where archive was extracted
-        backup_data: Parsed JSON backup data
+        backup_data: Backup objects (BackupData)
 
     Returns:
         Dict with 'restored' and 'failed' counts
@@ -234,7 +398,8 @@ def restore_external_url_files(extract_dir, backup_data):
                 try:
                     app_label, model_class_name = model_name.split('.')
                     model_class = apps.get_model(app_label, model_class_name)
-                    model_class.objects.filter(pk=pk).update(**{field_name: new_url})
+                    # Rows a later archive of an incremental chain changed keep their value
+                    model_class.objects.filter(pk=pk, **{field_name: url}).update(**{field_name: new_url})
                     logger.debug(f"Updated {model_name}[{pk}].{field_name} -> {new_url}")
                 except Exception as e:
                     logger.warning(f"Failed to update {model_name}[{pk}].{field_name}: {e}")
@@ -252,7 +417,7 @@ def _extract_file_field_references(backup_data):
     Extract file field references from backup data.
 
     Args:
-        backup_data: Parsed JSON backup data
+        backup_data: Backup objects (BackupData)
 
     Returns:
         Dict mapping model_name -> {pk: {field_name: file_path}}
@@ -315,33 +480,29 @@ def determine_backup_type(file_path):
             return 'json'  # Default to JSON
 
 
-def _cleanup_existing_data_for_non_tenant_restore(file_path, exclude_models=None, using=DEFAULT_DB_ALIAS):
+def _cleanup_existing_data_for_non_tenant_restore(data_files, exclude_models=None, using=DEFAULT_DB_ALIAS):
     """
     Clean up existing data before performing a non-tenant restore.
 
     This function:
-    1. Parses the fixture file to identify which models will be loaded
+    1. Reads the data files to identify which models will be loaded
     2. Deletes all existing data for those models (excluding excluded models)
     3. Handles foreign key constraints properly by deleting in dependency order
 
     Args:
-        file_path: Path to the fixture JSON file
+        data_files: Paths to the backup data files
         exclude_models: List of model names to exclude from cleanup (format: 'app_label.model_name')
         using: Database alias to use
     """
     if exclude_models is None:
         exclude_models = []
 
-    logger.info(f"Starting cleanup of existing data for non-tenant restore from {file_path}")
+    logger.info(f"Starting cleanup of existing data for non-tenant restore from {data_files}")
 
     try:
-        # Parse the fixture file to get the models that will be loaded
-        with open(file_path, 'r') as f:
-            fixture_data = json.load(f)
-
-        # Get unique model names from the fixture
+        # Get unique model names from the data files
         models_in_fixture = set()
-        for obj in fixture_data:
+        for obj in BackupData(data_files):
             model_name = obj['model'].lower()
             models_in_fixture.add(model_name)
 
@@ -471,9 +632,9 @@ def process_restore(self, restore_pk):
 
         # Determine which file to use: backup file or uploaded file
         temp_dir = None
-        json_file_path = None
+        data_files = None
+        archives = []
         media_restore_result = None
-        backup_data = None
         has_media_files = False
 
         try:
@@ -504,25 +665,19 @@ def process_restore(self, restore_pk):
                 temp_dir = tempfile.mkdtemp(prefix='restore_')
                 logger.info(f"Created temporary directory for extraction: {temp_dir}")
 
-                # Extract the archive and get JSON file path
-                json_file_path = extract_backup_archive(temp_source_path, temp_dir)
-                logger.info(f"Extracted JSON file to: {json_file_path}")
+                # Extract the archive, and those of its parent backups if it is incremental
+                archives = extract_backup_chain(temp_source_path, temp_dir)
+                data_files = [data_file for archive in archives for data_file in archive['data_files']]
+                logger.info(f"Extracted {len(data_files)} data files from {len(archives)} archives to: {temp_dir}")
 
                 # Check if media directory exists
-                media_dir = Path(temp_dir) / 'media'
-                has_media_files = media_dir.exists() and any(media_dir.rglob('*'))
+                has_media_files = any(_has_media_files(archive['dir']) for archive in archives)
                 logger.info(f"Archive contains media files: {has_media_files}")
 
             else:
                 # Handle direct JSON file
-                json_file_path = temp_source_path
-                logger.info(f"Using JSON file directly: {json_file_path}")
-
-            # Parse backup data for later use in media restoration
-            if has_media_files:
-                logger.info("Parsing backup data for media file restoration...")
-                with open(json_file_path, 'r') as f:
-                    backup_data = json.load(f)
+                data_files = [temp_source_path]
+                logger.info(f"Using JSON file directly: {temp_source_path}")
 
             # Clean up the temporary source file if we extracted it
             if backup_type == 'zip':
@@ -537,40 +692,70 @@ def process_restore(self, restore_pk):
                 'exclude':  settings.BACKUPS.get('BACKUP_TYPES', {}).get(restore.type, {}).get('exclude_models_from_import', []),
             }
 
+            fast_restore = restore.fast_restore
+            if fast_restore:
+                if MULTI_TENANT_ENABLED and tenant:
+                    reason = "it does not support tenant restores"
+                else:
+                    reason = CopyFixtureLoader(
+                        using=options['database'], exclude_models=options['exclude']
+                    ).unsupported_reason(data_files, restore.cleanup_existing_data)
+                if reason:
+                    logger.warning(f"Fast restore unavailable ({reason}), falling back to loaddata")
+                    fast_restore = False
+
             # If we have a tenant, use tenant_loaddata
             if MULTI_TENANT_ENABLED and tenant:
                 options['no_cleanup'] = not restore.cleanup_existing_data
                 options['tenant_pk'] = tenant.pk
                 logger.info(f"Running tenant_loaddata for tenant {tenant.pk}")
-                call_command('tenant_loaddata', json_file_path, **options)
+                call_command('tenant_loaddata', *data_files, **options)
+            elif fast_restore:
+                # Truncates the restored tables in place of the cleanup
+                logger.info("Running fast restore with COPY (no tenant)")
+                CopyFixtureLoader(using=options['database'], exclude_models=options['exclude']).load(data_files)
             else:
                 logger.info("Running loaddata (no tenant)")
                 if restore.cleanup_existing_data:
                     logger.info("Cleanup existing data is enabled, cleaning up existing data from fixture models")
                     _cleanup_existing_data_for_non_tenant_restore(
-                        file_path=json_file_path,
+                        data_files=data_files,
                         exclude_models=options.get('exclude', []),
                         using=options.get('database', 'default')
                     )
 
-                call_command('loaddata', json_file_path, **options)
+                call_command('loaddata', *data_files, **options)
 
-            # Now restore media files AFTER loaddata commands are complete
-            if has_media_files and backup_data:
-                logger.info("Starting media file restoration after successful data load...")
-                media_restore_result = restore_media_files_after_loaddata(temp_dir, backup_data)
-                logger.info(f"Media restoration completed: {len(media_restore_result['restored'])} files restored, "
-                           f"{len(media_restore_result['failed'])} failed")
+            # Rows the older archives of an incremental chain brought back but later deleted
+            deleted_count = delete_rows_removed_in_chain(
+                archives,
+                exclude_models=options.get('exclude', []),
+                using=options.get('database', 'default'),
+            )
+            if deleted_count:
+                logger.info(f"Deleted {deleted_count} rows removed before the last incremental backup")
+
+            # Now restore media files AFTER loaddata commands are complete, oldest archive first
+            if has_media_files:
+                for archive in archives:
+                    if not _has_media_files(archive['dir']):
+                        continue
+                    # Backup data for media restoration, streamed from the archive's data files
+                    backup_data = BackupData(archive['data_files'])
+
+                    logger.info(f"Starting media file restoration from {archive['dir']} after successful data load...")
+                    media_restore_result = restore_media_files_after_loaddata(archive['dir'], backup_data)
+                    logger.info(f"Media restoration completed: {len(media_restore_result['restored'])} files restored, "
+                               f"{len(media_restore_result['failed'])} failed")
+
+                    # Restore external URL files (thumbnail_url, etc.)
+                    ext_restore_result = restore_external_url_files(archive['dir'], backup_data)
+                    if ext_restore_result['restored'] or ext_restore_result['failed']:
+                        logger.info(f"External URL restoration: {ext_restore_result['restored']} restored, "
+                                   f"{ext_restore_result['failed']} failed")
             else:
                 logger.info("No media files to restore")
 
-            # Restore external URL files (thumbnail_url, etc.)
-            if backup_data:
-                ext_restore_result = restore_external_url_files(temp_dir, backup_data)
-                if ext_restore_result['restored'] or ext_restore_result['failed']:
-                    logger.info(f"External URL restoration: {ext_restore_result['restored']} restored, "
-                               f"{ext_restore_result['failed']} failed")
-
             # Clean up tenant context
             unset_current_tenant()
 
@@ -585,12 +770,14 @@ def process_restore(self, restore_pk):
 
         finally:
             # Clean up temporary files and directories
-            if json_file_path and os.path.exists(json_file_path):
+            for data_file in data_files or []:
+                if not os.path.exists(data_file):
+                    continue
                 try:
-                    os.unlink(json_file_path)
-                    logger.debug(f"Cleaned up temporary JSON file: {json_file_path}")
+                    os.unlink(data_file)
+                    logger.debug(f"Cleaned up temporary data file: {data_file}")
                 except Exception as e:
-                    logger.warning(f"Failed to clean up temporary JSON file: {e}")
+                    logger.warning(f"Failed to clean up temporary data file: {e}")
 
             if temp_dir and os.path.exists(temp_dir):
                 try:
@@ -0,0 +1,88 @@
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from superapp.apps.radio_crestin.models import StationGroups
+
+from ..services.backup_archive_writer import BACKUP_MANIFEST, BackupArchiveWriter
+from ..tasks.restore import (
+    _cleanup_existing_data_for_non_tenant_restore,
+    _extract_chain_archive,
+    delete_rows_removed_in_chain,
+    extract_backup_archive,
+)
+
+
+class BackupArchiveRoundTripTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.groups = [
+            StationGroups.objects.create(slug='first', name='First\tgroup\nwith "quotes" \\ and ünicode', order=1),
+            StationGroups.objects.create(slug='second', name='Second', station_group_order=2.5),
+        ]
+
+    def values(self):
+        return list(StationGroups.objects.order_by('pk').values('pk', 'slug', 'name', 'order', 'station_group_order'))
+
+    def write(self, name, **kwargs):
+        archive_path = self.tmp / f'{name}.zip'
+        stats = BackupArchiveWriter(archive_path, self.tmp / f'{name}-work').write([StationGroups], **kwargs)
+        return archive_path, stats
+
+    def test_dump_then_restore(self):
+        expected = self.values()
+
+        archive_path, stats = self.write('full')
+
+        self.assertEqual(stats['objects'], {'radio_crestin.stationgroups': 2})
+        with zipfile.ZipFile(archive_path) as zipf:
+            manifest = json.loads(zipf.read(BACKUP_MANIFEST))
+        self.assertEqual(manifest['data_files'], ['data/radio_crestin.stationgroups.jsonl'])
+        self.assertFalse(manifest['incremental'])
+
+        StationGroups.objects.all().delete()
+        StationGroups.objects.create(slug='stale', name='Stale')
+
+        data_files = extract_backup_archive(archive_path, self.tmp / 'restore')
+        _cleanup_existing_data_for_non_tenant_restore(data_files)
+        call_command('loaddata', *data_files, verbosity=0)
+
+        self.assertEqual(self.values(), expected)
+
+    def test_excluded_fields_are_left_out(self):
+        archive_path, _ = self.write('full', excluded_fields={'radio_crestin.stationgroups': ['order']})
+
+        data_files = extract_backup_archive(archive_path, self.tmp / 'restore')
+        with open(data_files[0]) as f:
+            fields = json.loads(f.readline())['fields']
+        self.assertNotIn('order', fields)
+        self.assertIn('name', fields)
+
+    def test_delta_then_restore_chain(self):
+        full_path, stats = self.write('full')
+        StationGroups.objects.filter(pk=self.groups[0].pk).update(name='Renamed', updated_at=stats['watermark'])
+        self.groups[1].delete()
+        added = StationGroups.objects.create(slug='third', name='Third')
+        expected = self.values()
+
+        delta_path, delta_stats = self.write('delta', since=stats['watermark'])
+
+        self.assertEqual(delta_stats['objects'], {'radio_crestin.stationgroups': 2})
+
+        StationGroups.objects.all().delete()
+        archives = [
+            _extract_chain_archive(full_path, self.tmp / 'restore' / '0'),
+            _extract_chain_archive(delta_path, self.tmp / 'restore' / '1'),
+        ]
+        self.assertEqual(len(archives[1]['pk_files']), 1)
+        call_command('loaddata', *[f for archive in archives for f in archive['data_files']], verbosity=0)
+        self.assertEqual(delete_rows_removed_in_chain(archives), 1)
+
+        self.assertEqual(self.values(), expected)
+        self.assertTrue(StationGroups.objects.filter(pk=added.pk).exists())
@@ -0,0 +1,165 @@
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import models
+from django.test import SimpleTestCase
+
+from superapp.apps.radio_crestin.models import StationGroups
+
+from ..services.copy_fixture_loader import COPY_NULL, CopyFixtureLoader, _LineStream, copy_text_value
+
+
+class CopyTextValueTests(SimpleTestCase):
+    def test_null(self):
+        self.assertEqual(copy_text_value(models.TextField(), None), COPY_NULL)
+
+    def test_text_escapes(self):
+        self.assertEqual(
+            copy_text_value(models.TextField(), 'a\tb\nc\rd\\e'),
+            'a\\tb\\nc\\rd\\\\e',
+        )
+
+    def test_literal_backslash_n_is_not_null(self):
+        self.assertEqual(copy_text_value(models.TextField(), '\\N'), '\\\\N')
+
+    def test_bool(self):
+        self.assertEqual(copy_text_value(models.BooleanField(), True), 't')
+        self.assertEqual(copy_text_value(models.BooleanField(), False), 'f')
+
+    def test_numbers(self):
+        self.assertEqual(copy_text_value(models.IntegerField(), 0), '0')
+        self.assertEqual(copy_text_value(models.FloatField(), 1.5), '1.5')
+
+    def test_json(self):
+        value = copy_text_value(models.JSONField(), {'title': 'a\tb', 'tags': [1, None]})
+
+        self.assertEqual(value, '{"title": "a\\\\tb", "tags": [1, null]}')
+        # What COPY hands to PostgreSQL after unescaping
+        self.assertEqual(json.loads(value.replace('\\\\', '\\')), {'title': 'a\tb', 'tags': [1, None]})
+
+    def test_json_scalar_string(self):
+        self.assertEqual(copy_text_value(models.JSONField(), 'text'), '"text"')
+
+    def test_binary_from_base64(self):
+        self.assertEqual(copy_text_value(models.BinaryField(), 'AQL/'), '\\\\x0102ff')
+
+
+class LineStreamTests(SimpleTestCase):
+    def test_read_all(self):
+        stream = _LineStream(['ab\n', 'cd\n'])
+
+        self.assertEqual(stream.read(), 'ab\ncd\n')
+        self.assertEqual(stream.read(), '')
+
+    def test_read_in_chunks_across_lines(self):
+        stream = _LineStream(['abc\n', 'de\n', 'fghij\n'])
+
+        self.assertEqual([stream.read(4), stream.read(4), stream.read(4), stream.read(4)], ['abc\n', 'de\nf', 'ghij', '\n'])
+        self.assertEqual(stream.read(4), '')
+
+    def test_read_rest_after_a_chunk(self):
+        stream = _LineStream(['abc\n', 'de\n'])
+
+        self.assertEqual(stream.read(2), 'ab')
+        self.assertEqual(stream.read(-1), 'c\nde\n')
+
+    def test_lines_are_consumed_lazily(self):
+        lines = iter(['abc\n', 'de\n'])
+        stream = _LineStream(lines)
+
+        stream.read(2)
+
+        self.assertEqual(list(lines), ['de\n'])
+
+
+class SupportsTests(SimpleTestCase):
+    def supports(self, names, vendor='postgresql'):
+        connections = {'default': SimpleNamespace(vendor=vendor)}
+        with mock.patch('superapp.apps.backups.services.copy_fixture_loader.connections', connections):
+            return CopyFixtureLoader.supports([f'/tmp/restore/0/data/{name}' for name in names])
+
+    def test_per_model_files_on_postgresql(self):
+        self.assertTrue(self.supports(['radio_crestin.stations.jsonl', 'radio_crestin.posts.jsonl']))
+
+    def test_other_databases(self):
+        self.assertFalse(self.supports(['radio_crestin.stations.jsonl'], vendor='sqlite'))
+
+    def test_legacy_backup_json(self):
+        self.assertFalse(self.supports(['backup.json']))
+
+    def test_incremental_chain(self):
+        connections = {'default': SimpleNamespace(vendor='postgresql')}
+        with mock.patch('superapp.apps.backups.services.copy_fixture_loader.connections', connections):
+            self.assertFalse(CopyFixtureLoader.supports([
+                '/tmp/restore/0/data/radio_crestin.stations.jsonl',
+                '/tmp/restore/1/data/radio_crestin.stations.jsonl',
+            ]))
+
+
+class CopyModelTests(SimpleTestCase):
+    def test_rows_follow_the_column_list(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = Path(tmp) / 'radio_crestin.stationgroups.jsonl'
+            data_file.write_text(json.dumps({
+                'model': 'radio_crestin.stationgroups',
+                'pk': 4,
+                'fields': {
+                    'created_at': '2026-10-18T10:00:00Z',
+                    'updated_at': '2026-10-18T11:00:00Z',
+                    'slug': 'group',
+                    'name': 'Group\tone',
+                    # Left out of the backup: gets its default
+                    'station_group_order': None,
+                },
+            }) + '\n\n')
+
+            copied = {}
+
+            def copy(cursor, table, columns, lines):
+                copied[table] = (columns, list(lines))
+
+            loader = CopyFixtureLoader()
+            with mock.patch.object(loader, '_copy', side_effect=copy):
+                count = loader._copy_model(None, StationGroups, str(data_file))
+
+        self.assertEqual(count, 1)
+        columns, lines = copied[StationGroups._meta.db_table]
+        self.assertEqual(columns[0], 'id')
+        row = dict(zip(columns, lines[0].rstrip('\n').split('\t')))
+        self.assertEqual(row['id'], '4')
+        self.assertEqual(row['name'], 'Group\\tone')
+        self.assertEqual(row['station_group_order'], COPY_NULL)
+        self.assertEqual(row['order'], '0')
+
+
+class UnsupportedReasonTests(SimpleTestCase):
+    def reason(self, labels, cleanup_existing_data=True, exclude_models=None):
+        loader = CopyFixtureLoader(exclude_models=exclude_models)
+        with mock.patch.object(CopyFixtureLoader, 'supports', return_value=True):
+            return loader.unsupported_reason(
+                [f'/tmp/restore/0/data/{label}.jsonl' for label in labels], cleanup_existing_data
+            )
+
+    def test_self_contained_tables(self):
+        self.assertIsNone(self.reason(['radio_crestin.stationgroups', 'radio_crestin.stationtostationgroup']))
+
+    def test_needs_cleanup_of_existing_data(self):
+        self.assertIn('cleanup', self.reason(['radio_crestin.posts'], cleanup_existing_data=False))
+
+    def test_referencing_tables_outside_the_restore(self):
+        self.assertIn('radio_crestin.stationtostationgroup', self.reason(['radio_crestin.stationgroups']))
+
+    def test_excluded_models_would_be_emptied(self):
+        reason = self.reason(
+            ['radio_crestin.stationgroups', 'radio_crestin.stationtostationgroup'],
+            exclude_models=['radio_crestin.stationtostationgroup'],
+        )
+
+        self.assertIn('radio_crestin.stationtostationgroup', reason)
+
+    def test_load_refuses_to_cascade(self):
+        with self.assertRaises(ValueError):
+            CopyFixtureLoader().load(['/tmp/restore/0/data/radio_crestin.stationgroups.jsonl'])
@@ -0,0 +1,239 @@
+import json
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models.backup import Backup
+from ..tasks.backup import cleanup_old_backups_for_type, get_parent_backup, sweep_media_store, write_backup_archive
+from ..tasks.restore import delete_rows_removed_in_chain
+
+
+def incremental_settings(full_every=2, **extra):
+    backups = dict(settings.BACKUPS, **extra)
+    backups['BACKUP_TYPES'] = dict(
+        backups['BACKUP_TYPES'],
+        incremental_type={
+            'name': 'Incremental',
+            'models': [],
+            'incremental': {'enabled': True, 'full_every': full_every},
+        },
+    )
+    return backups
+
+
+class IncrementalBackupTestMixin:
+    def make_backup(self, name, parent=None, minutes_ago=0, done=True, file='backups/archive.zip'):
+        created_at = timezone.now() - timedelta(minutes=minutes_ago)
+        backup = Backup.objects.create(
+            name=name,
+            type='incremental_type',
+            file=file,
+            done=done,
+            parent=parent,
+            watermark=created_at if done else None,
+        )
+        # created_at is auto_now_add
+        Backup.objects.filter(pk=backup.pk).update(created_at=created_at)
+        backup.refresh_from_db()
+        return backup
+
+
+class BackupChainTests(IncrementalBackupTestMixin, TestCase):
+    def test_chain_is_oldest_first(self):
+        full = self.make_backup('full', minutes_ago=30)
+        delta1 = self.make_backup('delta1', parent=full, minutes_ago=20)
+        delta2 = self.make_backup('delta2', parent=delta1, minutes_ago=10)
+
+        self.assertEqual(full.get_chain(), [full])
+        self.assertEqual(delta2.get_chain(), [full, delta1, delta2])
+
+    def test_parent_is_latest_finished_backup_of_the_type(self):
+        full = self.make_backup('full', minutes_ago=30)
+        delta = self.make_backup('delta', parent=full, minutes_ago=20)
+        self.make_backup('unfinished', minutes_ago=15, done=False)
+        backup = self.make_backup('new', done=False)
+
+        with self.settings(BACKUPS=incremental_settings()):
+            self.assertEqual(get_parent_backup(backup), delta)
+
+    def test_full_backup_once_the_chain_has_full_every_deltas(self):
+        full = self.make_backup('full', minutes_ago=30)
+        delta1 = self.make_backup('delta1', parent=full, minutes_ago=20)
+        delta2 = self.make_backup('delta2', parent=delta1, minutes_ago=10)
+        backup = self.make_backup('new', done=False)
+
+        with self.settings(BACKUPS=incremental_settings(full_every=3)):
+            self.assertEqual(get_parent_backup(backup), delta2)
+        with self.settings(BACKUPS=incremental_settings(full_every=2)):
+            self.assertIsNone(get_parent_backup(backup))
+
+    def test_no_parent_when_incremental_is_disabled(self):
+        self.make_backup('full', minutes_ago=30)
+        backup = self.make_backup('new', done=False)
+
+        self.assertIsNone(get_parent_backup(backup))
+
+
+class WriteBackupArchiveTests(IncrementalBackupTestMixin, TestCase):
+    def write(self, parent):
+        with mock.patch('superapp.apps.backups.tasks.backup.resolve_models', return_value=[]), \
+                mock.patch('superapp.apps.backups.tasks.backup.BackupArchiveWriter') as writer_class:
+            write_backup_archive('incremental_type', 'archive.zip', 'work', parent=parent)
+        return writer_class.return_value.write.call_args
+
+    def test_delta_reaches_back_the_overlap_before_the_parent_watermark(self):
+        full = self.make_backup('full', minutes_ago=30)
+        delta = self.make_backup('delta', parent=full, minutes_ago=20)
+
+        with self.settings(BACKUPS=incremental_settings(INCREMENTAL_OVERLAP=120)):
+            call = self.write(delta)
+
+        self.assertEqual(call.kwargs['since'], delta.watermark - timedelta(seconds=120))
+        self.assertEqual(call.kwargs['manifest_extra'], {'chain': [full.pk, delta.pk]})
+
+    def test_full_backup_has_no_since(self):
+        call = self.write(None)
+
+        self.assertIsNone(call.kwargs['since'])
+        self.assertEqual(call.kwargs['manifest_extra'], {'chain': []})
+
+
+class DeleteRowsRemovedInChainTests(IncrementalBackupTestMixin, TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def archive(self, name, objects=(), pks=None):
+        archive_dir = Path(self.tmp.name) / name
+        os.makedirs(archive_dir / 'pks')
+        data_file = archive_dir / 'backups.backup.jsonl'
+        with open(data_file, 'w') as f:
+            for obj in objects:
+                f.write(json.dumps({'model': 'backups.backup', 'pk': obj.pk, 'fields': {}}) + '\n')
+        pk_files = []
+        if pks is not None:
+            pk_file = archive_dir / 'pks' / 'backups.backup.jsonl'
+            pk_file.write_text(''.join(f'{pk}\n' for pk in pks))
+            pk_files.append(str(pk_file))
+        return {'dir': str(archive_dir), 'data_files': [str(data_file)], 'pk_files': pk_files}
+
+    def test_rows_missing_from_the_last_pk_list_are_deleted(self):
+        kept, removed, added = (self.make_backup(name, file=None) for name in ('kept', 'removed', 'added'))
+        archives = [
+            self.archive('0', objects=[kept, removed]),
+            self.archive('1', objects=[added], pks=[kept.pk, added.pk]),
+        ]
+
+        self.assertEqual(delete_rows_removed_in_chain(archives), 1)
+        self.assertQuerySetEqual(Backup.objects.order_by('pk'), [kept, added])
+
+    def test_excluded_models_are_left_alone(self):
+        kept, removed = (self.make_backup(name, file=None) for name in ('kept', 'removed'))
+        archives = [
+            self.archive('0', objects=[kept, removed]),
+            self.archive('1', pks=[kept.pk]),
+        ]
+
+        self.assertEqual(delete_rows_removed_in_chain(archives, exclude_models=['backups.Backup']), 0)
+        self.assertEqual(Backup.objects.count(), 2)
+
+    def test_single_archive_deletes_nothing(self):
+        removed = self.make_backup('removed', file=None)
+
+        self.assertEqual(delete_rows_removed_in_chain([self.archive('0', objects=[removed], pks=[])]), 0)
+        self.assertTrue(Backup.objects.filter(pk=removed.pk).exists())
+
+
+class CleanupOldBackupsTests(IncrementalBackupTestMixin, TestCase):
+    def cleanup(self, max_backups):
+        with self.settings(BACKUPS=incremental_settings(RETENTION={'MAX_BACKUPS': max_backups})):
+            return cleanup_old_backups_for_type('incremental_type')
+
+    def test_chain_ancestors_of_retained_backups_are_kept(self):
+        old = self.make_backup('old', minutes_ago=40, file=None)
+        full = self.make_backup('full', minutes_ago=30, file=None)
+        delta = self.make_backup('delta', parent=full, minutes_ago=20, file=None)
+
+        self.assertEqual(self.cleanup(max_backups=1), 1)
+        self.assertFalse(Backup.objects.filter(pk=old.pk).exists())
+        self.assertQuerySetEqual(Backup.objects.order_by('created_at'), [full, delta])
+
+    def test_deltas_are_deleted_before_their_parents(self):
+        full = self.make_backup('full', minutes_ago=30, file=None)
+        self.make_backup('delta', parent=full, minutes_ago=20, file=None)
+        new_full = self.make_backup('new_full', minutes_ago=10, file=None)
+
+        self.assertEqual(self.cleanup(max_backups=1), 2)
+        self.assertQuerySetEqual(Backup.objects.all(), [new_full])
+
+    def test_parent_of_an_unfinished_delta_is_protected(self):
+        full = self.make_backup('full', minutes_ago=30, file=None)
+        self.make_backup('running', parent=full, minutes_ago=20, done=False, file=None)
+        new_full = self.make_backup('new_full', minutes_ago=10, file=None)
+
+        self.assertEqual(self.cleanup(max_backups=1), 0)
+        self.assertTrue(Backup.objects.filter(pk=full.pk).exists())
+        self.assertTrue(Backup.objects.filter(pk=new_full.pk).exists())
+
+
+class SweepMediaStoreTests(IncrementalBackupTestMixin, TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.storage = FileSystemStorage(location=tmp.name)
+        patcher = mock.patch.object(Backup._meta.get_field('file'), 'storage', self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for store_path in ('media_store/aa/aa1.jpg', 'media_store/aa/aa2.jpg', 'media_store/bb/bb1.png'):
+            self.storage.save(store_path, ContentFile(b'media'))
+
+    def make_archive(self, name, media_index=None):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = Path(tmp) / 'backup.zip'
+            with zipfile.ZipFile(archive_path, 'w') as zipf:
+                zipf.writestr('backup_manifest.json', '{}')
+                if media_index is not None:
+                    zipf.writestr('media_index.json', json.dumps(media_index))
+            return self.storage.save(f'{name}.zip', ContentFile(archive_path.read_bytes()))
+
+    def test_unreferenced_files_are_deleted(self):
+        self.make_backup('full', file=self.make_archive('full', {'media/a.jpg': 'media_store/aa/aa1.jpg'}))
+        self.make_backup('plain', file=self.make_archive('plain'))
+
+        self.assertEqual(sweep_media_store(), 2)
+        self.assertTrue(self.storage.exists('media_store/aa/aa1.jpg'))
+        self.assertFalse(self.storage.exists('media_store/aa/aa2.jpg'))
+        self.assertFalse(self.storage.exists('media_store/bb/bb1.png'))
+
+    def test_nothing_is_deleted_while_a_backup_runs(self):
+        running = self.make_backup('running', done=False, file=None)
+        Backup.objects.filter(pk=running.pk).update(started_at=timezone.now())
+
+        self.assertEqual(sweep_media_store(), 0)
+        self.assertTrue(self.storage.exists('media_store/bb/bb1.png'))
+
+    def test_nothing_is_deleted_when_an_archive_cannot_be_read(self):
+        self.make_backup('missing', file='missing.zip')
+
+        self.assertEqual(sweep_media_store(), 0)
+        self.assertTrue(self.storage.exists('media_store/bb/bb1.png'))
+
+    def test_cleanup_sweeps_after_deleting_backups(self):
+        self.make_backup('old', minutes_ago=20, file=self.make_archive('old', {'media/b.png': 'media_store/bb/bb1.png'}))
+        self.make_backup('new', minutes_ago=10, file=self.make_archive('new', {'media/a.jpg': 'media_store/aa/aa1.jpg'}))
+
+        with self.settings(BACKUPS=incremental_settings(RETENTION={'MAX_BACKUPS': 1})):
+            self.assertEqual(cleanup_old_backups_for_type('incremental_type'), 1)
+
+        self.assertTrue(self.storage.exists('media_store/aa/aa1.jpg'))
+        self.assertFalse(self.storage.exists('media_store/bb/bb1.png'))
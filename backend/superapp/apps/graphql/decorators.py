@@ -1,48 +1,64 @@
 import os
 from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import HttpResponse
 
 
 def cors_exempt(view_func):
     """
     Decorator to add CORS headers to a view, similar to csrf_exempt.
-    Allows cross-origin requests to the decorated view.
+    Allows cross-origin requests to the decorated view (sync or async).
     """
-    @wraps(view_func)
-    def wrapped_view(request, *args, **kwargs):
-        # Handle preflight OPTIONS request
-        if request.method == 'OPTIONS':
-            response = HttpResponse()
-        else:
-            response = view_func(request, *args, **kwargs)
-
-        # Get allowed origins from environment variable
-        allowed_origins_env = os.environ.get('GRAPHQL_CORS_ALLOWED_ORIGINS', '').strip()
-        allow_all_origins = os.environ.get('GRAPHQL_CORS_ALLOW_ALL_ORIGINS', 'false').lower() == 'true'
-
-        # Get the origin from the request
-        origin = request.headers.get('Origin')
-
-        if allow_all_origins:
-            response['Access-Control-Allow-Origin'] = '*'
-        elif allowed_origins_env and origin:
-            # Check if origin is in allowed list
-            allowed_origins = [o.strip() for o in allowed_origins_env.split(',') if o.strip()]
-            if origin in allowed_origins:
-                response['Access-Control-Allow-Origin'] = origin
-        elif origin:
-            # Default allowed origins
-            default_allowed = [
-                'http://localhost:8080',
-            ]
-            if origin in default_allowed:
-                response['Access-Control-Allow-Origin'] = origin
-
-        # Add other CORS headers if origin is allowed or allow_all_origins is true
-        response['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-        response['Access-Control-Allow-Headers'] = 'Accept, Accept-Encoding, Authorization, Content-Type, content-type, DNT, Origin, User-Agent, X-CSRFToken, X-Requested-With, Apollo-Require-Preflight'
-        response['Access-Control-Allow-Credentials'] = 'true'
-        response['Access-Control-Max-Age'] = '86400'  # 24 hours
-        return response
-
-    return wrapped_view
+    if iscoroutinefunction(view_func):
+        async def wrapped_view(request, *args, **kwargs):
+            # Handle preflight OPTIONS request
+            if request.method == 'OPTIONS':
+                response = HttpResponse()
+            else:
+                response = await view_func(request, *args, **kwargs)
+            return _add_cors_headers(request, response)
+
+        markcoroutinefunction(wrapped_view)
+    else:
+        def wrapped_view(request, *args, **kwargs):
+            # Handle preflight OPTIONS request
+            if request.method == 'OPTIONS':
+                response = HttpResponse()
+            else:
+                response = view_func(request, *args, **kwargs)
+            return _add_cors_headers(request, response)
+
+    return wraps(view_func)(wrapped_view)
+
+
+def _add_cors_headers(request, response):
+    """Add the CORS headers allowed for the request's origin."""
+    # Get allowed origins from environment variable
+    allowed_origins_env = os.environ.get('GRAPHQL_CORS_ALLOWED_ORIGINS', '').strip()
+    allow_all_origins = os.environ.get('GRAPHQL_CORS_ALLOW_ALL_ORIGINS', 'false').lower() == 'true'
+
+    # Get the origin from the request
+    origin = request.headers.get('Origin')
+
+    if allow_all_origins:
+        response['Access-Control-Allow-Origin'] = '*'
+    elif allowed_origins_env and origin:
+        # Check if origin is in allowed list
+        allowed_origins = [o.strip() for o in allowed_origins_env.split(',') if o.strip()]
+        if origin in allowed_origins:
+            response['Access-Control-Allow-Origin'] = origin
+    elif origin:
+        # Default allowed origins
+        default_allowed = [
+            'http://localhost:8080',
+        ]
+        if origin in default_allowed:
+            response['Access-Control-Allow-Origin'] = origin
+
+    # Add other CORS headers if origin is allowed or allow_all_origins is true
+    response['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+    response['Access-Control-Allow-Headers'] = 'Accept, Accept-Encoding, Authorization, Content-Type, content-type, DNT, Origin, User-Agent, X-CSRFToken, X-Requested-With, Apollo-Require-Preflight'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    response['Access-Control-Max-Age'] = '86400'  # 24 hours
+    return response
@@ -13,12 +13,18 @@ from typing import Optional
 def cached(
     ttl: Optional[int] = 60,
     refresh_while_caching: Optional[bool] = True,
-    include_user: Optional[bool] = False
+    include_user: Optional[bool] = False,
+    stale_ttl: Optional[int] = None
 ):
     """Cache directive for field-level caching"""
     def decorator(resolver):
         # Store directive parameters in resolver metadata for caching extension
-        resolver._cached_metadata = {"ttl": ttl, "refresh_while_caching": refresh_while_caching, "include_user": include_user}
+        resolver._cached_metadata = {
+            "ttl": ttl,
+            "refresh_while_caching": refresh_while_caching,
+            "include_user": include_user,
+            "stale_ttl": stale_ttl,
+        }
         return resolver
     return decorator
 
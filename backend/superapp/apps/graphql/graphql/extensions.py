@@ -2,10 +2,12 @@ import hashlib
 import json
 import logging
 from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Any, Dict, Optional
-from django.core.cache import cache
 from strawberry.extensions import SchemaExtension
 
+from superapp.apps.graphql.result_cache import result_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,15 @@ class CacheParams:
     include_user: bool = False
 
 
+class _RefreshContext:
+    """Context for background refreshes: the original user, no response"""
+    graphql_cache_refresh = True
+
+    def __init__(self, user):
+        self.request = SimpleNamespace(user=user, META={}) if user is not None else None
+        self.response = None
+
+
 @dataclass
 class CacheControlParams:
     """Parameters for cache control extension"""
@@ -31,176 +42,199 @@ class CacheControlParams:
 
 
 class CacheExtension(SchemaExtension):
-    """Extension to cache GraphQL query/mutation results based on @cached directive
-
-    Note: This is a basic implementation that caches entire query results.
-    For production use, consider:
-    - Field-level caching for more granular control
-    - Cache invalidation strategies
-    - User-specific cache keys for authenticated queries
+    """Extension to cache GraphQL query results based on @cached directive
+
+    Results are kept in the stale-while-revalidate cache from result_cache:
+    fresh for `ttl` seconds, then served stale for `stale_ttl` more seconds
+    (defaults to `ttl`) while a background thread of this process refreshes
+    them, when `refresh_while_caching` is set. Mutations and operations with
+    a ttl of 0 are never cached.
+
+    The extension instance is shared by every request and
+    self.execution_context is reassigned per request, so on_execute captures
+    it once and keeps all per-request state in its locals. on_execute runs on
+    the event loop of async requests and uses the async result_cache methods.
     """
 
     def __init__(self, cache_params: Optional[CacheParams] = None):
         super().__init__()
-        self.cached_params: Optional[Dict[str, Any]] = None
-        self.cache_key: Optional[str] = None
-        self.should_cache = False
         self.cache_params = cache_params or CacheParams()
+
+    def _default_params(self) -> Dict[str, Any]:
         # Always use default values, directives will override
-        self.cached_params = {
+        return {
             'ttl': self.cache_params.ttl,
+            'stale_ttl': None,
             'refresh_while_caching': self.cache_params.refresh_while_caching,
             'include_user': self.cache_params.include_user
         }
 
-    def on_parse(self):
-        """Called during the parsing phase"""
-        yield
+    @staticmethod
+    def _get_operation(execution_context):
+        """Return the first operation definition of the document"""
+        document = getattr(execution_context, 'graphql_document', None)
+        if not document:
+            return None
+        for definition in document.definitions:
+            if hasattr(definition, 'operation'):
+                return definition
+        return None
+
+    def _read_cached_params(self, operation) -> Dict[str, Any]:
+        """Merge the @cached directive arguments with the defaults"""
+        cached_params = self._default_params()
+        if not operation or not operation.directives:
+            return cached_params
+
+        for directive in operation.directives:
+            if directive.name.value != 'cached':
+                continue
+            for arg in directive.arguments:
+                arg_name = arg.name.value
+                arg_value = arg.value
+
+                # Handle different argument value types
+                if hasattr(arg_value, 'value'):
+                    value = arg_value.value
+                    # Convert string numbers to integers for numeric fields
+                    if arg_name in ['ttl', 'stale_ttl'] and isinstance(value, str):
+                        try:
+                            value = int(value)
+                        except ValueError:
+                            pass
+                    # Convert string booleans to booleans
+                    elif arg_name in ['refresh_while_caching', 'include_user'] and isinstance(value, str):
+                        value = value.lower() in ('true', '1', 'yes')
+                    cached_params[arg_name] = value
+                else:
+                    cached_params[arg_name] = arg_value
+            break
+
+        return cached_params
+
+    @staticmethod
+    def _get_request(execution_context):
+        context = getattr(execution_context, 'context', None)
+        if context is None:
+            return None
+        # Django request object
+        return context.get('request') if hasattr(context, 'get') else getattr(context, 'request', None)
+
+    @staticmethod
+    def _is_refresh(execution_context) -> bool:
+        context = getattr(execution_context, 'context', None)
+        return bool(getattr(context, 'graphql_cache_refresh', False))
+
+    def _serve(self, execution_context, cached):
+        """Answer the operation with a cached result"""
+        from graphql import ExecutionResult
+
+        request = self._get_request(execution_context)
+        if request is not None and getattr(request, 'graphql_accepts_encoded_result', False):
+            # The view writes the stored bytes to the response as is
+            request.graphql_encoded_result = cached.body
+            execution_context.result = ExecutionResult(data=None)
+        else:
+            execution_context.result = ExecutionResult(data=json.loads(cached.body)['data'])
 
-        # Look for cached directive on the operation
-        execution_context = self.execution_context
+    async def _refresh_in_background(self, execution_context, cache_key: str, ttl: int, stale_ttl: int):
+        """Re-execute the operation in a background thread and store the result"""
+        request = self._get_request(execution_context)
+        user = getattr(request, 'user', None)
 
-        # Try to find the cached directive
-        operation = None
-        if hasattr(execution_context, 'graphql_document') and execution_context.graphql_document:
-            # Get the first operation definition
-            for definition in execution_context.graphql_document.definitions:
-                if hasattr(definition, 'operation'):
-                    operation = definition
-                    break
+        def refresh():
+            from asgiref.sync import async_to_sync
+            from superapp.apps.graphql.schema import schema
 
-        if operation and hasattr(operation, 'directives') and operation.directives:
-            for directive in operation.directives:
-                if directive.name.value == 'cached':
-                    # Extract and merge the directive arguments with defaults
-                    for arg in directive.arguments:
-                        arg_name = arg.name.value
-                        arg_value = arg.value
-
-                        # Handle different argument value types
-                        if hasattr(arg_value, 'value'):
-                            value = arg_value.value
-                            # Convert string numbers to integers for numeric fields
-                            if arg_name == 'ttl' and isinstance(value, str):
-                                try:
-                                    value = int(value)
-                                except ValueError:
-                                    pass
-                            # Convert string booleans to booleans
-                            elif arg_name in ['refresh_while_caching', 'include_user'] and isinstance(value, str):
-                                value = value.lower() in ('true', '1', 'yes')
-                            self.cached_params[arg_name] = value
-                        else:
-                            self.cached_params[arg_name] = arg_value
-
-                    # Get user ID if needed
-                    user_id = None
-                    if 'include_user' in self.cached_params and self.cached_params['include_user']:
-                        # Try to get user from context
-                        if hasattr(execution_context, 'context'):
-                            context = execution_context.context
-                            # Django request object
-                            request = context.get('request') if hasattr(context, 'get') else getattr(context, 'request', None)
-                            if request and hasattr(request, 'user') and request.user.is_authenticated:
-                                user_id = str(request.user.id)
-
-                    # Generate cache key
-                    self.cache_key = self._generate_cache_key(
-                        execution_context.query,
-                        execution_context.variables,
-                        execution_context.operation_name,
-                        user_id
-                    )
-                    self.should_cache = True
-                    break
-        else:
-            # No cached directive found, use defaults for caching behavior
-            # Get user ID if include_user is True by default
-            user_id = None
-            if self.cached_params['include_user']:
-                # Try to get user from context
-                if hasattr(execution_context, 'context'):
-                    context = execution_context.context
-                    # Django request object
-                    request = context.get('request') if hasattr(context, 'get') else getattr(context, 'request', None)
-                    if request and hasattr(request, 'user') and request.user.is_authenticated:
-                        user_id = str(request.user.id)
-
-            # Generate cache key with default settings
-            self.cache_key = self._generate_cache_key(
+            # The schema's resolvers and on_execute hooks are async
+            result = async_to_sync(schema.execute)(
                 execution_context.query,
-                execution_context.variables,
-                execution_context.operation_name,
-                user_id
+                variable_values=execution_context.variables,
+                operation_name=execution_context.operation_name,
+                context_value=_RefreshContext(user),
             )
-            self.should_cache = True
-
-    def on_operation(self):
-        """Called when the operation is executed"""
-        # Check cache before execution
-        if self.should_cache and self.cache_key:
-            cached_result = cache.get(self.cache_key)
-            if cached_result is not None:
-                # Check if we should refresh while serving cached content
-                refresh_while_caching = self.cached_params['refresh_while_caching']
-
-                # Set cached result regardless of refresh_while_caching
-                from graphql import ExecutionResult
-                self.execution_context.result = ExecutionResult(
-                    data=cached_result['data'] if 'data' in cached_result else None,
-                    errors=cached_result['errors'] if 'errors' in cached_result else None
-                )
-
-                if refresh_while_caching:
-                    # Check if there's already a refresh task running for this cache key
-                    refresh_lock_key = f"{self.cache_key}:refresh_lock"
-
-                    # Try to acquire lock with a short TTL (5 seconds for task to start)
-                    # If lock already exists, another refresh is in progress
-                    if cache.add(refresh_lock_key, True, timeout=5):
-                        # Lock acquired, trigger background refresh
-                        from superapp.apps.graphql.tasks import refresh_graphql_cache
-
-                        ttl = self.cached_params['ttl']
-
-                        # Get user ID if needed for background refresh
-                        user_id = None
-                        if 'include_user' in self.cached_params and self.cached_params['include_user']:
-                            context = self.execution_context.context
-                            request = context.get('request') if hasattr(context, 'get') else getattr(context, 'request', None)
-                            if request and hasattr(request, 'user') and request.user.is_authenticated:
-                                user_id = request.user.id
-
-                        logger.debug(f"Triggering background refresh for cache key: {self.cache_key}")
-                        refresh_graphql_cache.delay(
-                            query=self.execution_context.query,
-                            variables=self.execution_context.variables,
-                            operation_name=self.execution_context.operation_name,
-                            cache_key=self.cache_key,
-                            ttl=ttl,
-                            user_id=user_id
-                        )
-                    else:
-                        logger.debug(f"Skipping background refresh for cache key {self.cache_key} - refresh already in progress")
-
-                yield  # Must yield even when returning cached result
+            if result.errors:
+                logger.error(f"Background refresh of {cache_key} failed: {result.errors}")
                 return
+            result_cache.set(cache_key, result.data, ttl, stale_ttl)
+
+        if await result_cache.arefresh_in_background(cache_key, refresh):
+            logger.debug(f"Refreshing stale cache key {cache_key} in the background")
 
-        # Execute the query normally
-        yield
-
-        # Cache the result after execution
-        if self.should_cache and self.cache_key:
-            result = self.execution_context.result
-            if result and not (hasattr(result, 'errors') and result.errors):
-                # Cache the data
-                ttl = self.cached_params['ttl']
-                cache_data = {
-                    'data': result.data,
-                    'errors': None
-                }
-                cache.set(self.cache_key, cache_data, ttl)
+    @staticmethod
+    async def _store(execution_context, cache_key: str, ttl: int, stale_ttl: int):
+        result = execution_context.result
+        if result and not (hasattr(result, 'errors') and result.errors):
+            await result_cache.aset(cache_key, result.data, ttl, stale_ttl)
 
+    async def on_execute(self):
+        """Called when the operation is about to be executed"""
+        execution_context = self.execution_context
+        operation = self._get_operation(execution_context)
+        cached_params = self._read_cached_params(operation)
+        ttl = cached_params['ttl']
+        is_mutation = operation is not None and operation.operation.value == 'mutation'
+        if is_mutation or not isinstance(ttl, int) or ttl <= 0:
+            yield
+            return
+
+        refresh_while_caching = cached_params['refresh_while_caching']
+        stale_ttl = cached_params['stale_ttl']
+        if not isinstance(stale_ttl, int):
+            stale_ttl = ttl if refresh_while_caching else 0
+
+        # Get user ID if needed
+        user_id = None
+        if cached_params['include_user']:
+            request = self._get_request(execution_context)
+            if request and hasattr(request, 'user') and request.user.is_authenticated:
+                user_id = str(request.user.id)
+
+        cache_key = self._generate_cache_key(
+            execution_context.query,
+            execution_context.variables,
+            execution_context.operation_name,
+            user_id
+        )
+
+        if self._is_refresh(execution_context):
+            # Background refresh: always execute, then store
+            yield
+            await self._store(execution_context, cache_key, ttl, stale_ttl)
+            return
+
+        cached = await result_cache.aget(cache_key)
+        if cached is not None:
+            self._serve(execution_context, cached)
+            if not cached.fresh and refresh_while_caching:
+                await self._refresh_in_background(execution_context, cache_key, ttl, stale_ttl)
+            yield  # Must yield even when returning cached result
+            return
+
+        # Miss: only one request per key executes the query
+        if not result_cache.begin(cache_key):
+            cached = await result_cache.await_local(cache_key)
+            if cached is not None:
+                self._serve(execution_context, cached)
+                yield
+                return
+            yield
+            await self._store(execution_context, cache_key, ttl, stale_ttl)
+            return
+
+        locked = False
+        try:
+            locked = await result_cache.alock(cache_key)
+            if not locked:
+                cached = await result_cache.await_remote(cache_key)
+                if cached is not None:
+                    self._serve(execution_context, cached)
+                    yield
+                    return
+            yield
+            await self._store(execution_context, cache_key, ttl, stale_ttl)
+        finally:
+            await result_cache.aend(cache_key, locked)
 
     def _generate_cache_key(self, query: str, variables: Optional[Dict[str, Any]], operation_name: Optional[str], user_id: Optional[str] = None) -> str:
         """Generate a unique cache key for the query"""
@@ -4,6 +4,8 @@ from strawberry.exceptions.exception import StrawberryException
 from typing import TYPE_CHECKING
 import strawberry
 
+from superapp.apps.graphql.sync_executor import threaded_resolver
+
 try:
     # Django-channels is not always used/intalled,
     # therefore it shouldn't be it a hard requirement.
@@ -22,6 +24,7 @@ class Query:
         return True
     
     @strawberry.field
+    @threaded_resolver
     def current_time(self, info: strawberry.Info) -> str:
         """Returns current time - useful for testing caching"""
         # Simulate some processing time
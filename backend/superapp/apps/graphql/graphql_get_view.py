@@ -1,17 +1,28 @@
 """
 GraphQL POST-to-GET redirect view for CDN caching.
 
-When a POST query hits /graphql, this view redirects it to a GET URL:
-  /graphql?query=...&variables=...&timestamp=<rounded>
+When a POST query hits /graphql, this view redirects it to a GET URL that
+references the query by its SHA-256 hash (automatic persisted queries):
+  /graphql?extensions={"persistedQuery":{...}}&variables=...&timestamp=<rounded>
+
+Clients can use persisted queries directly with the Apollo APQ protocol; an
+unknown hash answers PERSISTED_QUERY_NOT_FOUND and the client retries with the
+query text.
 
 GET requests with a query param are executed directly and return JSON
 with Cache-Control headers parsed from the @cache_control directive.
 
+The view is async: queries run through schema.execute on the worker's event
+loop, with blocking resolver work offloaded to the thread pool of
+sync_executor.
+
 Mutations are NOT redirected - they execute via POST as normal.
 
 Configuration (via Django settings):
   GRAPHQL_GET_REDIRECT_ENABLED = True/False  (default: True)
   GRAPHQL_GET_REDIRECT_TIMESTAMP_ROUND_SECONDS = 10  (default: 10)
+  GRAPHQL_PERSISTED_QUERIES_ENABLED = True/False  (default: True; False puts
+      the full query text in the redirect URL)
 """
 
 import json
@@ -25,9 +36,17 @@ from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
 from django.utils import timezone
 from django.views import View
 from strawberry.django.context import StrawberryDjangoContext
-from strawberry.django.views import GraphQLView
-
+from strawberry.django.views import AsyncGraphQLView
+
+from superapp.apps.graphql.persisted_queries import (
+    PERSISTED_QUERY_NOT_FOUND,
+    build_persisted_query_extensions,
+    encode_persisted_query_extensions,
+    get_persisted_query_hash,
+    registry as persisted_registry,
+)
 from superapp.apps.graphql.schema import schema
+from superapp.apps.graphql.sync_executor import load_request_user
 
 
 logger = logging.getLogger(__name__)
@@ -103,49 +122,84 @@ def _parse_cache_control_header(query: str) -> str:
 class GraphQLWithGetRedirectView(View):
     """GraphQL view that redirects POST queries to GET for CDN caching.
 
-    POST /graphql (query) -> 302 GET /graphql?query=...&variables=...&timestamp=<rounded>
+    POST /graphql (query) -> 302 GET /graphql?extensions=<persisted query>&variables=...&timestamp=<rounded>
     POST /graphql (mutation) -> execute normally via Strawberry
     GET /graphql?query=... -> execute query, return JSON with Cache-Control headers
+    GET /graphql?extensions=... -> execute a persisted query by hash
     GET /graphql (no query) -> Strawberry handles normally (GraphiQL IDE)
     """
 
+    # dispatch() is a coroutine for every method
+    view_is_async = True
+
     _strawberry_view_func = None
 
     @classmethod
     def _get_strawberry_view(cls):
         if cls._strawberry_view_func is None:
-            cls._strawberry_view_func = GraphQLView.as_view(schema=schema)
+            cls._strawberry_view_func = AsyncGraphQLView.as_view(schema=schema)
         return cls._strawberry_view_func
 
-    def dispatch(self, request, *args, **kwargs):
-        # POST queries -> redirect to GET for CDN caching
-        if request.method == 'POST' and self._should_redirect(request):
-            return self._redirect_post_to_get(request)
+    async def _strawberry(self, request, *args, **kwargs):
+        await load_request_user(request)
+        return await self._get_strawberry_view()(request, *args, **kwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        # GET with query or persisted query hash -> execute directly, return JSON with cache headers
+        if request.method == 'GET' and ('query' in request.GET or 'extensions' in request.GET):
+            return await self._execute_get_query(request)
+
+        if request.method != 'POST':
+            # Everything else (GraphiQL IDE, OPTIONS) -> Strawberry
+            return await self._strawberry(request, *args, **kwargs)
+
+        try:
+            body = json.loads(request.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return JsonResponse(
+                {"errors": [{"message": "Invalid JSON body."}]},
+                status=400,
+            )
+        if not isinstance(body, dict):
+            return JsonResponse(
+                {"errors": [{"message": "Invalid JSON body."}]},
+                status=400,
+            )
 
-        # GET with query param -> execute directly, return JSON with cache headers
-        if request.method == 'GET' and 'query' in request.GET:
-            return self._execute_get_query(request)
+        # Resolve or register an automatic persisted query
+        query = body.get('query') or ''
+        persisted_hash = get_persisted_query_hash(body.get('extensions'))
+        if persisted_hash:
+            query, error_response = await self._resolve_persisted_query(query, persisted_hash)
+            if error_response is not None:
+                return error_response
 
         # Reject POST requests with empty/missing query to avoid
         # "Must provide document" errors in strawberry validation cache
-        if request.method == 'POST':
-            try:
-                body = json.loads(request.body)
-                if not body.get('query'):
-                    return JsonResponse(
-                        {"errors": [{"message": "Must provide a query string."}]},
-                        status=400,
-                    )
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                return JsonResponse(
-                    {"errors": [{"message": "Invalid JSON body."}]},
-                    status=400,
-                )
+        if not query:
+            return JsonResponse(
+                {"errors": [{"message": "Must provide a query string."}]},
+                status=400,
+            )
+
+        # POST queries -> redirect to GET for CDN caching
+        if self._should_redirect(request, query):
+            return await self._redirect_post_to_get(request, body, query)
+
+        # A hash-only POST carries no query text Strawberry could execute
+        if not body.get('query'):
+            return await self._execute_query(
+                request,
+                query,
+                body.get('variables') or {},
+                body.get('operationName'),
+                persisted_hash,
+            )
 
-        # Everything else (GraphiQL IDE, OPTIONS, POST mutations) -> Strawberry
-        return self._get_strawberry_view()(request, *args, **kwargs)
+        # POST mutations and API-authenticated requests -> Strawberry
+        return await self._strawberry(request, *args, **kwargs)
 
-    def _should_redirect(self, request):
+    def _should_redirect(self, request, query):
         """Check if this POST request should be redirected to GET."""
         enabled = getattr(settings, 'GRAPHQL_GET_REDIRECT_ENABLED', True)
         if not enabled:
@@ -155,25 +209,50 @@ class GraphQLWithGetRedirectView(View):
         if request.headers.get('X-Streaming-Api-Key') or request.headers.get('Authorization'):
             return False
 
-        try:
-            body = json.loads(request.body)
-            query = body.get('query', '')
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            return False
-
         if _is_mutation(query):
             return False
 
         return True
 
-    def _redirect_post_to_get(self, request):
-        """Build GET redirect URL from POST body and redirect."""
-        try:
-            body = json.loads(request.body)
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            return self._get_strawberry_view()(request)
+    async def _resolve_persisted_query(self, query, persisted_hash):
+        """Return the query text for a persisted query hash, or an error response.
+
+        With query text the hash is checked and registered (the query still
+        runs if the registry is unavailable); without it the hash is looked up
+        in the registry.
+        """
+        if query:
+            if persisted_registry.hash_query(query) != persisted_hash:
+                return '', JsonResponse(
+                    {"errors": [{"message": "provided sha does not match query"}]},
+                    status=400,
+                )
+            try:
+                await persisted_registry.aregister(query, persisted_hash)
+            except Exception as e:
+                logger.warning(f"Could not register persisted query {persisted_hash}: {e}")
+            return query, None
 
-        query = body.get('query', '')
+        try:
+            query = await persisted_registry.aget_query(persisted_hash)
+        except Exception as e:
+            # Answered as a miss: the client retries with the query text
+            logger.warning(f"Could not look up persisted query {persisted_hash}: {e}")
+            query = None
+        if query is None:
+            response = JsonResponse({
+                "errors": [{
+                    "message": "PersistedQueryNotFound",
+                    "extensions": {"code": PERSISTED_QUERY_NOT_FOUND},
+                }],
+            })
+            # The client retries with the query text; never cache the miss
+            response['Cache-Control'] = 'no-store'
+            return '', response
+        return query, None
+
+    async def _redirect_post_to_get(self, request, body, query):
+        """Build GET redirect URL from POST body and redirect."""
         variables = body.get('variables') or {}
         operation_name = body.get('operationName')
 
@@ -182,7 +261,18 @@ class GraphQLWithGetRedirectView(View):
 
         # Build URL params (ordered for consistent CDN cache keys)
         params = OrderedDict()
-        params['query'] = query
+        persisted_hash = None
+        if getattr(settings, 'GRAPHQL_PERSISTED_QUERIES_ENABLED', True):
+            # Reference the query by hash: short URLs and small, stable cache keys
+            try:
+                persisted_hash = await persisted_registry.aregister(query)
+            except Exception as e:
+                # The hash would not resolve: redirect with the query text instead
+                logger.warning(f"Could not register persisted query, redirecting with its text: {e}")
+        if persisted_hash:
+            params['extensions'] = encode_persisted_query_extensions(persisted_hash)
+        else:
+            params['query'] = query
         if variables:
             params['variables'] = json.dumps(variables, sort_keys=True, separators=(',', ':'))
         if operation_name:
@@ -200,9 +290,25 @@ class GraphQLWithGetRedirectView(View):
 
         return HttpResponseRedirect(redirect_url)
 
-    def _execute_get_query(self, request):
+    async def _execute_get_query(self, request):
         """Execute a GraphQL GET query and return JSON with Cache-Control headers."""
         query = request.GET.get('query', '')
+
+        persisted_hash = None
+        extensions_param = request.GET.get('extensions')
+        if extensions_param:
+            try:
+                persisted_hash = get_persisted_query_hash(json.loads(extensions_param))
+            except (json.JSONDecodeError, TypeError):
+                return JsonResponse(
+                    {"error": "Invalid 'extensions' parameter - must be valid JSON"},
+                    status=400,
+                )
+            if persisted_hash:
+                query, error_response = await self._resolve_persisted_query(query, persisted_hash)
+                if error_response is not None:
+                    return error_response
+
         if not query:
             return JsonResponse({"error": "Missing 'query' parameter"}, status=400)
 
@@ -220,25 +326,42 @@ class GraphQLWithGetRedirectView(View):
 
         operation_name = request.GET.get('operationName')
 
+        return await self._execute_query(request, query, variables, operation_name, persisted_hash)
+
+    async def _execute_query(self, request, query, variables, operation_name, persisted_hash=None):
+        """Execute a GraphQL query and return JSON with Cache-Control headers.
+
+        With a persisted query hash the parser and validation extensions reuse
+        the document already parsed and validated for it.
+        """
         try:
             # Execute via Strawberry schema (runs all extensions including @cached)
             response_obj = HttpResponse()
             context = StrawberryDjangoContext(request=request, response=response_obj)
+            # Let the @cached extension hand over a cached result as encoded JSON
+            request.graphql_accepts_encoded_result = True
+            await load_request_user(request)
 
-            result = schema.execute_sync(
+            result = await schema.execute(
                 query,
                 variable_values=variables if variables else None,
                 operation_name=operation_name,
                 context_value=context,
+                operation_extensions=(
+                    build_persisted_query_extensions(persisted_hash) if persisted_hash else None
+                ),
             )
 
-            response_data = {"data": result.data}
-            if result.errors:
-                response_data["errors"] = [
-                    {"message": str(error)} for error in result.errors
-                ]
-
-            response = JsonResponse(response_data)
+            encoded_result = getattr(request, 'graphql_encoded_result', None)
+            if encoded_result is not None and not result.errors:
+                response = HttpResponse(encoded_result, content_type='application/json')
+            else:
+                response_data = {"data": result.data}
+                if result.errors:
+                    response_data["errors"] = [
+                        {"message": str(error)} for error in result.errors
+                    ]
+                response = JsonResponse(response_data)
 
             # Set Cache-Control: first check if the extension set it on context.response,
             # then fall back to parsing the @cache_control directive from the query.
@@ -1,39 +1,71 @@
 import asyncio
+import io
 import os
 import logging
+import zlib
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import JsonResponse
 
+from superapp.apps.graphql.sync_executor import load_request_user, run_sync
+
 logger = logging.getLogger(__name__)
 
 
 class GraphQlSuperuserApiAuthMiddleware:
+    """
+    Authenticates GraphQL requests carrying the superuser API key as the
+    first superuser.
+
+    Supports both sync and async (ASGI) request paths; on the async path the
+    user lookups run in the GraphQL thread pool.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    GRAPHQL_PATHS = ('/graphql', '/v1/graphql', '/v2/graphql')
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.api_key = os.getenv('ADMIN_GRAPHQL_SUPERUSER_API_KEY')
         self._superuser = None  # Cache the superuser to avoid repeated DB queries
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
 
     def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
         # The authentication is disabled for now
-        if request.path == '/graphql' or request.path == '/v1/graphql' or request.path == '/v2/graphql':
-            auth_header = request.headers.get('Authorization')
-            if not request.user.is_authenticated:
-                if auth_header and self.api_key and auth_header.endswith(self.api_key):
-                    # Lazy load superuser only when needed
-                    if self._superuser is None:
-                        User = get_user_model()
-                        try:
-                            self._superuser = User.objects.filter(is_superuser=True).first()
-                        except Exception as e:
-                            logger.warning(f"Could not fetch superuser: {e}")
-                    
-                    if self._superuser:
-                        request.user = self._superuser
+        if request.path in self.GRAPHQL_PATHS:
+            self._authenticate(request)
 
         response = self.get_response(request)
         return response
 
+    async def __acall__(self, request):
+        if request.path in self.GRAPHQL_PATHS:
+            # Also loads request.user for the resolvers running on the event loop
+            await load_request_user(request)
+            await run_sync(self._authenticate, request)
+        return await self.get_response(request)
+
+    def _authenticate(self, request):
+        auth_header = request.headers.get('Authorization')
+        if not request.user.is_authenticated:
+            if auth_header and self.api_key and auth_header.endswith(self.api_key):
+                # Lazy load superuser only when needed
+                if self._superuser is None:
+                    User = get_user_model()
+                    try:
+                        self._superuser = User.objects.filter(is_superuser=True).first()
+                    except Exception as e:
+                        logger.warning(f"Could not fetch superuser: {e}")
+                
+                if self._superuser:
+                    request.user = self._superuser
+
 
 class ConnectionAbortMiddleware:
     """
@@ -81,3 +113,56 @@ class ConnectionAbortMiddleware:
         except Exception as e:
             logger.error(f"Unexpected error in ConnectionAbortMiddleware (async): {e}", exc_info=True)
             raise
+
+
+class GzipRequestMiddleware:
+    """
+    Middleware to accept request bodies sent with Content-Encoding: gzip.
+
+    The streaming pods compress their listening event batches and metadata
+    reports. The decompressed body replaces the original one, capped at
+    DATA_UPLOAD_MAX_MEMORY_SIZE so a small payload can't expand unbounded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        error_response = self._decompress(request)
+        if error_response is not None:
+            return error_response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        error_response = self._decompress(request)
+        if error_response is not None:
+            return error_response
+        return await self.get_response(request)
+
+    @staticmethod
+    def _decompress(request):
+        if request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower() != 'gzip':
+            return None
+
+        max_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(request.body, max_size + 1 if max_size else 0)
+        except zlib.error as e:
+            logger.warning(f"Invalid gzip request body for {request.path}: {e}")
+            return JsonResponse({"error": "Invalid gzip body"}, status=400)
+        if max_size and len(body) > max_size:
+            return JsonResponse({"error": "Request body too large"}, status=413)
+
+        request._body = body
+        request._stream = io.BytesIO(body)
+        request.META['CONTENT_LENGTH'] = str(len(body))
+        del request.META['HTTP_CONTENT_ENCODING']
+        return None
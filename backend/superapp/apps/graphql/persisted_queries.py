@@ -0,0 +1,210 @@
+"""
+Automatic persisted queries (APQ).
+
+Queries are identified by the SHA-256 hash of their text, following the
+Apollo APQ protocol:
+
+  GET /graphql?extensions={"persistedQuery":{"version":1,"sha256Hash":"<hash>"}}
+
+The hash -> query text registry lives in the Django cache (Redis), so every
+replica can resolve a hash registered by another one. Entries expire after
+TTL unless used; a hit pushes the expiry back. Each process also keeps
+the parsed and validated document of recently used hashes, which lets the
+parser and validation extensions below skip both steps entirely.
+
+The async views use aregister() / aget_query(), which run the cache round
+trips in the GraphQL thread pool.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+from graphql.validation import validate
+from strawberry.extensions import ParserCache
+from strawberry.schema.validation_rules.one_of import OneOfInputValidationRule
+from strawberry_django.extensions.django_validation_cache import DjangoValidationCache
+
+from superapp.apps.graphql.sync_executor import run_sync
+
+
+logger = logging.getLogger(__name__)
+
+PERSISTED_QUERY_NOT_FOUND = 'PERSISTED_QUERY_NOT_FOUND'
+
+
+@dataclass
+class PersistedDocument:
+    """A registered query and, once used, its parsed document and validation errors."""
+    query: str
+    document: Any = None
+    validation_errors: Optional[List[Any]] = None
+
+
+class PersistedQueryRegistry:
+    """Maps query hashes to query text (shared) and pre-parsed documents (per process)."""
+
+    KEY_PREFIX = 'graphql:persisted_query'
+    # Anyone can register a query, so unused hashes must not pile up in Redis
+    TTL = 7 * 24 * 60 * 60
+    # How often a process re-writes a hash it uses, to push its expiry back
+    # (and in case the shared cache lost it)
+    REFRESH_SECONDS = 60 * 60
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._documents: 'OrderedDict[str, PersistedDocument]' = OrderedDict()
+        self._registered_at: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_query(query: str) -> str:
+        return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+    def _key(self, sha256_hash: str) -> str:
+        return f'{self.KEY_PREFIX}:{sha256_hash}'
+
+    def register(self, query: str, sha256_hash: Optional[str] = None) -> str:
+        """Register a query and return its hash.
+
+        Always writes the shared entry, even if this process wrote it recently:
+        the caller is about to hand the hash out, so it must resolve even if
+        Redis evicted it. Raises if the cache is unavailable.
+        """
+        sha256_hash = sha256_hash or self.hash_query(query)
+        cache.set(self._key(sha256_hash), query, timeout=self.TTL)
+        self._mark_refreshed(sha256_hash, time.monotonic())
+        self._remember(sha256_hash, query)
+        return sha256_hash
+
+    async def aregister(self, query: str, sha256_hash: Optional[str] = None) -> str:
+        return await run_sync(self.register, query, sha256_hash)
+
+    def get_query(self, sha256_hash: str) -> Optional[str]:
+        """Return the query text for a hash, or None if it was never registered."""
+        with self._lock:
+            document = self._documents.get(sha256_hash)
+            if document is not None:
+                self._documents.move_to_end(sha256_hash)
+        if document is not None:
+            self._refresh(sha256_hash, document.query)
+            return document.query
+
+        query = cache.get(self._key(sha256_hash))
+        if query is not None:
+            self._refresh(sha256_hash, query)
+            self._remember(sha256_hash, query)
+        return query
+
+    async def aget_query(self, sha256_hash: str) -> Optional[str]:
+        return await run_sync(self.get_query, sha256_hash)
+
+    def get_document(self, execution_context) -> Optional[PersistedDocument]:
+        """
+        The persisted document of an operation executed with a persistedQuery
+        extension, provided the hash really belongs to the executed query.
+        """
+        sha256_hash = get_persisted_query_hash(execution_context.operation_extensions)
+        if not sha256_hash:
+            return None
+
+        with self._lock:
+            document = self._documents.get(sha256_hash)
+        if document is None or document.query != execution_context.query:
+            return None
+        return document
+
+    def _refresh(self, sha256_hash: str, query: str):
+        """(Re)write a used hash with a fresh TTL, at most once per REFRESH_SECONDS per process."""
+        now = time.monotonic()
+        with self._lock:
+            registered_at = self._registered_at.get(sha256_hash)
+            if registered_at is not None and now - registered_at <= self.REFRESH_SECONDS:
+                return
+        self._mark_refreshed(sha256_hash, now)
+        cache.set(self._key(sha256_hash), query, timeout=self.TTL)
+
+    def _mark_refreshed(self, sha256_hash: str, now: float):
+        with self._lock:
+            self._registered_at[sha256_hash] = now
+            self._registered_at.move_to_end(sha256_hash)
+            while len(self._registered_at) > self.maxsize:
+                self._registered_at.popitem(last=False)
+
+    def _remember(self, sha256_hash: str, query: str):
+        with self._lock:
+            if sha256_hash in self._documents:
+                self._documents.move_to_end(sha256_hash)
+                return
+            self._documents[sha256_hash] = PersistedDocument(query=query)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+
+
+registry = PersistedQueryRegistry()
+
+
+def get_persisted_query_hash(extensions: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Extract the sha256Hash from an APQ `extensions` payload."""
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get('persistedQuery')
+    if not isinstance(persisted_query, dict):
+        return None
+    sha256_hash = persisted_query.get('sha256Hash')
+    return sha256_hash if isinstance(sha256_hash, str) else None
+
+
+def build_persisted_query_extensions(sha256_hash: str) -> Dict[str, Any]:
+    return {'persistedQuery': {'version': 1, 'sha256Hash': sha256_hash}}
+
+
+def encode_persisted_query_extensions(sha256_hash: str) -> str:
+    return json.dumps(build_persisted_query_extensions(sha256_hash), separators=(',', ':'))
+
+
+class PersistedQueryParserCache(ParserCache):
+    """ParserCache that parses a persisted query once per process and reuses the document."""
+
+    def on_parse(self):
+        execution_context = self.execution_context
+        document = registry.get_document(execution_context)
+        if document is None:
+            yield from super().on_parse()
+            return
+
+        if document.document is None:
+            document.document = self.cached_parse_document(
+                execution_context.query, **execution_context.parse_options
+            )
+        execution_context.graphql_document = document.document
+        yield
+
+
+class PersistedQueryValidationCache(DjangoValidationCache):
+    """DjangoValidationCache that validates a persisted document once per process."""
+
+    def on_validate(self):
+        execution_context = self.execution_context
+        document = registry.get_document(execution_context)
+        if document is None or document.document is not execution_context.graphql_document:
+            yield from super().on_validate()
+            return
+
+        if document.validation_errors is None:
+            document.validation_errors = validate(
+                execution_context.schema._schema,
+                execution_context.graphql_document,
+                (
+                    *execution_context.validation_rules,
+                    OneOfInputValidationRule,
+                ),
+            )
+        execution_context.pre_execution_errors = list(document.validation_errors)
+        yield
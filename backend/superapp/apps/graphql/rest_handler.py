@@ -2,7 +2,9 @@
 Generic REST API handler for GraphQL-backed endpoints
 
 This module provides a view handler that executes GraphQL queries/mutations
-and returns JSON responses for REST API endpoints.
+and returns JSON responses for REST API endpoints. The view is async: the
+schema runs through schema.execute, and the endpoint's pre/post processors and
+variable extractor are called on the event loop, so they must not block.
 """
 
 import logging
@@ -13,6 +15,7 @@ from django.views import View
 from strawberry.django.context import StrawberryDjangoContext
 
 from superapp.apps.graphql.schema import schema
+from superapp.apps.graphql.sync_executor import load_request_user
 
 
 logger = logging.getLogger(__name__)
@@ -34,7 +37,7 @@ class GraphQLRestApiView(View):
         if not self.endpoint_config:
             raise ValueError("endpoint_config must be set before instantiating view")
     
-    def dispatch(self, request, *args, **kwargs):
+    async def dispatch(self, request, *args, **kwargs):
         """Override dispatch to handle HTTP method checking"""
         # Check if method is allowed
         if request.method != self.endpoint_config.method.value:
@@ -49,36 +52,36 @@ class GraphQLRestApiView(View):
             response['Allow'] = ', '.join(allowed_methods)
             return response
         
-        return super().dispatch(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
     
-    def options(self, request, *args, **kwargs):
+    async def options(self, request, *args, **kwargs):
         """Handle OPTIONS requests for CORS"""
         response = HttpResponse()
         self._add_cors_headers(response)
         response['Allow'] = ', '.join(self.endpoint_config.cors_methods or [self.endpoint_config.method.value])
         return response
     
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         """Handle GET requests"""
-        return self._handle_request(request, *args, **kwargs)
+        return await self._handle_request(request, *args, **kwargs)
     
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """Handle POST requests"""
-        return self._handle_request(request, *args, **kwargs)
+        return await self._handle_request(request, *args, **kwargs)
     
-    def put(self, request, *args, **kwargs):
+    async def put(self, request, *args, **kwargs):
         """Handle PUT requests"""
-        return self._handle_request(request, *args, **kwargs)
+        return await self._handle_request(request, *args, **kwargs)
     
-    def patch(self, request, *args, **kwargs):
+    async def patch(self, request, *args, **kwargs):
         """Handle PATCH requests"""
-        return self._handle_request(request, *args, **kwargs)
+        return await self._handle_request(request, *args, **kwargs)
     
-    def delete(self, request, *args, **kwargs):
+    async def delete(self, request, *args, **kwargs):
         """Handle DELETE requests"""
-        return self._handle_request(request, *args, **kwargs)
+        return await self._handle_request(request, *args, **kwargs)
     
-    def _handle_request(self, request, *args, **kwargs):
+    async def _handle_request(self, request, *args, **kwargs):
         """
         Main request handler that executes GraphQL and returns response
         """
@@ -107,7 +110,7 @@ class GraphQLRestApiView(View):
                 variables = self.endpoint_config.variable_extractor(request, **kwargs)
 
             # Execute GraphQL query/mutation
-            response_data = self._execute_graphql(
+            response_data = await self._execute_graphql(
                 query=self.endpoint_config.graphql_query,
                 variables=variables,
                 request=request
@@ -139,7 +142,7 @@ class GraphQLRestApiView(View):
 
             return response
     
-    def _execute_graphql(self, query: str, variables: Dict[str, Any], request) -> Dict[str, Any]:
+    async def _execute_graphql(self, query: str, variables: Dict[str, Any], request) -> Dict[str, Any]:
         """
         Execute GraphQL query/mutation using Strawberry schema
         
@@ -158,7 +161,8 @@ class GraphQLRestApiView(View):
         context = StrawberryDjangoContext(request=request, response=response)
         
         # Execute GraphQL
-        result = schema.execute_sync(
+        await load_request_user(request)
+        result = await schema.execute(
             query,
             variable_values=variables if variables else None,
             context_value=context
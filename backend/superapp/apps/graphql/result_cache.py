@@ -0,0 +1,178 @@
+"""
+Stale-while-revalidate cache for GraphQL results (the @cached directive).
+
+Entries live in the Django cache (Redis) as (fresh_until, body), where body
+is the zlib-compressed JSON of the response ({"data": ...}):
+
+  - fresh (younger than ttl): served as is
+  - stale (up to stale_ttl past ttl): served as is while one process
+    re-executes the query in a background thread of its own
+  - missing: one request per key executes the query (single flight). Other
+    requests in the same process wait for it; requests in other processes
+    poll the cache while the shared lock is held. Either falls back to
+    executing the query itself if no result shows up in time.
+
+Hits are served from the stored bytes: the GET view writes them straight to
+the response, without rebuilding an ExecutionResult or re-encoding JSON.
+
+The a-prefixed methods are the variants for the extension, which runs on the
+event loop of async requests: cache round trips go to the GraphQL thread pool
+and waits sleep on the loop instead of blocking it.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+
+from superapp.apps.graphql.sync_executor import run_sync
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResult:
+    """Encoded response body of a cached query and whether it is still fresh."""
+    body: bytes
+    fresh: bool
+
+
+class GraphQLResultCache:
+    """Stores encoded results and coordinates who executes a query on a miss."""
+
+    LOCK_SUFFIX = ':lock'
+    # How long a process may hold the shared lock of a key
+    LOCK_TIMEOUT = 10
+    # How long a request waits for another one's result before executing itself
+    WAIT_TIMEOUT = 5
+    POLL_INTERVAL = 0.05
+    REFRESH_WORKERS = 4
+
+    def __init__(self):
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def encode(data: Any) -> bytes:
+        return json.dumps({'data': data}, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        entry = cache.get(key)
+        # Anything else is an entry written in an older format
+        if not isinstance(entry, tuple) or len(entry) != 2:
+            return None
+        fresh_until, compressed = entry
+        try:
+            body = zlib.decompress(compressed)
+        except zlib.error:
+            return None
+        return CachedResult(body=body, fresh=time.time() < fresh_until)
+
+    def set(self, key: str, data: Any, ttl: int, stale_ttl: int = 0) -> bytes:
+        """Store a result for ttl seconds, served stale for stale_ttl more."""
+        body = self.encode(data)
+        cache.set(key, (time.time() + ttl, zlib.compress(body, 6)), ttl + stale_ttl)
+        return body
+
+    def begin(self, key: str) -> bool:
+        """Claim the key in this process; False if a local request already has."""
+        with self._lock:
+            if key in self._inflight:
+                return False
+            self._inflight[key] = threading.Event()
+            return True
+
+    def lock(self, key: str) -> bool:
+        """Claim the key across processes; False if another process already has."""
+        return cache.add(f'{key}{self.LOCK_SUFFIX}', 1, timeout=self.LOCK_TIMEOUT)
+
+    def end(self, key: str, locked: bool) -> None:
+        """Release the claims taken with begin() and lock()."""
+        if locked:
+            cache.delete(f'{key}{self.LOCK_SUFFIX}')
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def aget(self, key: str) -> Optional[CachedResult]:
+        return await run_sync(self.get, key)
+
+    async def aset(self, key: str, data: Any, ttl: int, stale_ttl: int = 0) -> bytes:
+        return await run_sync(self.set, key, data, ttl, stale_ttl)
+
+    async def alock(self, key: str) -> bool:
+        return await run_sync(self.lock, key)
+
+    async def aend(self, key: str, locked: bool) -> None:
+        if locked:
+            await run_sync(cache.delete, f'{key}{self.LOCK_SUFFIX}')
+        self.end(key, locked=False)
+
+    async def await_local(self, key: str) -> Optional[CachedResult]:
+        """Wait for the local request executing the key, then read its result.
+
+        Polls the event instead of blocking the loop on it.
+        """
+        with self._lock:
+            event = self._inflight.get(key)
+        if event is not None:
+            deadline = time.monotonic() + self.WAIT_TIMEOUT
+            while not event.is_set() and time.monotonic() < deadline:
+                await asyncio.sleep(self.POLL_INTERVAL)
+        return await self.aget(key)
+
+    async def await_remote(self, key: str) -> Optional[CachedResult]:
+        """Poll for the result of another process while it holds the lock."""
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        lock_key = f'{key}{self.LOCK_SUFFIX}'
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            cached = await self.aget(key)
+            if cached is not None:
+                return cached
+            if await run_sync(cache.get, lock_key) is None:
+                # The other process gave up without storing a result
+                return None
+        return None
+
+    async def arefresh_in_background(self, key: str, refresh: Callable[[], None]) -> bool:
+        """Run refresh() in a background thread unless the key is being executed already."""
+        if not self.begin(key):
+            return False
+        if not await self.alock(key):
+            self.end(key, locked=False)
+            return False
+
+        def run():
+            close_old_connections()
+            try:
+                refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing GraphQL cache key {key}: {e}")
+            finally:
+                self.end(key, locked=True)
+                close_old_connections()
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.REFRESH_WORKERS, thread_name_prefix='graphql-cache-refresh'
+                )
+            executor = self._executor
+        executor.submit(run)
+        return True
+
+
+result_cache = GraphQLResultCache()
@@ -6,12 +6,12 @@ from typing import List, Type, Any
 import strawberry
 from django.apps import apps
 from django.db import connection
-from strawberry.extensions import Extension, ParserCache
+from strawberry.extensions import Extension
 from strawberry.tools import merge_types
 from strawberry.types.base import StrawberryObjectDefinition
-from strawberry_django.extensions.django_validation_cache import DjangoValidationCache
 from strawberry_django.optimizer import DjangoOptimizerExtension
 from .graphql.extensions import CacheControlExtension, CacheExtension
+from .persisted_queries import PersistedQueryParserCache, PersistedQueryValidationCache
 
 
 class SQLPrintingExtension(Extension):
@@ -211,8 +211,8 @@ all_directives = find_graphql_directives()
 
 # Collect base extensions
 base_extensions = [
-    ParserCache(maxsize=1000),
-    DjangoValidationCache(
+    PersistedQueryParserCache(maxsize=1000),
+    PersistedQueryValidationCache(
         timeout=7 * 24 * 60 * 60,  # Cache for 7 days
     ),
     DjangoOptimizerExtension(
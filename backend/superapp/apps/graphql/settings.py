@@ -1,3 +1,6 @@
+import os
+
+
 def extend_superapp_settings(main_settings):
     main_settings['INSTALLED_APPS'] += [
         'strawberry_django',
@@ -7,6 +10,10 @@ def extend_superapp_settings(main_settings):
         'superapp.apps.graphql.middleware.GraphQlSuperuserApiAuthMiddleware',
     ]
     main_settings['DATA_UPLOAD_MAX_MEMORY_SIZE'] = 1024 * 1024 * 10  # 10MB
+    # Threads per worker for the database work of async GraphQL requests
+    # (see sync_executor). 0 runs it on Django's single thread-sensitive
+    # thread, which tests need to see the data of their transaction.
+    main_settings['GRAPHQL_SYNC_THREADS'] = int(os.environ.get('GRAPHQL_SYNC_THREADS', 16))
 
     # Replace Django's debug toolbar with Strawberry's version (only in DEBUG mode)
     debug = main_settings.get('DEBUG', False)
@@ -19,5 +26,7 @@ def extend_superapp_settings(main_settings):
             'strawberry_django.middlewares.debug_toolbar.DebugToolbarMiddleware',
         ]
 
-    # Add connection abort handler middleware early in the chain
+    # Add connection abort handler middleware early in the chain, followed by
+    # gzip request body support (used by the streaming pods)
+    main_settings['MIDDLEWARE'].insert(0, 'superapp.apps.graphql.middleware.GzipRequestMiddleware')
     main_settings['MIDDLEWARE'].insert(0, 'superapp.apps.graphql.middleware.ConnectionAbortMiddleware')
@@ -0,0 +1,85 @@
+"""
+Thread pool for the blocking work of async GraphQL requests.
+
+The GraphQL views execute the schema asynchronously (schema.execute) on the
+Uvicorn worker's event loop. Anything blocking - ORM queries, services,
+sleeps - must leave the loop, or every other request of the worker waits
+for it. run_sync() runs a function in a pool shared by the worker, sized by
+the GRAPHQL_SYNC_THREADS setting (default: 16), which also bounds the number
+of database connections a worker opens for GraphQL. With 0 it falls back to
+Django's thread-sensitive sync_to_async.
+
+Resolvers declared with strawberry_django are offloaded by strawberry_django
+itself; plain Strawberry resolvers and DataLoader batch functions that touch
+the database use threaded_resolver / run_sync.
+"""
+
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.functional import SimpleLazyObject, empty
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_sync_threads() -> int:
+    return getattr(settings, 'GRAPHQL_SYNC_THREADS', 16)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_sync_threads(), thread_name_prefix='graphql-sync')
+        return _executor
+
+
+def _call_with_connection_cleanup(func: Callable, *args, **kwargs) -> Any:
+    # Pool threads outlive requests: drop connections past CONN_MAX_AGE or broken
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking function in the GraphQL thread pool and await its result."""
+    if get_sync_threads() <= 0:
+        return await sync_to_async(func)(*args, **kwargs)
+    return await sync_to_async(
+        _call_with_connection_cleanup, thread_sensitive=False, executor=get_executor()
+    )(func, *args, **kwargs)
+
+
+def threaded_resolver(func: Callable) -> Callable:
+    """
+    Turn a blocking Strawberry resolver into an async one running in the pool.
+
+    Strawberry reads the arguments and return type from the wrapped function.
+    The resolver must return plain objects (lists, not lazy querysets).
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_sync(func, *args, **kwargs)
+
+    return wrapper
+
+
+async def load_request_user(request) -> None:
+    """
+    Evaluate the lazy request.user in the pool.
+
+    Resolvers, permission classes and extensions read request.user on the
+    event loop, where loading it from the session would raise
+    SynchronousOnlyOperation.
+    """
+    user = getattr(request, 'user', None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        await run_sync(getattr, user, 'is_authenticated')
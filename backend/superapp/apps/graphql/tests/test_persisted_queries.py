@@ -0,0 +1,131 @@
+import json
+import urllib.parse
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..persisted_queries import (
+    PERSISTED_QUERY_NOT_FOUND,
+    PersistedQueryRegistry,
+    encode_persisted_query_extensions,
+    registry,
+)
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+QUERY = '{ __typename }'
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PersistedQueryRegistryTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.registry = PersistedQueryRegistry(maxsize=2)
+
+    def test_unknown_hash_misses(self):
+        self.assertIsNone(self.registry.get_query(PersistedQueryRegistry.hash_query(QUERY)))
+
+    def test_registered_hash_resolves_in_another_process(self):
+        sha256_hash = self.registry.register(QUERY)
+
+        self.assertEqual(sha256_hash, PersistedQueryRegistry.hash_query(QUERY))
+        self.assertEqual(PersistedQueryRegistry().get_query(sha256_hash), QUERY)
+
+    def test_register_sets_a_finite_ttl(self):
+        with mock.patch('superapp.apps.graphql.persisted_queries.cache') as shared_cache:
+            self.registry.register(QUERY)
+
+        shared_cache.set.assert_called_once_with(
+            self.registry._key(PersistedQueryRegistry.hash_query(QUERY)), QUERY, timeout=PersistedQueryRegistry.TTL
+        )
+
+    def test_register_rewrites_a_recently_registered_hash(self):
+        sha256_hash = self.registry.register(QUERY)
+        # Evicted from Redis: the next redirect must store it again
+        cache.delete(self.registry._key(sha256_hash))
+
+        self.registry.register(QUERY)
+
+        self.assertEqual(PersistedQueryRegistry().get_query(sha256_hash), QUERY)
+
+    def test_hit_refreshes_the_ttl_once_per_refresh_interval(self):
+        sha256_hash = self.registry.register(QUERY)
+
+        with mock.patch('superapp.apps.graphql.persisted_queries.cache') as shared_cache, \
+                mock.patch('superapp.apps.graphql.persisted_queries.time.monotonic') as monotonic:
+            monotonic.return_value = self.registry._registered_at[sha256_hash] + 1
+            self.assertEqual(self.registry.get_query(sha256_hash), QUERY)
+            shared_cache.set.assert_not_called()
+
+            monotonic.return_value += PersistedQueryRegistry.REFRESH_SECONDS
+            self.assertEqual(self.registry.get_query(sha256_hash), QUERY)
+            shared_cache.set.assert_called_once_with(
+                self.registry._key(sha256_hash), QUERY, timeout=PersistedQueryRegistry.TTL
+            )
+
+    def test_per_process_state_is_bounded(self):
+        for index in range(5):
+            self.registry.register(f'{{ q{index}: __typename }}')
+        # Hashes resolved from the shared cache count too
+        other = PersistedQueryRegistry().register('{ other: __typename }')
+        self.registry.get_query(other)
+
+        self.assertEqual(len(self.registry._documents), 2)
+        self.assertEqual(len(self.registry._registered_at), 2)
+        self.assertIn(other, self.registry._registered_at)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PersistedQueryViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry._documents.clear()
+        registry._registered_at.clear()
+        self.sha256_hash = PersistedQueryRegistry.hash_query(QUERY)
+        self.extensions = {'persistedQuery': {'version': 1, 'sha256Hash': self.sha256_hash}}
+
+    def post(self, body):
+        return self.client.post('/graphql', json.dumps(body), content_type='application/json')
+
+    def test_miss_register_hit(self):
+        response = self.post({'extensions': self.extensions})
+        self.assertEqual(response.json()['errors'][0]['extensions']['code'], PERSISTED_QUERY_NOT_FOUND)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+        response = self.post({'query': QUERY, 'extensions': self.extensions})
+        self.assertEqual(response.status_code, 302)
+        location = urllib.parse.urlsplit(response['Location'])
+        params = urllib.parse.parse_qs(location.query)
+        self.assertEqual(params['extensions'], [encode_persisted_query_extensions(self.sha256_hash)])
+        self.assertNotIn('query', params)
+
+        response = self.client.get(f'{location.path}?{location.query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {'__typename': 'queryRoot'})
+
+        # Known hash without the query text: redirected to the same GET
+        response = self.post({'extensions': self.extensions})
+        self.assertEqual(response.status_code, 302)
+        redirect_params = urllib.parse.parse_qs(urllib.parse.urlsplit(response['Location']).query)
+        self.assertEqual(redirect_params['extensions'], params['extensions'])
+
+    def test_redirects_with_query_text_when_the_cache_is_down(self):
+        with mock.patch('superapp.apps.graphql.persisted_queries.cache') as shared_cache:
+            shared_cache.set.side_effect = ConnectionError('cache down')
+            shared_cache.get.side_effect = ConnectionError('cache down')
+
+            response = self.post({'query': QUERY})
+            self.assertEqual(response.status_code, 302)
+            params = urllib.parse.parse_qs(urllib.parse.urlsplit(response['Location']).query)
+            self.assertEqual(params['query'], [QUERY])
+            self.assertNotIn('extensions', params)
+
+            # Hash-only requests are answered as a miss, so clients resend the text
+            response = self.post({'extensions': self.extensions})
+            self.assertEqual(response.json()['errors'][0]['extensions']['code'], PERSISTED_QUERY_NOT_FOUND)
+
+    def test_hash_of_another_query_is_rejected(self):
+        response = self.post({'query': '{ other: __typename }', 'extensions': self.extensions})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNone(registry.get_query(self.sha256_hash))
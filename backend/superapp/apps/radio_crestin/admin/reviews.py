@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
 
@@ -69,12 +70,12 @@ class ReviewsAdmin(SuperAppModelAdmin):
     verified_status.admin_order_field = 'verified'
     
     def verify_reviews(self, request, queryset):
-        updated = queryset.update(verified=True)
+        updated = queryset.update(verified=True, updated_at=timezone.now())
         self.message_user(request, f"{updated} review(s) have been verified.")
     verify_reviews.short_description = _("Verify selected reviews")
     
     def unverify_reviews(self, request, queryset):
-        updated = queryset.update(verified=False)
+        updated = queryset.update(verified=False, updated_at=timezone.now())
         self.message_user(request, f"{updated} review(s) have been unverified.")
     unverify_reviews.short_description = _("Unverify selected reviews")
     
@@ -1,10 +1,28 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Hashable, Optional
 from strawberry.dataloader import DataLoader
 from collections import defaultdict
 
+from superapp.apps.graphql.sync_executor import run_sync
+
 from ..services.listener_analytics_service import ListenerAnalyticsService
 
 
+def get_loader(info, key: Hashable, factory: Callable[[], DataLoader]) -> DataLoader:
+    """
+    Return the request's DataLoader for key, creating it with factory().
+
+    Loaders batch the loads of one request only: they are kept on the
+    GraphQL context, which is created per request.
+    """
+    loaders = getattr(info.context, '_dataloaders', None)
+    if loaders is None:
+        loaders = {}
+        setattr(info.context, '_dataloaders', loaders)
+    if key not in loaders:
+        loaders[key] = factory()
+    return loaders[key]
+
+
 def create_listener_count_loader() -> DataLoader[int, Dict[str, int]]:
     """
     Create a DataLoader for batching listener count queries.
@@ -13,7 +31,7 @@ def create_listener_count_loader() -> DataLoader[int, Dict[str, int]]:
     - 'radio_crestin': Radio Crestin platform listener count
     - 'total': Combined count from all sources
     """
-    async def batch_load_listener_counts(station_ids: List[int]) -> List[Dict[str, int]]:
+    def load_listener_counts(station_ids: List[int]) -> List[Dict[str, int]]:
         # Get all stations that need data
         from ..models import Stations
         stations = list(
@@ -35,23 +53,27 @@ def create_listener_count_loader() -> DataLoader[int, Dict[str, int]]:
             counts.get(station_id, {'radio_crestin': 0, 'total': 0})
             for station_id in station_ids
         ]
-    
+
+    async def batch_load_listener_counts(station_ids: List[int]) -> List[Dict[str, int]]:
+        return await run_sync(load_listener_counts, list(station_ids))
+
     return DataLoader(load_fn=batch_load_listener_counts)
 
 
-def create_posts_loader(limit: int = 1) -> DataLoader[int, List[Any]]:
+def create_posts_loader(limit: Optional[int] = 1) -> DataLoader[int, List[Any]]:
     """
     Create a DataLoader for batching posts queries with limit support.
     
-    Returns a loader that accepts station IDs and returns lists of posts.
+    Returns a loader that accepts station IDs and returns lists of posts,
+    newest first. A limit of None loads all posts.
     """
-    async def batch_load_posts(station_ids: List[int]) -> List[List[Any]]:
+    def load_posts(station_ids: List[int]) -> List[List[Any]]:
         from ..models import Posts
         from django.db.models import Window, F
         from django.db.models.functions import RowNumber
         
         # For small limits, it's more efficient to fetch all and slice in Python
-        if limit <= 3:
+        if limit is None or limit <= 3:
             # Get all posts for requested stations
             posts = list(
                 Posts.objects.filter(
@@ -62,7 +84,7 @@ def create_posts_loader(limit: int = 1) -> DataLoader[int, List[Any]]:
             # Group by station_id and apply limit
             posts_by_station = defaultdict(list)
             for post in posts:
-                if len(posts_by_station[post.station_id]) < limit:
+                if limit is None or len(posts_by_station[post.station_id]) < limit:
                     posts_by_station[post.station_id].append(post)
             
             # Return in the same order as requested
@@ -125,4 +147,7 @@ def create_posts_loader(limit: int = 1) -> DataLoader[int, List[Any]]:
                 for station_id in station_ids
             ]
     
-    return DataLoader(load_fn=batch_load_posts)
\ No newline at end of file
+    async def batch_load_posts(station_ids: List[int]) -> List[List[Any]]:
+        return await run_sync(load_posts, list(station_ids))
+
+    return DataLoader(load_fn=batch_load_posts)
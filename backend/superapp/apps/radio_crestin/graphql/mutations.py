@@ -5,7 +5,6 @@ import strawberry
 from typing import List, Optional
 
 import strawberry_django
-from datetime import datetime
 import logging
 
 from strawberry import BasePermission
@@ -29,9 +28,10 @@ from .types import (
     ReportStationMetadataInput,
     ReportStationMetadataResponse,
 )
-from ..models import Stations, ListeningSessions, AppUsers
+from ..models import Stations
 from ..services.share_link_service import ShareLinkService
 from ..services.review_service import ReviewService
+from ..services.listening_ingest_service import ListeningIngestService
 
 
 class IsSuperuser(BasePermission):
@@ -79,61 +79,7 @@ class Mutation:
         processed_count = 0
 
         try:
-            # Cache user and station lookups within the batch to avoid repeated queries
-            user_cache = {}
-            station_cache = {}
-
-            for event_input in events:
-                logger.info("Processing event: %s", event_input)
-                try:
-                    # Parse timestamp
-                    timestamp = datetime.fromisoformat(event_input.timestamp.replace('Z', '+00:00'))
-
-                    # Find or get station by slug (cached)
-                    station_slug = event_input.station_slug
-                    if station_slug not in station_cache:
-                        try:
-                            station_cache[station_slug] = Stations.objects.get(slug=station_slug)
-                        except Stations.DoesNotExist:
-                            station_cache[station_slug] = None
-                            logger.warning(f"Station not found: {station_slug}")
-                    station = station_cache[station_slug]
-                    if station is None:
-                        continue
-
-                    # Get or create AppUsers by anonymous_id (same device ID from ?s= param)
-                    # Links the same user across listening sessions, reviews, and share links
-                    session_id = event_input.anonymous_session_id
-                    if session_id not in user_cache:
-                        user, _ = AppUsers.objects.get_or_create(
-                            anonymous_id=session_id
-                        )
-                        user_cache[session_id] = user
-                    anonymous_user = user_cache[session_id]
-
-                    # Get or create listening session and update activity
-                    session, created = ListeningSessions.get_or_create_session(
-                        user=anonymous_user,
-                        station=station,
-                        anonymous_session_id=event_input.anonymous_session_id,
-                        ip_address=event_input.ip_address,
-                        user_agent=event_input.user_agent,
-                        referer=event_input.referer
-                    )
-
-                    # Update session activity with new event data
-                    is_playlist = event_input.event_type == 'playlist_request'
-                    session.update_activity(
-                        timestamp=timestamp,
-                        bytes_sent=event_input.bytes_transferred,
-                        is_playlist=is_playlist
-                    )
-
-                    processed_count += 1
-
-                except Exception as event_error:
-                    logger.error(f"Error processing individual event: {event_error}")
-                    continue
+            processed_count = ListeningIngestService.ingest_events(events)
 
             return SubmitListeningEventsResponse(
                 success=True,
@@ -14,10 +14,11 @@ from .types import (
     StationMetadataHistoryType, StationMetadataHistoryEntryType,
     StationStreamingConfigType, StationScraperConfigType,
 )
-from ..models import Stations, StationGroups, StationStreams, Posts, StationToStationGroup, Artists, Songs
+from ..models import Stations, StationGroups, Posts, StationToStationGroup, Artists, Songs
 from ..models import StationsNowPlayingHistory
 from ..services import AutocompleteService
 from ..utils.cdn_proxy import proxy_image_url
+from superapp.apps.graphql.sync_executor import threaded_resolver
 
 
 @strawberry.input
@@ -82,151 +83,55 @@ class Query:
 
         Cache: This query is cached automatically by QueryCache extension.
 
+        Catalog data (stations, streams, latest post, review stats) is served
+        from StationsSnapshotService; only now playing, uptime and listener
+        counts are loaded per request.
         """
-        # Build optimized queryset with all necessary prefetches
-        queryset = Stations.objects.select_related(
-            'latest_station_uptime',
-            'latest_station_now_playing',
-            'latest_station_now_playing__song',
-            'latest_station_now_playing__song__artist'
-        ).prefetch_related(
-            # Prefetch station streams ordered by order field
-            Prefetch(
-                'station_streams',
-                queryset=StationStreams.objects.order_by('order', 'id')
-            )
-        ).filter(disabled=False)
+        from ..services.listener_analytics_service import ListenerAnalyticsService
+        from ..services.stations_snapshot_service import StationsSnapshotService
+
+        stations_list = StationsSnapshotService.get_stations()
 
         # Apply slug filters
         if station_slugs:
-            queryset = queryset.filter(slug__in=station_slugs)
+            slugs = set(station_slugs)
+            stations_list = [s for s in stations_list if s.slug in slugs]
         if exclude_station_slugs:
-            queryset = queryset.exclude(slug__in=exclude_station_slugs)
+            excluded = set(exclude_station_slugs)
+            stations_list = [s for s in stations_list if s.slug not in excluded]
 
-        # Apply ordering - default to order asc, title asc for Hasura compatibility
-        if order_by:
-            order_fields = []
-            if order_by.order:
-                if order_by.order == OrderDirection.desc:
-                    order_fields.append('-order')
-                else:
-                    order_fields.append('order')
+        # Apply ordering - the snapshot is already in the default Hasura
+        # ordering (order asc, title asc)
+        if order_by and (order_by.order or order_by.title):
+            # Stable sorts, applied from the least to the most significant key
             if order_by.title:
-                if order_by.title == OrderDirection.desc:
-                    order_fields.append('-title')
-                else:
-                    order_fields.append('title')
-            if order_fields:
-                queryset = queryset.order_by(*order_fields)
-            else:
-                # Default Hasura ordering if no specific fields provided
-                queryset = queryset.order_by('order', 'title')
-        else:
-            # Default Hasura ordering
-            queryset = queryset.order_by('order', 'title')
+                stations_list.sort(
+                    key=lambda s: s._snapshot_title_rank,
+                    reverse=order_by.title == OrderDirection.desc
+                )
+            if order_by.order:
+                stations_list.sort(
+                    key=lambda s: s.order,
+                    reverse=order_by.order == OrderDirection.desc
+                )
 
         # Apply pagination
         if offset:
-            queryset = queryset[offset:]
+            stations_list = stations_list[offset:]
         if limit:
-            queryset = queryset[:limit]
+            stations_list = stations_list[:limit]
 
-        # Convert to list to execute the query
-        stations_list = list(queryset)
+        StationsSnapshotService.apply_volatile_fields(stations_list)
 
-        # Batch load listener counts for all stations
-        from ..services.listener_analytics_service import ListenerAnalyticsService
-        station_ids = [station.id for station in stations_list]
+        # Attach listener counts to stations to avoid N+1 queries
         listener_counts = ListenerAnalyticsService.get_combined_listener_counts(
             stations=stations_list,
             minutes=1
         )
-
-        # Attach listener counts to stations to avoid N+1 queries
         for station in stations_list:
             if station.id in listener_counts:
                 station._listener_counts_cache = listener_counts[station.id]
 
-        # If we're not already prefetching posts, batch load latest posts for common case (limit=1)
-        if not any('posts' in str(p) for p in queryset._prefetch_related_lookups):
-            from ..models import Posts
-            # Use raw SQL with window function for efficient single post per station
-            from django.db import connection
-
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    WITH ranked_posts AS (
-                        SELECT 
-                            id, title, description, link, published, 
-                            created_at, updated_at, station_id,
-                            ROW_NUMBER() OVER (PARTITION BY station_id ORDER BY published DESC) as rn
-                        FROM posts
-                        WHERE station_id = ANY(%s)
-                    )
-                    SELECT * FROM ranked_posts WHERE rn = 1
-                    ORDER BY station_id
-                """, [station_ids])
-
-                columns = [col[0] for col in cursor.description]
-                posts_raw = cursor.fetchall()
-
-            # Create Post objects and attach to stations
-            posts_by_station = {}
-            for row in posts_raw:
-                post_dict = dict(zip(columns, row))
-                post_dict.pop('rn', None)
-
-                post = Posts(
-                    id=post_dict['id'],
-                    title=post_dict['title'],
-                    description=post_dict['description'],
-                    link=post_dict['link'],
-                    published=post_dict['published'],
-                    created_at=post_dict['created_at'],
-                    updated_at=post_dict['updated_at'],
-                    station_id=post_dict['station_id']
-                )
-                post._state.adding = False
-                post._state.db = 'default'
-
-                posts_by_station[post.station_id] = [post]
-
-            # Attach posts to stations
-            for station in stations_list:
-                if station.id in posts_by_station:
-                    station._posts_cache = posts_by_station[station.id]
-                else:
-                    # Ensure all stations have a cache entry to prevent N+1 queries
-                    station._posts_cache = []
-
-        # Batch load review stats for all stations in a single query
-        from django.db.models import Avg, Count
-        from ..models import Reviews as ReviewsModel
-
-        reviews_stats = ReviewsModel.objects.filter(
-            station_id__in=station_ids,
-            verified=True
-        ).values('station_id').annotate(
-            count=Count('id'),
-            avg_rating=Avg('stars')
-        )
-
-        # Build lookup dict
-        reviews_stats_by_station = {
-            stat['station_id']: {
-                'count': stat['count'] or 0,
-                'avg_rating': round(stat['avg_rating'] or 0.0, 2)
-            }
-            for stat in reviews_stats
-        }
-
-        # Attach review stats cache to stations
-        for station in stations_list:
-            station._reviews_stats_cache = reviews_stats_by_station.get(
-                station.id,
-                {'count': 0, 'avg_rating': 0.0}
-            )
-
         return stations_list
 
     @strawberry_django.field
@@ -376,6 +281,7 @@ class Query:
             return None
 
     @strawberry.field
+    @threaded_resolver
     def reviews(
         self,
         station_id: Optional[int] = None,
@@ -432,6 +338,7 @@ class Query:
         ]
 
     @strawberry.field
+    @threaded_resolver
     def autocomplete(
         self,
         query: str,
@@ -456,6 +363,7 @@ class Query:
         )
 
     @strawberry.field
+    @threaded_resolver
     def stations_metadata(
         self,
         timestamp: Optional[int] = None,
@@ -657,6 +565,7 @@ class Query:
         ]
 
     @strawberry.field
+    @threaded_resolver
     def stations_metadata_history(
         self,
         station_slug: str,
@@ -754,6 +663,7 @@ class Query:
         )
 
     @strawberry.field
+    @threaded_resolver
     def streaming_station_configs(
         self,
         info: strawberry.Info,
@@ -6,6 +6,9 @@ from enum import Enum
 
 from django.conf import settings
 
+from superapp.apps.graphql.sync_executor import run_sync
+
+from .dataloaders import create_listener_count_loader, create_posts_loader, get_loader
 from .scalars import timestamptz, jsonb
 from ..utils.cdn_proxy import proxy_image_url
 
@@ -32,6 +35,11 @@ class ListeningEventInput:
     status_code: int
     request_count: Optional[int] = None
     referer: Optional[str] = None
+    # Set by pods that pre-aggregate a session's requests into one event;
+    # timestamp is then the latest request
+    first_timestamp: Optional[str] = None
+    playlist_request_count: Optional[int] = None
+    segment_request_count: Optional[int] = None
 
 from ..models import (
     Artists,
@@ -43,10 +51,17 @@ from ..models import (
     StationsNowPlaying,
     StationGroups,
     StationToStationGroup,
-    ListeningSessions,
 )
 
 
+async def _load_listener_counts(station, info: strawberry.Info) -> dict:
+    """Listener counts pre-loaded by the query, or batch loaded for the request"""
+    if hasattr(station, '_listener_counts_cache'):
+        return station._listener_counts_cache
+    loader = get_loader(info, 'listener_counts', create_listener_count_loader)
+    return await loader.load(station.id)
+
+
 @strawberry_django.type(model=Artists, fields="__all__")
 class ArtistType:
     id: int = strawberry_django.field()
@@ -151,17 +166,11 @@ class StationType:
         return f"https://proxy.radio-crestin.com/{self.stream_url}"
 
     @strawberry.field
-    def radio_crestin_listeners(self) -> Optional[int]:
+    async def radio_crestin_listeners(self, info: strawberry.Info) -> Optional[int]:
         """Get listener count specific to radio-crestin platform from real-time analytics"""
         try:
-            # Check if listener counts were pre-loaded
-            if hasattr(self, '_listener_counts_cache'):
-                return self._listener_counts_cache.get('radio_crestin', 0)
-            
-            # Fallback to individual query if not pre-loaded
-            # Get count of unique active listeners from ListeningSessions
-            # Active = had activity in the last 60 seconds
-            return ListeningSessions.get_active_listeners_count(station=self, minutes=1)
+            counts = await _load_listener_counts(self, info)
+            return counts.get('radio_crestin', 0)
         except Exception as e:
             if settings.DEBUG:
                 raise e
@@ -170,14 +179,13 @@ class StationType:
 
     # Custom posts resolver to handle limit and order_by
     @strawberry.field
-    def posts(
+    async def posts(
         self,
+        info: strawberry.Info,
         limit: Optional[int] = None,
         order_by: Optional[PostOrderBy] = None
     ) -> List[PostType]:
         """Get posts with limit and ordering support, optimized to use prefetched data when available"""
-        from ..models import Posts
-
         # Check if posts are already prefetched or cached to avoid N+1 queries
         if hasattr(self, '_prefetched_objects_cache') and 'posts' in self._prefetched_objects_cache:
             # Use prefetched data - it's already ordered by -published from the main query
@@ -208,59 +216,41 @@ class StationType:
             
             return posts
         else:
-            # Fallback to individual query if not prefetched
-            queryset = Posts.objects.filter(station=self)
-
-            # Apply ordering
-            if order_by and order_by.published:
-                if order_by.published == OrderDirection.desc:
-                    queryset = queryset.order_by('-published')
-                else:
-                    queryset = queryset.order_by('published')
-            else:
-                # Default ordering
-                queryset = queryset.order_by('-published')
-
-            # Apply limit
-            if limit:
-                queryset = queryset[:limit]
+            # Batch loaded with the other stations of the request, newest first
+            ascending = bool(order_by and order_by.published and order_by.published != OrderDirection.desc)
+            # The oldest posts need all of them loaded
+            load_limit = None if ascending else (limit or None)
+            loader = get_loader(info, ('posts', load_limit), lambda: create_posts_loader(limit=load_limit))
+            posts = list(await loader.load(self.id))
+
+            if ascending:
+                posts.reverse()
+                if limit:
+                    posts = posts[:limit]
 
-            return list(queryset)
+            return posts
 
     # Additional computed fields for backward compatibility
     @strawberry.field
-    def total_listeners(self) -> Optional[int]:
+    async def total_listeners(self, info: strawberry.Info) -> Optional[int]:
         """Get total listener count from both now playing data and radio-crestin analytics"""
         try:
-            # Check if listener counts were pre-loaded
-            if hasattr(self, '_listener_counts_cache'):
-                total = self._listener_counts_cache.get('total', 0)
-                return total if total > 0 else None
-            
-            # Fallback to individual calculation if not pre-loaded
-            # Get radio-crestin specific listeners from real-time analytics
-            radio_crestin_count = ListeningSessions.get_active_listeners_count(station=self, minutes=1)
-
-            # Get external listeners from latest now playing data
-            external_count = 0
-            if hasattr(self, 'latest_station_now_playing') and self.latest_station_now_playing:
-                external_count = self.latest_station_now_playing.listeners or 0
-
-            # Return the combined count
+            # Radio-crestin listeners plus the external ones from the latest now playing data
             # Note: This assumes external sources don't overlap with radio-crestin listeners
-            total = radio_crestin_count + external_count
+            counts = await _load_listener_counts(self, info)
+            total = counts.get('total', 0)
             return total if total > 0 else None
 
         except Exception as e:
             if settings.DEBUG:
                 raise e
-            # Fallback to just external count if there's an error
-            if hasattr(self, 'latest_station_now_playing') and self.latest_station_now_playing:
+            # Fallback to just external count if there's an error (when already loaded)
+            if Stations.latest_station_now_playing.is_cached(self) and self.latest_station_now_playing:
                 return self.latest_station_now_playing.listeners
             return None
 
     @strawberry.field
-    def reviews(self, info: strawberry.Info) -> List["ReviewType"]:
+    async def reviews(self, info: strawberry.Info) -> List["ReviewType"]:
         """Get verified reviews for this station.
 
         Returns empty array by default. Only fetches actual reviews when
@@ -276,10 +266,15 @@ class StationType:
 
         from ..models import Reviews as ReviewsModel
 
-        reviews = ReviewsModel.objects.filter(
-            station_id=self.id,
-            verified=True
-        ).order_by('-created_at')
+        def load_reviews():
+            return list(
+                ReviewsModel.objects.filter(
+                    station_id=self.id,
+                    verified=True
+                ).order_by('-created_at')
+            )
+
+        reviews = await run_sync(load_reviews)
 
         return [
             ReviewType(
@@ -297,7 +292,7 @@ class StationType:
         ]
 
     @strawberry.field
-    def reviews_stats(self) -> "ReviewsStatsType":
+    async def reviews_stats(self) -> "ReviewsStatsType":
         """Get review statistics for this station.
 
         Uses batch-loaded _reviews_stats_cache when available to avoid N+1 queries.
@@ -314,10 +309,11 @@ class StationType:
         from django.db.models import Avg, Count
         from ..models import Reviews as ReviewsModel
 
-        stats = ReviewsModel.objects.filter(
-            station_id=self.id,
-            verified=True
-        ).aggregate(
+        stats = await run_sync(
+            ReviewsModel.objects.filter(
+                station_id=self.id,
+                verified=True
+            ).aggregate,
             count=Count('id'),
             avg_rating=Avg('stars')
         )
@@ -0,0 +1,96 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from superapp.apps.radio_crestin.services.read_api_benchmark_service import (
+    SCENARIOS,
+    ReadApiBenchmarkService,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the public read API (REST endpoints and GraphQL resolvers): '
+        'p50/p95/p99 latency, SQL queries and peak allocations per request. '
+        'Run generate_benchmark_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Timed requests per scenario (default: 50)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Untimed requests per scenario before measuring (default: 5)'
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=[scenario.name for scenario in SCENARIOS],
+            help='Run only this scenario (repeatable)'
+        )
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help='Disable the Django cache so every request runs the resolvers'
+        )
+        parser.add_argument(
+            '--no-allocations',
+            action='store_true',
+            help='Skip tracemalloc allocation tracking'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file (usable as a baseline)'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Fail if results regress against this JSON file from --output'
+        )
+        parser.add_argument(
+            '--max-regression',
+            type=float,
+            default=0.25,
+            help='Allowed p95 latency growth against the baseline, as a fraction (default: 0.25)'
+        )
+
+    def handle(self, *args, **options):
+        benchmark = ReadApiBenchmarkService(
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            cold_cache=options['cold_cache'],
+            track_allocations=not options['no_allocations'],
+        )
+        results = benchmark.run(only=options['scenario'])
+
+        self.stdout.write(
+            f"{'scenario':<40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'alloc KB':>9}"
+        )
+        for result in results:
+            alloc = f'{result.alloc_peak_kb:.1f}' if result.alloc_peak_kb is not None else '-'
+            self.stdout.write(
+                f'{result.name:<40} {result.p50_ms:>9.2f} {result.p95_ms:>9.2f} {result.p99_ms:>9.2f} '
+                f'{result.queries_per_request:>8.1f} {alloc:>9}'
+            )
+            for error in result.errors:
+                self.stdout.write(self.style.WARNING(f'  {result.name}: {error}'))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(ReadApiBenchmarkService.to_dict(results), f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            regressions = ReadApiBenchmarkService.find_regressions(
+                results, baseline, max_regression=options['max_regression']
+            )
+            if regressions:
+                raise CommandError('Regressions against baseline:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+
+from superapp.apps.radio_crestin.services.benchmark_data_service import BenchmarkDataService
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic stations, history and listening sessions for the read API benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stations',
+            type=int,
+            default=50,
+            help='Number of stations (default: 50)'
+        )
+        parser.add_argument(
+            '--history-per-station',
+            type=int,
+            default=2000,
+            help='Now playing history rows per station (default: 2000)'
+        )
+        parser.add_argument(
+            '--active-sessions',
+            type=int,
+            default=1000,
+            help='Active listening sessions (default: 1000)'
+        )
+        parser.add_argument(
+            '--history-hours',
+            type=int,
+            default=24,
+            help='Hours the history rows are spread over, ending now (default: 24)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed (default: 42)'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Only delete previously generated benchmark data'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            BenchmarkDataService.clear()
+            self.stdout.write(self.style.SUCCESS('Benchmark data cleared'))
+            return
+
+        counts = BenchmarkDataService.generate(
+            stations=options['stations'],
+            history_per_station=options['history_per_station'],
+            active_sessions=options['active_sessions'],
+            history_hours=options['history_hours'],
+            seed=options['seed'],
+        )
+        for table, count in counts.items():
+            self.stdout.write(f'{table}: {count}')
+        self.stdout.write(self.style.SUCCESS('Benchmark data generated'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from superapp.apps.radio_crestin.services.history_partition_service import HistoryPartitionService
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming and drop expired daily partitions of stations_now_playing_history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days-ahead',
+            type=int,
+            default=7,
+            help='Number of future daily partitions to create (default: 7)'
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=None,
+            help='Drop partitions older than this many days '
+                 '(default: NOW_PLAYING_HISTORY_RETENTION_DAYS or 7)'
+        )
+        parser.add_argument(
+            '--skip-drop',
+            action='store_true',
+            help='Only create partitions, never drop any'
+        )
+
+    def handle(self, *args, **options):
+        if not HistoryPartitionService.is_partitioned():
+            raise CommandError('stations_now_playing_history is not a partitioned table')
+
+        created = HistoryPartitionService.create_partitions(days_ahead=options['days_ahead'])
+        for name in created:
+            self.stdout.write(f'Created {name}')
+
+        if not options['skip_drop']:
+            retention_days = options['retention_days']
+            if retention_days is None:
+                retention_days = HistoryPartitionService.get_retention_days()
+            dropped = HistoryPartitionService.drop_expired_partitions(retention_days=retention_days)
+            for name in dropped:
+                self.stdout.write(f'Dropped {name}')
+
+        self.stdout.write(self.style.SUCCESS('History partitions are up to date'))
@@ -0,0 +1,115 @@
+"""
+Convert stations_now_playing_history into a table range-partitioned by day.
+
+The partition key has to be part of the primary key, so the table's primary
+key becomes (id, timestamp); Django keeps treating `id` as the primary key,
+which stays unique through the shared sequence. Daily partitions are created
+for the retained history plus a week ahead, with a default partition catching
+anything outside those ranges. HistoryPartitionService maintains them
+afterwards.
+
+No-op on databases other than PostgreSQL.
+"""
+import os
+from datetime import datetime, time, timedelta, timezone as dt_tz
+
+from django.db import migrations
+
+TABLE = 'stations_now_playing_history'
+LEGACY_TABLE = f'{TABLE}_legacy'
+SEQUENCE = 'stations_now_playing_history_partitioned_id_seq'
+DAYS_AHEAD = 7
+
+
+def _add_constraints_and_indexes(cursor, table):
+    cursor.execute(f"""
+        ALTER TABLE "{table}" ADD CONSTRAINT snph_station_id_fk
+            FOREIGN KEY (station_id) REFERENCES stations (id) DEFERRABLE INITIALLY DEFERRED
+    """)
+    cursor.execute(f"""
+        ALTER TABLE "{table}" ADD CONSTRAINT snph_song_id_fk
+            FOREIGN KEY (song_id) REFERENCES songs (id) DEFERRABLE INITIALLY DEFERRED
+    """)
+    cursor.execute(f'CREATE INDEX idx_snph_station_ts ON "{table}" (station_id, "timestamp" DESC)')
+    cursor.execute(f'CREATE INDEX idx_snph_ts_station ON "{table}" ("timestamp", station_id)')
+    # LIKE copies no indexes: recreate the one Django adds for the song foreign key
+    cursor.execute(f'CREATE INDEX idx_snph_song_id ON "{table}" (song_id)')
+
+
+def partition_history(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    retention_days = int(os.getenv('NOW_PLAYING_HISTORY_RETENTION_DAYS', '7'))
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+        cursor.execute('ALTER INDEX idx_snph_station_ts RENAME TO idx_snph_station_ts_legacy')
+        cursor.execute('ALTER INDEX idx_snph_ts_station RENAME TO idx_snph_ts_station_legacy')
+        # Free the "<table>_pkey" name for the new table's primary key
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+            [LEGACY_TABLE],
+        )
+        pkey_name = cursor.fetchone()[0]
+        cursor.execute(f'ALTER TABLE "{LEGACY_TABLE}" RENAME CONSTRAINT "{pkey_name}" TO "{LEGACY_TABLE}_pkey"')
+
+        cursor.execute(f"""
+            CREATE TABLE "{TABLE}" (LIKE "{LEGACY_TABLE}" INCLUDING DEFAULTS)
+            PARTITION BY RANGE ("timestamp")
+        """)
+        cursor.execute(f'CREATE SEQUENCE "{SEQUENCE}" AS bigint')
+        cursor.execute(f'ALTER TABLE "{TABLE}" ALTER COLUMN id SET DEFAULT nextval(\'"{SEQUENCE}"\')')
+        cursor.execute(f'ALTER SEQUENCE "{SEQUENCE}" OWNED BY "{TABLE}".id')
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, "timestamp")')
+        _add_constraints_and_indexes(cursor, TABLE)
+
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+        cursor.execute(f'SELECT MIN("timestamp") FROM "{LEGACY_TABLE}"')
+        oldest = cursor.fetchone()[0]
+        today = datetime.now(dt_tz.utc).date()
+        first_day = today - timedelta(days=retention_days + 1)
+        if oldest is not None:
+            first_day = max(first_day, oldest.astimezone(dt_tz.utc).date())
+
+        day = first_day
+        while day <= today + timedelta(days=DAYS_AHEAD):
+            start = datetime.combine(day, time.min, tzinfo=dt_tz.utc)
+            cursor.execute(
+                f'CREATE TABLE "{TABLE}_p{day:%Y%m%d}" PARTITION OF "{TABLE}" '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [start, start + timedelta(days=1)],
+            )
+            day += timedelta(days=1)
+
+        cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY_TABLE}"')
+        cursor.execute(
+            f'SELECT setval(\'"{SEQUENCE}"\', COALESCE((SELECT MAX(id) FROM "{LEGACY_TABLE}"), 0) + 1, false)'
+        )
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+
+
+def unpartition_history(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{LEGACY_TABLE}" (LIKE "{TABLE}" INCLUDING DEFAULTS)')
+        cursor.execute(f'ALTER SEQUENCE "{SEQUENCE}" OWNED BY "{LEGACY_TABLE}".id')
+        cursor.execute(f'INSERT INTO "{LEGACY_TABLE}" SELECT * FROM "{TABLE}"')
+        cursor.execute(f'DROP TABLE "{TABLE}" CASCADE')
+        cursor.execute(f'ALTER TABLE "{LEGACY_TABLE}" RENAME TO "{TABLE}"')
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id)')
+        _add_constraints_and_indexes(cursor, TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('radio_crestin', '0042_stationstreams_enabled'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_history, unpartition_history),
+    ]
@@ -0,0 +1,82 @@
+"""
+Create listener_minutes, the per-station, per-minute listener time series
+rolled up from listening_sessions before they are purged.
+
+Where the TimescaleDB extension is available, the table becomes a hypertable
+on `bucket` (7 day chunks), which keeps range scans over recent minutes cheap
+as the series grows. A hypertable's unique indexes must include the time
+column, so the primary key becomes (id, bucket); Django keeps treating `id`
+as the primary key, which stays unique through its identity sequence.
+
+Without TimescaleDB (or on databases other than PostgreSQL) listener_minutes
+stays a plain table.
+"""
+import logging
+
+import django.db.models.deletion
+from django.db import DatabaseError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'listener_minutes'
+
+
+def create_hypertable(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+        if cursor.fetchone() is None:
+            logger.warning(f"TimescaleDB is not available, {TABLE} stays a plain table")
+            return
+
+    try:
+        # Savepoint: preloading / permissions can still make the extension unusable
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS timescaledb')
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+                [TABLE],
+            )
+            pkey_name = cursor.fetchone()[0]
+            cursor.execute(f'ALTER TABLE "{TABLE}" DROP CONSTRAINT "{pkey_name}"')
+            cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, bucket)')
+            cursor.execute(
+                "SELECT create_hypertable(%s, 'bucket', chunk_time_interval => INTERVAL '7 days')",
+                [TABLE],
+            )
+    except DatabaseError as e:
+        logger.warning(f"Could not set up TimescaleDB for {TABLE}, it stays a plain table: {e}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('radio_crestin', '0043_partition_stations_now_playing_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListenerMinutes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(verbose_name='Minute')),
+                ('listeners', models.IntegerField(default=0, verbose_name='Listeners')),
+                ('bytes_transferred', models.BigIntegerField(default=0, verbose_name='Bytes transferred')),
+                ('sessions_started', models.IntegerField(default=0, verbose_name='Sessions started')),
+                ('sessions_ended', models.IntegerField(default=0, verbose_name='Sessions ended')),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listener_minutes', to='radio_crestin.stations', verbose_name='Station')),
+            ],
+            options={
+                'verbose_name': 'Listener Minute',
+                'verbose_name_plural': 'Listener Minutes',
+                'db_table': 'listener_minutes',
+                'ordering': ('-bucket',),
+                'managed': True,
+                'constraints': [models.UniqueConstraint(fields=('station', 'bucket'), name='uq_listener_minutes_station_bucket')],
+            },
+        ),
+        migrations.RunPython(create_hypertable, migrations.RunPython.noop),
+    ]
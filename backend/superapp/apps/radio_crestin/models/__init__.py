@@ -11,6 +11,7 @@ from .stations_now_playing import StationsNowPlaying
 from .stations_now_playing_history import StationsNowPlayingHistory
 from .stations_uptime import StationsUptime
 from .listening_sessions import ListeningSessions
+from .listener_minutes import ListenerMinutes
 from .reviews import Reviews
 from .users import AppUsers
 from .share_links import ShareLink, ShareLinkVisit
@@ -30,6 +31,7 @@ __all__ = [
     'StationsNowPlayingHistory',
     'StationsUptime',
     'ListeningSessions',
+    'ListenerMinutes',
     'Reviews',
     'AppUsers',
     'ShareLink',
@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ListenerMinutes(models.Model):
+    """
+    Per-station, per-minute listener time series.
+
+    Rolled up from ListeningSessions right before delete_stale_listening_sessions
+    purges them: every expired session counts as one listener in each minute it
+    spanned, its bytes are spread evenly over those minutes, and it adds one
+    session start / end to its first / last minute. Rows are added to when
+    sessions overlapping an existing minute expire later on.
+
+    On TimescaleDB the table is a hypertable on `bucket` (see migration 0044).
+    """
+    bucket = models.DateTimeField(_("Minute"))
+    station = models.ForeignKey(
+        'Stations',
+        verbose_name=_("Station"),
+        on_delete=models.CASCADE,
+        related_name='listener_minutes'
+    )
+    listeners = models.IntegerField(_("Listeners"), default=0)
+    bytes_transferred = models.BigIntegerField(_("Bytes transferred"), default=0)
+    sessions_started = models.IntegerField(_("Sessions started"), default=0)
+    sessions_ended = models.IntegerField(_("Sessions ended"), default=0)
+
+    class Meta:
+        managed = True
+        verbose_name = _("Listener Minute")
+        verbose_name_plural = _("Listener Minutes")
+        db_table = 'listener_minutes'
+        ordering = ('-bucket',)
+        constraints = [
+            models.UniqueConstraint(fields=('station', 'bucket'), name='uq_listener_minutes_station_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.station} - {self.bucket}: {self.listeners} listeners"
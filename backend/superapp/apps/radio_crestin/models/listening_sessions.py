@@ -207,11 +207,12 @@ class ListeningSessions(models.Model):
         
         # Update end_time for sessions that don't have it set
         inactive_sessions.filter(end_time__isnull=True).update(
-            end_time=models.F('last_activity')
+            end_time=models.F('last_activity'),
+            updated_at=timezone.now()
         )
         
         # Mark as inactive
-        count = inactive_sessions.update(is_active=False)
+        count = inactive_sessions.update(is_active=False, updated_at=timezone.now())
         
         return count
     
@@ -42,6 +42,8 @@ class StationsNowPlayingHistory(models.Model):
     )
 
     class Meta:
+        # Range-partitioned by day on `timestamp` (migration 0043), maintained by
+        # HistoryPartitionService. The database primary key is (id, timestamp).
         managed = True
         verbose_name = _("Station Now Playing History")
         verbose_name_plural = _("Station Now Playing History")
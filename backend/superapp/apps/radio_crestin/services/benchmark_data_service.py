@@ -0,0 +1,210 @@
+import logging
+import random
+from datetime import timedelta
+from typing import Dict
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import (
+    Artists, ListeningSessions, Songs, Stations, StationsNowPlaying,
+    StationsNowPlayingHistory, StationsUptime,
+)
+from .live_listener_index import LiveListenerIndex
+from .stations_snapshot_service import StationsSnapshotService
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkDataService:
+    """
+    Synthetic data for the read API benchmarks.
+
+    Everything it creates is recognisable by prefix (station slugs, song and
+    artist names, anonymous session ids), so it can be cleared without
+    touching real data. Meant for local/staging databases only.
+    """
+
+    SLUG_PREFIX = 'bench-station-'
+    NAME_PREFIX = 'Bench '
+    SESSION_PREFIX = 'bench-anon-'
+    BATCH_SIZE = 5000
+
+    @classmethod
+    def generate(
+        cls,
+        stations: int = 50,
+        history_per_station: int = 2000,
+        active_sessions: int = 1000,
+        history_hours: int = 24,
+        songs: int = 1000,
+        seed: int = 42,
+    ) -> Dict[str, int]:
+        """
+        Replace any previous benchmark data with a fresh data set.
+
+        Args:
+            stations: Number of stations (N)
+            history_per_station: Now playing history rows per station (M)
+            active_sessions: Active listening sessions spread over the stations (K)
+            history_hours: Time span the history rows are spread over, ending now
+            songs: Size of the song catalogue the history draws from
+            seed: Random seed, so runs are reproducible
+
+        Returns:
+            Dict with the number of rows created per table
+        """
+        rng = random.Random(seed)
+        now = timezone.now()
+        cls.clear()
+
+        with transaction.atomic():
+            artist_objs = Artists.objects.bulk_create(
+                [Artists(name=f'{cls.NAME_PREFIX}Artist {i}') for i in range(max(songs // 5, 1))],
+                batch_size=cls.BATCH_SIZE,
+            )
+            song_objs = Songs.objects.bulk_create(
+                [
+                    Songs(name=f'{cls.NAME_PREFIX}Song {i}', artist=artist_objs[i % len(artist_objs)])
+                    for i in range(songs)
+                ],
+                batch_size=cls.BATCH_SIZE,
+            )
+
+            station_objs = Stations.objects.bulk_create(
+                [
+                    Stations(
+                        slug=f'{cls.SLUG_PREFIX}{i}',
+                        title=f'{cls.NAME_PREFIX}Station {i}',
+                        order=i,
+                        station_order=float(i),
+                        stream_url=f'https://stream.example.com/{cls.SLUG_PREFIX}{i}',
+                        website=f'https://example.com/{cls.SLUG_PREFIX}{i}',
+                    )
+                    for i in range(stations)
+                ],
+                batch_size=cls.BATCH_SIZE,
+            )
+
+            uptime_objs = StationsUptime.objects.bulk_create(
+                [
+                    StationsUptime(
+                        station=station,
+                        timestamp=now,
+                        is_up=rng.random() > 0.05,
+                        latency_ms=rng.randint(20, 800),
+                        raw_data={},
+                    )
+                    for station in station_objs
+                ],
+                batch_size=cls.BATCH_SIZE,
+            )
+            now_playing_objs = StationsNowPlaying.objects.bulk_create(
+                [
+                    StationsNowPlaying(
+                        station=station,
+                        timestamp=now,
+                        song=rng.choice(song_objs),
+                        listeners=rng.randint(0, 500),
+                        raw_data={},
+                        error=None,
+                    )
+                    for station in station_objs
+                ],
+                batch_size=cls.BATCH_SIZE,
+            )
+            for station, uptime, now_playing in zip(station_objs, uptime_objs, now_playing_objs):
+                station.latest_station_uptime = uptime
+                station.latest_station_now_playing = now_playing
+                station.updated_at = timezone.now()
+            Stations.objects.bulk_update(
+                station_objs,
+                ['latest_station_uptime', 'latest_station_now_playing', 'updated_at'],
+                batch_size=cls.BATCH_SIZE,
+            )
+
+            history_count = cls._generate_history(
+                rng, now, station_objs, song_objs, history_per_station, history_hours
+            )
+            session_activity = cls._generate_sessions(rng, now, station_objs, active_sessions)
+
+        # Bulk writes bypass the signals that keep these in sync
+        StationsSnapshotService.invalidate()
+        LiveListenerIndex.record_activity(session_activity)
+
+        counts = {
+            'artists': len(artist_objs),
+            'songs': len(song_objs),
+            'stations': len(station_objs),
+            'history': history_count,
+            'sessions': len(session_activity),
+        }
+        logger.info(f"Generated benchmark data: {counts}")
+        return counts
+
+    @classmethod
+    def _generate_history(cls, rng, now, station_objs, song_objs, per_station, hours) -> int:
+        if per_station <= 0:
+            return 0
+
+        step = timedelta(hours=hours) / per_station
+        batch = []
+        created = 0
+        for station in station_objs:
+            for j in range(per_station):
+                batch.append(StationsNowPlayingHistory(
+                    station=station,
+                    timestamp=now - step * (j + 1),
+                    song=rng.choice(song_objs),
+                    listeners=rng.randint(0, 500),
+                ))
+                if len(batch) >= cls.BATCH_SIZE:
+                    StationsNowPlayingHistory.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+        if batch:
+            StationsNowPlayingHistory.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    @classmethod
+    def _generate_sessions(cls, rng, now, station_objs, count):
+        sessions = []
+        for i in range(count):
+            last_activity = now - timedelta(seconds=rng.randint(0, 60))
+            start_time = last_activity - timedelta(minutes=rng.randint(1, 120))
+            sessions.append(ListeningSessions(
+                station=rng.choice(station_objs),
+                anonymous_session_id=f'{cls.SESSION_PREFIX}{i}',
+                start_time=start_time,
+                last_activity=last_activity,
+                duration_seconds=int((last_activity - start_time).total_seconds()),
+                is_active=True,
+            ))
+        ListeningSessions.objects.bulk_create(sessions, batch_size=cls.BATCH_SIZE)
+        return [
+            (session.station_id, None, session.anonymous_session_id, session.last_activity)
+            for session in sessions
+        ]
+
+    @classmethod
+    def clear(cls) -> None:
+        """Delete all benchmark data."""
+        with transaction.atomic():
+            station_ids = list(
+                Stations.objects.filter(slug__startswith=cls.SLUG_PREFIX).values_list('id', flat=True)
+            )
+            # Children first, as plain DELETEs rather than through the station cascade
+            StationsNowPlayingHistory.objects.filter(station_id__in=station_ids).delete()
+            ListeningSessions.objects.filter(station_id__in=station_ids).delete()
+            Stations.objects.filter(id__in=station_ids).update(
+                latest_station_uptime=None, latest_station_now_playing=None,
+            )
+            StationsUptime.objects.filter(station_id__in=station_ids).delete()
+            StationsNowPlaying.objects.filter(station_id__in=station_ids).delete()
+            Stations.objects.filter(id__in=station_ids).delete()
+            Songs.objects.filter(name__startswith=cls.NAME_PREFIX).delete()
+            Artists.objects.filter(name__startswith=cls.NAME_PREFIX).delete()
+
+        if station_ids:
+            StationsSnapshotService.invalidate()
@@ -0,0 +1,140 @@
+import logging
+import os
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_tz
+from typing import List
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryPartitionService:
+    """
+    Maintains the daily range partitions of stations_now_playing_history.
+
+    Partitions cover one UTC day each and are named
+    stations_now_playing_history_pYYYYMMDD. Rows outside every partition land
+    in stations_now_playing_history_default. Retention drops whole partitions
+    instead of deleting rows.
+    """
+
+    PARENT_TABLE = 'stations_now_playing_history'
+    DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+    PARTITION_NAME_RE = re.compile(rf'^{PARENT_TABLE}_p(\d{{8}})$')
+
+    @staticmethod
+    def get_retention_days() -> int:
+        return int(os.getenv('NOW_PLAYING_HISTORY_RETENTION_DAYS', '7'))
+
+    @classmethod
+    def is_partitioned(cls) -> bool:
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = %s AND pg_table_is_visible(c.oid)
+            """, [cls.PARENT_TABLE])
+            return cursor.fetchone() is not None
+
+    @classmethod
+    def partition_name(cls, day: date) -> str:
+        return f'{cls.PARENT_TABLE}_p{day:%Y%m%d}'
+
+    @classmethod
+    def list_partitions(cls) -> List[date]:
+        """Days covered by the existing daily partitions, oldest first."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)
+            """, [cls.PARENT_TABLE])
+            names = [row[0] for row in cursor.fetchall()]
+
+        days = []
+        for name in names:
+            match = cls.PARTITION_NAME_RE.match(name)
+            if match:
+                days.append(datetime.strptime(match.group(1), '%Y%m%d').date())
+        return sorted(days)
+
+    @classmethod
+    def create_partitions(cls, days_ahead: int = 7) -> List[str]:
+        """
+        Create the partitions for today and the next `days_ahead` days.
+
+        CREATE TABLE ... PARTITION OF fails when the default partition already
+        holds rows of the new range (e.g. after the task did not run for a
+        day), so each partition is created as a plain table, the default
+        partition's rows of its day are moved into it, and it is attached.
+        """
+        today = timezone.now().astimezone(dt_tz.utc).date()
+        existing = set(cls.list_partitions())
+        created = []
+
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if day in existing:
+                continue
+            name = cls.partition_name(day)
+            start = datetime.combine(day, time.min, tzinfo=dt_tz.utc)
+            end = start + timedelta(days=1)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'CREATE TABLE "{name}" (LIKE "{cls.PARENT_TABLE}" INCLUDING DEFAULTS)')
+                cursor.execute(f"""
+                    WITH moved AS (
+                        DELETE FROM "{cls.DEFAULT_PARTITION}"
+                        WHERE "timestamp" >= %s AND "timestamp" < %s
+                        RETURNING *
+                    )
+                    INSERT INTO "{name}" SELECT * FROM moved
+                """, [start, end])
+                moved = cursor.rowcount
+                # Creates the partition's indexes and foreign keys from the parent's
+                cursor.execute(
+                    f'ALTER TABLE "{cls.PARENT_TABLE}" ATTACH PARTITION "{name}" '
+                    f'FOR VALUES FROM (%s) TO (%s)',
+                    [start, end],
+                )
+            created.append(name)
+            if moved:
+                logger.info(f"Created history partition {name} with {moved} rows moved from the default partition")
+            else:
+                logger.info(f"Created history partition {name}")
+
+        return created
+
+    @classmethod
+    def drop_expired_partitions(cls, retention_days: int) -> List[str]:
+        """
+        Drop every daily partition that ends before the retention cutoff and
+        purge expired rows from the default partition.
+        """
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        dropped = []
+
+        for day in cls.list_partitions():
+            partition_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=dt_tz.utc)
+            if partition_end > cutoff:
+                break
+            name = cls.partition_name(day)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS "{name}"')
+            dropped.append(name)
+            logger.info(f"Dropped expired history partition {name}")
+
+        # The default partition only catches rows outside the daily ranges, so
+        # this stays a small delete.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{cls.DEFAULT_PARTITION}" WHERE "timestamp" < %s',
+                [cutoff],
+            )
+
+        return dropped
@@ -4,7 +4,9 @@ from django.utils import timezone
 from django.db.models import Count, Q
 from collections import defaultdict
 
-from ..models import ListeningSessions, Stations
+from ..models import ListenerMinutes, ListeningSessions, Stations
+from .listener_rollup_service import ListenerRollupService
+from .live_listener_index import LiveListenerIndex
 
 
 class ListenerAnalyticsService:
@@ -29,6 +31,11 @@ class ListenerAnalyticsService:
         Returns:
             Dict mapping station_id to listener count
         """
+        # Served from the live listener index; SQL is the fallback
+        counts = LiveListenerIndex.get_counts(station_ids=list(station_ids), minutes=minutes)
+        if counts is not None:
+            return counts
+
         activity_threshold = timezone.now() - timedelta(minutes=minutes)
         
         # Get all active sessions for the requested stations
@@ -70,6 +77,11 @@ class ListenerAnalyticsService:
         Returns:
             Dict mapping station_id to listener count
         """
+        # Served from the live listener index; SQL is the fallback
+        counts = LiveListenerIndex.get_counts(minutes=minutes)
+        if counts is not None:
+            return counts
+
         activity_threshold = timezone.now() - timedelta(minutes=minutes)
         
         # Use raw SQL for optimal performance with proper distinct counting
@@ -126,4 +138,86 @@ class ListenerAnalyticsService:
                 'total': radio_crestin_count + external_count
             }
             
-        return result
\ No newline at end of file
+        return result
+
+    @classmethod
+    def get_listener_timeseries(
+        cls,
+        station_ids: Optional[List[int]] = None,
+        hours: int = 24,
+        bucket_minutes: int = 5
+    ) -> Dict[int, List[Dict]]:
+        """
+        Get listener history per station, from the ListenerMinutes rollup plus
+        the sessions that have not been rolled up yet.
+
+        Args:
+            station_ids: Stations to include (default: all)
+            hours: How far back to go (default: 24)
+            bucket_minutes: Width of each point in minutes (default: 5)
+
+        Returns:
+            Dict mapping station_id to points ordered by time, each
+            {'bucket', 'peak_listeners', 'average_listeners', 'bytes_transferred',
+            'sessions_started', 'sessions_ended'}
+        """
+        now = timezone.now()
+        since = (now - timedelta(hours=hours)).replace(second=0, microsecond=0)
+
+        # (station_id, minute) -> [listeners, bytes, started, ended]
+        minutes = defaultdict(lambda: [0, 0, 0, 0])
+
+        rolled_up = ListenerMinutes.objects.filter(bucket__gte=since)
+        live = ListeningSessions.objects.filter(last_activity__gte=since)
+        if station_ids is not None:
+            rolled_up = rolled_up.filter(station_id__in=station_ids)
+            live = live.filter(station_id__in=station_ids)
+
+        for station_id, bucket, listeners, bytes_sent, started, ended in rolled_up.values_list(
+            'station_id', 'bucket', 'listeners', 'bytes_transferred', 'sessions_started', 'sessions_ended'
+        ):
+            row = minutes[(station_id, bucket)]
+            row[0] += listeners
+            row[1] += bytes_sent
+            row[2] += started
+            row[3] += ended
+
+        # Live sessions have not ended yet
+        for station_id, start_time, last_activity, bytes_transferred in live.values_list(
+            'station_id', 'start_time', 'last_activity', 'bytes_transferred'
+        ):
+            for bucket, bytes_sent, started, _ in ListenerRollupService.minute_buckets(
+                start_time, last_activity, bytes_transferred
+            ):
+                if bucket < since:
+                    continue
+                row = minutes[(station_id, bucket)]
+                row[0] += 1
+                row[1] += bytes_sent
+                row[2] += started
+
+        points = defaultdict(dict)
+        for (station_id, minute), (listeners, bytes_sent, started, ended) in minutes.items():
+            offset = int((minute - since).total_seconds() // 60) // bucket_minutes
+            bucket = since + timedelta(minutes=offset * bucket_minutes)
+            point = points[station_id].setdefault(bucket, {
+                'bucket': bucket,
+                'peak_listeners': 0,
+                'listener_minutes': 0,
+                'bytes_transferred': 0,
+                'sessions_started': 0,
+                'sessions_ended': 0,
+            })
+            point['peak_listeners'] = max(point['peak_listeners'], listeners)
+            point['listener_minutes'] += listeners
+            point['bytes_transferred'] += bytes_sent
+            point['sessions_started'] += started
+            point['sessions_ended'] += ended
+
+        result = {}
+        for station_id, station_points in points.items():
+            series = [station_points[bucket] for bucket in sorted(station_points)]
+            for point in series:
+                point['average_listeners'] = point.pop('listener_minutes') / bucket_minutes
+            result[station_id] = series
+        return result
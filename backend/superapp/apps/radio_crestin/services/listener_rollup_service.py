@@ -0,0 +1,159 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from django.db import connection, transaction
+
+from ..models import ListenerMinutes, ListeningSessions
+
+logger = logging.getLogger(__name__)
+
+
+class ListenerRollupService:
+    """
+    Folds expiring ListeningSessions into the ListenerMinutes time series.
+
+    Each session counts as one listener in every minute from its start_time to
+    its last_activity; its bytes are split evenly over those minutes (the
+    remainder goes to the last one) and it adds a session start to its first
+    minute and a session end to its last. Minutes already present are added to.
+    """
+
+    @staticmethod
+    def minute_buckets(start_time: datetime, last_activity: datetime, bytes_transferred: int) -> List[Tuple[datetime, int, int, int]]:
+        """The (bucket, bytes, started, ended) minutes a session spanned."""
+        first = start_time.replace(second=0, microsecond=0)
+        last = max(last_activity.replace(second=0, microsecond=0), first)
+        count = int((last - first).total_seconds() // 60) + 1
+        share, remainder = divmod(bytes_transferred or 0, count)
+
+        buckets = []
+        for i in range(count):
+            bucket = first + timedelta(minutes=i)
+            is_last = i == count - 1
+            buckets.append((
+                bucket,
+                share + (remainder if is_last else 0),
+                1 if i == 0 else 0,
+                1 if is_last else 0,
+            ))
+        return buckets
+
+    @classmethod
+    def roll_up_and_delete(cls, cutoff_time: datetime) -> Tuple[int, int]:
+        """
+        Delete the sessions idle since before cutoff_time, adding them to
+        ListenerMinutes in the same transaction.
+
+        Returns:
+            Tuple of (deleted sessions, station minutes written)
+        """
+        if connection.vendor == 'postgresql':
+            return cls._roll_up_and_delete_sql(cutoff_time)
+        return cls._roll_up_and_delete_orm(cutoff_time)
+
+    @staticmethod
+    def _roll_up_and_delete_sql(cutoff_time: datetime) -> Tuple[int, int]:
+        # One statement: the rows returned by the DELETE are exactly the ones
+        # rolled up, even with ingestion updating sessions concurrently
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("""
+                WITH expired AS (
+                    DELETE FROM listening_sessions
+                    WHERE last_activity < %s
+                    RETURNING
+                        station_id,
+                        date_trunc('minute', start_time) AS first_bucket,
+                        GREATEST(date_trunc('minute', last_activity), date_trunc('minute', start_time)) AS last_bucket,
+                        COALESCE(bytes_transferred, 0) AS bytes_transferred
+                ),
+                spans AS (
+                    SELECT
+                        expired.*,
+                        (EXTRACT(EPOCH FROM last_bucket - first_bucket) / 60)::bigint + 1 AS minutes
+                    FROM expired
+                ),
+                session_minutes AS (
+                    SELECT
+                        spans.station_id,
+                        minute.bucket,
+                        spans.bytes_transferred / spans.minutes
+                            + CASE WHEN minute.bucket = spans.last_bucket
+                                   THEN spans.bytes_transferred %% spans.minutes ELSE 0 END AS bytes_transferred,
+                        (minute.bucket = spans.first_bucket)::int AS started,
+                        (minute.bucket = spans.last_bucket)::int AS ended
+                    FROM spans
+                    CROSS JOIN LATERAL generate_series(
+                        spans.first_bucket, spans.last_bucket, INTERVAL '1 minute'
+                    ) AS minute(bucket)
+                ),
+                rolled AS (
+                    INSERT INTO listener_minutes (
+                        station_id, bucket, listeners, bytes_transferred, sessions_started, sessions_ended
+                    )
+                    SELECT station_id, bucket, COUNT(*), SUM(bytes_transferred), SUM(started), SUM(ended)
+                    FROM session_minutes
+                    GROUP BY station_id, bucket
+                    ON CONFLICT (station_id, bucket) DO UPDATE SET
+                        listeners = listener_minutes.listeners + EXCLUDED.listeners,
+                        bytes_transferred = listener_minutes.bytes_transferred + EXCLUDED.bytes_transferred,
+                        sessions_started = listener_minutes.sessions_started + EXCLUDED.sessions_started,
+                        sessions_ended = listener_minutes.sessions_ended + EXCLUDED.sessions_ended
+                    RETURNING 1
+                )
+                SELECT (SELECT COUNT(*) FROM expired), (SELECT COUNT(*) FROM rolled)
+            """, [cutoff_time])
+            deleted_count, minutes_count = cursor.fetchone()
+        return deleted_count, minutes_count
+
+    @classmethod
+    def _roll_up_and_delete_orm(cls, cutoff_time: datetime) -> Tuple[int, int]:
+        with transaction.atomic():
+            sessions = list(
+                ListeningSessions.objects
+                .select_for_update()
+                .filter(last_activity__lt=cutoff_time)
+                .values_list('id', 'station_id', 'start_time', 'last_activity', 'bytes_transferred')
+            )
+            if not sessions:
+                return 0, 0
+
+            totals: Dict[Tuple[int, datetime], List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+            for _, station_id, start_time, last_activity, bytes_transferred in sessions:
+                for bucket, bytes_sent, started, ended in cls.minute_buckets(start_time, last_activity, bytes_transferred):
+                    row = totals[(station_id, bucket)]
+                    row[0] += 1
+                    row[1] += bytes_sent
+                    row[2] += started
+                    row[3] += ended
+
+            existing = {
+                (row.station_id, row.bucket): row
+                for row in ListenerMinutes.objects.filter(
+                    station_id__in={station_id for station_id, _ in totals},
+                    bucket__in={bucket for _, bucket in totals},
+                )
+            }
+            to_create, to_update = [], []
+            for (station_id, bucket), (listeners, bytes_sent, started, ended) in totals.items():
+                row = existing.get((station_id, bucket))
+                if row is None:
+                    to_create.append(ListenerMinutes(
+                        station_id=station_id, bucket=bucket, listeners=listeners,
+                        bytes_transferred=bytes_sent, sessions_started=started, sessions_ended=ended,
+                    ))
+                    continue
+                row.listeners += listeners
+                row.bytes_transferred += bytes_sent
+                row.sessions_started += started
+                row.sessions_ended += ended
+                to_update.append(row)
+
+            ListenerMinutes.objects.bulk_create(to_create)
+            ListenerMinutes.objects.bulk_update(
+                to_update, ['listeners', 'bytes_transferred', 'sessions_started', 'sessions_ended']
+            )
+            deleted_count, _ = ListeningSessions.objects.filter(id__in=[s[0] for s in sessions]).delete()
+
+        return deleted_count, len(totals)
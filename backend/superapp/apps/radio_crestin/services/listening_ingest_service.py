@@ -0,0 +1,251 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import AppUsers, ListeningSessions, Stations
+from .live_listener_index import LiveListenerIndex
+
+logger = logging.getLogger(__name__)
+
+# Same window as ListeningSessions.get_or_create_session()
+SESSION_TIMEOUT = timedelta(minutes=5)
+
+SessionKey = Tuple[int, int, str]  # (user_id, station_id, anonymous_session_id)
+
+
+@dataclass
+class SessionDelta:
+    """Activity accumulated for one listening session within a batch."""
+    first_activity: datetime
+    last_activity: datetime
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    referer: Optional[str] = None
+    total_requests: int = 0
+    bytes_transferred: int = 0
+    playlist_requests: int = 0
+    segment_requests: int = 0
+
+    def add(self, first_activity: datetime, last_activity: datetime, bytes_sent: int,
+            playlist_requests: int, segment_requests: int):
+        self.first_activity = min(self.first_activity, first_activity)
+        self.last_activity = max(self.last_activity, last_activity)
+        self.total_requests += playlist_requests + segment_requests
+        self.bytes_transferred += bytes_sent
+        self.playlist_requests += playlist_requests
+        self.segment_requests += segment_requests
+
+
+class ListeningIngestService:
+    """
+    Set-based ingestion of listening events reported by the streaming pods.
+
+    A batch costs a fixed number of queries regardless of its size: one for
+    stations, two for users (bulk insert + select), one for the active
+    sessions, one bulk insert for new sessions and one UPDATE ... FROM (VALUES)
+    for the existing ones. The live listener index is updated afterwards.
+    """
+
+    @classmethod
+    def ingest_events(cls, events) -> int:
+        """
+        Apply a batch of ListeningEventInput objects.
+
+        Returns:
+            Number of events that were applied to a session
+        """
+        parsed = cls._parse_events(events)
+        if not parsed:
+            return 0
+
+        station_ids = dict(
+            Stations.objects.filter(
+                slug__in={event.station_slug for event, _, _ in parsed}
+            ).values_list('slug', 'id')
+        )
+        for slug in {event.station_slug for event, _, _ in parsed} - station_ids.keys():
+            logger.warning(f"Station not found: {slug}")
+
+        parsed = [item for item in parsed if item[0].station_slug in station_ids]
+        if not parsed:
+            return 0
+
+        with transaction.atomic():
+            user_ids = cls._resolve_users({event.anonymous_session_id for event, _, _ in parsed})
+
+            deltas: Dict[SessionKey, SessionDelta] = {}
+            for event, first_activity, timestamp in parsed:
+                key = (
+                    user_ids[event.anonymous_session_id],
+                    station_ids[event.station_slug],
+                    event.anonymous_session_id,
+                )
+                delta = deltas.get(key)
+                if delta is None:
+                    delta = deltas[key] = SessionDelta(
+                        first_activity=first_activity,
+                        last_activity=timestamp,
+                        ip_address=event.ip_address,
+                        user_agent=event.user_agent,
+                        referer=event.referer,
+                    )
+                delta.add(
+                    first_activity=first_activity,
+                    last_activity=timestamp,
+                    bytes_sent=event.bytes_transferred,
+                    **cls._request_counts(event),
+                )
+
+            active_sessions = cls._find_active_sessions(deltas.keys())
+
+            cls._create_sessions({
+                key: delta for key, delta in deltas.items() if key not in active_sessions
+            })
+            cls._update_sessions({
+                active_sessions[key]: delta for key, delta in deltas.items() if key in active_sessions
+            })
+
+        # Postgres is the durable record; the index serves the listener counts
+        LiveListenerIndex.record_activity(
+            (station_id, user_id, anonymous_session_id, delta.last_activity)
+            for (user_id, station_id, anonymous_session_id), delta in deltas.items()
+        )
+
+        return sum(delta.total_requests for delta in deltas.values())
+
+    @staticmethod
+    def _parse_timestamp(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+    @classmethod
+    def _parse_events(cls, events) -> List[tuple]:
+        """Return (event, first_activity, last_activity) for each parseable event."""
+        parsed = []
+        for event in events:
+            try:
+                timestamp = cls._parse_timestamp(event.timestamp)
+                first_timestamp = event.first_timestamp
+                first_activity = cls._parse_timestamp(first_timestamp) if first_timestamp else timestamp
+            except (AttributeError, ValueError) as error:
+                logger.error(f"Error parsing listening event timestamp {event.timestamp!r}: {error}")
+                continue
+            parsed.append((event, min(first_activity, timestamp), timestamp))
+        return parsed
+
+    @staticmethod
+    def _request_counts(event) -> Dict[str, int]:
+        """Playlist/segment requests an event stands for.
+
+        Pre-aggregated events carry explicit counts; a plain event is one
+        request of its event_type.
+        """
+        playlist_requests = event.playlist_request_count
+        segment_requests = event.segment_request_count
+        if playlist_requests is None and segment_requests is None:
+            is_playlist = event.event_type == 'playlist_request'
+            return {'playlist_requests': int(is_playlist), 'segment_requests': int(not is_playlist)}
+        return {
+            'playlist_requests': max(playlist_requests or 0, 0),
+            'segment_requests': max(segment_requests or 0, 0),
+        }
+
+    @staticmethod
+    def _resolve_users(anonymous_ids) -> Dict[str, int]:
+        """Create missing AppUsers and return {anonymous_id: user_id}."""
+        AppUsers.objects.bulk_create(
+            [AppUsers(anonymous_id=anonymous_id) for anonymous_id in anonymous_ids],
+            ignore_conflicts=True,
+        )
+        return dict(
+            AppUsers.objects.filter(
+                anonymous_id__in=anonymous_ids
+            ).values_list('anonymous_id', 'id')
+        )
+
+    @staticmethod
+    def _find_active_sessions(keys) -> Dict[SessionKey, int]:
+        """Return {key: session_id} for the latest active session of each key."""
+        keys = set(keys)
+        sessions = ListeningSessions.objects.filter(
+            station_id__in={station_id for _, station_id, _ in keys},
+            anonymous_session_id__in={session_id for _, _, session_id in keys},
+            is_active=True,
+            last_activity__gte=timezone.now() - SESSION_TIMEOUT,
+        ).order_by('-last_activity').values_list(
+            'id', 'user_id', 'station_id', 'anonymous_session_id'
+        )
+
+        active = {}
+        for session_id, user_id, station_id, anonymous_session_id in sessions:
+            key = (user_id, station_id, anonymous_session_id)
+            if key in keys and key not in active:
+                active[key] = session_id
+        return active
+
+    @staticmethod
+    def _create_sessions(deltas: Dict[SessionKey, SessionDelta]):
+        if not deltas:
+            return
+
+        ListeningSessions.objects.bulk_create([
+            ListeningSessions(
+                user_id=user_id,
+                station_id=station_id,
+                anonymous_session_id=anonymous_session_id,
+                start_time=delta.first_activity,
+                last_activity=delta.last_activity,
+                duration_seconds=int((delta.last_activity - delta.first_activity).total_seconds()),
+                total_requests=delta.total_requests,
+                bytes_transferred=delta.bytes_transferred,
+                playlist_requests=delta.playlist_requests,
+                segment_requests=delta.segment_requests,
+                ip_address=delta.ip_address,
+                user_agent=delta.user_agent,
+                referer=delta.referer,
+                is_active=True,
+            )
+            for (user_id, station_id, anonymous_session_id), delta in deltas.items()
+        ])
+
+    @staticmethod
+    def _update_sessions(deltas: Dict[int, SessionDelta]):
+        if not deltas:
+            return
+
+        values_sql = ', '.join(
+            ['(%s::bigint, %s::timestamptz, %s::integer, %s::bigint, %s::integer, %s::integer)'] * len(deltas)
+        )
+        params = []
+        for session_id, delta in deltas.items():
+            params.extend([
+                session_id,
+                delta.last_activity,
+                delta.total_requests,
+                delta.bytes_transferred,
+                delta.playlist_requests,
+                delta.segment_requests,
+            ])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                UPDATE listening_sessions AS ls SET
+                    last_activity = GREATEST(ls.last_activity, v.last_activity),
+                    total_requests = ls.total_requests + v.total_requests,
+                    bytes_transferred = ls.bytes_transferred + v.bytes_transferred,
+                    playlist_requests = ls.playlist_requests + v.playlist_requests,
+                    segment_requests = ls.segment_requests + v.segment_requests,
+                    duration_seconds = EXTRACT(
+                        EPOCH FROM GREATEST(ls.last_activity, v.last_activity) - ls.start_time
+                    )::integer,
+                    is_active = true,
+                    updated_at = now()
+                FROM (VALUES {values_sql}) AS v(
+                    id, last_activity, total_requests, bytes_transferred,
+                    playlist_requests, segment_requests
+                )
+                WHERE ls.id = v.id
+            """, params)
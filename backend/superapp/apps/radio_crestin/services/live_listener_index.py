@@ -0,0 +1,148 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import ListeningSessions
+from ..utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class LiveListenerIndex:
+    """
+    Redis index of live listeners, fed by listening event ingestion.
+
+    Each station has a sorted set whose members are listeners
+    ("<user_id>-<anonymous_session_id>", the same identity the SQL counts use)
+    scored by their last activity as a unix timestamp. Counting the listeners
+    active in the last N minutes is a ZCOUNT, so the hot read path never scans
+    listening_sessions. Postgres stays the durable record: the index is rebuilt
+    from it whenever the ready marker is missing (cold start, Redis flush).
+    """
+
+    KEY_PREFIX = 'radio_crestin:live_listeners'
+    STATIONS_KEY = f'{KEY_PREFIX}:stations'
+    READY_KEY = f'{KEY_PREFIX}:ready'
+
+    # Members older than this are pruned; longest window the index can answer
+    RETENTION = timedelta(minutes=10)
+    # Lifetime of the ready marker while a rebuild runs, in case the rebuilding process dies
+    REBUILD_TIMEOUT = 60
+
+    @classmethod
+    def _station_key(cls, station_id: int) -> str:
+        return f'{cls.KEY_PREFIX}:{station_id}'
+
+    @staticmethod
+    def _member(user_id: Optional[int], anonymous_session_id: str) -> str:
+        return f"{user_id or ''}-{anonymous_session_id}"
+
+    @classmethod
+    def record_activity(cls, activity: Iterable[Tuple[int, Optional[int], str, datetime]]) -> bool:
+        """
+        Record listener activity.
+
+        Args:
+            activity: (station_id, user_id, anonymous_session_id, last_activity) tuples
+
+        Returns:
+            True if the index was updated
+        """
+        client = get_redis_client()
+        if client is None:
+            return False
+
+        try:
+            cls._ensure_ready(client)
+            cls._write(client, activity)
+            return True
+        except redis.RedisError as e:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error updating live listener index: {e}")
+            return False
+
+    @classmethod
+    def get_counts(cls, station_ids: Optional[List[int]] = None, minutes: int = 1) -> Optional[Dict[int, int]]:
+        """
+        Count listeners active in the last `minutes` per station.
+
+        Args:
+            station_ids: Stations to count, or None for every indexed station
+
+        Returns:
+            Dict mapping station_id to listener count, or None when the index
+            is unavailable and callers should fall back to SQL
+        """
+        if timedelta(minutes=minutes) > cls.RETENTION:
+            return None
+
+        client = get_redis_client()
+        if client is None:
+            return None
+
+        try:
+            cls._ensure_ready(client)
+            if station_ids is None:
+                station_ids = [int(station_id) for station_id in client.smembers(cls.STATIONS_KEY)]
+
+            min_score = time.time() - minutes * 60
+            pipe = client.pipeline(transaction=False)
+            for station_id in station_ids:
+                pipe.zcount(cls._station_key(station_id), min_score, '+inf')
+            return dict(zip(station_ids, pipe.execute()))
+        except redis.RedisError as e:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error reading live listener index: {e}")
+            return None
+
+    @classmethod
+    def _write(cls, client: redis.Redis, activity):
+        by_station: Dict[int, Dict[str, float]] = {}
+        for station_id, user_id, anonymous_session_id, last_activity in activity:
+            members = by_station.setdefault(station_id, {})
+            member = cls._member(user_id, anonymous_session_id)
+            members[member] = max(members.get(member, 0), last_activity.timestamp())
+
+        if not by_station:
+            return
+
+        prune_before = time.time() - cls.RETENTION.total_seconds()
+        ttl = int(cls.RETENTION.total_seconds())
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd(cls.STATIONS_KEY, *by_station.keys())
+        for station_id, members in by_station.items():
+            key = cls._station_key(station_id)
+            # GT: late/out-of-order batches never move a listener back in time
+            pipe.zadd(key, members, gt=True)
+            pipe.zremrangebyscore(key, '-inf', prune_before)
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    @classmethod
+    def _ensure_ready(cls, client: redis.Redis):
+        """Rebuild the index from listening_sessions if it was never built or was lost."""
+        if client.exists(cls.READY_KEY):
+            return
+        # NX so only one process rebuilds; the others serve a briefly partial index
+        if not client.set(cls.READY_KEY, '1', nx=True, ex=cls.REBUILD_TIMEOUT):
+            return
+
+        try:
+            sessions = ListeningSessions.objects.filter(
+                is_active=True,
+                last_activity__gte=timezone.now() - cls.RETENTION,
+            ).values_list('station_id', 'user_id', 'anonymous_session_id', 'last_activity')
+            cls._write(client, sessions.iterator())
+        except Exception:
+            # Let the next call rebuild instead of serving a partial index for good
+            client.delete(cls.READY_KEY)
+            raise
+        client.persist(cls.READY_KEY)
+        logger.info("Rebuilt live listener index from listening sessions")
@@ -0,0 +1,364 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from django.db import connection
+from django.utils import timezone
+
+from ..models import Artists, Songs, Stations, StationsNowPlaying, StationsNowPlayingHistory
+from .now_playing_events_service import NowPlayingEventsService
+
+logger = logging.getLogger(__name__)
+
+SongKey = Tuple[Optional[str], str]  # (artist name, song name)
+
+
+@dataclass
+class NowPlayingReport:
+    """One now playing observation for a station, from a scraper or a streaming pod."""
+    timestamp: datetime
+    station_id: Optional[int] = None
+    # Looked up among enabled stations when station_id is not given
+    station_slug: Optional[str] = None
+    # None when nothing identifiable is playing
+    song_name: Optional[str] = None
+    artist_name: Optional[str] = None
+    song_thumbnail_url: Optional[str] = None
+    dirty_metadata: bool = True
+    listeners: Optional[int] = None
+    raw_data: Any = field(default_factory=dict)
+    error: Any = None
+    # Pods keep the current thumbnail on the now playing row (falling back to
+    # the song's stored one); scrapers leave that column alone
+    store_thumbnail_url: bool = False
+    id3_timestamp: Optional[datetime] = None
+    scraper_timestamp: Optional[datetime] = None
+    timestamp_source: str = ''
+
+
+@dataclass
+class NowPlayingWriteResult:
+    station_id: int
+    song_id: Optional[int]
+    thumbnail_url: Optional[str]
+    # False when the report matched the stored state and nothing was written
+    written: bool
+    # True when a history row was written (song or listeners changed)
+    metadata_changed: bool
+
+
+@dataclass
+class _SongIdentity:
+    song_id: int
+    thumbnail_url: Optional[str]
+    dirty_metadata: bool
+
+
+@dataclass
+class _StationState:
+    station_id: int
+    station_slug: str
+    latest_now_playing_id: Optional[int]
+    now_playing_id: Optional[int]
+    song_id: Optional[int]
+    listeners: Optional[int]
+    thumbnail_url: Optional[str]
+    error: Any
+    song_key: Optional[SongKey]
+    song: Optional[_SongIdentity]
+
+
+class MetadataWriteService:
+    """
+    Single write path for now playing metadata, shared by the scrapers
+    (StationService.upsert_station_now_playing) and the streaming pods
+    (PodMetadataService.report_metadata).
+
+    Every report costs one SELECT of the station's current state. When the
+    report matches it (same song, listeners, thumbnails and errors) nothing is
+    written: the stored timestamp keeps marking when the song started and
+    raw_data is only refreshed along with a real change.
+
+    Otherwise the now playing row is upserted, a history row written when
+    the song or listeners changed, and the station's latest_station_now_playing
+    reference pointed at it. An in-process LRU maps (artist, song) to the
+    song's id, so songs seen before skip the artist/song upserts too.
+    """
+
+    SONG_CACHE_SIZE = 10000
+
+    _song_cache: 'OrderedDict[SongKey, _SongIdentity]' = OrderedDict()
+    _song_cache_lock = threading.Lock()
+
+    @classmethod
+    def write(cls, report: NowPlayingReport) -> NowPlayingWriteResult:
+        """
+        Persist a now playing report. Call inside a transaction.
+
+        Raises:
+            Stations.DoesNotExist: if the station is unknown (or disabled, when
+                looked up by slug)
+        """
+        state = cls._read_state(report)
+        song_key = cls._song_key(report)
+        if state.song is not None:
+            cls._remember_song(state.song_key, state.song)
+
+        if cls._is_unchanged(report, state, song_key):
+            return NowPlayingWriteResult(
+                station_id=state.station_id,
+                song_id=state.song_id,
+                thumbnail_url=state.thumbnail_url if report.store_thumbnail_url else report.song_thumbnail_url,
+                written=False,
+                metadata_changed=False,
+            )
+
+        cached_song = cls._cached_song(song_key, report)
+        row = cls._write(report, state, song_key, cached_song)
+        if row is None:
+            # The cached song was deleted meanwhile; nothing was written
+            cls._forget_song(song_key)
+            row = cls._write(report, state, song_key, None)
+
+        now_playing_id, song_id, song_thumbnail_url, artist_id, artist_thumbnail_url, metadata_changed = row
+        if song_id is not None:
+            cls._remember_song(song_key, _SongIdentity(song_id, song_thumbnail_url, report.dirty_metadata))
+
+        song = None
+        if song_id is not None:
+            song = Songs(id=song_id, name=report.song_name, thumbnail_url=song_thumbnail_url)
+            if artist_id is not None:
+                song.artist = Artists(id=artist_id, name=report.artist_name, thumbnail_url=artist_thumbnail_url)
+
+        if metadata_changed:
+            now_playing = StationsNowPlaying(
+                id=now_playing_id,
+                station_id=state.station_id,
+                timestamp=report.timestamp,
+                listeners=report.listeners,
+            )
+            NowPlayingEventsService.publish_change(state.station_id, state.station_slug, now_playing, song)
+
+        return NowPlayingWriteResult(
+            station_id=state.station_id,
+            song_id=song_id,
+            thumbnail_url=report.song_thumbnail_url or song_thumbnail_url,
+            written=True,
+            metadata_changed=bool(metadata_changed),
+        )
+
+    @staticmethod
+    def _song_key(report: NowPlayingReport) -> Optional[SongKey]:
+        if report.song_name is None:
+            return None
+        return (report.artist_name or None, report.song_name)
+
+    @classmethod
+    def _read_state(cls, report: NowPlayingReport) -> _StationState:
+        if report.station_id is not None:
+            stations = Stations.objects.filter(id=report.station_id)
+        else:
+            stations = Stations.objects.filter(slug=report.station_slug, disabled=False)
+
+        row = stations.values_list(
+            'id', 'slug', 'latest_station_now_playing_id',
+            'now_playing__id', 'now_playing__song_id', 'now_playing__listeners',
+            'now_playing__thumbnail_url', 'now_playing__error',
+            'now_playing__song__name', 'now_playing__song__thumbnail_url',
+            'now_playing__song__dirty_metadata', 'now_playing__song__artist__name',
+        ).order_by().first()
+
+        if row is None:
+            raise Stations.DoesNotExist(
+                f"Station {report.station_id or report.station_slug} does not exist"
+            )
+
+        (station_id, station_slug, latest_now_playing_id, now_playing_id, song_id, listeners,
+         thumbnail_url, error, song_name, song_thumbnail_url, song_dirty, artist_name) = row
+
+        song_key = None
+        song = None
+        if song_id is not None:
+            song_key = (artist_name, song_name)
+            song = _SongIdentity(song_id, song_thumbnail_url, song_dirty)
+
+        return _StationState(
+            station_id=station_id,
+            station_slug=station_slug,
+            latest_now_playing_id=latest_now_playing_id,
+            now_playing_id=now_playing_id,
+            song_id=song_id,
+            listeners=listeners,
+            thumbnail_url=thumbnail_url,
+            error=error,
+            song_key=song_key,
+            song=song,
+        )
+
+    @staticmethod
+    def _song_up_to_date(report: NowPlayingReport, song: _SongIdentity) -> bool:
+        """Whether upserting the reported song would leave the stored row as it is."""
+        return (
+            (not report.song_thumbnail_url or report.song_thumbnail_url == song.thumbnail_url)
+            and report.dirty_metadata == song.dirty_metadata
+        )
+
+    @classmethod
+    def _is_unchanged(cls, report: NowPlayingReport, state: _StationState, song_key: Optional[SongKey]) -> bool:
+        if state.now_playing_id is None or state.latest_now_playing_id != state.now_playing_id:
+            return False
+        if song_key != state.song_key:
+            return False
+        if state.song is not None and not cls._song_up_to_date(report, state.song):
+            return False
+        if report.listeners != state.listeners or report.error != state.error:
+            return False
+        if report.store_thumbnail_url:
+            resolved = report.song_thumbnail_url or (state.song.thumbnail_url if state.song else None)
+            if resolved != state.thumbnail_url:
+                return False
+        return True
+
+    @classmethod
+    def _cached_song(cls, song_key: Optional[SongKey], report: NowPlayingReport) -> Optional[_SongIdentity]:
+        if song_key is None:
+            return None
+        with cls._song_cache_lock:
+            song = cls._song_cache.get(song_key)
+            if song is not None:
+                cls._song_cache.move_to_end(song_key)
+        if song is not None and cls._song_up_to_date(report, song):
+            return song
+        return None
+
+    @classmethod
+    def _remember_song(cls, song_key: SongKey, song: _SongIdentity):
+        with cls._song_cache_lock:
+            cls._song_cache[song_key] = song
+            cls._song_cache.move_to_end(song_key)
+            while len(cls._song_cache) > cls.SONG_CACHE_SIZE:
+                cls._song_cache.popitem(last=False)
+
+    @classmethod
+    def _forget_song(cls, song_key: SongKey):
+        with cls._song_cache_lock:
+            cls._song_cache.pop(song_key, None)
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._song_cache_lock:
+            cls._song_cache.clear()
+
+    @classmethod
+    def _write(
+        cls,
+        report: NowPlayingReport,
+        state: _StationState,
+        song_key: Optional[SongKey],
+        cached_song: Optional[_SongIdentity],
+    ):
+        """
+        Write the song (unless cached), the now playing and history rows and
+        the station's latest_station_now_playing reference.
+
+        Returns (now_playing_id, song_id, song_thumbnail_url, artist_id,
+        artist_thumbnail_url, history_written), or None if a cached song id no
+        longer exists, in which case nothing was written.
+        """
+        if song_key is None:
+            song = (None, None, None, None)
+        elif cached_song is not None:
+            song = Songs.objects.filter(id=cached_song.song_id).values_list(
+                'id', 'thumbnail_url', 'artist_id', 'artist__thumbnail_url',
+            ).order_by().first()
+            if song is None:
+                return None
+        else:
+            song = cls._upsert_song(report, song_key)
+        song_id, song_thumbnail_url, artist_id, artist_thumbnail_url = song
+
+        now_playing = StationsNowPlaying(
+            station_id=state.station_id,
+            timestamp=report.timestamp,
+            song_id=song_id,
+            listeners=report.listeners,
+            raw_data=report.raw_data if report.raw_data is not None else {},
+            error=report.error,
+        )
+        update_fields = ['updated_at', 'timestamp', 'song', 'listeners', 'raw_data', 'error']
+        if report.store_thumbnail_url:
+            now_playing.thumbnail_url = report.song_thumbnail_url or song_thumbnail_url
+            update_fields.append('thumbnail_url')
+        # The row's id is returned whether it was inserted or updated
+        StationsNowPlaying.objects.bulk_create(
+            [now_playing], update_conflicts=True, unique_fields=['station'], update_fields=update_fields,
+        )
+
+        history_written = (
+            state.now_playing_id is None
+            or state.listeners != report.listeners
+            or state.song_id != song_id
+        )
+        if history_written:
+            StationsNowPlayingHistory.objects.create(
+                timestamp=report.timestamp,
+                station_id=state.station_id,
+                song_id=song_id,
+                listeners=report.listeners,
+                id3_timestamp=report.id3_timestamp,
+                scraper_timestamp=report.scraper_timestamp,
+                timestamp_source=report.timestamp_source or '',
+            )
+
+        if state.latest_now_playing_id != now_playing.id:
+            Stations.objects.filter(id=state.station_id).update(
+                latest_station_now_playing_id=now_playing.id, updated_at=timezone.now(),
+            )
+
+        return now_playing.id, song_id, song_thumbnail_url, artist_id, artist_thumbnail_url, history_written
+
+    @staticmethod
+    def _upsert_song(report: NowPlayingReport, song_key: SongKey):
+        """
+        Create or update the reported song (and create its artist).
+
+        Returns (song_id, thumbnail_url, artist_id, artist_thumbnail_url).
+        """
+        artist = None
+        if song_key[0] is not None:
+            artist, _ = Artists.objects.get_or_create(
+                name=song_key[0], defaults={'dirty_metadata': report.dirty_metadata},
+            )
+
+        # Raw SQL: songs are unique through two partial indexes (with and
+        # without an artist), which bulk_create(update_conflicts=True) can't
+        # name as the conflict target. Scrapers and pods report the same song
+        # concurrently, so one atomic upsert replaces update_or_create's
+        # SELECT ... FOR UPDATE / INSERT and its IntegrityError retry.
+        if artist is not None:
+            conflict_target = '(name, artist_id) WHERE artist_id IS NOT NULL'
+        else:
+            conflict_target = '(name) WHERE artist_id IS NULL'
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO songs (created_at, updated_at, name, artist_id, thumbnail_url, dirty_metadata)
+                VALUES (now(), now(), %s, %s, %s, %s)
+                ON CONFLICT {conflict_target} DO UPDATE SET
+                    updated_at = now(),
+                    thumbnail_url = COALESCE(EXCLUDED.thumbnail_url, songs.thumbnail_url),
+                    dirty_metadata = EXCLUDED.dirty_metadata
+                RETURNING id, thumbnail_url
+            """, [
+                report.song_name,
+                artist.id if artist is not None else None,
+                report.song_thumbnail_url or None,
+                report.dirty_metadata,
+            ])
+            song_id, thumbnail_url = cursor.fetchone()
+
+        if artist is None:
+            return song_id, thumbnail_url, None, None
+        return song_id, thumbnail_url, artist.id, artist.thumbnail_url
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..utils.cdn_proxy import proxy_image_url
+from ..utils.redis_client import create_async_redis_client, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class NowPlayingEventsService:
+    """
+    Publishes now playing changes to a Redis pub/sub channel.
+
+    Every web replica relays the channel to its SSE subscribers through
+    NowPlayingBroadcaster, so a song change reaches clients as soon as it is
+    committed instead of on their next poll.
+    """
+
+    CHANNEL = 'radio_crestin:now_playing'
+
+    @classmethod
+    def publish_change(cls, station_id: int, station_slug: str, now_playing, song=None) -> None:
+        """Publish a compact delta for a station once the current transaction commits."""
+        payload = cls.build_delta(station_id, station_slug, now_playing, song)
+        transaction.on_commit(lambda: cls._publish(payload))
+
+    @staticmethod
+    def build_delta(station_id: int, station_slug: str, now_playing, song=None) -> dict:
+        """Same shape as a `stations_metadata` now_playing entry, keyed by station."""
+        song_data = None
+        if song:
+            artist = song.artist
+            song_data = {
+                'id': song.id,
+                'name': song.name,
+                'thumbnail_url': proxy_image_url(song.thumbnail_url, width=250, format="webp"),
+                'artist': {
+                    'id': artist.id,
+                    'name': artist.name,
+                    'thumbnail_url': proxy_image_url(artist.thumbnail_url, width=250, format="webp"),
+                } if artist else None,
+            }
+
+        timestamp = now_playing.timestamp or timezone.now()
+        return {
+            'station_id': station_id,
+            'station_slug': station_slug,
+            'now_playing': {
+                'timestamp': timestamp.isoformat(),
+                'listeners': now_playing.listeners,
+                'song': song_data,
+            },
+        }
+
+    @classmethod
+    def _publish(cls, payload: dict) -> None:
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.publish(cls.CHANNEL, json.dumps(payload, separators=(',', ':')))
+        except redis.RedisError as e:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error publishing now playing change for {payload['station_slug']}: {e}")
+
+
+class NowPlayingBroadcaster:
+    """
+    Per-process fan-out of the now playing channel.
+
+    A single Redis subscription per worker feeds a bounded asyncio queue per
+    SSE client; the subscription is dropped when the last client leaves.
+    """
+
+    QUEUE_SIZE = 100
+    RECONNECT_DELAY = 1
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _dispatch(self, slug: str, data: str) -> None:
+        for queue in list(self._subscribers):
+            if queue.full():
+                # Slow client: drop its oldest delta rather than block everyone
+                queue.get_nowait()
+            queue.put_nowait((slug, data))
+
+    async def _run(self):
+        while self._subscribers:
+            client = create_async_redis_client()
+            if client is None:
+                return
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(NowPlayingEventsService.CHANNEL)
+                while self._subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=5)
+                    if message is None:
+                        continue
+                    data = message['data'].decode()
+                    try:
+                        slug = json.loads(data)['station_slug']
+                    except (ValueError, KeyError):
+                        logger.warning(f"Ignoring malformed now playing message: {data[:200]}")
+                        continue
+                    self._dispatch(slug, data)
+            except redis.RedisError as e:
+                logger.error(f"Now playing subscription lost: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+broadcaster = NowPlayingBroadcaster()
@@ -0,0 +1,243 @@
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..constants import STATIONS_GRAPHQL_QUERY
+from ..graphql.constants_metadata import (
+    STATIONS_METADATA_GRAPHQL_QUERY,
+    STATIONS_METADATA_HISTORY_GRAPHQL_QUERY,
+)
+from ..models import Stations
+from .benchmark_data_service import BenchmarkDataService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkScenario:
+    """One request shape; params are built per run so timestamps stay current."""
+    name: str
+    path: str
+    params: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    queries_per_request: float
+    alloc_peak_kb: Optional[float]
+    errors: List[str] = field(default_factory=list)
+
+
+def _graphql_params(query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    params = {'query': query}
+    if variables:
+        params['variables'] = json.dumps(variables, sort_keys=True, separators=(',', ':'))
+    return params
+
+
+SCENARIOS = [
+    BenchmarkScenario(
+        'rest_stations', '/api/v1/stations',
+        lambda ctx: {'timestamp': ctx['timestamp']},
+    ),
+    BenchmarkScenario(
+        'rest_stations_metadata', '/api/v1/stations-metadata',
+        lambda ctx: {'timestamp': ctx['timestamp']},
+    ),
+    BenchmarkScenario(
+        'rest_stations_metadata_changes', '/api/v1/stations-metadata',
+        lambda ctx: {'timestamp': ctx['timestamp'], 'changes_from_timestamp': ctx['timestamp'] - 60},
+    ),
+    BenchmarkScenario(
+        'rest_stations_metadata_history', '/api/v1/stations-metadata-history',
+        lambda ctx: {'station_slug': ctx['station_slug']},
+    ),
+    BenchmarkScenario(
+        'graphql_stations', '/graphql',
+        lambda ctx: _graphql_params(STATIONS_GRAPHQL_QUERY),
+    ),
+    BenchmarkScenario(
+        'graphql_stations_metadata_current', '/graphql',
+        lambda ctx: _graphql_params(STATIONS_METADATA_GRAPHQL_QUERY),
+    ),
+    BenchmarkScenario(
+        'graphql_stations_metadata_timestamp', '/graphql',
+        lambda ctx: _graphql_params(STATIONS_METADATA_GRAPHQL_QUERY, {'timestamp': ctx['timestamp'] - 1800}),
+    ),
+    BenchmarkScenario(
+        'graphql_stations_metadata_changes', '/graphql',
+        lambda ctx: _graphql_params(
+            STATIONS_METADATA_GRAPHQL_QUERY, {'changes_from_timestamp': ctx['timestamp'] - 60}
+        ),
+    ),
+    BenchmarkScenario(
+        'graphql_stations_metadata_history', '/graphql',
+        lambda ctx: _graphql_params(STATIONS_METADATA_HISTORY_GRAPHQL_QUERY, {'station_slug': ctx['station_slug']}),
+    ),
+]
+
+
+class ReadApiBenchmarkService:
+    """
+    Benchmarks the public read API in-process, through the full Django stack
+    (middleware, REST handlers, GraphQL view and extensions).
+
+    Each scenario runs in two passes so instrumentation does not skew the
+    timings: an uninstrumented latency pass, then a shorter pass that records
+    SQL queries and, optionally, peak Python allocations per request.
+
+    With cold_cache the Django cache is swapped for a dummy backend, so every
+    request runs the resolvers instead of being served from a cached result.
+    """
+
+    INSTRUMENTED_REQUESTS = 10
+
+    def __init__(
+        self,
+        iterations: int = 50,
+        warmup: int = 5,
+        cold_cache: bool = False,
+        track_allocations: bool = True,
+    ):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.cold_cache = cold_cache
+        self.track_allocations = track_allocations
+
+    def run(self, only: Optional[List[str]] = None) -> List[ScenarioResult]:
+        scenarios = [s for s in SCENARIOS if not only or s.name in only]
+        context = self._build_context()
+        client = Client(HTTP_HOST=self._get_host())
+
+        if self.cold_cache:
+            with override_settings(CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            }):
+                return [self._run_scenario(client, scenario, context) for scenario in scenarios]
+        return [self._run_scenario(client, scenario, context) for scenario in scenarios]
+
+    @staticmethod
+    def _get_host() -> str:
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*' and not host.startswith('.'):
+                return host
+        return 'localhost'
+
+    @staticmethod
+    def _build_context() -> Dict[str, Any]:
+        # Prefer the synthetic stations so runs are comparable
+        station_slug = (
+            Stations.objects.filter(slug__startswith=BenchmarkDataService.SLUG_PREFIX)
+            .order_by('id').values_list('slug', flat=True).first()
+            or Stations.objects.order_by('id').values_list('slug', flat=True).first()
+            or ''
+        )
+        # Rounded like the clients do, and never in the future
+        timestamp = int(timezone.now().timestamp() // 10) * 10
+        return {'station_slug': station_slug, 'timestamp': timestamp}
+
+    def _request(self, client: Client, scenario: BenchmarkScenario, context: Dict[str, Any]):
+        return client.get(scenario.path, scenario.params(context), secure=True)
+
+    def _run_scenario(self, client: Client, scenario: BenchmarkScenario, context: Dict[str, Any]) -> ScenarioResult:
+        errors = []
+
+        for _ in range(self.warmup):
+            self._request(client, scenario, context)
+
+        timings = []
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            response = self._request(client, scenario, context)
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200 and len(errors) < 5:
+                errors.append(f"HTTP {response.status_code}")
+
+        instrumented = min(self.INSTRUMENTED_REQUESTS, self.iterations)
+        query_counts = []
+        alloc_peaks = []
+        if self.track_allocations:
+            tracemalloc.start()
+        try:
+            for _ in range(instrumented):
+                if self.track_allocations:
+                    tracemalloc.reset_peak()
+                    baseline, _ = tracemalloc.get_traced_memory()
+                # CaptureQueriesContext only sees this thread's connection:
+                # run the GraphQL blocking work inline instead of in the pool
+                with override_settings(GRAPHQL_SYNC_THREADS=0), CaptureQueriesContext(connection) as queries:
+                    self._request(client, scenario, context)
+                query_counts.append(len(queries.captured_queries))
+                if self.track_allocations:
+                    _, peak = tracemalloc.get_traced_memory()
+                    alloc_peaks.append((peak - baseline) / 1024)
+        finally:
+            if self.track_allocations:
+                tracemalloc.stop()
+
+        return ScenarioResult(
+            name=scenario.name,
+            requests=len(timings),
+            p50_ms=round(self._percentile(timings, 50), 2),
+            p95_ms=round(self._percentile(timings, 95), 2),
+            p99_ms=round(self._percentile(timings, 99), 2),
+            mean_ms=round(statistics.fmean(timings), 2) if timings else 0.0,
+            queries_per_request=round(statistics.fmean(query_counts), 1) if query_counts else 0.0,
+            alloc_peak_kb=round(statistics.fmean(alloc_peaks), 1) if alloc_peaks else None,
+            errors=errors,
+        )
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    @staticmethod
+    def to_dict(results: List[ScenarioResult]) -> Dict[str, Any]:
+        return {result.name: asdict(result) for result in results}
+
+    @staticmethod
+    def find_regressions(
+        results: List[ScenarioResult],
+        baseline: Dict[str, Any],
+        max_regression: float = 0.25,
+    ) -> List[str]:
+        """
+        Compare results to a baseline produced by to_dict().
+
+        A scenario regresses when its p95 latency grows by more than
+        max_regression (a fraction) or when it issues more queries.
+        """
+        regressions = []
+        for result in results:
+            previous = baseline.get(result.name)
+            if not previous:
+                continue
+            if previous['p95_ms'] and result.p95_ms > previous['p95_ms'] * (1 + max_regression):
+                regressions.append(
+                    f"{result.name}: p95 {previous['p95_ms']}ms -> {result.p95_ms}ms"
+                )
+            if result.queries_per_request > previous['queries_per_request']:
+                regressions.append(
+                    f"{result.name}: queries {previous['queries_per_request']} -> {result.queries_per_request}"
+                )
+        return regressions
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import redis
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import ShareLink, ShareLinkVisit
+from ..utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ShareLinkVisitBuffer:
+    """
+    Write-behind queue for share link visits.
+
+    The redirect view only talks to Redis: a SET NX per (share link, visitor)
+    drops repeat visits, and first visits are appended to a pending list. A
+    periodic task drains the list, bulk-inserts the ShareLinkVisit rows and
+    applies the per-link visit_count deltas with one UPDATE, so a viral link
+    no longer serializes its visitors on a row lock.
+
+    Without Redis, visits are tracked synchronously through ShareLinkService.
+    """
+
+    KEY_PREFIX = 'radio_crestin:share_link_visits'
+    PENDING_KEY = f'{KEY_PREFIX}:pending'
+
+    # How long a visitor is remembered in Redis; the flush also checks the
+    # database, so this only bounds how many duplicates reach it
+    DEDUPE_TTL = timedelta(days=1)
+    FLUSH_BATCH_SIZE = 5000
+
+    @staticmethod
+    def visitor_id(visitor_ip: Optional[str], visitor_user_agent: Optional[str]) -> str:
+        """Stable visitor identity, used instead of a Django session."""
+        raw = f"{visitor_ip or ''}|{visitor_user_agent or ''}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    @classmethod
+    def _seen_key(cls, share_link_id: int, visitor_id: str) -> str:
+        return f'{cls.KEY_PREFIX}:seen:{share_link_id}:{visitor_id}'
+
+    @classmethod
+    def record(
+        cls,
+        share_link: ShareLink,
+        visitor_ip: Optional[str] = None,
+        visitor_user_agent: Optional[str] = None,
+        visitor_referer: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue a visit.
+
+        Returns:
+            True if the visit was new and queued (or tracked directly)
+        """
+        visitor_id = cls.visitor_id(visitor_ip, visitor_user_agent)
+
+        client = get_redis_client()
+        if client is None:
+            return cls._track_directly(share_link, visitor_id, visitor_ip, visitor_user_agent, visitor_referer)
+
+        try:
+            if not client.set(
+                cls._seen_key(share_link.id, visitor_id), 1,
+                nx=True, ex=int(cls.DEDUPE_TTL.total_seconds()),
+            ):
+                return False
+            client.rpush(cls.PENDING_KEY, json.dumps({
+                'share_link_id': share_link.id,
+                'visitor_id': visitor_id,
+                'visitor_ip': visitor_ip,
+                'visitor_user_agent': visitor_user_agent,
+                'visitor_referer': visitor_referer,
+                'visited_at': timezone.now().isoformat(),
+            }, separators=(',', ':')))
+            return True
+        except redis.RedisError as e:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error queueing share link visit: {e}")
+            return cls._track_directly(share_link, visitor_id, visitor_ip, visitor_user_agent, visitor_referer)
+
+    @staticmethod
+    def _track_directly(share_link, visitor_id, visitor_ip, visitor_user_agent, visitor_referer) -> bool:
+        from .share_link_service import ShareLinkService
+
+        return ShareLinkService.track_visit(
+            share_id=share_link.share_id,
+            visitor_ip=visitor_ip,
+            visitor_user_agent=visitor_user_agent,
+            visitor_referer=visitor_referer,
+            visitor_session_id=visitor_id,
+        ) is not None
+
+    @classmethod
+    def flush(cls, max_batches: int = 20) -> Dict[str, int]:
+        """
+        Drain queued visits into the database.
+
+        Returns:
+            Dict with the number of queued items read and visits written
+        """
+        client = get_redis_client()
+        if client is None:
+            return {'read': 0, 'written': 0}
+
+        read = written = 0
+        for _ in range(max_batches):
+            items = cls._pop_batch(client)
+            if not items:
+                break
+            read += len(items)
+            try:
+                written += cls._write(items)
+            except Exception:
+                # Put the batch back so the next run retries it
+                client.rpush(cls.PENDING_KEY, *items)
+                raise
+            if len(items) < cls.FLUSH_BATCH_SIZE:
+                break
+
+        return {'read': read, 'written': written}
+
+    @classmethod
+    def _pop_batch(cls, client) -> List[bytes]:
+        pipe = client.pipeline(transaction=True)
+        pipe.lrange(cls.PENDING_KEY, 0, cls.FLUSH_BATCH_SIZE - 1)
+        pipe.ltrim(cls.PENDING_KEY, cls.FLUSH_BATCH_SIZE, -1)
+        items, _ = pipe.execute()
+        return items
+
+    @staticmethod
+    def _parse(items: List[bytes]) -> Dict[tuple, dict]:
+        visits = {}
+        for item in items:
+            try:
+                visit = json.loads(item)
+                key = (int(visit['share_link_id']), visit['visitor_id'])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Dropping malformed share link visit: {e}")
+                continue
+            # Keep the earliest visit per visitor
+            if key not in visits:
+                visits[key] = visit
+        return visits
+
+    @classmethod
+    def _write(cls, items: List[bytes]) -> int:
+        visits = cls._parse(items)
+        if not visits:
+            return 0
+
+        with transaction.atomic():
+            active_ids = set(
+                ShareLink.objects.filter(
+                    id__in={share_link_id for share_link_id, _ in visits},
+                    is_active=True,
+                ).values_list('id', flat=True)
+            )
+            already_seen = set(
+                ShareLinkVisit.objects.filter(
+                    share_link_id__in=active_ids,
+                    visitor_session_id__in={visitor_id for _, visitor_id in visits},
+                ).values_list('share_link_id', 'visitor_session_id')
+            )
+
+            new_visits = [
+                ShareLinkVisit(
+                    share_link_id=share_link_id,
+                    visitor_ip=visit.get('visitor_ip'),
+                    visitor_user_agent=visit.get('visitor_user_agent'),
+                    visitor_referer=(visit.get('visitor_referer') or '')[:500] or None,
+                    visitor_session_id=visitor_id,
+                    visited_at=cls._parse_timestamp(visit.get('visited_at')),
+                )
+                for (share_link_id, visitor_id), visit in visits.items()
+                if share_link_id in active_ids and (share_link_id, visitor_id) not in already_seen
+            ]
+            if not new_visits:
+                return 0
+
+            ShareLinkVisit.objects.bulk_create(new_visits)
+            cls._increment_counts(Counter(visit.share_link_id for visit in new_visits))
+
+        return len(new_visits)
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> datetime:
+        return (parse_datetime(value) if value else None) or timezone.now()
+
+    @staticmethod
+    def _increment_counts(deltas: Dict[int, int]):
+        values_sql = ', '.join(['(%s::bigint, %s::integer)'] * len(deltas))
+        params = []
+        for share_link_id, delta in deltas.items():
+            params.extend([share_link_id, delta])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                UPDATE share_links AS sl SET
+                    visit_count = sl.visit_count + v.delta,
+                    updated_at = now()
+                FROM (VALUES {values_sql}) AS v(id, delta)
+                WHERE sl.id = v.id
+            """, params)
@@ -0,0 +1,200 @@
+import copy
+import logging
+import threading
+import uuid
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Prefetch
+
+from ..models import Posts, Reviews, Stations, StationStreams
+
+logger = logging.getLogger(__name__)
+
+
+class StationsSnapshotService:
+    """
+    Materialized, versioned snapshot of the station catalog served by the
+    `stations` GraphQL query.
+
+    The snapshot holds everything that only changes when an editor touches the
+    catalog (stations, streams, latest post, review stats). It is rebuilt lazily
+    after the version token is bumped by the signals in
+    `signals/stations_snapshot.py`. Volatile data (now playing, uptime,
+    listener counts) is never part of the snapshot and is overlaid per request.
+    """
+
+    VERSION_CACHE_KEY = 'radio_crestin:stations_snapshot:version'
+    SNAPSHOT_CACHE_KEY = 'radio_crestin:stations_snapshot:{version}'
+    SNAPSHOT_TTL = 3600
+
+    # Fields refreshed from the live row on every request. config_version is
+    # bumped with queryset.update() (no signals), so it is treated as volatile.
+    VOLATILE_FIELDS = (
+        'latest_station_uptime',
+        'latest_station_now_playing',
+        'config_version',
+    )
+
+    _local_snapshot: Optional[tuple] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Bump the snapshot version now and, inside a transaction, again after
+        commit so a snapshot rebuilt from pre-commit data is discarded.
+        """
+        cls._bump_version()
+        if connection.in_atomic_block:
+            transaction.on_commit(cls._bump_version)
+
+    @classmethod
+    def _bump_version(cls) -> None:
+        # A random token (not a counter) so an evicted version key can never
+        # resurrect an older snapshot held in another process.
+        cache.set(cls.VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        logger.info("Stations snapshot invalidated")
+
+    @classmethod
+    def _get_version(cls) -> str:
+        version = cache.get(cls.VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(cls.VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(cls.VERSION_CACHE_KEY)
+        return version
+
+    @classmethod
+    def get_stations(cls) -> List[Stations]:
+        """
+        Return per-request copies of the snapshot stations, ordered by
+        ('order', 'title'), with volatile fields not yet overlaid.
+        """
+        version = cls._get_version()
+        local = cls._local_snapshot
+
+        if local is None or local[0] != version:
+            with cls._lock:
+                local = cls._local_snapshot
+                if local is None or local[0] != version:
+                    snapshot_key = cls.SNAPSHOT_CACHE_KEY.format(version=version)
+                    stations = cache.get(snapshot_key)
+                    if stations is None:
+                        stations = cls._build_snapshot()
+                        cache.set(snapshot_key, stations, cls.SNAPSHOT_TTL)
+                    local = (version, stations)
+                    cls._local_snapshot = local
+
+        # Shallow copies keep the shared prefetched caches read-only while
+        # letting each request overlay its own related objects.
+        return [copy.copy(station) for station in local[1]]
+
+    @classmethod
+    def apply_volatile_fields(cls, stations: List[Stations]) -> None:
+        """Overlay now playing, uptime and config_version from a single query."""
+        if not stations:
+            return
+
+        live_stations = Stations.objects.select_related(
+            'latest_station_uptime',
+            'latest_station_now_playing',
+            'latest_station_now_playing__song',
+            'latest_station_now_playing__song__artist'
+        ).filter(id__in=[station.id for station in stations])
+        live_by_id = {live.id: live for live in live_stations}
+
+        for station in stations:
+            live = live_by_id.get(station.id)
+            if live is None:
+                continue
+            for field in cls.VOLATILE_FIELDS:
+                setattr(station, field, getattr(live, field))
+
+    @classmethod
+    def _build_snapshot(cls) -> List[Stations]:
+        stations = list(
+            Stations.objects.prefetch_related(
+                Prefetch(
+                    'station_streams',
+                    queryset=StationStreams.objects.order_by('order', 'id')
+                )
+            ).filter(disabled=False).order_by('order', 'title')
+        )
+        station_ids = [station.id for station in stations]
+
+        # Title rank as sorted by the database, so custom orderings match the
+        # collation the ORM would have used.
+        title_ranks = {
+            station_id: rank
+            for rank, station_id in enumerate(
+                Stations.objects.filter(disabled=False)
+                .order_by('title', 'id')
+                .values_list('id', flat=True)
+            )
+        }
+
+        posts_by_station = cls._get_latest_posts(station_ids)
+        reviews_stats_by_station = cls._get_reviews_stats(station_ids)
+
+        for station in stations:
+            station._snapshot_title_rank = title_ranks.get(station.id, 0)
+            station._posts_cache = posts_by_station.get(station.id, [])
+            station._reviews_stats_cache = reviews_stats_by_station.get(
+                station.id,
+                {'count': 0, 'avg_rating': 0.0}
+            )
+
+        logger.info(f"Built stations snapshot with {len(stations)} stations")
+        return stations
+
+    @staticmethod
+    def _get_latest_posts(station_ids: List[int]) -> Dict[int, List[Posts]]:
+        """Latest post per station using a window function."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                WITH ranked_posts AS (
+                    SELECT
+                        id, title, description, link, published,
+                        created_at, updated_at, station_id,
+                        ROW_NUMBER() OVER (PARTITION BY station_id ORDER BY published DESC) as rn
+                    FROM posts
+                    WHERE station_id = ANY(%s)
+                )
+                SELECT * FROM ranked_posts WHERE rn = 1
+                ORDER BY station_id
+            """, [station_ids])
+
+            columns = [col[0] for col in cursor.description]
+            posts_raw = cursor.fetchall()
+
+        posts_by_station = {}
+        for row in posts_raw:
+            post_dict = dict(zip(columns, row))
+            post_dict.pop('rn', None)
+
+            post = Posts(**post_dict)
+            post._state.adding = False
+            post._state.db = 'default'
+
+            posts_by_station[post.station_id] = [post]
+
+        return posts_by_station
+
+    @staticmethod
+    def _get_reviews_stats(station_ids: List[int]) -> Dict[int, Dict]:
+        reviews_stats = Reviews.objects.filter(
+            station_id__in=station_ids,
+            verified=True
+        ).values('station_id').annotate(
+            count=Count('id'),
+            avg_rating=Avg('stars')
+        )
+
+        return {
+            stat['station_id']: {
+                'count': stat['count'] or 0,
+                'avg_rating': round(stat['avg_rating'] or 0.0, 2)
+            }
+            for stat in reviews_stats
+        }
@@ -142,10 +142,18 @@ def extend_superapp_settings(main_settings):
                 'task': 'superapp.apps.radio_crestin.tasks.delete_stale_listening_sessions.delete_stale_listening_sessions',
                 'schedule': crontab(minute='*'),  # Every minute
             },
+            'flush-share-link-visits': {
+                'task': 'superapp.apps.radio_crestin.tasks.flush_share_link_visits.flush_share_link_visits',
+                'schedule': 15.0,  # Every 15 seconds
+            },
             'delete-old-anonymous-users': {
                 'task': 'superapp.apps.radio_crestin.tasks.delete_old_anonymous_users.delete_old_anonymous_users',
                 'schedule': crontab(hour=2, minute=0),  # Daily at 2 AM
             },
+            'manage-now-playing-history-partitions': {
+                'task': 'superapp.apps.radio_crestin.tasks.manage_now_playing_history_partitions.manage_now_playing_history_partitions',
+                'schedule': crontab(hour=2, minute=5),  # Daily at 2:05 AM
+            },
             'delete-old-now-playing-history': {
                 'task': 'superapp.apps.radio_crestin.tasks.delete_old_now_playing_history.delete_old_now_playing_history',
                 'schedule': crontab(hour=2, minute=15),  # Daily at 2:15 AM
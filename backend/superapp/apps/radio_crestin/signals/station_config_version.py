@@ -3,6 +3,7 @@ import logging
 from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from superapp.apps.radio_crestin.models import Stations, StationsMetadataFetch
 
@@ -13,7 +14,8 @@ logger = logging.getLogger(__name__)
 def increment_config_version_on_fetcher_change(sender, instance, **kwargs):
     """When a scraper config changes, bump the station's config_version so the pod reloads."""
     Stations.objects.filter(id=instance.station_id).update(
-        config_version=models.F('config_version') + 1
+        config_version=models.F('config_version') + 1,
+        updated_at=timezone.now(),
     )
     logger.info(f"Incremented config_version for station {instance.station_id} (fetcher change)")
 
@@ -38,6 +40,7 @@ def increment_config_version_on_station_change(sender, instance, **kwargs):
     # Only bump if this is an update (not initial create) and not already handled
     if not kwargs.get('created', False) and update_fields is None:
         Stations.objects.filter(id=instance.id).update(
-            config_version=models.F('config_version') + 1
+            config_version=models.F('config_version') + 1,
+            updated_at=timezone.now(),
         )
         logger.info(f"Incremented config_version for station {instance.id} (station config change)")
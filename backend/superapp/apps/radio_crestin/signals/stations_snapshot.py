@@ -0,0 +1,34 @@
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from superapp.apps.radio_crestin.models import Posts, Reviews, Stations, StationStreams
+from superapp.apps.radio_crestin.services.stations_snapshot_service import StationsSnapshotService
+
+logger = logging.getLogger(__name__)
+
+# Saves touching only these fields don't affect the snapshot: they are
+# overlaid per request by StationsSnapshotService.apply_volatile_fields().
+VOLATILE_STATION_FIELDS = {'latest_station_now_playing', 'latest_station_uptime', 'config_version'}
+
+
+@receiver(post_save, sender=Stations)
+@receiver(post_delete, sender=Stations)
+def invalidate_snapshot_on_station_change(sender, instance, **kwargs):
+    """Rebuild the stations snapshot when a station's catalog data changes."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields and not (set(update_fields) - VOLATILE_STATION_FIELDS):
+        return
+    StationsSnapshotService.invalidate()
+
+
+@receiver(post_save, sender=StationStreams)
+@receiver(post_delete, sender=StationStreams)
+@receiver(post_save, sender=Posts)
+@receiver(post_delete, sender=Posts)
+@receiver(post_save, sender=Reviews)
+@receiver(post_delete, sender=Reviews)
+def invalidate_snapshot_on_related_change(sender, instance, **kwargs):
+    """Rebuild the stations snapshot when streams, posts or reviews change."""
+    StationsSnapshotService.invalidate()
@@ -6,9 +6,13 @@ Radio Crestin Celery tasks.
 from .delete_stale_listening_sessions import delete_stale_listening_sessions
 from .delete_old_anonymous_users import delete_old_anonymous_users
 from .delete_old_now_playing_history import delete_old_now_playing_history
+from .manage_now_playing_history_partitions import manage_now_playing_history_partitions
+from .flush_share_link_visits import flush_share_link_visits
 
 __all__ = [
     'delete_stale_listening_sessions',
     'delete_old_anonymous_users',
     'delete_old_now_playing_history',
+    'manage_now_playing_history_partitions',
+    'flush_share_link_visits',
 ]
\ No newline at end of file
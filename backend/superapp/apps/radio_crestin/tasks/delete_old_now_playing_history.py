@@ -9,6 +9,7 @@ from django.db import transaction
 from celery import shared_task
 
 from ..models import StationsNowPlayingHistory
+from ..services.history_partition_service import HistoryPartitionService
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +25,23 @@ def delete_old_now_playing_history(self):
     Delete StationsNowPlayingHistory records older than the configured retention period.
 
     Retention is controlled by NOW_PLAYING_HISTORY_RETENTION_DAYS env var (default: 7).
+    When the table is partitioned, expired daily partitions are dropped instead
+    of deleting rows.
     """
     try:
         retention_days = int(os.getenv('NOW_PLAYING_HISTORY_RETENTION_DAYS', '7'))
         cutoff_date = timezone.now() - timedelta(days=retention_days)
 
+        if HistoryPartitionService.is_partitioned():
+            dropped = HistoryPartitionService.drop_expired_partitions(retention_days=retention_days)
+            logger.info(f"Dropped {len(dropped)} now playing history partitions older than {retention_days} days")
+            return {
+                'success': True,
+                'dropped_partitions': dropped,
+                'cutoff_date': cutoff_date.isoformat(),
+                'message': f'Successfully dropped {len(dropped)} expired history partitions',
+            }
+
         with transaction.atomic():
             old_records = StationsNowPlayingHistory.objects.filter(
                 timestamp__lt=cutoff_date
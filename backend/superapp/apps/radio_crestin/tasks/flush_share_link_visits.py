@@ -0,0 +1,44 @@
+"""
+Task to write the share link visits queued by ShareLinkVisitBuffer.
+"""
+import logging
+
+from celery import shared_task
+
+from ..services.share_link_visit_buffer import ShareLinkVisitBuffer
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    queue='priority',
+)
+def flush_share_link_visits(self):
+    """
+    Bulk-insert queued share link visits and apply the visit_count deltas.
+
+    Returns:
+        dict: Number of queued visits read and visits written
+    """
+    try:
+        counts = ShareLinkVisitBuffer.flush()
+        if counts['read']:
+            logger.info(f"Flushed share link visits: {counts['written']} written of {counts['read']} queued")
+        return {
+            'success': True,
+            **counts,
+            'message': f"Wrote {counts['written']} share link visits",
+        }
+
+    except Exception as e:
+        logger.error(f"Error flushing share link visits: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'read': 0,
+            'written': 0,
+            'message': f'Failed to flush share link visits: {e}',
+        }
@@ -0,0 +1,63 @@
+"""
+Task to maintain the daily partitions of StationsNowPlayingHistory.
+"""
+import logging
+import os
+
+from celery import shared_task
+
+from ..services.history_partition_service import HistoryPartitionService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    queue='priority',
+)
+def manage_now_playing_history_partitions(self):
+    """
+    Create the upcoming StationsNowPlayingHistory partitions and drop the ones
+    past the retention period.
+
+    Retention is controlled by NOW_PLAYING_HISTORY_RETENTION_DAYS env var (default: 7),
+    the number of future daily partitions by NOW_PLAYING_HISTORY_PARTITIONS_AHEAD (default: 7).
+    """
+    try:
+        if not HistoryPartitionService.is_partitioned():
+            logger.info("stations_now_playing_history is not partitioned, skipping")
+            return {
+                'success': True,
+                'created': [],
+                'dropped': [],
+                'message': 'Table is not partitioned',
+            }
+
+        days_ahead = int(os.getenv('NOW_PLAYING_HISTORY_PARTITIONS_AHEAD', '7'))
+        retention_days = HistoryPartitionService.get_retention_days()
+
+        created = HistoryPartitionService.create_partitions(days_ahead=days_ahead)
+        dropped = HistoryPartitionService.drop_expired_partitions(retention_days=retention_days)
+
+        logger.info(
+            f"History partitions: created {len(created)}, dropped {len(dropped)} "
+            f"(retention {retention_days} days)"
+        )
+        return {
+            'success': True,
+            'created': created,
+            'dropped': dropped,
+            'message': f'Created {len(created)} and dropped {len(dropped)} partitions',
+        }
+
+    except Exception as e:
+        logger.error(f"Error maintaining now playing history partitions: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'created': [],
+            'dropped': [],
+            'message': f'Failed to maintain history partitions: {e}',
+        }
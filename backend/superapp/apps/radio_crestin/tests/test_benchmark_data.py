@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from ..models import ListeningSessions, Stations, StationsNowPlayingHistory
+from ..services.benchmark_data_service import BenchmarkDataService
+from ..services.read_api_benchmark_service import ReadApiBenchmarkService, ScenarioResult
+
+
+class BenchmarkDataServiceTests(TestCase):
+    def test_generate_and_clear(self):
+        real_station = Stations.objects.create(
+            slug="real-station",
+            title="Real Station",
+            website="https://real.example.com",
+            stream_url="https://real.example.com/live",
+        )
+
+        counts = BenchmarkDataService.generate(
+            stations=3, history_per_station=4, active_sessions=5, songs=10,
+        )
+
+        self.assertEqual(counts['stations'], 3)
+        self.assertEqual(counts['history'], 12)
+        self.assertEqual(counts['sessions'], 5)
+        bench_stations = Stations.objects.filter(slug__startswith=BenchmarkDataService.SLUG_PREFIX)
+        self.assertEqual(bench_stations.count(), 3)
+        self.assertFalse(bench_stations.filter(latest_station_now_playing__isnull=True).exists())
+        self.assertEqual(ListeningSessions.objects.filter(is_active=True).count(), 5)
+
+        BenchmarkDataService.clear()
+
+        self.assertFalse(Stations.objects.filter(slug__startswith=BenchmarkDataService.SLUG_PREFIX).exists())
+        self.assertEqual(StationsNowPlayingHistory.objects.count(), 0)
+        self.assertTrue(Stations.objects.filter(id=real_station.id).exists())
+
+    def test_find_regressions(self):
+        result = ScenarioResult(
+            name='rest_stations', requests=10, p50_ms=5.0, p95_ms=13.0, p99_ms=15.0,
+            mean_ms=6.0, queries_per_request=3.0, alloc_peak_kb=None,
+        )
+        baseline = {'rest_stations': {'p95_ms': 10.0, 'queries_per_request': 2.0}}
+
+        regressions = ReadApiBenchmarkService.find_regressions([result], baseline, max_regression=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(
+            ReadApiBenchmarkService.find_regressions([result], baseline, max_regression=0.5)[0],
+            'rest_stations: queries 2.0 -> 3.0',
+        )
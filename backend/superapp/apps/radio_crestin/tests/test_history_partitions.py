@@ -0,0 +1,91 @@
+from datetime import datetime, time, timedelta, timezone as dt_tz
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Songs, Stations, StationsNowPlayingHistory
+from ..services.history_partition_service import HistoryPartitionService
+
+
+class HistoryPartitionTests(TestCase):
+    """Runs against the table as partitioned by migration 0043."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.station = Stations.objects.create(
+            slug="partition-station",
+            title="Partition Station",
+            website="https://partition.example.com",
+            stream_url="https://partition.example.com/live",
+        )
+        cls.song = Songs.objects.create(name="Partition Song")
+
+    def partition_of(self, history):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT tableoid::regclass::text FROM "{HistoryPartitionService.PARENT_TABLE}" WHERE id = %s',
+                [history.id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_migration_partitions_the_table(self):
+        today = timezone.now().astimezone(dt_tz.utc).date()
+
+        self.assertTrue(HistoryPartitionService.is_partitioned())
+        self.assertIn(today, HistoryPartitionService.list_partitions())
+
+    def test_migration_indexes_the_song_foreign_key(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname = 'idx_snph_song_id'",
+                [HistoryPartitionService.PARENT_TABLE],
+            )
+            row = cursor.fetchone()
+
+        self.assertIsNotNone(row)
+        self.assertIn('(song_id)', row[0])
+
+    def test_rows_land_in_their_day_partition(self):
+        now = timezone.now()
+        history = StationsNowPlayingHistory.objects.create(timestamp=now, station=self.station, song=self.song)
+
+        self.assertEqual(
+            self.partition_of(history),
+            HistoryPartitionService.partition_name(now.astimezone(dt_tz.utc).date()),
+        )
+
+    def test_create_partitions_moves_rows_out_of_the_default_partition(self):
+        day = timezone.now().astimezone(dt_tz.utc).date() + timedelta(days=2)
+        name = HistoryPartitionService.partition_name(day)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE "{name}"')
+        history = StationsNowPlayingHistory.objects.create(
+            timestamp=datetime.combine(day, time(12), tzinfo=dt_tz.utc),
+            station=self.station,
+            song=self.song,
+        )
+        self.assertEqual(self.partition_of(history), HistoryPartitionService.DEFAULT_PARTITION)
+
+        created = HistoryPartitionService.create_partitions(days_ahead=2)
+
+        self.assertEqual(created, [name])
+        self.assertEqual(self.partition_of(history), name)
+        self.assertEqual(StationsNowPlayingHistory.objects.get(pk=history.pk).song, self.song)
+
+    def test_create_partitions_skips_existing_partitions(self):
+        self.assertEqual(HistoryPartitionService.create_partitions(days_ahead=2), [])
+
+    def test_drop_expired_partitions(self):
+        expired_day = timezone.now().astimezone(dt_tz.utc).date() - timedelta(days=30)
+        start = datetime.combine(expired_day, time.min, tzinfo=dt_tz.utc)
+        name = HistoryPartitionService.partition_name(expired_day)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE "{name}" PARTITION OF "{HistoryPartitionService.PARENT_TABLE}" '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [start, start + timedelta(days=1)],
+            )
+
+        self.assertIn(name, HistoryPartitionService.drop_expired_partitions(retention_days=7))
+        self.assertNotIn(expired_day, HistoryPartitionService.list_partitions())
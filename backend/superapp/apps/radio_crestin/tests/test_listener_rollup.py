@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone as dt_tz
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import ListenerMinutes, ListeningSessions, Stations
+from ..services.listener_analytics_service import ListenerAnalyticsService
+from ..services.listener_rollup_service import ListenerRollupService
+
+
+class ListenerRollupServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.station = Stations.objects.create(
+            slug="rollup-station",
+            title="Rollup Station",
+            order=0,
+            station_order=0.0,
+            website="https://rollup.example.com",
+            stream_url="https://stream.rollup.example.com/live",
+        )
+
+    def make_session(self, session_id, start_time, last_activity, bytes_transferred=0):
+        return ListeningSessions.objects.create(
+            station=self.station,
+            anonymous_session_id=session_id,
+            start_time=start_time,
+            last_activity=last_activity,
+            bytes_transferred=bytes_transferred,
+        )
+
+    def test_minute_buckets_split_bytes(self):
+        start = datetime(2026, 10, 18, 10, 0, 30, tzinfo=dt_tz.utc)
+
+        buckets = ListenerRollupService.minute_buckets(start, start + timedelta(minutes=2), 1001)
+
+        self.assertEqual([b[0].minute for b in buckets], [0, 1, 2])
+        self.assertEqual([b[1] for b in buckets], [333, 333, 335])
+        self.assertEqual([b[2] for b in buckets], [1, 0, 0])
+        self.assertEqual([b[3] for b in buckets], [0, 0, 1])
+
+    def test_rolls_up_expired_sessions_only(self):
+        base = (timezone.now() - timedelta(hours=1)).replace(second=0, microsecond=0)
+        self.make_session("a", base, base + timedelta(minutes=2, seconds=10), bytes_transferred=3000)
+        self.make_session("b", base + timedelta(minutes=1), base + timedelta(minutes=1, seconds=40), bytes_transferred=500)
+        self.make_session("live", timezone.now(), timezone.now())
+
+        deleted, minutes = ListenerRollupService.roll_up_and_delete(timezone.now() - timedelta(seconds=60))
+
+        self.assertEqual((deleted, minutes), (2, 3))
+        self.assertEqual(list(ListeningSessions.objects.values_list('anonymous_session_id', flat=True)), ["live"])
+        rows = {
+            row.bucket: (row.listeners, row.bytes_transferred, row.sessions_started, row.sessions_ended)
+            for row in ListenerMinutes.objects.filter(station=self.station)
+        }
+        self.assertEqual(rows, {
+            base: (1, 1000, 1, 0),
+            base + timedelta(minutes=1): (2, 1500, 1, 1),
+            base + timedelta(minutes=2): (1, 1000, 0, 1),
+        })
+
+    def test_later_rollups_add_to_existing_minutes(self):
+        base = (timezone.now() - timedelta(hours=1)).replace(second=0, microsecond=0)
+        self.make_session("a", base, base)
+        ListenerRollupService.roll_up_and_delete(timezone.now())
+        self.make_session("b", base, base + timedelta(seconds=30), bytes_transferred=100)
+
+        ListenerRollupService.roll_up_and_delete(timezone.now())
+
+        row = ListenerMinutes.objects.get(station=self.station, bucket=base)
+        self.assertEqual(row.listeners, 2)
+        self.assertEqual(row.bytes_transferred, 100)
+        self.assertEqual(row.sessions_started, 2)
+        self.assertEqual(row.sessions_ended, 2)
+
+    def test_timeseries_includes_live_sessions(self):
+        now = timezone.now()
+        minute = now.replace(second=0, microsecond=0)
+        ListenerMinutes.objects.create(station=self.station, bucket=minute, listeners=3, sessions_ended=3)
+        self.make_session("live", now, now, bytes_transferred=200)
+
+        series = ListenerAnalyticsService.get_listener_timeseries(
+            station_ids=[self.station.id], hours=1, bucket_minutes=1
+        )
+
+        point = series[self.station.id][-1]
+        self.assertEqual(point['bucket'], minute)
+        self.assertEqual(point['peak_listeners'], 4)
+        self.assertEqual(point['bytes_transferred'], 200)
+        self.assertEqual(point['sessions_started'], 1)
+        self.assertEqual(point['sessions_ended'], 3)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..graphql.types import ListeningEventInput
+from ..models import AppUsers, ListeningSessions, Stations
+from ..services.listening_ingest_service import ListeningIngestService
+
+
+def make_event(session_id, station_slug, timestamp, event_type='segment_request', bytes_transferred=1000):
+    return ListeningEventInput(
+        anonymous_session_id=session_id,
+        station_slug=station_slug,
+        ip_address="10.0.0.1",
+        user_agent="test-agent",
+        timestamp=timestamp.isoformat(),
+        event_type=event_type,
+        bytes_transferred=bytes_transferred,
+        request_duration=0.1,
+        status_code=200,
+    )
+
+
+class ListeningIngestServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.stations = [
+            Stations.objects.create(
+                slug=f"ingest-station-{i}",
+                title=f"Ingest Station {i}",
+                order=i,
+                station_order=float(i),
+                website=f"https://station{i}.example.com",
+                stream_url=f"https://stream{i}.example.com/live",
+            )
+            for i in range(2)
+        ]
+
+    def test_creates_users_and_sessions(self):
+        now = timezone.now()
+        events = [
+            make_event("listener-a", "ingest-station-0", now, event_type='playlist_request'),
+            make_event("listener-a", "ingest-station-0", now + timedelta(seconds=2)),
+            make_event("listener-b", "ingest-station-1", now),
+            make_event("listener-c", "unknown-station", now),
+        ]
+
+        processed = ListeningIngestService.ingest_events(events)
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(AppUsers.objects.filter(anonymous_id__in=["listener-a", "listener-b"]).count(), 2)
+        session = ListeningSessions.objects.get(anonymous_session_id="listener-a")
+        self.assertEqual(session.total_requests, 2)
+        self.assertEqual(session.playlist_requests, 1)
+        self.assertEqual(session.segment_requests, 1)
+        self.assertEqual(session.bytes_transferred, 2000)
+        self.assertEqual(session.duration_seconds, 2)
+
+    def test_updates_existing_active_session(self):
+        now = timezone.now()
+        ListeningIngestService.ingest_events([make_event("listener-a", "ingest-station-0", now)])
+        ListeningIngestService.ingest_events([
+            make_event("listener-a", "ingest-station-0", now + timedelta(seconds=10)),
+            make_event("listener-a", "ingest-station-0", now + timedelta(seconds=20)),
+        ])
+
+        session = ListeningSessions.objects.get(anonymous_session_id="listener-a")
+        self.assertEqual(session.total_requests, 3)
+        self.assertEqual(session.duration_seconds, 20)
+        self.assertEqual(session.last_activity, now + timedelta(seconds=20))
+
+    def test_pre_aggregated_event(self):
+        now = timezone.now()
+        event = make_event("listener-a", "ingest-station-0", now + timedelta(seconds=30), bytes_transferred=5000)
+        event.first_timestamp = now.isoformat()
+        event.playlist_request_count = 3
+        event.segment_request_count = 5
+
+        processed = ListeningIngestService.ingest_events([event])
+
+        self.assertEqual(processed, 8)
+        session = ListeningSessions.objects.get(anonymous_session_id="listener-a")
+        self.assertEqual(session.total_requests, 8)
+        self.assertEqual(session.playlist_requests, 3)
+        self.assertEqual(session.segment_requests, 5)
+        self.assertEqual(session.bytes_transferred, 5000)
+        self.assertEqual(session.start_time, now)
+        self.assertEqual(session.duration_seconds, 30)
+
+    def test_query_count_independent_of_batch_size(self):
+        now = timezone.now()
+        events = [
+            make_event(f"listener-{i}", f"ingest-station-{i % 2}", now + timedelta(seconds=i))
+            for i in range(50)
+        ]
+        ListeningIngestService.ingest_events(events)
+
+        with CaptureQueriesContext(connection) as ctx:
+            ListeningIngestService.ingest_events(events)
+        self.assertLessEqual(len(ctx.captured_queries), 8)
@@ -0,0 +1,100 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+import redis
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import ListeningSessions, Stations
+from ..services.live_listener_index import LiveListenerIndex
+from ..utils.redis_client import get_redis_client
+
+
+class LiveListenerIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.station = Stations.objects.create(
+            slug="index-station",
+            title="Index Station",
+            website="https://index.example.com",
+            stream_url="https://index.example.com/live",
+        )
+
+    def setUp(self):
+        self.redis = get_redis_client()
+        if self.redis is None:
+            self.skipTest("REDIS_BROKER_URL is not set")
+        try:
+            self.redis.ping()
+        except redis.RedisError as e:
+            self.skipTest(f"Redis is unavailable: {e}")
+
+        # Keys of their own, so the tests never touch a live index
+        prefix = f'test:{uuid.uuid4().hex}:live_listeners'
+        for name, value in (
+            ('KEY_PREFIX', prefix),
+            ('STATIONS_KEY', f'{prefix}:stations'),
+            ('READY_KEY', f'{prefix}:ready'),
+        ):
+            patcher = mock.patch.object(LiveListenerIndex, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.clear_index, prefix)
+
+    def clear_index(self, prefix):
+        keys = list(self.redis.scan_iter(f'{prefix}:*'))
+        if keys:
+            self.redis.delete(*keys)
+
+    def test_counts_listeners_active_in_the_window(self):
+        now = timezone.now()
+        LiveListenerIndex.record_activity([
+            (self.station.id, None, 'recent', now),
+            (self.station.id, None, 'recent', now - timedelta(minutes=3)),
+            (self.station.id, 7, 'recent', now),
+            (self.station.id, None, 'idle', now - timedelta(minutes=3)),
+        ])
+
+        self.assertEqual(LiveListenerIndex.get_counts([self.station.id], minutes=1), {self.station.id: 2})
+        self.assertEqual(LiveListenerIndex.get_counts([self.station.id], minutes=5), {self.station.id: 3})
+        self.assertEqual(LiveListenerIndex.get_counts(minutes=1)[self.station.id], 2)
+
+    def test_window_longer_than_retention_falls_back_to_sql(self):
+        self.assertIsNone(LiveListenerIndex.get_counts([self.station.id], minutes=60))
+
+    def test_missing_index_is_rebuilt_from_listening_sessions(self):
+        now = timezone.now()
+        ListeningSessions.objects.create(
+            station=self.station, anonymous_session_id='active', start_time=now, last_activity=now,
+        )
+        ListeningSessions.objects.create(
+            station=self.station, anonymous_session_id='expired',
+            start_time=now - timedelta(hours=1), last_activity=now - timedelta(hours=1),
+        )
+
+        self.assertEqual(LiveListenerIndex.get_counts([self.station.id]), {self.station.id: 1})
+        # The marker only loses its rebuild timeout once the rebuild succeeded
+        self.assertEqual(self.redis.ttl(LiveListenerIndex.READY_KEY), -1)
+
+    def test_failed_rebuild_clears_the_ready_marker(self):
+        with mock.patch.object(LiveListenerIndex, '_write', side_effect=redis.ConnectionError('lost')):
+            self.assertIsNone(LiveListenerIndex.get_counts([self.station.id]))
+
+        self.assertFalse(self.redis.exists(LiveListenerIndex.READY_KEY))
+
+    def test_rebuild_in_progress_elsewhere_is_not_repeated(self):
+        self.redis.set(LiveListenerIndex.READY_KEY, '1', ex=LiveListenerIndex.REBUILD_TIMEOUT)
+
+        with mock.patch.object(LiveListenerIndex, '_write') as write:
+            LiveListenerIndex.get_counts([self.station.id])
+
+        write.assert_not_called()
+        self.assertGreater(self.redis.ttl(LiveListenerIndex.READY_KEY), 0)
+
+    def test_unavailable_redis_returns_none(self):
+        with mock.patch(
+            'superapp.apps.radio_crestin.services.live_listener_index.get_redis_client', return_value=None
+        ):
+            self.assertIsNone(LiveListenerIndex.get_counts([self.station.id]))
+            self.assertFalse(LiveListenerIndex.record_activity([]))
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import Songs, Stations, StationsNowPlaying, StationsNowPlayingHistory
+from ..services.metadata_write_service import MetadataWriteService, NowPlayingReport
+
+
+class MetadataWriteServiceTests(TestCase):
+    def setUp(self):
+        MetadataWriteService.clear_cache()
+        self.station = Stations.objects.create(
+            slug="write-station",
+            title="Write Station",
+            website="https://write.example.com",
+            stream_url="https://write.example.com/live",
+        )
+
+    def _report(self, **kwargs):
+        defaults = {
+            'timestamp': timezone.now(),
+            'station_id': self.station.id,
+            'song_name': 'Song',
+            'artist_name': 'Artist',
+            'listeners': 10,
+        }
+        defaults.update(kwargs)
+        return NowPlayingReport(**defaults)
+
+    def test_first_report_creates_everything(self):
+        result = MetadataWriteService.write(self._report())
+
+        self.assertTrue(result.written)
+        self.assertTrue(result.metadata_changed)
+        song = Songs.objects.select_related('artist').get(id=result.song_id)
+        self.assertEqual((song.name, song.artist.name), ('Song', 'Artist'))
+        now_playing = StationsNowPlaying.objects.get(station=self.station)
+        self.assertEqual(now_playing.song_id, song.id)
+        self.station.refresh_from_db()
+        self.assertEqual(self.station.latest_station_now_playing_id, now_playing.id)
+        self.assertEqual(StationsNowPlayingHistory.objects.filter(station=self.station).count(), 1)
+
+    def test_unchanged_report_only_reads(self):
+        MetadataWriteService.write(self._report())
+
+        with CaptureQueriesContext(connection) as queries:
+            result = MetadataWriteService.write(self._report())
+
+        self.assertFalse(result.written)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(StationsNowPlayingHistory.objects.filter(station=self.station).count(), 1)
+
+    def test_song_change_writes_history_and_reuses_songs(self):
+        first = MetadataWriteService.write(self._report())
+        MetadataWriteService.write(self._report(song_name='Other'))
+
+        with CaptureQueriesContext(connection) as queries:
+            result = MetadataWriteService.write(self._report())
+
+        # State read, cached song check, now playing upsert and history insert:
+        # no artist/song upsert with the song id from the cache
+        self.assertEqual(len(queries.captured_queries), 4)
+        self.assertFalse(any('INSERT INTO "songs"' in q['sql'] or 'INSERT INTO songs' in q['sql']
+                             for q in queries.captured_queries))
+        self.assertEqual(result.song_id, first.song_id)
+        self.assertTrue(result.metadata_changed)
+        self.assertEqual(StationsNowPlayingHistory.objects.filter(station=self.station).count(), 3)
+
+    def test_stale_cached_song_is_recreated(self):
+        MetadataWriteService.write(self._report())
+        MetadataWriteService.write(self._report(song_name=None, artist_name=None))
+        Songs.objects.filter(name='Song').delete()
+
+        result = MetadataWriteService.write(self._report())
+
+        self.assertTrue(Songs.objects.filter(id=result.song_id, name='Song').exists())
+
+    def test_unknown_station_slug(self):
+        with self.assertRaises(Stations.DoesNotExist):
+            MetadataWriteService.write(self._report(station_id=None, station_slug='missing'))
@@ -0,0 +1,99 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from ..services.now_playing_events_service import (
+    NowPlayingBroadcaster,
+    NowPlayingEventsService,
+    broadcaster,
+)
+from ..views.now_playing_stream import NowPlayingStreamView
+
+
+class NowPlayingEventsServiceTests(SimpleTestCase):
+    def test_delta_has_the_stations_metadata_shape(self):
+        now_playing = SimpleNamespace(timestamp=timezone.now(), listeners=12)
+        song = SimpleNamespace(id=3, name='Song', thumbnail_url=None, artist=None)
+
+        delta = NowPlayingEventsService.build_delta(1, 'station', now_playing, song)
+
+        self.assertEqual(delta['station_slug'], 'station')
+        self.assertEqual(delta['now_playing']['listeners'], 12)
+        self.assertEqual(delta['now_playing']['song'], {'id': 3, 'name': 'Song', 'thumbnail_url': None, 'artist': None})
+
+    def test_publish_sends_compact_json(self):
+        client = mock.Mock()
+        with mock.patch(
+            'superapp.apps.radio_crestin.services.now_playing_events_service.get_redis_client', return_value=client
+        ):
+            NowPlayingEventsService._publish({'station_slug': 'station'})
+
+        client.publish.assert_called_once_with(NowPlayingEventsService.CHANNEL, '{"station_slug":"station"}')
+
+
+class NowPlayingBroadcasterTests(SimpleTestCase):
+    def test_slow_subscriber_loses_its_oldest_delta(self):
+        fanout = NowPlayingBroadcaster()
+        fanout.QUEUE_SIZE = 2
+
+        async def run():
+            with mock.patch.object(fanout, '_run', new=mock.AsyncMock()):
+                queue = fanout.subscribe()
+            for index in range(3):
+                fanout._dispatch('station', str(index))
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        self.assertEqual(asyncio.run(run()), [('station', '1'), ('station', '2')])
+
+    def test_unsubscribed_queue_gets_nothing(self):
+        fanout = NowPlayingBroadcaster()
+
+        async def run():
+            with mock.patch.object(fanout, '_run', new=mock.AsyncMock()):
+                queue = fanout.subscribe()
+            fanout.unsubscribe(queue)
+            fanout._dispatch('station', '{}')
+            return queue.empty()
+
+        self.assertTrue(asyncio.run(run()))
+
+
+class NowPlayingStreamViewTests(SimpleTestCase):
+    def test_stream_headers(self):
+        with mock.patch.object(broadcaster, '_run', new=mock.AsyncMock()):
+            response = self.client.get('/api/v1/stations-metadata/stream?station_slugs=a')
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual(response['X-Accel-Buffering'], 'no')
+
+    def test_stream_relays_deltas_of_the_requested_stations(self):
+        data = json.dumps({'station_slug': 'a'})
+
+        async def run():
+            with mock.patch.object(broadcaster, '_run', new=mock.AsyncMock()):
+                stream = NowPlayingStreamView()._event_stream({'a'})
+                events = [await anext(stream)]
+                broadcaster._dispatch('b', json.dumps({'station_slug': 'b'}))
+                broadcaster._dispatch('a', data)
+                events.append(await anext(stream))
+                await stream.aclose()
+            return events
+
+        self.assertEqual(asyncio.run(run()), ['retry: 3000\n\n', f'event: now_playing\ndata: {data}\n\n'])
+        self.assertEqual(broadcaster._subscribers, set())
+
+    def test_idle_stream_sends_keepalives(self):
+        async def run():
+            with mock.patch.object(broadcaster, '_run', new=mock.AsyncMock()), \
+                    mock.patch.object(NowPlayingStreamView, 'KEEPALIVE_SECONDS', 0.01):
+                stream = NowPlayingStreamView()._event_stream(set())
+                events = [await anext(stream), await anext(stream)]
+                await stream.aclose()
+            return events
+
+        self.assertEqual(asyncio.run(run())[1], ': keepalive\n\n')
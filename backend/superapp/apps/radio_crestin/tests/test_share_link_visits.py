@@ -0,0 +1,41 @@
+import json
+
+from django.test import TestCase
+
+from ..models import AppUsers, ShareLink, ShareLinkVisit
+from ..services.share_link_visit_buffer import ShareLinkVisitBuffer
+
+
+class ShareLinkVisitBufferTests(TestCase):
+    def setUp(self):
+        self.share_link = ShareLink.objects.create(
+            share_id="abc123",
+            user=AppUsers.objects.create(anonymous_id="creator"),
+        )
+
+    def _item(self, visitor_ip, share_link_id=None):
+        return json.dumps({
+            'share_link_id': share_link_id or self.share_link.id,
+            'visitor_id': ShareLinkVisitBuffer.visitor_id(visitor_ip, 'UA'),
+            'visitor_ip': visitor_ip,
+            'visitor_user_agent': 'UA',
+            'visitor_referer': '',
+            'visited_at': '2026-01-01T10:00:00+00:00',
+        }).encode()
+
+    def test_write_aggregates_and_dedupes(self):
+        items = [self._item('10.0.0.1'), self._item('10.0.0.2'), self._item('10.0.0.1'), b'not json']
+
+        self.assertEqual(ShareLinkVisitBuffer._write(items), 2)
+        # Visitors already in the database are not counted again
+        self.assertEqual(ShareLinkVisitBuffer._write([self._item('10.0.0.2'), self._item('10.0.0.3')]), 1)
+
+        self.share_link.refresh_from_db()
+        self.assertEqual(self.share_link.visit_count, 3)
+        self.assertEqual(ShareLinkVisit.objects.filter(share_link=self.share_link).count(), 3)
+
+    def test_write_skips_inactive_links(self):
+        ShareLink.objects.filter(id=self.share_link.id).update(is_active=False)
+
+        self.assertEqual(ShareLinkVisitBuffer._write([self._item('10.0.0.1')]), 0)
+        self.assertFalse(ShareLinkVisit.objects.exists())
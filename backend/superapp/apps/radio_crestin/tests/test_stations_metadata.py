@@ -11,7 +11,11 @@ from ..models import (
 )
 
 
-@override_settings(DEBUG_TOOLBAR_CONFIG={"SHOW_TOOLBAR_CALLBACK": lambda request: False})
+@override_settings(
+    DEBUG_TOOLBAR_CONFIG={"SHOW_TOOLBAR_CALLBACK": lambda request: False},
+    # GraphQL database work on the test thread, inside the test transaction
+    GRAPHQL_SYNC_THREADS=0,
+)
 class StationsMetadataPerformanceTests(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -108,6 +112,20 @@ class StationsMetadataPerformanceTests(TestCase):
         self.assertNotIn('station-0', slugs)
         self.assertNotIn('station-1', slugs)
 
+    def test_stations_snapshot_invalidated_on_station_change(self):
+        """Editing a station rebuilds the cached stations snapshot."""
+        ts = int(timezone.now().timestamp())
+        self.client.get('/api/v1/stations', {'timestamp': ts})
+
+        station = self.stations[3]
+        station.title = "Renamed Station"
+        station.save()
+
+        response = self.client.get('/api/v1/stations', {'timestamp': ts})
+        self.assertEqual(response.status_code, 200)
+        titles = {s['slug']: s['title'] for s in response.json()['data']['stations']}
+        self.assertEqual(titles['station-3'], "Renamed Station")
+
     # ──────────────────────────────────────────────
     # /api/v1/stations-metadata
     # ──────────────────────────────────────────────
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from . import views
-from .views import PodHealthReportView
+from .views import PodHealthReportView, NowPlayingStreamView
 
 # App-specific URL patterns
 app_name = 'radio_crestin'
@@ -22,4 +22,6 @@ def extend_superapp_urlpatterns(main_urlpatterns):
         path('api/v1/docs/', api_docs_view, name='api_docs'),
         # Pod health reporting API (for streaming pods)
         path('api/v1/pod-health/', PodHealthReportView.as_view(), name='api_v1_pod_health'),
+        # Server-sent events stream of now playing changes
+        path('api/v1/stations-metadata/stream', NowPlayingStreamView.as_view(), name='api_v1_stations_metadata_stream'),
     ])
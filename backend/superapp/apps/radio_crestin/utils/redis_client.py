@@ -0,0 +1,31 @@
+import os
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis_url() -> Optional[str]:
+    """Redis URL shared with the cache and the Celery broker."""
+    return os.environ.get('REDIS_BROKER_URL') or None
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """Process-wide synchronous Redis client, or None when Redis isn't configured."""
+    global _client
+    redis_url = get_redis_url()
+    if not redis_url:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(redis_url, socket_timeout=1)
+    return _client
+
+
+def create_async_redis_client() -> Optional[redis.asyncio.Redis]:
+    """New asyncio Redis client, to be owned (and closed) by the caller's event loop."""
+    redis_url = get_redis_url()
+    if not redis_url:
+        return None
+    return redis.asyncio.Redis.from_url(redis_url)
@@ -9,3 +9,4 @@ from .legacy_views import (
     api_docs_view,
 )
 from .pod_health_api import PodHealthReportView
+from .now_playing_stream import NowPlayingStreamView
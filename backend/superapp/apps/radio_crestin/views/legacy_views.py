@@ -10,6 +10,7 @@ import logging
 from ..models import Songs, Artists
 from ..services import AutocompleteService
 from ..services.share_link_service import ShareLinkService
+from ..services.share_link_visit_buffer import ShareLinkVisitBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -259,27 +260,20 @@ class ShareLinkRedirectView(View):
         visitor_user_agent = request.META.get('HTTP_USER_AGENT', '')
         visitor_referer = request.META.get('HTTP_REFERER', '')
         
-        # Get or create session ID for tracking unique visitors
-        visitor_session_id = ''
-        if hasattr(request, 'session'):
-            if not request.session.session_key:
-                request.session.create()
-            visitor_session_id = request.session.session_key
-        
         # Check if visitor is the share link creator (don't count their visits)
         is_creator = False
         if hasattr(request, 'user') and request.user.is_authenticated:
             if hasattr(request.user, 'anonymous_id'):
                 is_creator = request.user.anonymous_id == share_link.user.anonymous_id
         
-        # Track visit if not the creator
+        # Queue the visit if not the creator; it is deduplicated in Redis and
+        # written in bulk by the flush_share_link_visits task
         if not is_creator:
-            ShareLinkService.track_visit(
-                share_id=share_id,
+            ShareLinkVisitBuffer.record(
+                share_link,
                 visitor_ip=visitor_ip,
                 visitor_user_agent=visitor_user_agent,
                 visitor_referer=visitor_referer,
-                visitor_session_id=visitor_session_id
             )
         
         # Detect device type
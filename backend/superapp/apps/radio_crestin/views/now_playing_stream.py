@@ -0,0 +1,51 @@
+import asyncio
+
+from django.http import StreamingHttpResponse
+from django.views import View
+
+from ..services.now_playing_events_service import broadcaster
+
+
+class NowPlayingStreamView(View):
+    """
+    Server-sent events stream of now playing changes.
+
+    GET /api/v1/stations-metadata/stream?station_slugs=a,b
+
+    Each event's data is the JSON delta published by NowPlayingEventsService.
+    Clients should load the initial state from /api/v1/stations-metadata and
+    apply the deltas on top of it.
+    """
+
+    KEEPALIVE_SECONDS = 15
+
+    async def get(self, request):
+        station_slugs = {
+            slug for slug in request.GET.get('station_slugs', '').split(',') if slug
+        }
+
+        response = StreamingHttpResponse(
+            self._event_stream(station_slugs),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        response['Access-Control-Allow-Origin'] = '*'
+        return response
+
+    async def _event_stream(self, station_slugs):
+        queue = broadcaster.subscribe()
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    slug, data = await asyncio.wait_for(queue.get(), timeout=self.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keepalive\n\n'
+                    continue
+                if station_slugs and slug not in station_slugs:
+                    continue
+                yield f'event: now_playing\ndata: {data}\n\n'
+        finally:
+            broadcaster.unsubscribe(queue)
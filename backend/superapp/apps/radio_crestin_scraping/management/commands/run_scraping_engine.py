@@ -0,0 +1,47 @@
+import asyncio
+import signal
+
+from django.core.management.base import BaseCommand
+
+from superapp.apps.radio_crestin_scraping.services.scraping_engine import ScrapingEngine
+
+
+class Command(BaseCommand):
+    help = 'Scrape metadata for all stations continuously in a single asyncio event loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--per-host-limit',
+            type=int,
+            default=4,
+            help='Maximum concurrent requests to the same upstream host (default: 4)',
+        )
+        parser.add_argument(
+            '--max-connections',
+            type=int,
+            default=100,
+            help='Size of the shared HTTP connection pool (default: 100)',
+        )
+        parser.add_argument(
+            '--flush-interval',
+            type=float,
+            default=1.0,
+            help='Seconds between batched database writes (default: 1.0)',
+        )
+
+    def handle(self, *args, **options):
+        engine = ScrapingEngine(
+            per_host_limit=options['per_host_limit'],
+            max_connections=options['max_connections'],
+            flush_interval=options['flush_interval'],
+        )
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, engine.stop)
+            await engine.run()
+
+        self.stdout.write('Starting scraping engine...')
+        asyncio.run(main())
+        self.stdout.write(self.style.SUCCESS('Scraping engine stopped'))
@@ -1,7 +1,8 @@
 import logging
 import time
 import urllib3
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
 
 import requests
 from django.conf import settings
@@ -20,6 +21,9 @@ logger = logging.getLogger(__name__)
 class UptimeScraper(BaseScraper):
     """Scraper for checking station uptime using lightweight HTTP requests"""
 
+    # Upper bound on streams probed at the same time during a full sweep
+    MAX_CONCURRENT_CHECKS = 32
+
     def get_scraper_type(self) -> str:
         return "uptime_http"
 
@@ -50,21 +54,34 @@ class UptimeScraper(BaseScraper):
         return result
 
     def check_all_stations_uptime(self) -> Dict[str, Any]:
-        """Check uptime for all active stations"""
-        stations = UptimeService.get_all_active_stations()
+        """
+        Check uptime for all active stations.
+
+        Streams are probed concurrently on a bounded thread pool, so a sweep
+        takes about as long as the slowest probe instead of the sum of all of
+        them. The results are saved together in one bulk transaction.
+        """
+        stations = list(UptimeService.get_all_active_stations())
 
         results = []
+        uptime_by_station = {}
         total_checked = 0
         total_up = 0
 
-        for station in stations:
-            total_checked += 1
-            result = self._check_single_station_uptime(station)
-            results.append(result)
-            if result["is_up"]:
-                total_up += 1
+        if stations:
+            max_workers = min(self.MAX_CONCURRENT_CHECKS, len(stations))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='uptime') as executor:
+                probes = executor.map(self._probe_station_uptime, stations)
+                for station, (result, uptime_data) in zip(stations, probes):
+                    total_checked += 1
+                    results.append(result)
+                    uptime_by_station[station.id] = uptime_data
+                    if result["is_up"]:
+                        total_up += 1
+
+                    logger.info(f"Station {station.id} ({station.title}): UP={result['is_up']}, Latency={result['latency_ms']}ms")
 
-            logger.info(f"Station {station.id} ({station.title}): UP={result['is_up']}, Latency={result['latency_ms']}ms")
+        UptimeService.bulk_upsert_station_uptime(uptime_by_station)
 
         summary = {
             "success": True,
@@ -79,7 +96,21 @@ class UptimeScraper(BaseScraper):
 
     def _check_single_station_uptime(self, station) -> Dict[str, Any]:
         """Check uptime for a single station using lightweight HTTP request and save the result"""
-        # If check_uptime is False, save and return is_up=True with 0ms latency
+        result, uptime_data = self._probe_station_uptime(station)
+
+        # Save to database
+        try:
+            UptimeService.upsert_station_uptime(station.id, uptime_data)
+        except Exception as e:
+            logger.error(f"Failed to save uptime data for station {station.id}: {e}")
+            if settings.DEBUG:
+                raise
+
+        return result
+
+    def _probe_station_uptime(self, station) -> Tuple[Dict[str, Any], StationUptimeData]:
+        """Probe a station's stream without saving; safe to run from worker threads"""
+        # If check_uptime is False, report is_up=True with 0ms latency
         if not getattr(station, 'check_uptime', True):
             raw_data = {"method": "skipped", "reason": "check_uptime_disabled"}
             uptime_data = StationUptimeData(
@@ -88,10 +119,6 @@ class UptimeScraper(BaseScraper):
                 latency_ms=0,
                 raw_data=[raw_data]
             )
-            try:
-                UptimeService.upsert_station_uptime(station.id, uptime_data)
-            except Exception as e:
-                logger.error(f"Failed to save uptime data for station {station.id}: {e}")
             return {
                 "success": True,
                 "station_id": station.id,
@@ -101,9 +128,9 @@ class UptimeScraper(BaseScraper):
                 "latency_ms": 0,
                 "error": None,
                 "raw_data": raw_data
-            }
+            }, uptime_data
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         is_up = False
         latency_ms = 0
         error_msg = None
@@ -114,7 +141,7 @@ class UptimeScraper(BaseScraper):
             response_data = self._check_stream_response(station.stream_url)
 
             # Calculate latency
-            end_time = time.time()
+            end_time = time.perf_counter()
             latency_ms = int((end_time - start_time) * 1000)
 
             if response_data['success']:
@@ -136,7 +163,7 @@ class UptimeScraper(BaseScraper):
                 }
 
         except requests.exceptions.Timeout:
-            end_time = time.time()
+            end_time = time.perf_counter()
             latency_ms = int((end_time - start_time) * 1000)
             error_msg = f"Request timeout after {latency_ms}ms"
             raw_data = {
@@ -146,7 +173,7 @@ class UptimeScraper(BaseScraper):
             }
 
         except Exception as e:
-            end_time = time.time()
+            end_time = time.perf_counter()
             latency_ms = int((end_time - start_time) * 1000)
             error_msg = f"Unexpected error: {str(e)}"
             raw_data = {
@@ -167,14 +194,6 @@ class UptimeScraper(BaseScraper):
             raw_data=[raw_data]
         )
 
-        # Save to database
-        try:
-            UptimeService.upsert_station_uptime(station.id, uptime_data)
-        except Exception as e:
-            logger.error(f"Failed to save uptime data for station {station.id}: {e}")
-            if settings.DEBUG:
-                raise
-
         return {
             "success": True,
             "station_id": station.id,
@@ -184,7 +203,7 @@ class UptimeScraper(BaseScraper):
             "latency_ms": latency_ms,
             "error": error_msg,
             "raw_data": raw_data
-        }
+        }, uptime_data
 
     def _check_stream_response(self, url: str, timeout: float = 3.0) -> Dict[str, Any]:
         """Check if stream responds using lightweight HTTP GET request"""
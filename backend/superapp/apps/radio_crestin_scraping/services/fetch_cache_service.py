@@ -0,0 +1,115 @@
+import hashlib
+import logging
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchCacheEntry:
+    """Validators and extracted result of the last payload seen for a fetcher."""
+    url: str
+    content_hash: str
+    result: Dict[str, Any]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class FetchCacheService:
+    """
+    Change detection for metadata fetches.
+
+    Remembers, per metadata fetcher, the ETag/Last-Modified validators and a
+    hash of the last payload together with the result extracted from it. The
+    next fetch is sent as a conditional request; a 304 or a byte-identical body
+    reuses the stored result, so the payload is neither re-parsed nor written
+    again. Entries expire after TTL, which forces a full refresh now and then.
+    """
+
+    KEY_PREFIX = 'radio_crestin_scraping:fetch_cache'
+    TTL = timedelta(minutes=15)
+
+    @classmethod
+    def _key(cls, fetcher) -> str:
+        return f'{cls.KEY_PREFIX}:{fetcher.id}'
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[FetchCacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    @classmethod
+    def _from_cached(cls, fetcher, value) -> Optional[FetchCacheEntry]:
+        if not value:
+            return None
+        entry = FetchCacheEntry(**value)
+        # The fetcher was edited to point somewhere else
+        if entry.url != fetcher.url:
+            return None
+        return entry
+
+    @classmethod
+    def get(cls, fetcher) -> Optional[FetchCacheEntry]:
+        try:
+            return cls._from_cached(fetcher, cache.get(cls._key(fetcher)))
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error reading fetch cache for {fetcher.url}: {e}")
+            return None
+
+    @classmethod
+    async def aget(cls, fetcher) -> Optional[FetchCacheEntry]:
+        try:
+            return cls._from_cached(fetcher, await cache.aget(cls._key(fetcher)))
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error reading fetch cache for {fetcher.url}: {e}")
+            return None
+
+    @classmethod
+    def set(cls, fetcher, entry: FetchCacheEntry) -> None:
+        try:
+            cache.set(cls._key(fetcher), asdict(entry), timeout=int(cls.TTL.total_seconds()))
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error writing fetch cache for {fetcher.url}: {e}")
+
+    @classmethod
+    async def aset(cls, fetcher, entry: FetchCacheEntry) -> None:
+        try:
+            await cache.aset(cls._key(fetcher), asdict(entry), timeout=int(cls.TTL.total_seconds()))
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error writing fetch cache for {fetcher.url}: {e}")
+
+    @classmethod
+    def forget(cls, fetchers: Iterable[Any]) -> None:
+        """
+        Drop the entries of these fetchers, e.g. after their result failed to
+        persist, so the next poll is processed in full.
+        """
+        try:
+            cache.delete_many([cls._key(fetcher) for fetcher in fetchers])
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error clearing fetch cache: {e}")
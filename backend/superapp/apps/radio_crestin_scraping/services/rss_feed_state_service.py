@@ -0,0 +1,75 @@
+import logging
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RssFeedState:
+    """What the last successfully processed fetch of a station's feed looked like."""
+    url: str
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Identity (guid, else link) of the newest entry already stored
+    newest_entry_id: Optional[str] = None
+
+
+class RssFeedStateService:
+    """
+    Per-station RSS feed fingerprints.
+
+    Lets scrape_station_rss_feed send conditional requests, skip bodies that
+    are byte-identical to the last one, and stop walking entries at the first
+    one it has already stored. State only expires after TTL, so a feed is
+    still processed in full at least that often.
+    """
+
+    KEY_PREFIX = 'radio_crestin_scraping:rss_feed_state'
+    TTL = timedelta(hours=24)
+
+    @classmethod
+    def _key(cls, station_id: int) -> str:
+        return f'{cls.KEY_PREFIX}:{station_id}'
+
+    @staticmethod
+    def conditional_headers(state: Optional[RssFeedState]) -> Dict[str, str]:
+        headers = {}
+        if state is None:
+            return headers
+        if state.etag:
+            headers['If-None-Match'] = state.etag
+        if state.last_modified:
+            headers['If-Modified-Since'] = state.last_modified
+        return headers
+
+    @classmethod
+    def get(cls, station_id: int, url: str) -> Optional[RssFeedState]:
+        try:
+            value = cache.get(cls._key(station_id))
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error reading RSS feed state for station {station_id}: {e}")
+            return None
+        if not value:
+            return None
+        state = RssFeedState(**value)
+        # The station's feed URL was changed
+        if state.url != url:
+            return None
+        return state
+
+    @classmethod
+    def set(cls, station_id: int, state: RssFeedState) -> None:
+        try:
+            cache.set(cls._key(station_id), asdict(state), timeout=int(cls.TTL.total_seconds()))
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.warning(f"Error writing RSS feed state for station {station_id}: {e}")
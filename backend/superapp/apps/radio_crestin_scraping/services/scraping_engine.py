@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+
+from ..scrapers.factory import ScraperFactory
+from ..tasks.scrape_station_metadata import build_station_now_playing_data
+from ..tasks.utils import run_scraper_async
+from ..utils.data_types import StationNowPlayingData
+from .fetch_cache_service import FetchCacheService
+from .station_service import StationService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StationScrapeConfig:
+    """What the engine needs to scrape one station, reloaded periodically."""
+    station_id: int
+    interval: int
+    fetchers: List[Any]  # StationsMetadataFetch, ordered by -priority
+
+
+class ScrapingEngine:
+    """
+    Long-lived asyncio engine that scrapes every station in one event loop.
+
+    Replaces the per-station Celery fan-out of scrape_all_stations_metadata:
+      - one pooled httpx.AsyncClient shared by all scrapers (keep-alive, no
+        per-scrape TLS handshake)
+      - a concurrency limit per upstream host
+      - each station runs on its own metadata_scrape_interval
+      - results are queued and persisted in batched transactions
+    """
+
+    def __init__(
+        self,
+        per_host_limit: int = 4,
+        max_connections: int = 100,
+        flush_interval: float = 1.0,
+        reload_interval: float = 60.0,
+    ):
+        self.per_host_limit = per_host_limit
+        self.max_connections = max_connections
+        self.flush_interval = flush_interval
+        self.reload_interval = reload_interval
+
+        self._configs: Dict[int, StationScrapeConfig] = {}
+        self._station_tasks: Dict[int, asyncio.Task] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._pending: List[Tuple[StationScrapeConfig, StationNowPlayingData, bool]] = []
+        self._stop_event: Optional[asyncio.Event] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def stop(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self):
+        self._stop_event = asyncio.Event()
+        timeout = httpx.Timeout(connect=5.0, read=5.0, write=5.0, pool=5.0)
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+
+        async with httpx.AsyncClient(
+            timeout=timeout, limits=limits, verify=False, follow_redirects=True
+        ) as client:
+            self._client = client
+            writer = asyncio.create_task(self._writer_loop())
+            try:
+                while not self._stop_event.is_set():
+                    await self._reload_stations()
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), timeout=self.reload_interval)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                for task in self._station_tasks.values():
+                    task.cancel()
+                await asyncio.gather(*self._station_tasks.values(), return_exceptions=True)
+                self._station_tasks.clear()
+                writer.cancel()
+                await asyncio.gather(writer, return_exceptions=True)
+                await self._flush()
+
+        logger.info("Scraping engine stopped")
+
+    async def _reload_stations(self):
+        try:
+            configs = await sync_to_async(self._load_station_configs)()
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error loading stations for scraping engine: {e}")
+            return
+
+        self._configs = configs
+
+        for station_id in list(self._station_tasks):
+            if station_id not in configs:
+                self._station_tasks.pop(station_id).cancel()
+
+        for station_id in configs:
+            if station_id not in self._station_tasks:
+                self._station_tasks[station_id] = asyncio.create_task(self._station_loop(station_id))
+
+        logger.info(f"Scraping engine tracking {len(configs)} stations")
+
+    @staticmethod
+    def _load_station_configs() -> Dict[int, StationScrapeConfig]:
+        close_old_connections()
+        configs = {}
+        for station in StationService.get_stations_with_metadata_fetchers():
+            fetchers = sorted(
+                station.station_metadata_fetches.all(),
+                key=lambda fetcher: fetcher.priority,
+                reverse=True,
+            )
+            if not fetchers:
+                continue
+            configs[station.id] = StationScrapeConfig(
+                station_id=station.id,
+                interval=max(station.metadata_scrape_interval or 30, 1),
+                fetchers=fetchers,
+            )
+        return configs
+
+    async def _station_loop(self, station_id: int):
+        # Spread the first round over the interval instead of a thundering herd
+        config = self._configs.get(station_id)
+        await asyncio.sleep(random.uniform(0, config.interval if config else 1))
+
+        while True:
+            config = self._configs.get(station_id)
+            if config is None:
+                return
+
+            started = time.monotonic()
+            try:
+                await self._scrape_station(config)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Not re-raised under DEBUG: nothing awaits this task before shutdown,
+                # so the error would go unseen and the station would stop being scraped
+                if settings.DEBUG:
+                    logger.exception(f"Error scraping station {station_id}")
+                else:
+                    logger.error(f"Error scraping station {station_id}: {e}")
+
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(config.interval - elapsed, 0))
+
+    async def _scrape_station(self, config: StationScrapeConfig):
+        results = []
+        errors = []
+        all_unchanged = True
+
+        for fetcher in config.fetchers:
+            scraper = ScraperFactory.get_scraper(fetcher.station_metadata_fetch_category.slug)
+            if not scraper:
+                logger.warning(f"No scraper available for: {fetcher.station_metadata_fetch_category.slug}")
+                all_unchanged = False
+                continue
+
+            try:
+                async with self._host_semaphore(fetcher.url):
+                    result, unchanged = await run_scraper_async(scraper, fetcher, self._client)
+            except Exception as e:
+                all_unchanged = False
+                error_msg = f"Error scraping {fetcher.url}: {str(e)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                continue
+
+            all_unchanged = all_unchanged and unchanged
+
+            if result:
+                results.append({
+                    'priority': fetcher.priority,
+                    'data': result,
+                    'dirty_metadata': fetcher.dirty_metadata
+                })
+
+        if not results or all_unchanged:
+            return
+
+        # May fetch a thumbnail to compare hashes; keep it off the event loop
+        station_data = await asyncio.to_thread(build_station_now_playing_data, results, errors)
+        dirty_metadata = any(r['dirty_metadata'] for r in results)
+        self._pending.append((config, station_data, dirty_metadata))
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).hostname or ''
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def _writer_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._flush()
+            except Exception:
+                # Only raised under DEBUG; keep flushing, like _station_loop keeps scraping
+                logger.exception("Error flushing scraping results")
+
+    async def _flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await sync_to_async(self._write_batch)(batch)
+        except Exception as e:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error writing scraping batch of {len(batch)} stations: {e}")
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple[StationScrapeConfig, StationNowPlayingData, bool]]):
+        close_old_connections()
+        # Only the latest result per station matters within a batch
+        latest = {}
+        for config, station_data, dirty_metadata in batch:
+            latest[config.station_id] = (config, station_data, dirty_metadata)
+
+        failed = []
+        try:
+            with transaction.atomic():
+                for station_id, (config, station_data, dirty_metadata) in latest.items():
+                    # A savepoint per station: a failed write only rolls back its own station
+                    try:
+                        with transaction.atomic():
+                            success = StationService.upsert_station_now_playing(
+                                station_id,
+                                station_data,
+                                dirty_metadata=dirty_metadata
+                            )
+                    except DatabaseError as e:
+                        if settings.DEBUG:
+                            raise
+                        logger.error(f"Error persisting now playing for station {station_id}: {e}")
+                        success = False
+                    if not success:
+                        failed.extend(config.fetchers)
+        except Exception:
+            FetchCacheService.forget(
+                fetcher for config, _, _ in latest.values() for fetcher in config.fetchers
+            )
+            raise
+
+        if failed:
+            # Make the next poll reprocess these payloads instead of skipping them
+            FetchCacheService.forget(failed)
+
+        logger.info(f"Persisted now playing for {len(latest)} stations")
@@ -1,17 +1,19 @@
 import logging
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import List, Optional, Dict, Any
 
 from django.conf import settings
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
-from superapp.apps.radio_crestin.models import (
-    Stations, StationsNowPlaying, StationsNowPlayingHistory,
-    Songs, Artists, Posts
-)
+from superapp.apps.radio_crestin.models import Stations, Posts
+from superapp.apps.radio_crestin.services.metadata_write_service import MetadataWriteService, NowPlayingReport
+from superapp.apps.radio_crestin.services.stations_snapshot_service import StationsSnapshotService
 from ..utils.data_types import (
     StationNowPlayingData,
-    StationRssFeedData, SongData
+    StationRssFeedData
 )
 
 logger = logging.getLogger(__name__)
@@ -56,52 +58,30 @@ class StationService:
     def upsert_station_now_playing(station_id: int, data: StationNowPlayingData, dirty_metadata: bool = True) -> bool:
         """Upsert station now playing data"""
         try:
-            # Get or create song if we have song data
-            song = None
+            song_name = artist_name = thumbnail_url = None
             if data.current_song and (data.current_song.name or data.current_song.artist):
-                song = StationService._upsert_song(data.current_song, dirty_metadata)
+                song_name = data.current_song.name or ''
+                artist_name = data.current_song.artist or None
+                thumbnail_url = data.current_song.thumbnail_url or None
 
-            # Capture previous state before update (1 indexed single-row SELECT)
-            previous = StationsNowPlaying.objects.filter(
-                station_id=station_id
-            ).values('song_id', 'listeners').first()
+            timestamp = parse_datetime(data.timestamp) if isinstance(data.timestamp, str) else data.timestamp
+            if timestamp and timezone.is_naive(timestamp):
+                timestamp = timezone.make_aware(timestamp)
 
-            # Upsert station now playing record
-            now_playing, created = StationsNowPlaying.objects.update_or_create(
+            result = MetadataWriteService.write(NowPlayingReport(
+                timestamp=timestamp or timezone.now(),
                 station_id=station_id,
-                defaults={
-                    'timestamp': data.timestamp or timezone.now(),
-                    'song': song,
-                    'listeners': data.listeners,
-                    'raw_data': data.raw_data,
-                    'error': data.error,
-                }
-            )
-
-            # Write history when metadata changes (song or listener count)
-            new_song_id = song.id if song else None
-            new_listeners = data.listeners
-            now_timestamp = data.timestamp or timezone.now()
-
-            metadata_changed = (
-                created
-                or (previous['song_id'] if previous else None) != new_song_id
-                or (previous['listeners'] if previous else None) != new_listeners
-            )
-            if metadata_changed:
-                StationsNowPlayingHistory.objects.create(
-                    station_id=station_id,
-                    timestamp=now_timestamp,
-                    song=song,
-                    listeners=new_listeners,
-                )
-
-            # Update station's latest_station_now_playing reference
-            Stations.objects.filter(id=station_id).update(
-                latest_station_now_playing=now_playing
-            )
-
-            logger.info(f"{'Created' if created else 'Updated'} now playing for station {station_id}")
+                song_name=song_name,
+                artist_name=artist_name,
+                song_thumbnail_url=thumbnail_url,
+                dirty_metadata=dirty_metadata,
+                listeners=data.listeners,
+                raw_data=data.raw_data,
+                error=data.error,
+            ))
+
+            if result.written:
+                logger.info(f"Updated now playing for station {station_id}")
             return True
 
         except Exception as error:
@@ -114,43 +94,49 @@ class StationService:
     @staticmethod
     @transaction.atomic
     def upsert_station_posts(station_id: int, rss_data: StationRssFeedData) -> bool:
-        """Upsert station posts from RSS feed data"""
+        """
+        Upsert station posts from RSS feed data.
+
+        Existing posts are loaded with one query keyed by link; only new and
+        changed entries are written, so an unchanged feed costs one SELECT.
+        """
         if not rss_data.posts:
             return True
 
         try:
+            # Feeds occasionally repeat an entry; keep the first one per link
+            incoming = {}
+            for post_data in rss_data.posts:
+                published = StationService._parse_published(post_data.published)
+                if not post_data.link or published is None:
+                    logger.warning(f"Skipping post without link or valid date: {post_data.link}")
+                    continue
+                incoming.setdefault(post_data.link, (post_data.title, post_data.description, published))
+
+            existing = {}
+            for post in Posts.objects.filter(
+                station_id=station_id, link__in=incoming.keys()
+            ).only('id', 'link', 'title', 'description', 'published').order_by('id'):
+                existing.setdefault(post.link, post)
+
             posts_to_create = []
             posts_to_update = []
-
-            for post_data in rss_data.posts:
-                try:
-                    # Check if post already exists
-                    existing_post = Posts.objects.filter(
+            for link, (title, description, published) in incoming.items():
+                post = existing.get(link)
+                if post is None:
+                    posts_to_create.append(Posts(
                         station_id=station_id,
-                        link=post_data.link
-                    ).first()
-
-                    if existing_post:
-                        # Update existing post
-                        existing_post.title = post_data.title
-                        existing_post.description = post_data.description
-                        existing_post.published = post_data.published
-                        posts_to_update.append(existing_post)
-                    else:
-                        # Create new post
-                        posts_to_create.append(Posts(
-                            station_id=station_id,
-                            title=post_data.title,
-                            link=post_data.link,
-                            description=post_data.description,
-                            published=post_data.published
-                        ))
-
-                except Exception as post_error:
-                    if settings.DEBUG:
-                        raise
-                    logger.error(f"Error processing post {post_data.link}: {post_error}")
-                    continue
+                        title=title,
+                        link=link,
+                        description=description,
+                        published=published,
+                    ))
+                elif (post.title, post.description, post.published) != (title, description, published):
+                    post.title = title
+                    post.description = description
+                    post.published = published
+                    post.updated_at = timezone.now()
+                    posts_to_update.append(post)
 
             # Bulk operations
             if posts_to_create:
@@ -160,10 +146,14 @@ class StationService:
             if posts_to_update:
                 Posts.objects.bulk_update(
                     posts_to_update,
-                    ['title', 'description', 'published']
+                    ['title', 'description', 'published', 'updated_at']
                 )
                 logger.info(f"Updated {len(posts_to_update)} posts for station {station_id}")
 
+            if posts_to_create or posts_to_update:
+                # Bulk operations don't send model signals
+                StationsSnapshotService.invalidate()
+
             return True
 
         except Exception as error:
@@ -173,57 +163,25 @@ class StationService:
             return False
 
     @staticmethod
-    def _upsert_song(song_data: SongData, dirty_metadata: bool = True) -> Optional[Songs]:
-        """Upsert song and artist data with dirty metadata tracking"""
-        try:
-            # Get or create artist if we have artist name
-            artist = None
-            if song_data.artist:
-                try:
-                    # Check if artist already exists (don't override dirty_metadata=False)
-                    try:
-                        artist = Artists.objects.get(name=song_data.artist)
-                    except Artists.DoesNotExist:
-                        # Create new artist with dirty_metadata flag
-                        artist, _ = Artists.objects.get_or_create(
-                            name=song_data.artist,
-                            defaults={
-                                'name': song_data.artist,
-                                'dirty_metadata': dirty_metadata
-                            }
-                        )
-                except IntegrityError:
-                    # Handle race condition - artist was created by another process
-                    artist = Artists.objects.get(name=song_data.artist)
-
-            # Get or create song
-            song_defaults = {
-                'name': song_data.name or '',
-                'artist': artist,
-            }
-
-            if song_data.thumbnail_url:
-                song_defaults['thumbnail_url'] = song_data.thumbnail_url
-
-            # Check if song already exists (don't override dirty_metadata=False)
-            song_defaults['dirty_metadata'] = dirty_metadata
+    def _parse_published(published) -> Optional[datetime]:
+        """ISO 8601 or, as RSS feeds send it, RFC 2822 ("Tue, 14 Oct 2026 10:00:00 +0000")."""
+        if isinstance(published, datetime):
+            value = published
+        elif not published:
+            value = None
+        else:
             try:
-                song, created = Songs.objects.update_or_create(
-                    name=song_data.name or '',
-                    artist=artist,
-                    defaults=song_defaults
-                )
-            except IntegrityError:
-                # Handle race condition - song was created by another process
-                song = Songs.objects.get(name=song_data.name or '', artist=artist)
-
-            return song
-
-        except Exception as error:
-            if settings.DEBUG:
-                raise
-            logger.error(f"Error upserting song {song_data.name}: {error}")
-            return None
+                value = parse_datetime(published)
+            except ValueError:
+                value = None
+            if value is None:
+                try:
+                    value = parsedate_to_datetime(published)
+                except (TypeError, ValueError):
+                    value = None
+        if value is not None and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
 
     @staticmethod
     def delete_old_data(days_to_keep: int = 30):
@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Any
 from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from django.conf import settings
 from django.utils import timezone
 
@@ -35,7 +36,8 @@ class UptimeService:
 
             # Update station's latest_station_uptime reference
             Stations.objects.filter(id=station_id).update(
-                latest_station_uptime=uptime
+                latest_station_uptime=uptime,
+                updated_at=timezone.now()
             )
 
             logger.info(f"{'Created' if created else 'Updated'} uptime for station {station_id}")
@@ -45,4 +47,48 @@ class UptimeService:
             if settings.DEBUG:
                 raise
             logger.error(f"Error upserting station uptime for station {station_id}: {error}")
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def bulk_upsert_station_uptime(data_by_station: Dict[int, StationUptimeData]) -> bool:
+        """
+        Upsert the uptime of many stations at once: one INSERT ... ON CONFLICT
+        for the uptime rows and one UPDATE for the latest_station_uptime
+        references, in a single transaction.
+        """
+        if not data_by_station:
+            return True
+
+        try:
+            with transaction.atomic():
+                StationsUptime.objects.bulk_create(
+                    [
+                        StationsUptime(
+                            station_id=station_id,
+                            timestamp=data.timestamp,
+                            is_up=data.is_up,
+                            latency_ms=data.latency_ms,
+                            raw_data=data.raw_data,
+                        )
+                        for station_id, data in data_by_station.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=['station'],
+                    update_fields=['timestamp', 'is_up', 'latency_ms', 'raw_data', 'updated_at'],
+                )
+
+                Stations.objects.filter(id__in=data_by_station.keys()).update(
+                    latest_station_uptime=Subquery(
+                        StationsUptime.objects.filter(station_id=OuterRef('pk')).values('id')[:1]
+                    ),
+                    updated_at=timezone.now(),
+                )
+
+            logger.info(f"Upserted uptime for {len(data_by_station)} stations")
+            return True
+
+        except Exception as error:
+            if settings.DEBUG:
+                raise
+            logger.error(f"Error bulk upserting station uptime for {len(data_by_station)} stations: {error}")
+            return False
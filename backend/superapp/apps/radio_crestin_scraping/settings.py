@@ -54,6 +54,11 @@ def extend_superapp_settings(main_settings):
             },
         }
 
+        # The scraping engine (manage.py run_scraping_engine) scrapes every
+        # station on its own interval, so the Celery fan-out is not scheduled
+        if environ.get('SCRAPING_ENGINE_ENABLED', 'false').lower() == 'true':
+            del beat_schedule['scrape-all-stations-metadata']
+
         # Add beat schedule to Celery configuration
         main_settings['CELERY_BEAT_SCHEDULE'] = main_settings.get('CELERY_BEAT_SCHEDULE', {})
         main_settings['CELERY_BEAT_SCHEDULE'].update(beat_schedule)
@@ -3,13 +3,15 @@ import logging
 import uuid
 import hashlib
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from celery import shared_task
 from django.utils import timezone
 from django.conf import settings
 
 from ..scrapers.factory import ScraperFactory
+from ..services.fetch_cache_service import FetchCacheService
 from ..services.station_service import StationService
+from ..utils.data_types import StationNowPlayingData, SongData
 from .utils import run_scraper, merge_metadata_results
 
 logger = logging.getLogger(__name__)
@@ -89,6 +91,95 @@ def is_same_as_reference_colinde_thumbnail(thumbnail_url: str) -> bool:
     return image_hash == reference_hash
 
 
+def build_station_now_playing_data(results: List[Dict[str, Any]], errors: List[str]) -> StationNowPlayingData:
+    """
+    Merge fetcher results by priority into the StationNowPlayingData that gets
+    persisted, cleaning up known-bad thumbnails along the way.
+
+    Shared by the per-station Celery task and the async scraping engine.
+    """
+    merged_result = merge_metadata_results(results)
+    # Ensure merged_data is a dictionary
+    merged_data_raw = merged_result.get('results', {})
+    if isinstance(merged_data_raw, dict):
+        merged_data = merged_data_raw.get('merged_data', {})
+    else:
+        merged_data = {}
+    
+    # Ensure merged_data is a dictionary, not a list
+    if not isinstance(merged_data, dict):
+        merged_data = {}
+
+    song_data = merged_data.get('current_song', {}) if isinstance(merged_data, dict) else {}
+    current_song = None
+    
+    # Try to create SongData with proper error handling
+    try:
+        if isinstance(song_data, dict):
+            name_val = song_data.get('name')
+            artist_val = song_data.get('artist')
+            
+            # Only proceed if we have valid name or artist data
+            if name_val or artist_val:
+                # Ensure all values are strings, not lists
+                name_value = song_data.get('name', '')
+                artist_value = song_data.get('artist', '')
+                thumbnail_value = song_data.get('thumbnail_url', '')
+                
+                # Convert lists to strings if necessary
+                if isinstance(name_value, list):
+                    name_value = ' '.join(str(x) for x in name_value) if name_value else ''
+                else:
+                    name_value = str(name_value) if name_value else ''
+                    
+                if isinstance(artist_value, list):
+                    artist_value = ' '.join(str(x) for x in artist_value) if artist_value else ''
+                else:
+                    artist_value = str(artist_value) if artist_value else ''
+                    
+                if isinstance(thumbnail_value, list):
+                    thumbnail_value = str(thumbnail_value[0]) if thumbnail_value else ''
+                else:
+                    thumbnail_value = str(thumbnail_value) if thumbnail_value else ''
+
+                # Validate thumbnail_value and clean up invalid aripisprecer.ro thumbnails
+                if thumbnail_value:
+                    # Check for na.png from aripisprecer.ro
+                    if 'na.png' in thumbnail_value and 'aripisprecer.ro' in thumbnail_value:
+                        thumbnail_value = ''
+                    # Check if thumbnail is the same as reference colinde thumbnail by comparing image hashes
+                    elif 'aripisprecer.ro' in thumbnail_value:
+                        if is_same_as_reference_colinde_thumbnail(thumbnail_value):
+                            thumbnail_value = ''
+
+                current_song = SongData(
+                    name=name_value,
+                    artist=artist_value,
+                    thumbnail_url=thumbnail_value
+                )
+    except Exception as e:
+        logger.error(f"Error creating SongData: {e}, song_data: {song_data}")
+        current_song = None
+
+    listeners = merged_data.get('listeners') if isinstance(merged_data, dict) else None
+    error_list = merged_data.get('error', []) if isinstance(merged_data, dict) else []
+    if not isinstance(error_list, list):
+        error_list = []
+
+    station_data = StationNowPlayingData(
+        timestamp=timezone.now().isoformat(),
+        current_song=current_song,
+        listeners=listeners,
+        raw_data=json.loads(json.dumps({
+            'results': results,
+            'merged_data': merged_data,
+        }, default=str)),
+        error=error_list + errors
+    )
+
+    return station_data
+
+
 @shared_task(name='radio_crestin_scraping.scrape_station_metadata', time_limit=30)
 def scrape_station_metadata(station_id: int) -> Dict[str, Any]:
     """
@@ -122,15 +213,19 @@ def scrape_station_metadata(station_id: int) -> Dict[str, Any]:
     task_id = str(uuid.uuid4())
     results = []
     errors = []
+    # Stays True only if every fetcher returned the payload it returned last time
+    all_unchanged = True
 
     for fetcher in metadata_fetchers:
         try:
             scraper = ScraperFactory.get_scraper(fetcher.station_metadata_fetch_category.slug)
             if not scraper:
                 logger.warning(f"No scraper available for: {fetcher.station_metadata_fetch_category.slug}")
+                all_unchanged = False
                 continue
 
-            result = run_scraper(scraper, fetcher)
+            result, unchanged = run_scraper(scraper, fetcher)
+            all_unchanged = all_unchanged and unchanged
             if result:
                 results.append({
                     'priority': fetcher.priority,
@@ -139,97 +234,29 @@ def scrape_station_metadata(station_id: int) -> Dict[str, Any]:
                 })
 
         except Exception as e:
+            all_unchanged = False
             error_msg = f"Error scraping {fetcher.url}: {str(e)}"
             logger.error(error_msg)
             errors.append(error_msg)
             if settings.DEBUG:
                 raise
 
+    if results and all_unchanged:
+        # Same payloads as the last persisted scrape: nothing to merge or write
+        return {
+            "success": True,
+            "station_id": station_id,
+            "scraped_count": len(results),
+            "unchanged": True,
+            "errors": errors,
+            "task_id": task_id
+        }
+
     # Merge results and save
     success = False
 
     if results:
-        merged_result = merge_metadata_results(results)
-        # Ensure merged_data is a dictionary
-        merged_data_raw = merged_result.get('results', {})
-        if isinstance(merged_data_raw, dict):
-            merged_data = merged_data_raw.get('merged_data', {})
-        else:
-            merged_data = {}
-        
-        # Ensure merged_data is a dictionary, not a list
-        if not isinstance(merged_data, dict):
-            merged_data = {}
-
-        # Create a simple data object for the service
-        from ..utils.data_types import StationNowPlayingData, SongData
-
-        song_data = merged_data.get('current_song', {}) if isinstance(merged_data, dict) else {}
-        current_song = None
-        
-        # Try to create SongData with proper error handling
-        try:
-            if isinstance(song_data, dict):
-                name_val = song_data.get('name')
-                artist_val = song_data.get('artist')
-                
-                # Only proceed if we have valid name or artist data
-                if name_val or artist_val:
-                    # Ensure all values are strings, not lists
-                    name_value = song_data.get('name', '')
-                    artist_value = song_data.get('artist', '')
-                    thumbnail_value = song_data.get('thumbnail_url', '')
-                    
-                    # Convert lists to strings if necessary
-                    if isinstance(name_value, list):
-                        name_value = ' '.join(str(x) for x in name_value) if name_value else ''
-                    else:
-                        name_value = str(name_value) if name_value else ''
-                        
-                    if isinstance(artist_value, list):
-                        artist_value = ' '.join(str(x) for x in artist_value) if artist_value else ''
-                    else:
-                        artist_value = str(artist_value) if artist_value else ''
-                        
-                    if isinstance(thumbnail_value, list):
-                        thumbnail_value = str(thumbnail_value[0]) if thumbnail_value else ''
-                    else:
-                        thumbnail_value = str(thumbnail_value) if thumbnail_value else ''
-
-                    # Validate thumbnail_value and clean up invalid aripisprecer.ro thumbnails
-                    if thumbnail_value:
-                        # Check for na.png from aripisprecer.ro
-                        if 'na.png' in thumbnail_value and 'aripisprecer.ro' in thumbnail_value:
-                            thumbnail_value = ''
-                        # Check if thumbnail is the same as reference colinde thumbnail by comparing image hashes
-                        elif 'aripisprecer.ro' in thumbnail_value:
-                            if is_same_as_reference_colinde_thumbnail(thumbnail_value):
-                                thumbnail_value = ''
-
-                    current_song = SongData(
-                        name=name_value,
-                        artist=artist_value,
-                        thumbnail_url=thumbnail_value
-                    )
-        except Exception as e:
-            logger.error(f"Error creating SongData: {e}, song_data: {song_data}")
-            current_song = None
-
-        listeners = merged_data.get('listeners') if isinstance(merged_data, dict) else None
-        error_list = merged_data.get('error', []) if isinstance(merged_data, dict) else []
-        if not isinstance(error_list, list):
-            error_list = []
-
-        station_data = StationNowPlayingData(
-            timestamp=timezone.now().isoformat(),
-            current_song=current_song,
-            listeners=listeners,
-            raw_data=json.loads(json.dumps({
-                'results': results,
-                'merged_data': merged_data,
-            }, default=str)),
-            error=error_list + errors
-        )
+        station_data = build_station_now_playing_data(results, errors)
 
         # Determine if any successful fetcher has dirty metadata
         dirty_metadata = any(r['dirty_metadata'] for r in results)
@@ -238,6 +265,9 @@ def scrape_station_metadata(station_id: int) -> Dict[str, Any]:
             station_data,
             dirty_metadata=dirty_metadata
         )
+        if not success:
+            # Make the next poll reprocess these payloads instead of skipping them
+            FetchCacheService.forget(metadata_fetchers)
 
     return {
         "success": success,
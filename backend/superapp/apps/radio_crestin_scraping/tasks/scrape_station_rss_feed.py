@@ -1,11 +1,13 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from celery import shared_task
 from django.conf import settings
 import httpx
 import feedparser
 from email.utils import parsedate_to_datetime
 
+from ..services.fetch_cache_service import FetchCacheService
+from ..services.rss_feed_state_service import RssFeedState, RssFeedStateService
 from ..services.station_service import StationService
 from ..utils.data_types import StationRssFeedData, RssFeedPost
 
@@ -38,13 +40,26 @@ def scrape_station_rss_feed(station_id: int) -> Dict[str, Any]:
         return {"success": False, "error": f"Station {station_id} not found"}
     
     try:
-        # Fetch RSS feed
-        posts = _fetch_rss_posts(station.rss_feed)
-        
+        state = RssFeedStateService.get(station_id, station.rss_feed)
+        posts, new_state = _fetch_rss_posts(station.rss_feed, state)
+
+        if new_state is None:
+            # 304 or the same body as last time
+            logger.info(f"RSS feed for station {station_id} not modified")
+            return {
+                "success": True,
+                "station_id": station_id,
+                "posts_count": 0,
+                "not_modified": True,
+            }
+
         # Save posts
         rss_data = StationRssFeedData(posts=posts)
         success = StationService.upsert_station_posts(station_id, rss_data)
-        
+        if success:
+            # Only remember the feed once its entries are stored
+            RssFeedStateService.set(station_id, new_state)
+
         return {
             "success": success,
             "station_id": station_id,
@@ -62,43 +77,74 @@ def scrape_station_rss_feed(station_id: int) -> Dict[str, Any]:
         }
 
 
-def _fetch_rss_posts(rss_url: str) -> list[RssFeedPost]:
+# Browser-like headers for better compatibility
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+_client: Optional[httpx.Client] = None
+
+
+def _get_client() -> httpx.Client:
+    """Keep-alive client shared by the RSS tasks of a worker process."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            timeout=httpx.Timeout(60, connect=10),
+            verify=False,
+            headers=_HEADERS,
+            follow_redirects=True,
+        )
+    return _client
+
+
+def _entry_id(entry) -> Optional[str]:
+    return getattr(entry, 'id', None) or getattr(entry, 'link', None) or None
+
+
+def _fetch_rss_posts(
+    rss_url: str,
+    state: Optional[RssFeedState] = None,
+) -> Tuple[List[RssFeedPost], Optional[RssFeedState]]:
     """
     Fetch and parse RSS feed posts.
-    
+
+    Sends a conditional request when there is state from a previous run, and
+    only returns the entries newer than the newest one seen then (feeds list
+    newest first).
+
     Args:
         rss_url: URL of the RSS feed
-        
+        state: Feed state from the last successfully stored fetch
+
     Returns:
-        List of parsed RSS posts
+        (posts, new_state); new_state is None when the feed is unchanged
     """
     logger.info(f"Fetching RSS feed: {rss_url}")
-    
-    # Browser-like headers for better compatibility
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    }
-    
-    # Fetch RSS content
-    with httpx.Client(
-        timeout=60, 
-        verify=False, 
-        headers=headers, 
-        follow_redirects=True
-    ) as client:
-        response = client.get(rss_url)
-        response.raise_for_status()
-    
+
+    response = _get_client().get(rss_url, headers=RssFeedStateService.conditional_headers(state))
+    if response.status_code == 304 and state is not None:
+        return [], None
+    response.raise_for_status()
+
+    content_hash = FetchCacheService.content_hash(response.content)
+    if state is not None and state.content_hash == content_hash:
+        return [], None
+
     # Parse RSS feed
-    feed = feedparser.parse(response.text)
+    feed = feedparser.parse(response.content)
     posts = []
-    
+    seen_id = state.newest_entry_id if state else None
+
     for entry in feed.entries:
+        if seen_id and _entry_id(entry) == seen_id:
+            # Everything from here on was stored by a previous run
+            break
+
         # Parse published date
         published_iso = ''
         if hasattr(entry, 'published') and entry.published:
@@ -116,5 +162,12 @@ def _fetch_rss_posts(rss_url: str) -> list[RssFeedPost]:
             published=published_iso
         )
         posts.append(post)
-    
-    return posts
\ No newline at end of file
+
+    new_state = RssFeedState(
+        url=rss_url,
+        content_hash=content_hash,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        newest_entry_id=(_entry_id(feed.entries[0]) if feed.entries else None) or seen_id,
+    )
+    return posts, new_state
@@ -1,17 +1,18 @@
+import json
 import logging
 import asyncio
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime
 from django.utils import timezone
 import httpx
-import ssl
 
+from ..services.fetch_cache_service import FetchCacheEntry, FetchCacheService
 from ..utils.data_types import StationNowPlayingData, SongData
 
 logger = logging.getLogger(__name__)
 
 
-def run_scraper(scraper: Any, fetcher: Any) -> Optional[Dict[str, Any]]:
+def run_scraper(scraper: Any, fetcher: Any) -> Tuple[Optional[Dict[str, Any]], bool]:
     """
     Run a scraper synchronously with proper error handling.
     
@@ -20,7 +21,9 @@ def run_scraper(scraper: Any, fetcher: Any) -> Optional[Dict[str, Any]]:
         fetcher: The metadata fetcher configuration
         
     Returns:
-        Scraped data dictionary or None if failed
+        Tuple of the scraped data dictionary (None if failed) and whether the
+        payload is unchanged since the previous fetch, in which case the data
+        is the previously extracted result
     """
     try:
         # Check if this is a stream scraper that needs special handling
@@ -28,16 +31,36 @@ def run_scraper(scraper: Any, fetcher: Any) -> Optional[Dict[str, Any]]:
             # Handle async stream scrapers
             loop = _get_or_create_event_loop()
             result = loop.run_until_complete(scraper.scrape(fetcher.url, config=fetcher))
-        else:
-            # Handle regular HTTP scrapers
-            result = _scrape_http_content(scraper, fetcher)
-        
-        # Convert result to serializable format
-        return _serialize_scrape_result(result)
+            # Convert result to serializable format
+            return _serialize_scrape_result(result), False
+
+        # Handle regular HTTP scrapers
+        return _scrape_http_content(scraper, fetcher)
         
     except Exception as e:
         logger.error(f"Error running scraper for {fetcher.url}: {e}")
-        return None
+        return None, False
+
+
+async def run_scraper_async(
+    scraper: Any, fetcher: Any, client: httpx.AsyncClient
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Async counterpart of run_scraper() that reuses a shared, pooled client.
+
+    Produces the same result as run_scraper() for the same response, so the
+    Celery tasks and the scraping engine persist identical data.
+    """
+    try:
+        if hasattr(scraper, 'get_scraper_type') and scraper.get_scraper_type() == 'stream_id3':
+            result = await scraper.scrape(fetcher.url, config=fetcher)
+            return _serialize_scrape_result(result), False
+
+        return await _scrape_http_content_async(scraper, fetcher, client)
+
+    except Exception as e:
+        logger.error(f"Error running scraper for {fetcher.url}: {e}")
+        return None, False
 
 
 def merge_metadata_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -130,38 +153,102 @@ def _get_or_create_event_loop():
         return loop
 
 
-def _scrape_http_content(scraper: Any, fetcher: Any) -> Any:
+def _scrape_http_content(scraper: Any, fetcher: Any) -> Tuple[Optional[Dict[str, Any]], bool]:
     """Scrape content via HTTP with proper headers and timeout."""
-    # Create SSL context that doesn't verify certificates
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-    
     # Configure timeout
     timeout = httpx.Timeout(connect=5.0, read=5.0, write=5.0, pool=5.0)
+    cached = FetchCacheService.get(fetcher)
     
     with httpx.Client(timeout=timeout, verify=False, follow_redirects=True) as client:
-        # Check content type first
+        # Check content type first; a cached entry means it was already checked
+        if cached is None and _is_html_scraper(scraper):
+            try:
+                head_response = client.head(fetcher.url)
+                content_type = head_response.headers.get('content-type', '').lower()
+                
+                # Skip audio content for HTML scrapers
+                if 'audio' in content_type:
+                    logger.warning(
+                        f"Skipping HTML scraper for audio content from {fetcher.url}"
+                    )
+                    return None, False
+            except Exception as e:
+                logger.debug(f"HEAD request failed for {fetcher.url}: {e}")
+        
+        # Fetch content
+        response = client.get(fetcher.url, headers=FetchCacheService.conditional_headers(cached))
+
+    result, unchanged, entry = _extract_if_changed(scraper, fetcher, response, cached)
+    if entry is not None:
+        FetchCacheService.set(fetcher, entry)
+    return result, unchanged
+
+
+async def _scrape_http_content_async(
+    scraper: Any, fetcher: Any, client: httpx.AsyncClient
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Async counterpart of _scrape_http_content() using the caller's client."""
+    cached = await FetchCacheService.aget(fetcher)
+
+    if cached is None and _is_html_scraper(scraper):
+        # Only HTML scrapers care about the content type; skip the HEAD otherwise
         try:
-            head_response = client.head(fetcher.url)
+            head_response = await client.head(fetcher.url)
             content_type = head_response.headers.get('content-type', '').lower()
-            
-            # Skip audio content for HTML scrapers
-            if ('audio' in content_type and 
-                hasattr(scraper, 'get_scraper_type') and 
-                'html' in scraper.get_scraper_type()):
+            if 'audio' in content_type:
                 logger.warning(
                     f"Skipping HTML scraper for audio content from {fetcher.url}"
                 )
-                return None
+                return None, False
         except Exception as e:
             logger.debug(f"HEAD request failed for {fetcher.url}: {e}")
-        
-        # Fetch content
-        response = client.get(fetcher.url)
-        response.raise_for_status()
-        
-        return scraper.extract_data(response.text, config=fetcher)
+
+    response = await client.get(fetcher.url, headers=FetchCacheService.conditional_headers(cached))
+
+    result, unchanged, entry = _extract_if_changed(scraper, fetcher, response, cached)
+    if entry is not None:
+        await FetchCacheService.aset(fetcher, entry)
+    return result, unchanged
+
+
+def _is_html_scraper(scraper: Any) -> bool:
+    return hasattr(scraper, 'get_scraper_type') and 'html' in scraper.get_scraper_type()
+
+
+def _extract_if_changed(
+    scraper: Any,
+    fetcher: Any,
+    response: httpx.Response,
+    cached: Optional[FetchCacheEntry],
+) -> Tuple[Optional[Dict[str, Any]], bool, Optional[FetchCacheEntry]]:
+    """
+    Extract data from a fetch response unless the payload is the one already seen.
+
+    Returns:
+        Tuple of the result, whether it is unchanged, and the cache entry to
+        store (None when nothing needs storing)
+    """
+    if cached is not None and response.status_code == 304:
+        return cached.result, True, None
+
+    response.raise_for_status()
+
+    content_hash = FetchCacheService.content_hash(response.content)
+    if cached is not None and cached.content_hash == content_hash:
+        return cached.result, True, None
+
+    result = _serialize_scrape_result(scraper.extract_data(response.text, config=fetcher))
+    if result is None:
+        return None, False, None
+
+    entry = FetchCacheEntry(
+        url=fetcher.url,
+        content_hash=content_hash,
+        result=json.loads(json.dumps(result, default=str)),
+        etag=response.headers.get('etag'),
+        last_modified=response.headers.get('last-modified'),
+    )
+    return result, False, entry
 
 
 def _serialize_scrape_result(result: Any) -> Optional[Dict[str, Any]]:
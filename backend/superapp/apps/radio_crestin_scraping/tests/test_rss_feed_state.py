@@ -0,0 +1,118 @@
+from unittest import mock
+
+import httpx
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from superapp.apps.radio_crestin.models import Posts, Stations
+
+from ..services.rss_feed_state_service import RssFeedState, RssFeedStateService
+from ..tasks.scrape_station_rss_feed import scrape_station_rss_feed
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+FEED_URL = 'https://rss.example.com/feed'
+
+
+def make_feed(*items):
+    entries = ''.join(
+        f"<item><guid>{guid}</guid><title>{title}</title><link>https://rss.example.com/{guid}</link>"
+        f"<pubDate>Wed, 14 Oct 2026 10:00:00 +0000</pubDate></item>"
+        for guid, title in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{entries}</channel></rss>'.encode()
+
+
+def make_response(status_code, content=b'', headers=None):
+    return httpx.Response(status_code, content=content, headers=headers, request=httpx.Request('GET', FEED_URL))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RssFeedStateServiceTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_round_trip(self):
+        state = RssFeedState(url=FEED_URL, content_hash='abc', etag='"v1"', newest_entry_id='a')
+        RssFeedStateService.set(1, state)
+
+        self.assertEqual(RssFeedStateService.get(1, FEED_URL), state)
+
+    def test_changed_feed_url_discards_the_state(self):
+        RssFeedStateService.set(1, RssFeedState(url=FEED_URL, content_hash='abc'))
+
+        self.assertIsNone(RssFeedStateService.get(1, 'https://rss.example.com/other'))
+
+    def test_conditional_headers(self):
+        state = RssFeedState(url=FEED_URL, content_hash='abc', etag='"v1"', last_modified='Wed, 14 Oct 2026 10:00:00 GMT')
+
+        self.assertEqual(RssFeedStateService.conditional_headers(state), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 14 Oct 2026 10:00:00 GMT',
+        })
+        self.assertEqual(RssFeedStateService.conditional_headers(None), {})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ScrapeStationRssFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.station = Stations.objects.create(
+            slug="rss-station",
+            title="RSS Station",
+            website="https://rss.example.com",
+            stream_url="https://rss.example.com/live",
+            rss_feed=FEED_URL,
+        )
+        self.client_mock = mock.Mock()
+        patcher = mock.patch(
+            'superapp.apps.radio_crestin_scraping.tasks.scrape_station_rss_feed._get_client',
+            return_value=self.client_mock,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def scrape(self, response):
+        self.client_mock.get.return_value = response
+        return scrape_station_rss_feed(self.station.id)
+
+    def test_not_modified_response(self):
+        self.scrape(make_response(200, make_feed(('a', 'First')), headers={'ETag': '"v1"'}))
+
+        result = self.scrape(make_response(304))
+
+        self.assertTrue(result['not_modified'])
+        self.assertEqual(self.client_mock.get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+
+    def test_identical_body_is_not_processed(self):
+        self.scrape(make_response(200, make_feed(('a', 'First'))))
+
+        with mock.patch(
+            'superapp.apps.radio_crestin_scraping.tasks.scrape_station_rss_feed.StationService.upsert_station_posts'
+        ) as upsert:
+            result = self.scrape(make_response(200, make_feed(('a', 'First'))))
+
+        self.assertTrue(result['not_modified'])
+        upsert.assert_not_called()
+
+    def test_only_new_entries_are_stored(self):
+        self.scrape(make_response(200, make_feed(('b', 'Second'), ('a', 'First'))))
+
+        result = self.scrape(make_response(200, make_feed(('c', 'Third'), ('b', 'Second'), ('a', 'First'))))
+
+        self.assertEqual(result['posts_count'], 1)
+        self.assertEqual(
+            sorted(Posts.objects.filter(station=self.station).values_list('title', flat=True)),
+            ['First', 'Second', 'Third'],
+        )
+        self.assertEqual(RssFeedStateService.get(self.station.id, FEED_URL).newest_entry_id, 'c')
+
+    def test_failed_write_keeps_the_previous_state(self):
+        self.scrape(make_response(200, make_feed(('a', 'First'))))
+
+        with mock.patch(
+            'superapp.apps.radio_crestin_scraping.tasks.scrape_station_rss_feed.StationService.upsert_station_posts',
+            return_value=False,
+        ):
+            self.scrape(make_response(200, make_feed(('b', 'Second'), ('a', 'First'))))
+
+        self.assertEqual(RssFeedStateService.get(self.station.id, FEED_URL).newest_entry_id, 'a')
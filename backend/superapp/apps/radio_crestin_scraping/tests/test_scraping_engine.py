@@ -0,0 +1,260 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+
+from superapp.apps.radio_crestin.models import Stations, StationsUptime
+
+from ..scrapers.uptime import UptimeScraper
+from ..services.fetch_cache_service import FetchCacheEntry, FetchCacheService
+from ..services.scraping_engine import ScrapingEngine, StationScrapeConfig
+from ..services.uptime_service import UptimeService
+from ..tasks.utils import _extract_if_changed
+from ..utils.data_types import StationNowPlayingData, StationUptimeData
+
+ENGINE = 'superapp.apps.radio_crestin_scraping.services.scraping_engine'
+
+
+def make_fetcher(fetcher_id, url='https://meta.example.com/status', priority=0, dirty_metadata=False):
+    return SimpleNamespace(
+        id=fetcher_id,
+        url=url,
+        priority=priority,
+        dirty_metadata=dirty_metadata,
+        station_metadata_fetch_category=SimpleNamespace(slug='icecast'),
+    )
+
+
+def make_station(slug):
+    return Stations.objects.create(
+        slug=slug,
+        title=slug.title(),
+        website=f"https://{slug}.example.com",
+        stream_url=f"https://{slug}.example.com/live",
+    )
+
+
+class WriteBatchTests(TestCase):
+    def setUp(self):
+        self.first = make_station("first-station")
+        self.second = make_station("second-station")
+        self.first_config = StationScrapeConfig(self.first.id, 30, [make_fetcher(1)])
+        self.second_config = StationScrapeConfig(self.second.id, 30, [make_fetcher(2)])
+
+    def write_batch(self, upsert, batch):
+        with mock.patch(f'{ENGINE}.StationService.upsert_station_now_playing', side_effect=upsert) as upsert_mock, \
+                mock.patch(f'{ENGINE}.FetchCacheService.forget') as forget:
+            ScrapingEngine._write_batch(batch)
+        return upsert_mock, forget
+
+    def test_only_the_latest_result_per_station_is_written(self):
+        old, new = StationNowPlayingData(listeners=1), StationNowPlayingData(listeners=2)
+
+        upsert, forget = self.write_batch(
+            lambda station_id, data, dirty_metadata: True,
+            [(self.first_config, old, False), (self.first_config, new, True)],
+        )
+
+        upsert.assert_called_once_with(self.first.id, new, dirty_metadata=True)
+        forget.assert_not_called()
+
+    def test_failed_station_does_not_roll_back_the_others(self):
+        def upsert(station_id, data, dirty_metadata):
+            Stations.objects.filter(id=station_id).update(title='Written')
+            if station_id == self.first.id:
+                raise IntegrityError('duplicate key')
+            return True
+
+        _, forget = self.write_batch(upsert, [
+            (self.first_config, StationNowPlayingData(), False),
+            (self.second_config, StationNowPlayingData(), False),
+        ])
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.title, 'First-Station')
+        self.assertEqual(self.second.title, 'Written')
+        forget.assert_called_once_with(self.first_config.fetchers)
+
+    def test_unsuccessful_upsert_forgets_the_fetch_cache(self):
+        _, forget = self.write_batch(
+            lambda station_id, data, dirty_metadata: station_id != self.second.id,
+            [
+                (self.first_config, StationNowPlayingData(), False),
+                (self.second_config, StationNowPlayingData(), False),
+            ],
+        )
+
+        forget.assert_called_once_with(self.second_config.fetchers)
+
+
+class ScrapeStationTests(SimpleTestCase):
+    def scrape(self, fetchers, outcomes):
+        engine = ScrapingEngine()
+        config = StationScrapeConfig(1, 30, fetchers)
+        with mock.patch(f'{ENGINE}.ScraperFactory.get_scraper', return_value=object()), \
+                mock.patch(f'{ENGINE}.run_scraper_async', side_effect=outcomes), \
+                mock.patch(f'{ENGINE}.build_station_now_playing_data', return_value='station data') as build:
+            asyncio.run(engine._scrape_station(config))
+        return engine._pending, build
+
+    def test_changed_result_is_queued(self):
+        fetchers = [make_fetcher(1, priority=2), make_fetcher(2, priority=1, dirty_metadata=True)]
+
+        pending, build = self.scrape(fetchers, [({'listeners': 1}, True), ({'listeners': 2}, False)])
+
+        self.assertEqual(len(pending), 1)
+        config, station_data, dirty_metadata = pending[0]
+        self.assertEqual(station_data, 'station data')
+        self.assertTrue(dirty_metadata)
+        results, errors = build.call_args.args
+        self.assertEqual([r['priority'] for r in results], [2, 1])
+        self.assertEqual(errors, [])
+
+    def test_all_unchanged_results_are_skipped(self):
+        pending, build = self.scrape(
+            [make_fetcher(1), make_fetcher(2)],
+            [({'listeners': 1}, True), ({'listeners': 2}, True)],
+        )
+
+        self.assertEqual(pending, [])
+        build.assert_not_called()
+
+    def test_failed_fetcher_is_reported_with_the_others(self):
+        pending, build = self.scrape(
+            [make_fetcher(1), make_fetcher(2)],
+            [RuntimeError('boom'), ({'listeners': 2}, True)],
+        )
+
+        self.assertEqual(len(pending), 1)
+        results, errors = build.call_args.args
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(errors), 1)
+
+    def test_host_semaphores_are_shared_per_host(self):
+        engine = ScrapingEngine(per_host_limit=2)
+
+        self.assertIs(
+            engine._host_semaphore('https://a.example.com/one'),
+            engine._host_semaphore('https://a.example.com/two'),
+        )
+        self.assertIsNot(
+            engine._host_semaphore('https://a.example.com/one'),
+            engine._host_semaphore('https://b.example.com/one'),
+        )
+
+
+class StationLoopTests(SimpleTestCase):
+    def test_errors_are_logged_and_the_loop_continues_under_debug(self):
+        engine = ScrapingEngine()
+        engine._configs = {1: StationScrapeConfig(1, 0, [make_fetcher(1)])}
+        calls = []
+
+        async def scrape_station(config):
+            calls.append(config)
+            if len(calls) == 1:
+                raise RuntimeError('boom')
+            engine._configs.clear()
+
+        with self.settings(DEBUG=True), \
+                mock.patch.object(engine, '_scrape_station', side_effect=scrape_station), \
+                self.assertLogs(ENGINE, level='ERROR') as logs:
+            asyncio.run(engine._station_loop(1))
+
+        self.assertEqual(len(calls), 2)
+        self.assertIn('Error scraping station 1', logs.output[0])
+        self.assertIn('RuntimeError: boom', logs.output[0])
+
+
+class ExtractIfChangedTests(SimpleTestCase):
+    def setUp(self):
+        self.fetcher = make_fetcher(1)
+        self.scraper = mock.Mock()
+        self.scraper.extract_data.return_value = {'listeners': 5}
+
+    def response(self, status_code=200, content=b'{"listeners": 5}', headers=None):
+        return httpx.Response(
+            status_code,
+            content=content,
+            headers=headers,
+            request=httpx.Request('GET', self.fetcher.url),
+        )
+
+    def cached(self, content=b'{"listeners": 5}'):
+        return FetchCacheEntry(
+            url=self.fetcher.url,
+            content_hash=FetchCacheService.content_hash(content),
+            result={'listeners': 4},
+        )
+
+    def test_new_payload_is_extracted_and_stored(self):
+        result, unchanged, entry = _extract_if_changed(
+            self.scraper, self.fetcher, self.response(headers={'etag': '"v1"'}), None
+        )
+
+        self.assertEqual(result, {'listeners': 5})
+        self.assertFalse(unchanged)
+        self.assertEqual(entry.etag, '"v1"')
+        self.assertEqual(FetchCacheService.conditional_headers(entry), {'If-None-Match': '"v1"'})
+
+    def test_not_modified_reuses_the_cached_result(self):
+        result, unchanged, entry = _extract_if_changed(
+            self.scraper, self.fetcher, self.response(status_code=304, content=b''), self.cached()
+        )
+
+        self.assertEqual(result, {'listeners': 4})
+        self.assertTrue(unchanged)
+        self.assertIsNone(entry)
+        self.scraper.extract_data.assert_not_called()
+
+    def test_identical_payload_is_not_parsed_again(self):
+        result, unchanged, entry = _extract_if_changed(self.scraper, self.fetcher, self.response(), self.cached())
+
+        self.assertEqual(result, {'listeners': 4})
+        self.assertTrue(unchanged)
+        self.scraper.extract_data.assert_not_called()
+
+    def test_cached_entry_of_another_url_is_ignored(self):
+        entry = self.cached()
+        entry.url = 'https://old.example.com/status'
+
+        self.assertIsNone(FetchCacheService._from_cached(self.fetcher, vars(entry)))
+
+
+class UptimeSweepTests(TestCase):
+    def setUp(self):
+        self.stations = [make_station("up-station"), make_station("down-station")]
+
+    def uptime_data(self, is_up):
+        return StationUptimeData(timestamp='2026-10-18T10:00:00+00:00', is_up=is_up, latency_ms=10, raw_data=[])
+
+    def test_sweep_saves_all_probes_in_one_bulk_upsert(self):
+        def probe(station):
+            is_up = station.slug == 'up-station'
+            return {'is_up': is_up, 'latency_ms': 10}, self.uptime_data(is_up)
+
+        with mock.patch.object(UptimeScraper, '_probe_station_uptime', side_effect=probe), \
+                mock.patch.object(UptimeService, 'bulk_upsert_station_uptime') as bulk_upsert:
+            summary = UptimeScraper().check_all_stations_uptime()
+
+        self.assertEqual((summary['total_checked'], summary['total_up']), (2, 1))
+        saved = bulk_upsert.call_args.args[0]
+        self.assertEqual(set(saved), {station.id for station in self.stations})
+
+    def test_bulk_upsert_updates_rows_and_latest_uptime(self):
+        up, down = self.stations
+
+        self.assertTrue(UptimeService.bulk_upsert_station_uptime({up.id: self.uptime_data(True)}))
+        self.assertTrue(UptimeService.bulk_upsert_station_uptime({
+            up.id: self.uptime_data(False),
+            down.id: self.uptime_data(False),
+        }))
+
+        self.assertEqual(StationsUptime.objects.count(), 2)
+        for station in self.stations:
+            station.refresh_from_db()
+            self.assertEqual(station.latest_station_uptime, StationsUptime.objects.get(station=station))
+            self.assertFalse(station.latest_station_uptime.is_up)
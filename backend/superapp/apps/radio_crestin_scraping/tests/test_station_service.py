@@ -0,0 +1,75 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from superapp.apps.radio_crestin.models import Posts, Stations
+
+from ..services.station_service import StationService
+from ..utils.data_types import RssFeedPost, StationRssFeedData
+
+PUBLISHED = '2026-10-14T10:00:00+00:00'
+
+
+def make_feed(*posts):
+    return StationRssFeedData(posts=[
+        RssFeedPost(title=title, link=link, description='', published=published)
+        for title, link, published in posts
+    ])
+
+
+class UpsertStationPostsTests(TestCase):
+    def setUp(self):
+        self.station = Stations.objects.create(
+            slug="posts-station",
+            title="Posts Station",
+            website="https://posts.example.com",
+            stream_url="https://posts.example.com/live",
+        )
+
+    def test_unchanged_feed_costs_one_select(self):
+        feed = make_feed(('First', 'https://posts.example.com/1', PUBLISHED))
+        StationService.upsert_station_posts(self.station.id, feed)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(StationService.upsert_station_posts(self.station.id, feed))
+
+        statements = [q['sql'] for q in queries.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('SELECT'))
+
+    def test_changed_title_updates_the_post(self):
+        StationService.upsert_station_posts(
+            self.station.id, make_feed(('First', 'https://posts.example.com/1', PUBLISHED))
+        )
+
+        StationService.upsert_station_posts(
+            self.station.id, make_feed(('Renamed', 'https://posts.example.com/1', PUBLISHED))
+        )
+
+        post = Posts.objects.get(station=self.station)
+        self.assertEqual(post.title, 'Renamed')
+
+    def test_duplicate_link_keeps_the_first_entry(self):
+        StationService.upsert_station_posts(self.station.id, make_feed(
+            ('First', 'https://posts.example.com/1', PUBLISHED),
+            ('Repeated', 'https://posts.example.com/1', PUBLISHED),
+        ))
+
+        self.assertEqual(list(Posts.objects.filter(station=self.station).values_list('title', flat=True)), ['First'])
+
+    def test_rfc_2822_dates(self):
+        StationService.upsert_station_posts(
+            self.station.id, make_feed(('First', 'https://posts.example.com/1', 'Wed, 14 Oct 2026 10:00:00 +0000'))
+        )
+
+        post = Posts.objects.get(station=self.station)
+        self.assertEqual(post.published, datetime(2026, 10, 14, 10, tzinfo=dt_timezone.utc))
+
+    def test_unparseable_date_is_skipped(self):
+        StationService.upsert_station_posts(
+            self.station.id, make_feed(('First', 'https://posts.example.com/1', 'last week'))
+        )
+
+        self.assertFalse(Posts.objects.filter(station=self.station).exists())
@@ -1,38 +1,302 @@
 """
 Client for the Django API.
 
-Used by health_server to report pod health status to Django.
+Shared by every pod component hosted in the sidecar process: health_server
+reports pod health, scraper_engine and log_monitor send GraphQL requests.
+Connections are kept alive and reused (one per thread and host, since
+http.client connections are not thread-safe) instead of reconnecting for
+every call. Request bodies above GZIP_MIN_BYTES are sent gzip-compressed.
+
+Mutations that must survive a Django outage go through send_or_spool():
+when Django is unreachable (connection error, 5xx, 429) the request is
+written to a bounded on-disk spool under /data and retried in the
+background with exponential backoff, oldest first.
 """
 
+import gzip
 import json
 import os
-from http.client import HTTPConnection
+import threading
+import time
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlparse
 
 DJANGO_API_URL = os.environ.get("DJANGO_API_URL", "web:8080")
+DJANGO_GRAPHQL_URL = os.environ.get("DJANGO_GRAPHQL_URL", "http://web:8080/v1/graphql")
 STREAMING_POD_API_KEY = os.environ.get("STREAMING_POD_API_KEY", "dev-streaming-key")
 STATION_SLUG = os.environ.get("STATION_SLUG", "")
 
+GZIP_REQUESTS = os.environ.get("DJANGO_API_GZIP", "true").lower() in ("1", "true", "yes")
+GZIP_MIN_BYTES = 1024
+
+SPOOL_DIR = os.environ.get("DJANGO_API_SPOOL_DIR", "/data/spool")
+SPOOL_MAX_BYTES = int(os.environ.get("DJANGO_API_SPOOL_MAX_BYTES", str(64 * 1024 * 1024)))
+SPOOL_MAX_FILES = 10000
+RETRY_BACKOFF_INITIAL = 2.0
+RETRY_BACKOFF_MAX = 300.0
+
 _host, _port = DJANGO_API_URL.split(":") if ":" in DJANGO_API_URL else (DJANGO_API_URL, "8080")
 _port = int(_port)
 
+_local = threading.local()
+
+
+class DjangoUnavailable(Exception):
+    """Django answered with a status worth retrying later (5xx, 429)."""
+
+    def __init__(self, status: int):
+        super().__init__(f"Django API unavailable (HTTP {status})")
+        self.status = status
+
+
+# Errors after which a request may succeed if sent again later
+TRANSIENT_ERRORS = (OSError, HTTPException, DjangoUnavailable)
+
+
+def _get_connection(scheme: str, host: str, port: int, timeout: float):
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    key = (scheme, host, port)
+    conn = connections.get(key)
+    if conn is None:
+        conn_class = HTTPSConnection if scheme == "https" else HTTPConnection
+        conn = connections[key] = conn_class(host, port, timeout=timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(scheme: str, host: str, port: int):
+    conn = getattr(_local, "connections", {}).pop((scheme, host, port), None)
+    if conn is not None:
+        conn.close()
+
+
+def http_request(method: str, url: str, body: bytes | None = None,
+                 headers: dict | None = None, timeout: float = 10) -> tuple[int, bytes]:
+    """Send a request over a kept-alive connection; returns (status, body).
+
+    A request on a connection the server already closed is retried once on a
+    fresh one. Redirects (Django APPEND_SLASH) are followed on the same host.
+    Raises OSError / HTTPException when Django is unreachable.
+    """
+    headers = dict(headers or {})
+    if GZIP_REQUESTS and body is not None and len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+
+    parsed = urlparse(url)
+    scheme = parsed.scheme or "http"
+    host = parsed.hostname
+    port = parsed.port or (443 if scheme == "https" else 80)
+    path = parsed.path or "/"
+    if parsed.query:
+        path += "?" + parsed.query
+    headers = {"X-Streaming-Api-Key": STREAMING_POD_API_KEY, **headers}
+
+    for redirect in range(2):
+        for attempt in range(2):
+            conn = _get_connection(scheme, host, port, timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except ConnectionError:
+                # Typically a kept-alive connection the server closed
+                _drop_connection(scheme, host, port)
+                if attempt:
+                    raise
+            except (HTTPException, OSError):
+                _drop_connection(scheme, host, port)
+                raise
+        if resp.will_close:
+            _drop_connection(scheme, host, port)
+        if resp.status in (301, 302, 307, 308) and not redirect:
+            path = urlparse(resp.getheader("Location", "")).path or path
+            continue
+        return resp.status, data
+    return resp.status, data
+
+
+def graphql_request(query: str, variables: dict | None = None, timeout: float = 10) -> dict:
+    """POST a GraphQL document to DJANGO_GRAPHQL_URL; returns the decoded
+    JSON response. Raises one of TRANSIENT_ERRORS when Django is unreachable
+    or overloaded, ValueError when the response isn't JSON."""
+    body = json.dumps({"query": query, "variables": variables or {}}, separators=(",", ":")).encode()
+    status, data = http_request(
+        "POST", DJANGO_GRAPHQL_URL, body=body,
+        headers={"Content-Type": "application/json"}, timeout=timeout,
+    )
+    if status >= 500 or status == 429:
+        raise DjangoUnavailable(status)
+    return json.loads(data)
+
+
+class Spool:
+    """Bounded directory of GraphQL requests waiting to be re-sent.
+
+    Each request is one JSON file, written via temp file + rename. Requests
+    with a slot replace the previous request of that slot (only the latest
+    metadata report is worth delivering); the others queue up. Past
+    max_bytes / max_files the oldest requests are dropped.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = SPOOL_MAX_BYTES, max_files: int = SPOOL_MAX_FILES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def _files(self) -> list[tuple[int, str, int]]:
+        """(mtime_ns, path, size) of spooled requests, oldest first."""
+        files = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((st.st_mtime_ns, entry.path, st.st_size))
+        except FileNotFoundError:
+            pass
+        files.sort()
+        return files
+
+    def put(self, query: str, variables: dict, slot: str | None = None) -> None:
+        payload = json.dumps({"query": query, "variables": variables}, separators=(",", ":"))
+        name = f"slot-{slot}.json" if slot else f"{time.time_ns():020d}-{threading.get_ident()}.json"
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + ".tmp", "w") as f:
+                f.write(payload)
+            os.replace(path + ".tmp", path)
+            self._enforce_limits()
+
+    def _enforce_limits(self) -> None:
+        files = self._files()
+        total = sum(size for _, _, size in files)
+        dropped = 0
+        while files and (total > self.max_bytes or len(files) > self.max_files):
+            _, path, size = files.pop(0)
+            self._remove(path)
+            total -= size
+            dropped += 1
+        if dropped:
+            print(f"django_api_client: spool full, dropped {dropped} oldest request(s)", flush=True)
+
+    def discard(self, slot: str) -> None:
+        self._remove(os.path.join(self.directory, f"slot-{slot}.json"))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._files())
+
+    def drain(self, send) -> bool:
+        """Re-send spooled requests oldest first with send(query, variables).
+
+        Stops at the first transient failure and returns False; requests that
+        fail permanently (bad JSON, rejected by Django) are dropped.
+        """
+        for _, path, _ in self._files():
+            try:
+                with open(path) as f:
+                    payload = json.load(f)
+            except FileNotFoundError:
+                continue
+            except ValueError:
+                self._remove(path)
+                continue
+            try:
+                send(payload["query"], payload.get("variables") or {})
+            except TRANSIENT_ERRORS:
+                return False
+            except Exception as e:
+                print(f"django_api_client: dropping spooled request: {e}", flush=True)
+            self._remove(path)
+        return True
+
+
+_spool = Spool(SPOOL_DIR)
+_spool_wakeup = threading.Event()
+_spool_thread = None
+_spool_thread_lock = threading.Lock()
+
+
+def _retry_spooled() -> None:
+    """Background thread: drain the spool, backing off while Django is down."""
+    backoff = RETRY_BACKOFF_INITIAL
+    while True:
+        _spool_wakeup.wait(backoff)
+        _spool_wakeup.clear()
+        pending = len(_spool)
+        if not pending:
+            backoff = RETRY_BACKOFF_INITIAL
+            continue
+        if _spool.drain(graphql_request):
+            print(f"django_api_client: re-sent {pending} spooled request(s)", flush=True)
+            backoff = RETRY_BACKOFF_INITIAL
+        else:
+            backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+
+
+def _ensure_retry_thread() -> None:
+    global _spool_thread
+    with _spool_thread_lock:
+        if _spool_thread is None:
+            _spool_thread = threading.Thread(target=_retry_spooled, name="django-spool", daemon=True)
+            _spool_thread.start()
+
+
+def send_or_spool(query: str, variables: dict | None = None, slot: str | None = None,
+                  timeout: float = 10) -> dict | None:
+    """Send a GraphQL mutation; spool it for retry if Django is unreachable.
+
+    Returns the decoded response, or None when the request was spooled.
+    Requests left in the spool by a previous run are picked up too.
+    """
+    _ensure_retry_thread()
+    variables = variables or {}
+    try:
+        result = graphql_request(query, variables, timeout=timeout)
+    except TRANSIENT_ERRORS as e:
+        print(f"django_api_client: Django unavailable ({e}), spooling request", flush=True)
+        try:
+            _spool.put(query, variables, slot=slot)
+        except OSError as spool_error:
+            print(f"django_api_client: spool write failed: {spool_error}", flush=True)
+        return None
+    if slot:
+        # Superseded by the request that just went through
+        _spool.discard(slot)
+    # Django is reachable again: retry the backlog now rather than after the backoff
+    _spool_wakeup.set()
+    return result
+
 
 def _request(method, path, body=None):
     """Make an HTTP request to the Django API."""
     try:
-        conn = HTTPConnection(_host, _port, timeout=10)
-        headers = {
-            "X-Streaming-Api-Key": STREAMING_POD_API_KEY,
-            "Content-Type": "application/json",
-        }
-
         payload = json.dumps(body).encode() if body else None
-        conn.request(method, path, body=payload, headers=headers)
-        r = conn.getresponse()
-        data = r.read()
-        conn.close()
+        status, data = http_request(
+            method, f"http://{_host}:{_port}{path}", body=payload,
+            headers={"Content-Type": "application/json"},
+        )
 
-        if r.status >= 400:
-            print(f"Django API error {method} {path}: {r.status} {data[:200]}", flush=True)
+        if status >= 400:
+            print(f"Django API error {method} {path}: {status} {data[:200]}", flush=True)
             return None
         return json.loads(data) if data else {}
     except Exception as e:
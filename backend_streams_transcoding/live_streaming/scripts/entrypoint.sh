@@ -40,6 +40,13 @@ python3 /app/scripts/report_event.py pod_started \
 #                                          per-run counter from ffmpeg.
 mkdir -p /data/hls/aac /data/metadata
 
+# Ingest ffmpeg stderr, tailed by metadata_monitor (in the sidecar). Recreated
+# before the sidecar starts so a leftover log from a previous container is
+# never replayed, and again (new inode) on every ffmpeg start.
+export INGEST_LOG=/data/metadata/ingest.log
+rm -f "$INGEST_LOG"
+: > "$INGEST_LOG"
+
 # Render NGINX config with env vars
 envsubst '${STATION_SLUG}' < /app/nginx/nginx.conf > /tmp/nginx/nginx.conf
 
@@ -47,29 +54,12 @@ echo "Starting NGINX..."
 nginx -c /tmp/nginx/nginx.conf -g 'daemon off;' &
 NGINX_PID=$!
 
-echo "Starting health server..."
-python3 /app/scripts/health_server.py &
-HEALTH_PID=$!
-
-echo "Starting metadata monitor..."
-python3 /app/scripts/metadata_monitor.py &
-METADATA_PID=$!
-
-echo "Starting scraper engine..."
-python3 /app/scripts/scraper_engine.py &
-SCRAPER_PID=$!
-
-echo "Starting playlist rewriter..."
-python3 /app/scripts/playlist_rewriter.py &
-PLAYLIST_REWRITER_PID=$!
-
-echo "Starting log monitor..."
-python3 /app/scripts/log_monitor.py &
-LOG_MONITOR_PID=$!
-
-echo "Starting stream monitor..."
-python3 /app/scripts/stream_monitor.py &
-STREAM_MONITOR_PID=$!
+# health server, scraper engine, playlist rewriter, log monitor, stream
+# monitor and metadata monitor share one supervised Python process (see
+# sidecar.py)
+echo "Starting sidecar..."
+python3 /app/scripts/sidecar.py &
+SIDECAR_PID=$!
 
 echo "Starting segment cleanup (30min max)..."
 sh /app/scripts/cleanup.sh &
@@ -77,10 +67,9 @@ CLEANUP_PID=$!
 
 cleanup() {
     echo "Shutting down gracefully..."
+    # ffmpeg_loop forwards the TERM to ffmpeg and waits for it
     kill -TERM "$FFMPEG_LOOP_PID" 2>/dev/null || true
-    kill -TERM "$FFMPEG_PID" 2>/dev/null || true
-    kill -TERM "$METADATA_PID" "$SCRAPER_PID" "$PLAYLIST_REWRITER_PID" "$LOG_MONITOR_PID" "$STREAM_MONITOR_PID" "$CLEANUP_PID" 2>/dev/null || true
-    kill -TERM "$HEALTH_PID" 2>/dev/null || true
+    kill -TERM "$SIDECAR_PID" "$CLEANUP_PID" 2>/dev/null || true
     sleep 5
     kill -TERM "$NGINX_PID" 2>/dev/null || true
     wait
@@ -117,6 +106,9 @@ start_ffmpeg() {
     # STATION_SLUG is regex-validated near the top of this script, so it
     # contains only [a-z0-9-] — safe to embed in a path.
     local SEGMENT_PREFIX="${STATION_SLUG}-$(date +%s)"
+    # New inode: metadata_monitor drops the previous run's segment state
+    rm -f "$INGEST_LOG"
+    : > "$INGEST_LOG"
     echo "Starting FFmpeg (HLS, ${SEGMENT_DURATION}s, ${HLS_LIST_SIZE} segments, prefix=${SEGMENT_PREFIX})..."
     # Mirrors the old backend_hls_streaming flag set:
     #   - HE-AAC v1 64k (libfdk_aac aac_he)        same encoder/bitrate as legacy clients tuned for
@@ -137,7 +129,15 @@ start_ffmpeg() {
     #                                              which collided whenever two segments wrote
     #                                              in the same epoch second.
     #   - input -reconnect flags                   transient input flap recovery without exiting
-    ffmpeg -loglevel warning \
+    # Single ingest: the same decoded input also feeds a null output with
+    # silencedetect, and stderr (verbose, for mid-stream ICY "Metadata update"
+    # lines and HLS segment opens) is appended to $INGEST_LOG, which
+    # metadata_monitor tails. One upstream connection and one decode per pod;
+    # the monitor echoes warnings and errors back to the pod log. A file (not a
+    # pipe) so a stalled or crashed monitor can't block or SIGPIPE the encoder,
+    # and $! stays ffmpeg's own PID. Opened O_APPEND (>>) so the monitor can
+    # truncate it in place once consumed.
+    ffmpeg -loglevel level+verbose -nostats \
         -reconnect 1 -reconnect_streamed 1 -reconnect_on_network_error 1 \
         -reconnect_delay_max 4 \
         -fflags +genpts+discardcorrupt -max_delay 5000000 \
@@ -156,7 +156,9 @@ start_ffmpeg() {
             -hls_segment_type mpegts \
             -hls_segment_options 'mpegts_flags=+initial_discontinuity' \
             -hls_segment_filename "/data/hls/aac/${SEGMENT_PREFIX}-%d.ts" \
-            '/data/hls/aac/live.m3u8' &
+            '/data/hls/aac/live.m3u8' \
+        -map 0:a:0 -af silencedetect=noise=-40dB:d=1.5 -f null - \
+        >/dev/null 2>>"$INGEST_LOG" &
     FFMPEG_PID=$!
     echo "FFmpeg started (PID $FFMPEG_PID)"
 }
@@ -166,11 +168,14 @@ ffmpeg_loop() {
     local restarts=0
     local started_at
     local ran_for
+    local exit_code
+    # Background subshells don't inherit cleanup's trap: stop ffmpeg with us
+    trap 'kill -TERM "$FFMPEG_PID" 2>/dev/null; wait "$FFMPEG_PID" 2>/dev/null; exit 0' TERM
     while true; do
         started_at=$(date +%s)
         start_ffmpeg
-        wait "$FFMPEG_PID" || true
-        local exit_code=$?
+        exit_code=0
+        wait "$FFMPEG_PID" || exit_code=$?
         ran_for=$(( $(date +%s) - started_at ))
         restarts=$((restarts + 1))
         echo "ffmpeg_loop: ffmpeg exited (code=${exit_code}, ran=${ran_for}s, restart_count=${restarts}); retrying in ${delay}s"
@@ -0,0 +1,259 @@
+"""
+Shared file-watch layer for the pod sidecar scripts.
+
+FileWatcher reports which files changed in a set of directories using Linux
+inotify (through ctypes — the image ships no extra Python packages). Where
+inotify is unavailable, or its queue overflowed, wait() returns None instead
+of a set of paths, meaning "anything may have changed": callers then fall
+back to their own stat-based checks, exactly like the old polling loops.
+
+Built on top of it:
+  - SegmentIndex — in-memory view of the segment directory (name → mtime,
+    size), updated from events instead of globbing and stat-ing every .ts
+    file on each health/monitor cycle. shared_segment_index() hands every
+    component in the sidecar process the same instance.
+  - JsonFileCache — a JSON file parsed only when its mtime/size changed.
+
+ffmpeg writes both live.m3u8 and segments via temp file + rename, and the
+metadata monitor rewrites index.json in place, so CLOSE_WRITE + MOVED_TO
+(plus CREATE/DELETE/MOVED_FROM for the index) cover every update.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+    return _libc
+
+
+class FileWatcher:
+    """Change notifications for files directly inside `directories`."""
+
+    def __init__(self, directories, poll_interval: float = 1.0):
+        self.directories = [os.fspath(d) for d in directories]
+        self.poll_interval = poll_interval
+        self._fd = -1
+        self._wds: dict[int, str] = {}
+        try:
+            self._start_inotify()
+        except (OSError, AttributeError) as e:
+            self.close()
+            print(f"file_watch: inotify unavailable ({e}), polling every {poll_interval}s", flush=True)
+
+    @property
+    def inotify(self) -> bool:
+        return self._fd >= 0
+
+    def _start_inotify(self):
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._wds[wd] = directory
+
+    def wait(self, timeout: float):
+        """Block up to `timeout` seconds for changes.
+
+        Returns the set of changed paths (empty on timeout), or None when
+        changes can't be tracked precisely (polling mode, queue overflow).
+        """
+        if not self.inotify:
+            if timeout > 0:
+                time.sleep(min(timeout, self.poll_interval))
+            return None
+
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return set()
+
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].split(b"\0", 1)[0]
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self._wds.get(wd)
+                if directory and name:
+                    changed.add(os.path.join(directory, os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = -1
+        self._wds = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SegmentIndex:
+    """In-memory index of the segment files in one directory."""
+
+    # Full rescan now and then, in case an event was ever missed
+    RESCAN_INTERVAL = 300
+
+    def __init__(self, directory, suffix: str = ".ts", watcher: FileWatcher | None = None):
+        self.directory = os.fspath(directory)
+        self.suffix = suffix
+        self.watcher = watcher or FileWatcher([self.directory])
+        self._entries: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self._scanned_at = 0.0
+        self.refresh()
+
+    def _rescan(self):
+        entries = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.suffix):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries[entry.name] = (st.st_mtime, st.st_size)
+        except FileNotFoundError:
+            pass
+        self._entries = entries
+        self._scanned_at = time.monotonic()
+
+    def refresh(self):
+        """Apply pending change events (never blocks)."""
+        with self._lock:
+            changed = self.watcher.wait(0)
+            if changed is None or time.monotonic() - self._scanned_at > self.RESCAN_INTERVAL:
+                self._rescan()
+                return
+            for path in changed:
+                name = os.path.basename(path)
+                if os.path.dirname(path) != self.directory or not name.endswith(self.suffix):
+                    continue
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    self._entries.pop(name, None)
+                    continue
+                self._entries[name] = (st.st_mtime, st.st_size)
+
+    def get(self, name: str) -> tuple[float, int] | None:
+        """(mtime, size) of a segment, or None if it isn't on disk."""
+        return self._entries.get(name)
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        entries = list(self._entries.values())
+        if not entries:
+            return {"count": 0, "newest_mtime": None, "oldest_mtime": None, "total_size": 0}
+        mtimes = [mtime for mtime, _ in entries]
+        return {
+            "count": len(entries),
+            "newest_mtime": max(mtimes),
+            "oldest_mtime": min(mtimes),
+            "total_size": sum(size for _, size in entries),
+        }
+
+
+_shared_lock = threading.Lock()
+_shared_indexes: dict[str, SegmentIndex] = {}
+
+
+def shared_segment_index(directory, suffix: str = ".ts") -> SegmentIndex:
+    """Process-wide SegmentIndex for a directory, so components hosted in
+    the same sidecar process share one index and one inotify watch."""
+    key = os.fspath(directory)
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is None:
+            index = _shared_indexes[key] = SegmentIndex(key, suffix=suffix)
+        return index
+
+
+class JsonFileCache:
+    """A JSON file, re-read and parsed only when its mtime or size changes."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._signature = None
+        self._data = None
+
+    def read(self):
+        """Parsed content, or None if the file is missing or unparseable."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._signature = None
+            self._data = None
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature != self._signature:
+            try:
+                with open(self.path, "r") as f:
+                    self._data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                # Caught mid-write; try again on the next call
+                return self._data
+            self._signature = signature
+        return self._data
+
+
+_shared_json_files: dict[str, JsonFileCache] = {}
+
+
+def shared_json_file(path) -> JsonFileCache:
+    """Process-wide JsonFileCache for a path (e.g. the metadata index.json
+    read by both scraper_engine and playlist_rewriter)."""
+    key = os.fspath(path)
+    with _shared_lock:
+        cache = _shared_json_files.get(key)
+        if cache is None:
+            cache = _shared_json_files[key] = JsonFileCache(key)
+        return cache
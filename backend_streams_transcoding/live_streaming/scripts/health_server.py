@@ -14,7 +14,6 @@ real FFmpeg status. Reports immediately on startup (is_up=False, starting),
 then every REPORT_INTERVAL seconds with current status.
 """
 
-import glob
 import os
 import sys
 import time
@@ -22,6 +21,7 @@ import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
 import posthog_reporter
+from file_watch import SegmentIndex, shared_segment_index
 
 
 class QuietHTTPServer(HTTPServer):
@@ -48,6 +48,16 @@ MIN_READY_SEGMENTS = int(os.environ.get("MIN_READY_SEGMENTS", "3"))
 LISTEN_PORT = 8082
 REPORT_INTERVAL = int(os.environ.get("HEALTH_REPORT_INTERVAL", "15"))
 
+_reporter_started = False
+
+
+def _get_segments() -> SegmentIndex:
+    """Segment index kept current from inotify events; no directory glob +
+    stat per probe. Shared with stream_monitor inside the sidecar."""
+    segments = shared_segment_index(AAC_SEGMENTS_DIR)
+    segments.refresh()
+    return segments
+
 
 class HealthHandler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -78,15 +88,14 @@ class HealthHandler(BaseHTTPRequestHandler):
 def _check_segments_fresh():
     """Check that recent .ts segments exist on disk."""
     now = time.time()
-    segments = glob.glob(os.path.join(AAC_SEGMENTS_DIR, "*.ts"))
-    if not segments:
+    stats = _get_segments().stats()
+    if not stats["count"]:
         return False, "no aac segments on disk"
-    newest_mtime = max(os.path.getmtime(s) for s in segments)
-    age = now - newest_mtime
+    age = now - stats["newest_mtime"]
     if age > HEALTH_MAX_AGE:
         return False, f"aac segments stale ({int(age)}s old, max {HEALTH_MAX_AGE}s)"
-    if len(segments) < MIN_READY_SEGMENTS:
-        return False, f"warming up ({len(segments)}/{MIN_READY_SEGMENTS} segments)"
+    if stats["count"] < MIN_READY_SEGMENTS:
+        return False, f"warming up ({stats['count']}/{MIN_READY_SEGMENTS} segments)"
     return True, ""
 
 
@@ -98,15 +107,16 @@ def _check_playlist_segments():
     except FileNotFoundError:
         return False, "live.m3u8 not found"
 
+    segments = _get_segments()
     missing = []
     empty = []
     for line in lines:
         if not line.endswith(".ts"):
             continue
-        seg_path = os.path.join(AAC_SEGMENTS_DIR, line.strip())
-        if not os.path.exists(seg_path):
+        entry = segments.get(line.strip())
+        if entry is None:
             missing.append(line.strip())
-        elif os.path.getsize(seg_path) == 0:
+        elif entry[1] == 0:
             empty.append(line.strip())
 
     if missing:
@@ -131,11 +141,10 @@ def check_health():
 def _measure_latency():
     """Measure FFmpeg segment production latency (time since newest segment)."""
     try:
-        segments = glob.glob(os.path.join(AAC_SEGMENTS_DIR, "*.ts"))
-        if not segments:
+        stats = _get_segments().stats()
+        if not stats["count"]:
             return 0
-        newest_mtime = max(os.path.getmtime(s) for s in segments)
-        return max(0, int((time.time() - newest_mtime) * 1000))
+        return max(0, int((time.time() - stats["newest_mtime"]) * 1000))
     except Exception:
         return 0
 
@@ -164,7 +173,7 @@ def _report_health_loop():
     _report_to_django(is_up=False, reason="pod starting, waiting for ffmpeg")
 
     # Wait for first segment to appear
-    while not glob.glob(os.path.join(AAC_SEGMENTS_DIR, "*.ts")):
+    while not _get_segments().count():
         time.sleep(2)
 
     # Report that FFmpeg is now producing segments
@@ -182,12 +191,25 @@ def _report_health_loop():
         )
 
 
-if __name__ == "__main__":
-    posthog_reporter.install_global_handler("health_server")
-    # Start health reporting to Django in background thread
-    reporter = threading.Thread(target=_report_health_loop, daemon=True)
-    reporter.start()
+def main():
+    global _reporter_started
+    _get_segments()  # Build the index before the two threads share it
+
+    # Start health reporting to Django in background thread (once, even if
+    # the sidecar restarts the HTTP server)
+    if not _reporter_started:
+        reporter = threading.Thread(target=_report_health_loop, daemon=True)
+        reporter.start()
+        _reporter_started = True
 
     server = QuietHTTPServer(("127.0.0.1", LISTEN_PORT), HealthHandler)
-    print(f"Health server listening on 127.0.0.1:{LISTEN_PORT} (reporting every {REPORT_INTERVAL}s)")
-    server.serve_forever()
+    print(f"Health server listening on 127.0.0.1:{LISTEN_PORT} (reporting every {REPORT_INTERVAL}s)", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    posthog_reporter.install_global_handler("health_server")
+    main()
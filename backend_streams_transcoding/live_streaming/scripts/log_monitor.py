@@ -1,141 +1,168 @@
 """
 NGINX log monitor — tracks listening sessions from HLS request logs.
 
-Tails the NGINX session_access log, parses HLS playlist/segment requests,
-batches events every BATCH_INTERVAL seconds, and submits them to Django
-via the submit_listening_events GraphQL mutation.
+Tails the NGINX session_access log and folds every HLS playlist/segment
+request straight into per-session counters (SessionAggregator). Every
+BATCH_INTERVAL seconds the counters are swapped out and submitted to Django
+as one pre-aggregated event per session via the submit_listening_events
+GraphQL mutation, so memory is bounded by the number of active listeners
+rather than by the number of requests.
 
 Per-station pod: STATION_SLUG is known from env, no need to parse from URI.
 Auth: uses X-Streaming-Api-Key (same as scraper_engine / health_server).
 """
 
-import json
 import os
-import re
 import sys
 import threading
 import time
-from collections import defaultdict
 from datetime import datetime, timezone
-from http.client import HTTPConnection, HTTPSConnection
-from urllib.parse import urlparse
 
+import django_api_client
 import posthog_reporter
 
 STATION_SLUG = os.environ.get("STATION_SLUG", "")
-DJANGO_GRAPHQL_URL = os.environ.get("DJANGO_GRAPHQL_URL", "http://web:8080/v1/graphql")
 STREAMING_API_KEY = os.environ.get("STREAMING_POD_API_KEY", "")
 
 LOG_FILE = os.environ.get("NGINX_SESSION_LOG", "/tmp/nginx_session_access.log")
 BATCH_INTERVAL = int(os.environ.get("LOG_MONITOR_BATCH_INTERVAL", "10"))
 
-# Regex for the session_access log format defined in nginx.conf
-_LOG_RE = re.compile(
-    r'(?P<remote_addr>\S+) - (?P<remote_user>\S+) '
-    r'\[(?P<time_local>[^\]]+)\] '
-    r'"(?P<request>[^"]+)" '
-    r'(?P<status>\d+) '
-    r'(?P<body_bytes_sent>\d+) '
-    r'"(?P<http_referer>[^"]*)" '
-    r'"(?P<http_user_agent>[^"]*)" '
-    r'session_id="(?P<session_id>[^"]*)" '
-    r'ref="(?P<ref>[^"]*)" '
-    r'real_ip="(?P<real_ip>[^"]*)" '
-    r'cf_ip="(?P<cf_ip>[^"]*)"'
-)
-
-_batch_queue = []
-_batch_lock = threading.Lock()
+_aggregator = None
 _running = True
+_batch_thread = None
 
 
-def _graphql_request(query, variables=None):
-    """Execute a GraphQL mutation against Django (same pattern as scraper_engine)."""
-    parsed = urlparse(DJANGO_GRAPHQL_URL)
-    body = json.dumps({"query": query, "variables": variables or {}}).encode()
-    headers = {
-        "Content-Type": "application/json",
-        "X-Streaming-Api-Key": STREAMING_API_KEY,
-    }
-    try:
-        if parsed.scheme == "https":
-            conn = HTTPSConnection(parsed.hostname, parsed.port or 443, timeout=15)
-        else:
-            conn = HTTPConnection(parsed.hostname, parsed.port or 80, timeout=15)
-        path = parsed.path or "/"
-        conn.request("POST", path, body=body, headers=headers)
-        resp = conn.getresponse()
-        if resp.status in (301, 302, 307, 308):
-            location = resp.getheader("Location", "")
-            resp.read()
-            conn.close()
-            redirect_path = urlparse(location).path or path
-            if parsed.scheme == "https":
-                conn = HTTPSConnection(parsed.hostname, parsed.port or 443, timeout=15)
-            else:
-                conn = HTTPConnection(parsed.hostname, parsed.port or 80, timeout=15)
-            conn.request("POST", redirect_path, body=body, headers=headers)
-            resp = conn.getresponse()
-        data = json.loads(resp.read())
-        conn.close()
-        return data
-    except Exception as e:
-        print(f"log_monitor: graphql error: {e}", flush=True)
-        return None
-
-
-def _parse_log_line(line):
-    """Parse a single NGINX session_access log line. Returns dict or None."""
-    m = _LOG_RE.match(line.strip())
-    if not m:
-        return None
-
-    d = m.groupdict()
-
-    # Only process HLS requests (.m3u8 playlists and .ts segments)
-    request_parts = d["request"].split(" ")
-    uri = request_parts[1] if len(request_parts) > 1 else "/"
-    # Strip query string before checking extension (/index.m3u8?s=abc -> /index.m3u8)
-    path = uri.split("?")[0]
-    is_playlist = path.endswith(".m3u8")
-    is_segment = path.endswith(".ts")
-    if not (is_playlist or is_segment):
-        return None
-
-    # Must have a session id (the ?s= query param from the client)
-    session_id = d["session_id"]
-    if not session_id or session_id == "-":
-        return None
-
-    # Resolve real client IP: CF-Connecting-IP > X-Forwarded-For > remote_addr
-    cf_ip = d.get("cf_ip", "").strip()
-    x_fwd = d.get("real_ip", "").strip()
+def _client_ip(remote_addr, real_ip, cf_ip):
+    """Resolve the real client IP: CF-Connecting-IP > X-Forwarded-For > remote_addr."""
     if cf_ip and cf_ip != "-":
-        ip = cf_ip
-    elif x_fwd and x_fwd != "-":
-        ip = x_fwd.split(",")[0].strip()
-    else:
-        ip = d["remote_addr"]
+        return cf_ip.strip()
+    if real_ip and real_ip != "-":
+        return real_ip.split(",", 1)[0].strip()
+    return remote_addr
 
-    # Referer: prefer ?ref= param, fall back to HTTP Referer header
-    ref_param = d.get("ref", "").strip()
-    referer = ref_param if ref_param and ref_param != "-" else d["http_referer"]
 
-    try:
-        ts = datetime.strptime(d["time_local"], "%d/%b/%Y:%H:%M:%S %z")
-    except ValueError:
-        ts = datetime.now(timezone.utc)
-
-    return {
-        "session_id": session_id,
-        "ip": ip,
-        "user_agent": d["http_user_agent"],
-        "referer": referer,
-        "timestamp": ts.isoformat(),
-        "is_playlist": is_playlist,
-        "bytes_sent": int(d["body_bytes_sent"]),
-        "status": int(d["status"]),
-    }
+class SessionAggregator:
+    """Per-session request counters built directly from session_access lines.
+
+    The line is split on double quotes instead of matched against a regex:
+    NGINX escapes quotes inside variables (as \\x22), so for the format in
+    nginx.conf the quoted fields always land at the same indexes:
+
+        addr - user [time] "request" status bytes "referer" "ua"
+        session_id="s" ref="r" real_ip="x" cf_ip="c"
+
+    Non-HLS requests and requests without a session are rejected before
+    anything else is parsed. time_local has one-second resolution, so parsed
+    timestamps are cached per distinct value.
+    """
+
+    _FIELD_COUNT = 15
+    _TIME_CACHE_SIZE = 64
+
+    def __init__(self, station_slug):
+        self.station_slug = station_slug
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._times = {}
+
+    def _timestamp(self, time_local):
+        cached = self._times.get(time_local)
+        if cached is None:
+            try:
+                ts = datetime.strptime(time_local, "%d/%b/%Y:%H:%M:%S %z")
+            except ValueError:
+                ts = datetime.now(timezone.utc)
+            cached = (ts.timestamp(), ts.isoformat())
+            if len(self._times) >= self._TIME_CACHE_SIZE:
+                self._times.clear()
+            self._times[time_local] = cached
+        return cached
+
+    def feed(self, line):
+        """Fold one log line into the session counters. Returns True if counted."""
+        fields = line.split('"')
+        if len(fields) != self._FIELD_COUNT:
+            return False
+
+        session_id = fields[7]
+        if not session_id or session_id == "-":
+            return False
+
+        # "GET /aac/index.m3u8?s=abc HTTP/1.1" -> /aac/index.m3u8
+        request = fields[1].split(" ", 2)
+        path = request[1].split("?", 1)[0] if len(request) > 1 else "/"
+        is_playlist = path.endswith(".m3u8")
+        if not is_playlist and not path.endswith(".ts"):
+            return False
+
+        head = fields[0]
+        status_bytes = fields[2].split()
+        try:
+            status = int(status_bytes[0])
+            bytes_sent = int(status_bytes[1])
+        except (IndexError, ValueError):
+            return False
+        epoch, iso = self._timestamp(head[head.find("[") + 1:head.rfind("]")])
+
+        # Referer: prefer ?ref= param, fall back to HTTP Referer header
+        ref_param = fields[9].strip()
+        referer = ref_param if ref_param and ref_param != "-" else fields[3]
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = {
+                    "first": (epoch, iso),
+                    "last": (epoch, iso),
+                    "bytes": 0,
+                    "playlist": 0,
+                    "segment": 0,
+                }
+            elif epoch < session["first"][0]:
+                session["first"] = (epoch, iso)
+            if epoch >= session["last"][0]:
+                session["last"] = (epoch, iso)
+            session["bytes"] += bytes_sent
+            if is_playlist:
+                session["playlist"] += 1
+            else:
+                session["segment"] += 1
+            # Latest request wins for the descriptive fields
+            session["remote_addr"] = head[:head.find(" ")]
+            session["forwarded"] = (fields[11], fields[13])
+            session["user_agent"] = fields[5]
+            session["referer"] = referer
+            session["status"] = status
+            session["is_playlist"] = is_playlist
+        return True
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def drain(self):
+        """Swap out the counters; returns one ListeningEventInput dict per session."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+
+        events = []
+        for session_id, session in sessions.items():
+            events.append({
+                "anonymous_session_id": session_id,
+                "station_slug": self.station_slug,
+                "ip_address": _client_ip(session["remote_addr"], *session["forwarded"]),
+                "user_agent": session["user_agent"],
+                "timestamp": session["last"][1],
+                "first_timestamp": session["first"][1],
+                "event_type": "playlist_request" if session["is_playlist"] else "segment_request",
+                "bytes_transferred": session["bytes"],
+                "request_duration": 0.0,
+                "status_code": session["status"],
+                "request_count": session["playlist"] + session["segment"],
+                "playlist_request_count": session["playlist"],
+                "segment_request_count": session["segment"],
+                "referer": session["referer"],
+            })
+        return events
 
 
 def _submit_batch(events):
@@ -160,7 +187,12 @@ def _submit_batch(events):
     }
     """
 
-    result = _graphql_request(mutation, {"events": events})
+    # Spooled to disk and retried if Django is unreachable
+    try:
+        result = django_api_client.send_or_spool(mutation, {"events": events}, timeout=15)
+    except Exception as e:
+        print(f"log_monitor: graphql error: {e}", flush=True)
+        return
     if result:
         data = (result.get("data") or {}).get("submit_listening_events")
         if not data:
@@ -169,7 +201,7 @@ def _submit_batch(events):
         typename = data.get("__typename")
         if typename == "SubmitListeningEventsResponse":
             count = data.get("processed_count", 0)
-            print(f"log_monitor: submitted {count}/{len(events)} events", flush=True)
+            print(f"log_monitor: submitted {count} requests from {len(events)} sessions", flush=True)
         elif typename == "OperationInfo":
             msgs = data.get("messages", [])
             for msg in msgs:
@@ -180,27 +212,9 @@ def _submit_batch(events):
 
 
 def _process_batch():
-    """Consolidate queued events per session and submit."""
-    with _batch_lock:
-        queue = list(_batch_queue)
-        _batch_queue.clear()
-
-    if not queue:
-        return
-
-    # Group by session_id, keep latest event per session, sum bytes/counts
-    grouped = defaultdict(list)
-    for ev in queue:
-        grouped[ev["anonymous_session_id"]].append(ev)
-
-    consolidated = []
-    for _sid, events in grouped.items():
-        latest = max(events, key=lambda e: e["timestamp"])
-        latest["bytes_transferred"] = sum(e["bytes_transferred"] for e in events)
-        latest["request_count"] = len(events)
-        consolidated.append(latest)
-
-    _submit_batch(consolidated)
+    """Submit the per-session deltas accumulated since the last flush."""
+    if _aggregator is not None:
+        _submit_batch(_aggregator.drain())
 
 
 def _batch_loop():
@@ -216,10 +230,11 @@ def _batch_loop():
 
 
 def _tail_log():
-    """Poll the NGINX session access log for new lines and enqueue events.
+    """Poll the NGINX session access log and feed new lines to the aggregator.
 
     Uses file-position polling instead of `tail -f` for reliability with
-    NGINX's buffered writes inside containers.
+    NGINX's buffered writes inside containers. The file stays open and is
+    consumed line by line; a trailing partial line is left for the next poll.
     """
     print(f"log_monitor: waiting for {LOG_FILE}...", flush=True)
     while _running and not os.path.exists(LOG_FILE):
@@ -230,54 +245,55 @@ def _tail_log():
 
     print(f"log_monitor: polling {LOG_FILE} (station={STATION_SLUG}, batch={BATCH_INTERVAL}s)", flush=True)
 
-    # Start at the end of the file (only process new lines)
-    pos = os.path.getsize(LOG_FILE)
+    f = None
+    try:
+        while _running:
+            try:
+                if f is None:
+                    f = open(LOG_FILE, "rb")
+                    # Start at the end of the file (only process new lines)
+                    f.seek(0, os.SEEK_END)
+
+                st = os.stat(LOG_FILE)
+                if st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell():
+                    # Rotated or truncated: start over from the beginning
+                    f.close()
+                    f = open(LOG_FILE, "rb")
 
-    while _running:
-        try:
-            size = os.path.getsize(LOG_FILE)
-            if size < pos:
-                # File was truncated (log rotation), reset
-                pos = 0
-            if size == pos:
-                time.sleep(1)
-                continue
-
-            with open(LOG_FILE, "r") as f:
-                f.seek(pos)
-                new_data = f.read()
                 pos = f.tell()
+                read_any = False
+                for raw in iter(f.readline, b""):
+                    if not raw.endswith(b"\n"):
+                        # NGINX hasn't finished writing this line yet
+                        f.seek(pos)
+                        break
+                    pos += len(raw)
+                    read_any = True
+                    _aggregator.feed(raw.decode("utf-8", "replace").rstrip("\n"))
+
+                if not read_any:
+                    time.sleep(1)
+
+            except Exception as e:
+                print(f"log_monitor: read error: {e}", flush=True)
+                if f is not None:
+                    f.close()
+                    f = None
+                time.sleep(2)
+    finally:
+        if f is not None:
+            f.close()
 
-            for line in new_data.splitlines():
-                if not line:
-                    continue
-                parsed = _parse_log_line(line)
-                if not parsed:
-                    continue
-
-                event = {
-                    "anonymous_session_id": parsed["session_id"],
-                    "station_slug": STATION_SLUG,
-                    "ip_address": parsed["ip"],
-                    "user_agent": parsed["user_agent"],
-                    "timestamp": parsed["timestamp"],
-                    "event_type": "playlist_request" if parsed["is_playlist"] else "segment_request",
-                    "bytes_transferred": parsed["bytes_sent"],
-                    "request_duration": 0.0,
-                    "status_code": parsed["status"],
-                    "referer": parsed["referer"],
-                }
-
-                with _batch_lock:
-                    _batch_queue.append(event)
 
-        except Exception as e:
-            print(f"log_monitor: read error: {e}", flush=True)
-            time.sleep(2)
+def shutdown():
+    """Stop tailing and submit the pending session counters (called by the sidecar on SIGTERM)."""
+    global _running
+    _running = False
+    _process_batch()
 
 
 def main():
-    global _running
+    global _aggregator, _running, _batch_thread
 
     if not STATION_SLUG:
         print("log_monitor: STATION_SLUG not set, exiting", flush=True)
@@ -287,9 +303,17 @@ def main():
         print("log_monitor: STREAMING_POD_API_KEY not set, exiting", flush=True)
         sys.exit(1)
 
-    # Start batch processor thread
-    batch_thread = threading.Thread(target=_batch_loop, daemon=True)
-    batch_thread.start()
+    if _aggregator is None:
+        # Kept across sidecar restarts so unsent counters survive a crash
+        _aggregator = SessionAggregator(STATION_SLUG)
+
+    # A crash's finally cleared the flag: the sidecar restarts main()
+    _running = True
+
+    # Start batch processor thread, unless the one of a crashed run is still sleeping
+    if _batch_thread is None or not _batch_thread.is_alive():
+        _batch_thread = threading.Thread(target=_batch_loop, daemon=True)
+        _batch_thread.start()
 
     try:
         _tail_log()
@@ -1,22 +1,28 @@
 """
 Song metadata monitor — detects song changes via ICY metadata + silence detection.
 
-Runs FFmpeg with the source stream to extract:
+Tails the stderr log of the pod's single ingest FFmpeg (entrypoint.sh
+redirects it to INGEST_LOG), so the source stream is only pulled and decoded
+once:
 1. ICY metadata (StreamTitle) — authoritative song info from the radio station
 2. Silence detection — catches gaps between songs as backup
+3. HLS segment opens — song changes are stamped with the start of the
+   segment being written when the new title arrived
+
+FFmpeg warnings and errors are echoed to stdout so they still reach the pod
+logs. The log is a plain file rather than a pipe so a slow or crashed monitor
+can never block or SIGPIPE the encoder; each FFmpeg start recreates it, and
+the monitor truncates it once it has consumed MAX_LOG_BYTES.
 
 Writes song history to a 15-minute file tree:
   /data/metadata/index.json              → current song + aggregated info
   /data/metadata/YYYY/MM/DD/HH-MM.json  → songs in that 15-minute window
 
-Runs as a background process alongside the main FFmpeg transcoder.
 """
 
 import json
 import os
 import re
-import subprocess
-import sys
 import threading
 import time
 from datetime import datetime, timezone
@@ -24,9 +30,10 @@ from pathlib import Path
 
 import posthog_reporter
 
-STREAM_URL = os.environ.get("STREAM_URL", "")
 METADATA_DIR = Path("/data/metadata")
 INDEX_PATH = METADATA_DIR / "index.json"
+INGEST_LOG = os.environ.get("INGEST_LOG", "/data/metadata/ingest.log")
+MAX_LOG_BYTES = 16 * 1024 * 1024
 
 # Current song state
 _current_song = {
@@ -98,6 +105,19 @@ def _save_index():
         print(f"metadata: index write error: {e}", flush=True)
 
 
+def _restore_index():
+    """Pick up the current song and recent history after an ingest restart."""
+    try:
+        with open(INDEX_PATH, "r") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return
+    with _lock:
+        current = data.get("current") or {}
+        _current_song.update({k: current[k] for k in _current_song if k in current})
+        _song_history[:] = list(reversed(data.get("recent") or []))
+
+
 def _on_song_change(raw_title: str, epoch: float):
     """Handle a song change event."""
     artist, title = _parse_stream_title(raw_title)
@@ -163,80 +183,143 @@ def _get_hls_newest_segment_epoch():
     return time.time()
 
 
-def _monitor_ffmpeg_output(proc):
-    """Parse FFmpeg stderr for metadata changes and silence events."""
-    last_title = ""
-    silence_re = re.compile(
-        r"silencedetect.*silence_start:\s*([\d.]+)"
-    )
-    # Match both formats:
-    #   Startup:  "    StreamTitle     : Artist - Song"
-    #   Verbose:  "[https @ 0x...] Metadata update for StreamTitle: Artist - Song"
-    title_re = re.compile(r"StreamTitle\s*:\s*(.+)")
-    metadata_update_re = re.compile(r"Metadata update for StreamTitle:\s*(.+)")
+_SILENCE_RE = re.compile(r"silencedetect.*silence_start:\s*([\d.]+)")
+# Match both formats:
+#   Startup:  "    StreamTitle     : Artist - Song"
+#   Verbose:  "[https @ 0x...] Metadata update for StreamTitle: Artist - Song"
+_TITLE_RE = re.compile(r"StreamTitle\s*:\s*(.+)")
+_METADATA_UPDATE_RE = re.compile(r"Metadata update for StreamTitle:\s*(.+)")
+# HLS muxer, verbose: "[hls @ 0x...] [verbose] Opening '/data/hls/aac/x-1.ts.tmp' for writing"
+# (+temp_file writes x-1.ts.tmp and renames it; the suffix is not captured)
+_SEGMENT_OPEN_RE = re.compile(r"Opening '([^']+\.ts)(?:\.tmp)?' for writing")
+# Prefix added by -loglevel level+...
+_LEVEL_RE = re.compile(r"\[(panic|fatal|error|warning)\]")
 
-    for line in proc.stderr:
+
+class IngestLogParser:
+    """Turns ingest FFmpeg stderr lines into song change / silence events."""
+
+    def __init__(self, last_title: str = ""):
+        self.last_title = last_title
+        self.segment = ""
+        self.segment_opened_at = 0.0
+
+    def feed(self, line: str, now: float | None = None):
+        """Parse one line. Returns ("song", raw, epoch), ("silence", epoch),
+        ("log", line) for warnings/errors worth echoing, or None."""
         line = line.strip()
         if not line:
-            continue
+            return None
+        now = time.time() if now is None else now
+
+        m = _SEGMENT_OPEN_RE.search(line)
+        if m:
+            self.segment = m.group(1)
+            self.segment_opened_at = now
+            return None
 
         # ICY metadata change — verbose format (mid-stream updates)
-        m = metadata_update_re.search(line)
+        m = _METADATA_UPDATE_RE.search(line)
         if not m:
             # Fallback: startup format
-            m = title_re.search(line)
+            m = _TITLE_RE.search(line)
         if m:
             raw = m.group(1).strip()
-            if raw and raw != last_title:
-                last_title = raw
-                # Use the HLS segment PDT as the authoritative timestamp
-                epoch = _get_hls_newest_segment_epoch()
-                _on_song_change(raw, epoch)
-            continue
+            if raw and raw != self.last_title:
+                self.last_title = raw
+                # The segment being written right now is where the song starts
+                epoch = self.segment_opened_at or _get_hls_newest_segment_epoch()
+                return ("song", raw, epoch)
+            return None
 
         # Silence detection
-        m = silence_re.search(line)
-        if m:
-            _on_silence(time.time(), 0)
-            continue
-
-
-def _run_metadata_extractor():
-    """Run a lightweight FFmpeg process to monitor stream metadata."""
-    cmd = [
-        "ffmpeg",
-        # Verbose logging required — at default "info" level, FFmpeg only
-        # prints ICY StreamTitle at connect time.  Mid-stream ICY metadata
-        # updates are only printed at "verbose" level as:
-        #   [https @ 0x...] Metadata update for StreamTitle: Artist - Song
-        "-loglevel", "verbose",
-        "-reconnect", "1",
-        "-reconnect_streamed", "1",
-        "-reconnect_delay_max", "30",
-        "-i", STREAM_URL,
-        # Silence detection filter (low CPU)
-        "-af", "silencedetect=noise=-40dB:d=1.5",
-        # Null output — we only care about stderr metadata
-        "-f", "null", "-",
-    ]
-
-    print(f"metadata: starting monitor for {STREAM_URL}", flush=True)
+        if _SILENCE_RE.search(line):
+            return ("silence", now)
 
-    while True:
-        try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
-            _monitor_ffmpeg_output(proc)
-            proc.wait()
-            print("metadata: ffmpeg exited, restarting in 5s...", flush=True)
-        except Exception as e:
-            print(f"metadata: error: {e}", flush=True)
-        time.sleep(5)
+        if _LEVEL_RE.search(line):
+            return ("log", line)
+        return None
+
+
+def _handle_event(event):
+    if event[0] == "song":
+        _on_song_change(event[1], event[2])
+    elif event[0] == "silence":
+        _on_silence(event[1], 0)
+    else:
+        print(event[1], flush=True)
+
+
+# (inode, offset) reached in INGEST_LOG; kept across sidecar restarts so a
+# crashed monitor resumes where it stopped instead of replaying old titles
+_log_position = (0, 0)
+_running = False
+
+
+def _tail_ingest_log(poll_interval: float = 1.0, max_bytes: int = MAX_LOG_BYTES):
+    """Poll INGEST_LOG and feed complete lines to an IngestLogParser.
+
+    A new inode means FFmpeg restarted (entrypoint.sh recreates the file), so
+    the parser's segment state is reset. FFmpeg appends (O_APPEND), so once
+    the whole file has been consumed past max_bytes it is truncated in place;
+    only a line written between the last read and the truncate can be lost.
+    """
+    global _log_position
+
+    with _lock:
+        last_title = _current_song["raw"]
+    parser = IngestLogParser(last_title=last_title)
+
+    while _running and not os.path.exists(INGEST_LOG):
+        time.sleep(poll_interval)
+
+    f = None
+    try:
+        while _running:
+            try:
+                st = os.stat(INGEST_LOG)
+            except FileNotFoundError:
+                time.sleep(poll_interval)
+                continue
+
+            if f is None or st.st_ino != os.fstat(f.fileno()).st_ino:
+                if f is not None:
+                    f.close()
+                    parser = IngestLogParser(last_title=parser.last_title)
+                f = open(INGEST_LOG, "rb")
+                inode, offset = _log_position
+                if inode == st.st_ino and offset <= st.st_size:
+                    f.seek(offset)
+            elif st.st_size < f.tell():
+                f.seek(0)
+
+            pos = f.tell()
+            read_any = False
+            for raw in iter(f.readline, b""):
+                if not raw.endswith(b"\n"):
+                    # FFmpeg hasn't finished writing this line yet
+                    f.seek(pos)
+                    break
+                pos += len(raw)
+                read_any = True
+                event = parser.feed(raw.decode("utf-8", "replace"))
+                if event is not None:
+                    _handle_event(event)
+
+            if pos >= max_bytes and os.fstat(f.fileno()).st_size == pos:
+                os.truncate(INGEST_LOG, 0)
+                f.seek(0)
+                pos = 0
+            _log_position = (st.st_ino, pos)
+
+            if not read_any:
+                time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+_index_thread = None
 
 
 def _periodic_index_update():
@@ -246,19 +329,26 @@ def _periodic_index_update():
         time.sleep(10)
 
 
+def shutdown():
+    """Stop tailing (called by the sidecar on SIGTERM)."""
+    global _running
+    _running = False
+
+
 def main():
-    if not STREAM_URL:
-        print("metadata: STREAM_URL not set, exiting", flush=True)
-        return
+    global _index_thread, _running
 
     METADATA_DIR.mkdir(parents=True, exist_ok=True)
+    _restore_index()
 
-    # Start periodic index updates
-    t = threading.Thread(target=_periodic_index_update, daemon=True)
-    t.start()
+    # Start periodic index updates, unless the one of a crashed run is still alive
+    if _index_thread is None or not _index_thread.is_alive():
+        _index_thread = threading.Thread(target=_periodic_index_update, daemon=True)
+        _index_thread.start()
 
-    # Run the metadata extractor (blocks)
-    _run_metadata_extractor()
+    _running = True
+    print(f"metadata: tailing ingest ffmpeg log {INGEST_LOG}", flush=True)
+    _tail_ingest_log()
 
 
 if __name__ == "__main__":
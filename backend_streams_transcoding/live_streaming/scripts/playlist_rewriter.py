@@ -22,18 +22,21 @@ boundaries) and can mis-handle live audio when the player treats a
 metadata range as a playback boundary.
 """
 
-import json
 import os
 import re
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+from file_watch import FileWatcher, shared_json_file
+
 FFMPEG_PLAYLIST = Path("/data/hls/aac/live.m3u8")
 ENHANCED_PLAYLIST = Path("/data/hls/aac/index.m3u8")
 METADATA_PATH = Path("/data/metadata/index.json")
 
 POLL_INTERVAL = 1
+# Safety-net rewrite check when no event arrives (inotify mode)
+WATCH_TIMEOUT = 10
 SEGMENT_DURATION = int(os.environ.get("SEGMENT_DURATION", "6"))
 HLS_LIST_SIZE = int(os.environ.get("HLS_LIST_SIZE", "65"))
 
@@ -57,10 +60,9 @@ def _epoch_to_pdt(epoch: float) -> str:
 
 
 def _load_songs() -> list[dict]:
-    try:
-        with open(METADATA_PATH, "r") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    # Shared with scraper_engine in the sidecar; only re-parsed on change
+    data = shared_json_file(METADATA_PATH).read()
+    if not data:
         return []
     songs = list(data.get("recent", []))
     cur = data.get("current")
@@ -292,34 +294,48 @@ def write_atomic(path: Path, content: str) -> None:
     os.replace(tmp, path)
 
 
+def _rewrite_if_changed(last: tuple[float, float]) -> tuple[float, float]:
+    """Rewrite index.m3u8 if live.m3u8 or index.json changed since `last`
+    ((playlist_mtime, metadata_mtime)); returns the new marker."""
+    try:
+        playlist_mtime = FFMPEG_PLAYLIST.stat().st_mtime
+    except FileNotFoundError:
+        return last
+    try:
+        metadata_mtime = METADATA_PATH.stat().st_mtime
+    except FileNotFoundError:
+        metadata_mtime = 0.0
+
+    if (playlist_mtime, metadata_mtime) == last:
+        return last
+    try:
+        with open(FFMPEG_PLAYLIST, "r") as f:
+            raw = f.read()
+        if raw and "#EXTM3U" in raw:
+            songs = _load_songs()
+            write_atomic(ENHANCED_PLAYLIST, enhance(raw, songs))
+            return playlist_mtime, metadata_mtime
+    except Exception as e:
+        print(f"playlist_rewriter: error: {e}", flush=True)
+    return last
+
+
 def main() -> None:
     print(f"playlist_rewriter: {FFMPEG_PLAYLIST} → {ENHANCED_PLAYLIST}", flush=True)
-    last_playlist_mtime = 0.0
-    last_metadata_mtime = 0.0
-    while True:
-        try:
-            playlist_stat = FFMPEG_PLAYLIST.stat()
-        except FileNotFoundError:
-            time.sleep(POLL_INTERVAL)
-            continue
-        try:
-            metadata_mtime = METADATA_PATH.stat().st_mtime
-        except FileNotFoundError:
-            metadata_mtime = 0.0
-
-        if (playlist_stat.st_mtime != last_playlist_mtime
-                or metadata_mtime != last_metadata_mtime):
-            try:
-                with open(FFMPEG_PLAYLIST, "r") as f:
-                    raw = f.read()
-                if raw and "#EXTM3U" in raw:
-                    songs = _load_songs()
-                    write_atomic(ENHANCED_PLAYLIST, enhance(raw, songs))
-                    last_playlist_mtime = playlist_stat.st_mtime
-                    last_metadata_mtime = metadata_mtime
-            except Exception as e:
-                print(f"playlist_rewriter: error: {e}", flush=True)
-        time.sleep(POLL_INTERVAL)
+    with FileWatcher([FFMPEG_PLAYLIST.parent, METADATA_PATH.parent], poll_interval=POLL_INTERVAL) as watcher:
+        watched = {str(FFMPEG_PLAYLIST), str(METADATA_PATH)}
+        last = (0.0, 0.0)
+        changed = None
+        while True:
+            # Woken within milliseconds of ffmpeg's rename / the monitor's write.
+            # The mtime comparison stays the source of truth, so a missed event
+            # (or polling mode, where changed is None) is harmless.
+            if changed is None or changed & watched:
+                last = _rewrite_if_changed(last)
+            changed = watcher.wait(WATCH_TIMEOUT if watcher.inotify else POLL_INTERVAL)
+            if changed == set():
+                # Timed out without events: check anyway
+                changed = None
 
 
 if __name__ == "__main__":
@@ -24,11 +24,11 @@ from http.client import HTTPConnection, HTTPSConnection
 from pathlib import Path
 from urllib.parse import urlparse
 
+import django_api_client
 import posthog_reporter
+from file_watch import FileWatcher, shared_json_file
 
 STATION_SLUG = os.environ.get("STATION_SLUG", "")
-DJANGO_GRAPHQL_URL = os.environ.get("DJANGO_GRAPHQL_URL", "http://web:8080/v1/graphql")
-STREAMING_API_KEY = os.environ.get("STREAMING_POD_API_KEY", "")
 
 METADATA_INDEX = Path("/data/metadata/index.json")
 ID3_TRIGGER = Path("/data/id3_trigger")
@@ -38,39 +38,13 @@ CONFIG_POLL_INTERVAL = 60
 _config = None
 _config_version = 0
 _last_song_raw = ""
+_metadata_index = shared_json_file(METADATA_INDEX)
 
 
 def _graphql_request(query: str, variables: dict = None) -> dict:
     """Execute a GraphQL query/mutation against Django."""
-    parsed = urlparse(DJANGO_GRAPHQL_URL)
-    body = json.dumps({"query": query, "variables": variables or {}}).encode()
-    headers = {
-        "Content-Type": "application/json",
-        "X-Streaming-Api-Key": STREAMING_API_KEY,
-    }
     try:
-        if parsed.scheme == "https":
-            conn = HTTPSConnection(parsed.hostname, parsed.port or 443, timeout=10)
-        else:
-            conn = HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
-        path = parsed.path or "/"
-        conn.request("POST", path, body=body, headers=headers)
-        resp = conn.getresponse()
-        # Follow redirects (Django APPEND_SLASH)
-        if resp.status in (301, 302, 307, 308):
-            location = resp.getheader("Location", "")
-            resp.read()
-            conn.close()
-            redirect_parsed = urlparse(location)
-            redirect_path = redirect_parsed.path or path
-            if parsed.scheme == "https":
-                conn = HTTPSConnection(parsed.hostname, parsed.port or 443, timeout=10)
-            else:
-                conn = HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
-            conn.request("POST", redirect_path, body=body, headers=headers)
-            resp = conn.getresponse()
-        data = json.loads(resp.read())
-        conn.close()
+        data = django_api_client.graphql_request(query, variables, timeout=10)
         # GraphQL returns {"data": null, "errors": [...]} on failure — the
         # `, {}` default only fires for missing keys, not explicit None values.
         # Use `or {}` so callers can always do data.get(...) without a guard.
@@ -146,8 +120,14 @@ def _report_metadata(song_title, song_artist, thumbnail_url=None, listeners=None
             "dirty_metadata": dirty,
         }
     }
-    data = _graphql_request(query, variables)
-    result = data.get("report_station_metadata", {})
+    # Spooled and retried if Django is down; only the latest report is kept
+    try:
+        data = django_api_client.send_or_spool(query, variables, slot="metadata", timeout=10)
+    except Exception as e:
+        print(f"scraper: graphql error: {e}", flush=True)
+        posthog_reporter.capture_exception(e, context={"component": "scraper_engine.graphql"})
+        return {}
+    result = ((data or {}).get("data") or {}).get("report_station_metadata", {})
 
     # Update local metadata index with song_id and thumbnail from Django
     if result.get("success"):
@@ -435,24 +415,20 @@ def _check_trigger(trigger_path: Path) -> str:
         return ""
 
 
+def _get_id3_current() -> dict:
+    """Current song from metadata_monitor's index.json (parsed only when it changed)."""
+    data = _metadata_index.read()
+    return (data or {}).get("current", {}) or {}
+
+
 def _get_id3_song() -> str:
     """Read current song from metadata_monitor's index.json."""
-    try:
-        with open(METADATA_INDEX, "r") as f:
-            data = json.load(f)
-        return data.get("current", {}).get("raw", "")
-    except (FileNotFoundError, json.JSONDecodeError):
-        return ""
+    return _get_id3_current().get("raw", "")
 
 
 def _get_id3_started_at() -> float:
     """Read the stream-accurate started_at epoch from metadata_monitor."""
-    try:
-        with open(METADATA_INDEX, "r") as f:
-            data = json.load(f)
-        return data.get("current", {}).get("started_at", 0)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return 0
+    return _get_id3_current().get("started_at", 0)
 
 
 def main():
@@ -479,97 +455,99 @@ def main():
 
     last_scrape_time = 0
     last_config_check = time.time()
-    ts_source = _config.get("metadata_timestamp_source", "scraper")
-    interval = _config.get("metadata_scrape_interval", 30)
-
-    while True:
-        now = time.time()
-
-        # Periodically check for config changes
-        if now - last_config_check > CONFIG_POLL_INTERVAL:
-            new_config = _fetch_config()
-            if new_config and new_config.get("config_version", 0) > _config_version:
-                _config = new_config
-                _config_version = new_config["config_version"]
-                ts_source = _config.get("metadata_timestamp_source", "scraper")
-                interval = _config.get("metadata_scrape_interval", 30)
-                print(f"scraper: config updated to v{_config_version}", flush=True)
-            last_config_check = now
-
-        should_scrape = False
-        id3_ts = None
-        scraper_ts = None
-
-        if ts_source == "id3_metadata":
-            current_raw = _get_id3_song()
-            if current_raw and current_raw != _last_song_raw:
-                _last_song_raw = current_raw
-                should_scrape = True
-                # Use stream-accurate timestamp from metadata_monitor
-                stream_epoch = _get_id3_started_at()
-                if stream_epoch > 0:
-                    offset = _config.get("id3_metadata_delay_offset", 0)
-                    id3_epoch = stream_epoch - offset
-                else:
-                    offset = _config.get("id3_metadata_delay_offset", 0)
-                    id3_epoch = now - offset
-                from datetime import datetime, timezone as dt_tz
-                id3_ts = datetime.fromtimestamp(id3_epoch, tz=dt_tz.utc).isoformat()
-                print(f"scraper: id3 trigger: {current_raw}", flush=True)
-
-        else:  # scraper (periodic) — also catches any unknown/legacy ts_source
-            if now - last_scrape_time >= interval:
-                should_scrape = True
-                from datetime import datetime, timezone as dt_tz
-                # Use the stream-accurate timestamp from metadata_monitor
-                # if available (when FFmpeg ICY metadata detected the song)
-                stream_epoch = _get_id3_started_at()
-                if stream_epoch > 0:
-                    scraper_ts = datetime.fromtimestamp(stream_epoch, tz=dt_tz.utc).isoformat()
-                else:
-                    scraper_ts = datetime.fromtimestamp(now, tz=dt_tz.utc).isoformat()
-
-        if should_scrape:
-            scrapers = _config.get("scrapers", [])
-            result = _run_scrapers(scrapers)
-
-            # Fallback: if external scrapers returned nothing, use ICY metadata
-            if not result:
-                icy_song = _get_id3_song()
-                if icy_song:
-                    artist, title = "", icy_song
-                    if " - " in icy_song:
-                        parts = icy_song.split(" - ", 1)
-                        artist, title = parts[0].strip(), parts[1].strip()
-                    result = {
-                        "title": title,
-                        "artist": artist,
-                        "raw_title": icy_song,
-                        "dirty": True,
-                    }
-
-            if result:
-                resp = _report_metadata(
-                    song_title=result.get("title"),
-                    song_artist=result.get("artist"),
-                    thumbnail_url=result.get("thumbnail_url"),
-                    listeners=result.get("listeners"),
-                    raw_title=result.get("raw_title", ""),
-                    timestamp_source=ts_source,
-                    id3_ts=id3_ts,
-                    scraper_ts=scraper_ts,
-                    dirty=result.get("dirty", True),
-                )
-                if resp.get("success"):
-                    print(f"scraper: reported '{result.get('artist', '')} - {result.get('title', '')}'", flush=True)
-
-            last_scrape_time = now
-
-        # Sleep interval depends on timestamp source
-        if ts_source == "id3_metadata":
-            time.sleep(2)  # Poll id3 changes
-        else:
-            time.sleep(min(interval, 5))  # Don't sleep longer than 5s for responsiveness
+    # Wakes the id3 loop as soon as metadata_monitor writes index.json
+    with FileWatcher([METADATA_INDEX.parent], poll_interval=2) as metadata_watcher:
+        ts_source = _config.get("metadata_timestamp_source", "scraper")
+        interval = _config.get("metadata_scrape_interval", 30)
+
+        while True:
+            now = time.time()
+
+            # Periodically check for config changes
+            if now - last_config_check > CONFIG_POLL_INTERVAL:
+                new_config = _fetch_config()
+                if new_config and new_config.get("config_version", 0) > _config_version:
+                    _config = new_config
+                    _config_version = new_config["config_version"]
+                    ts_source = _config.get("metadata_timestamp_source", "scraper")
+                    interval = _config.get("metadata_scrape_interval", 30)
+                    print(f"scraper: config updated to v{_config_version}", flush=True)
+                last_config_check = now
+
+            should_scrape = False
+            id3_ts = None
+            scraper_ts = None
+
+            if ts_source == "id3_metadata":
+                current_raw = _get_id3_song()
+                if current_raw and current_raw != _last_song_raw:
+                    _last_song_raw = current_raw
+                    should_scrape = True
+                    # Use stream-accurate timestamp from metadata_monitor
+                    stream_epoch = _get_id3_started_at()
+                    if stream_epoch > 0:
+                        offset = _config.get("id3_metadata_delay_offset", 0)
+                        id3_epoch = stream_epoch - offset
+                    else:
+                        offset = _config.get("id3_metadata_delay_offset", 0)
+                        id3_epoch = now - offset
+                    from datetime import datetime, timezone as dt_tz
+                    id3_ts = datetime.fromtimestamp(id3_epoch, tz=dt_tz.utc).isoformat()
+                    print(f"scraper: id3 trigger: {current_raw}", flush=True)
+
+            else:  # scraper (periodic) — also catches any unknown/legacy ts_source
+                if now - last_scrape_time >= interval:
+                    should_scrape = True
+                    from datetime import datetime, timezone as dt_tz
+                    # Use the stream-accurate timestamp from metadata_monitor
+                    # if available (when FFmpeg ICY metadata detected the song)
+                    stream_epoch = _get_id3_started_at()
+                    if stream_epoch > 0:
+                        scraper_ts = datetime.fromtimestamp(stream_epoch, tz=dt_tz.utc).isoformat()
+                    else:
+                        scraper_ts = datetime.fromtimestamp(now, tz=dt_tz.utc).isoformat()
+
+            if should_scrape:
+                scrapers = _config.get("scrapers", [])
+                result = _run_scrapers(scrapers)
+
+                # Fallback: if external scrapers returned nothing, use ICY metadata
+                if not result:
+                    icy_song = _get_id3_song()
+                    if icy_song:
+                        artist, title = "", icy_song
+                        if " - " in icy_song:
+                            parts = icy_song.split(" - ", 1)
+                            artist, title = parts[0].strip(), parts[1].strip()
+                        result = {
+                            "title": title,
+                            "artist": artist,
+                            "raw_title": icy_song,
+                            "dirty": True,
+                        }
+
+                if result:
+                    resp = _report_metadata(
+                        song_title=result.get("title"),
+                        song_artist=result.get("artist"),
+                        thumbnail_url=result.get("thumbnail_url"),
+                        listeners=result.get("listeners"),
+                        raw_title=result.get("raw_title", ""),
+                        timestamp_source=ts_source,
+                        id3_ts=id3_ts,
+                        scraper_ts=scraper_ts,
+                        dirty=result.get("dirty", True),
+                    )
+                    if resp.get("success"):
+                        print(f"scraper: reported '{result.get('artist', '')} - {result.get('title', '')}'", flush=True)
+
+                last_scrape_time = now
+
+            # Sleep interval depends on timestamp source
+            if ts_source == "id3_metadata":
+                metadata_watcher.wait(2)  # Until index.json changes (at most 2s)
+            else:
+                time.sleep(min(interval, 5))  # Don't sleep longer than 5s for responsiveness
 
 
 if __name__ == "__main__":
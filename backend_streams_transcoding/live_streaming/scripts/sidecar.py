@@ -0,0 +1,127 @@
+"""
+Sidecar supervisor — hosts the pod's Python components in one process.
+
+Replaces one interpreter per component (health_server, scraper_engine,
+playlist_rewriter, log_monitor, stream_monitor, metadata_monitor): they share one copy of the
+interpreter, the PostHog client, the segment index / metadata caches from
+file_watch and the kept-alive Django connections from django_api_client.
+
+Each component's main() runs in its own daemon thread (they are blocking
+loops); an asyncio loop supervises them:
+  - an exception restarts the component after a backoff (1s doubling up to
+    60s, reset once it has stayed up for STABLE_AFTER seconds), and is
+    reported to PostHog tagged with the component name;
+  - a normal return or sys.exit() (e.g. STATION_SLUG not set) stops
+    supervising that component, as it stopped the standalone script before.
+
+SIGTERM / SIGINT run the components' shutdown hooks (log_monitor flushes its
+pending events) and flush PostHog before exiting.
+
+metadata_monitor tails the ingest ffmpeg's stderr log file (see
+entrypoint.sh), so a crash here never stops the encoder.
+"""
+
+import asyncio
+import importlib
+import signal
+import threading
+import time
+
+import posthog_reporter
+
+COMPONENTS = (
+    "health_server",
+    "scraper_engine",
+    "playlist_rewriter",
+    "log_monitor",
+    "stream_monitor",
+    "metadata_monitor",
+)
+
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+STABLE_AFTER = 300.0
+
+
+def _run_in_thread(loop: asyncio.AbstractEventLoop, name: str, func) -> asyncio.Future:
+    """Run func() in a daemon thread; the returned future resolves with its outcome."""
+    future = loop.create_future()
+
+    def _set(setter, value):
+        if not future.done():
+            setter(value)
+
+    def _target():
+        try:
+            result = func()
+        except BaseException as e:
+            loop.call_soon_threadsafe(_set, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(_set, future.set_result, result)
+
+    threading.Thread(target=_target, name=name, daemon=True).start()
+    return future
+
+
+async def _supervise(loop: asyncio.AbstractEventLoop, name: str, module) -> None:
+    backoff = BACKOFF_INITIAL
+    while True:
+        started = time.monotonic()
+        try:
+            await _run_in_thread(loop, name, module.main)
+            print(f"sidecar: {name} exited", flush=True)
+            return
+        except SystemExit as e:
+            print(f"sidecar: {name} exited (code {e.code})", flush=True)
+            return
+        except Exception as e:
+            posthog_reporter.capture_exception(e, context={"component": name})
+            if time.monotonic() - started >= STABLE_AFTER:
+                backoff = BACKOFF_INITIAL
+            print(f"sidecar: {name} crashed ({type(e).__name__}: {e}), restarting in {backoff:.0f}s", flush=True)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, BACKOFF_MAX)
+
+
+def _shutdown(modules: dict) -> None:
+    for name, module in modules.items():
+        hook = getattr(module, "shutdown", None)
+        if hook is None:
+            continue
+        try:
+            hook()
+        except Exception as e:
+            print(f"sidecar: {name} shutdown failed: {e}", flush=True)
+            posthog_reporter.capture_exception(e, context={"component": name})
+    posthog_reporter.flush()
+
+
+async def _main() -> None:
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    modules = {name: importlib.import_module(name) for name in COMPONENTS}
+    print(f"sidecar: starting {', '.join(modules)}", flush=True)
+    supervisors = [
+        asyncio.ensure_future(_supervise(loop, name, module))
+        for name, module in modules.items()
+    ]
+
+    await stop.wait()
+    print("sidecar: shutting down", flush=True)
+    for task in supervisors:
+        task.cancel()
+    # Hooks may block on network calls (log_monitor's final submit)
+    await loop.run_in_executor(None, _shutdown, modules)
+    print("sidecar: shutdown complete", flush=True)
+
+
+def main() -> None:
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    posthog_reporter.install_global_handler("sidecar")
+    main()
@@ -11,13 +11,13 @@ Logs a separate WARN line whenever any of the above crosses a threshold so the
 warnings are easy to grep / alert on without parsing the structured digest.
 """
 
-import glob
 import os
 import re
 import sys
 import time
 
 import posthog_reporter
+from file_watch import SegmentIndex, shared_segment_index
 
 AAC_DIR = "/data/hls/aac"
 PLAYLIST = os.path.join(AAC_DIR, "live.m3u8")
@@ -32,31 +32,19 @@ STALL_THRESHOLD = SEGMENT_DURATION * 3
 _ACCESS_RE = re.compile(r'"(?:GET|HEAD) ([^ ?"]+)[^"]*" (\d{3}) ')
 
 
-def _segment_stats():
+def _segment_stats(segments: SegmentIndex):
+    # The index follows ffmpeg / cleanup.sh through inotify events, so this
+    # no longer globs and stats every segment each tick.
     now = time.time()
-    files = glob.glob(os.path.join(AAC_DIR, "*.ts"))
-    if not files:
-        return {"count": 0, "oldest_s": None, "newest_s": None, "total_mb": 0.0}
-    # ffmpeg's delete_segments and cleanup.sh can remove segments between the
-    # glob() above and the stat() below. Skip files that vanish mid-iteration
-    # rather than crashing the monitor. One stat() per file (vs separate
-    # getmtime + getsize) also halves the syscall count.
-    mtimes: list[float] = []
-    sizes: list[int] = []
-    for f in files:
-        try:
-            st = os.stat(f)
-        except FileNotFoundError:
-            continue
-        mtimes.append(st.st_mtime)
-        sizes.append(st.st_size)
-    if not mtimes:
+    segments.refresh()
+    stats = segments.stats()
+    if not stats["count"]:
         return {"count": 0, "oldest_s": None, "newest_s": None, "total_mb": 0.0}
     return {
-        "count": len(mtimes),
-        "oldest_s": int(now - min(mtimes)),
-        "newest_s": int(now - max(mtimes)),
-        "total_mb": round(sum(sizes) / 1_000_000, 1),
+        "count": stats["count"],
+        "oldest_s": int(now - stats["oldest_mtime"]),
+        "newest_s": int(now - stats["newest_mtime"]),
+        "total_mb": round(stats["total_size"] / 1_000_000, 1),
     }
 
 
@@ -192,6 +180,7 @@ def _report_warnings_to_posthog(warns: list, seg: dict, pl: dict, http: dict, se
 
 def main():
     state = {"log_pos": 0, "last_media_seq": None}
+    segments = shared_segment_index(AAC_DIR)
     try:
         state["log_pos"] = os.path.getsize(SESSION_LOG)
     except FileNotFoundError:
@@ -210,7 +199,7 @@ def main():
 
     while True:
         time.sleep(MONITOR_INTERVAL)
-        seg = _segment_stats()
+        seg = _segment_stats(segments)
         pl = _playlist_stats()
         http = _consume_access_log(state)
 
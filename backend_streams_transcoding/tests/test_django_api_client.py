@@ -0,0 +1,114 @@
+"""Tests for the Django API client's request spool."""
+
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "live_streaming", "scripts",
+))
+
+import django_api_client  # noqa: E402
+from django_api_client import DjangoUnavailable, Spool  # noqa: E402
+
+
+class SpoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool = Spool(os.path.join(self.tmp.name, "spool"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_drain_resends_oldest_first(self):
+        for i in range(3):
+            self.spool.put("mutation", {"i": i})
+        sent = []
+
+        self.assertTrue(self.spool.drain(lambda query, variables: sent.append(variables["i"])))
+
+        self.assertEqual(sent, [0, 1, 2])
+        self.assertEqual(len(self.spool), 0)
+
+    def test_drain_stops_on_transient_error(self):
+        self.spool.put("mutation", {"i": 0})
+        self.spool.put("mutation", {"i": 1})
+
+        def send(query, variables):
+            raise DjangoUnavailable(503)
+
+        self.assertFalse(self.spool.drain(send))
+        self.assertEqual(len(self.spool), 2)
+
+    def test_permanent_failure_is_dropped(self):
+        self.spool.put("mutation", {"i": 0})
+
+        def send(query, variables):
+            raise ValueError("not json")
+
+        self.assertTrue(self.spool.drain(send))
+        self.assertEqual(len(self.spool), 0)
+
+    def test_slot_keeps_only_latest(self):
+        self.spool.put("mutation", {"song": "a"}, slot="metadata")
+        self.spool.put("mutation", {"song": "b"}, slot="metadata")
+        sent = []
+
+        self.spool.drain(lambda query, variables: sent.append(variables["song"]))
+
+        self.assertEqual(sent, ["b"])
+
+    def test_limits_drop_oldest(self):
+        spool = Spool(self.spool.directory, max_files=2)
+        for i in range(4):
+            spool.put("mutation", {"i": i})
+        sent = []
+
+        spool.drain(lambda query, variables: sent.append(variables["i"]))
+
+        self.assertEqual(sent, [2, 3])
+
+
+class SendOrSpoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.spool = Spool(self.tmp.name)
+        mock.patch.object(django_api_client, "_spool", self.spool).start()
+        mock.patch.object(django_api_client, "_ensure_retry_thread").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_spools_when_unreachable(self):
+        with mock.patch.object(django_api_client, "graphql_request", side_effect=ConnectionRefusedError()):
+            self.assertIsNone(django_api_client.send_or_spool("mutation", {"i": 1}))
+        self.assertEqual(len(self.spool), 1)
+
+    def test_success_discards_superseded_slot(self):
+        self.spool.put("mutation", {"song": "old"}, slot="metadata")
+        with mock.patch.object(django_api_client, "graphql_request", return_value={"data": {}}):
+            self.assertEqual(django_api_client.send_or_spool("mutation", {"song": "new"}, slot="metadata"),
+                             {"data": {}})
+        self.assertEqual(len(self.spool), 0)
+
+
+class GzipBodyTests(unittest.TestCase):
+    def test_large_bodies_are_compressed(self):
+        conn = mock.Mock()
+        conn.getresponse.return_value = mock.Mock(status=200, will_close=False, read=mock.Mock(return_value=b"{}"))
+        body = b"x" * (django_api_client.GZIP_MIN_BYTES * 2)
+
+        with mock.patch.object(django_api_client, "_get_connection", return_value=conn), \
+                mock.patch.object(django_api_client, "GZIP_REQUESTS", True):
+            django_api_client.http_request("POST", "http://web:8080/v1/graphql", body=body)
+
+        kwargs = conn.request.call_args.kwargs
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(kwargs["body"]), body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the inotify-based file watch layer shared by the sidecar scripts."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "live_streaming", "scripts",
+))
+
+import file_watch  # noqa: E402
+
+
+def _write(path, content):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+class FileWatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reports_renamed_files(self):
+        watcher = file_watch.FileWatcher([self.dir])
+        if not watcher.inotify:
+            self.skipTest("inotify unavailable")
+
+        _write(os.path.join(self.dir, "live.m3u8"), "#EXTM3U\n")
+
+        self.assertIn(os.path.join(self.dir, "live.m3u8"), watcher.wait(1))
+        self.assertEqual(watcher.wait(0), set())
+        watcher.close()
+
+    def test_context_manager_closes_the_inotify_fd(self):
+        with file_watch.FileWatcher([self.dir]) as watcher:
+            if not watcher.inotify:
+                self.skipTest("inotify unavailable")
+            fd = watcher._fd
+
+        self.assertFalse(watcher.inotify)
+        with self.assertRaises(OSError):
+            os.fstat(fd)
+
+    def test_segment_index_follows_changes(self):
+        _write(os.path.join(self.dir, "a-1.ts"), "x" * 10)
+        index = file_watch.SegmentIndex(self.dir)
+        self.assertEqual(index.count(), 1)
+
+        _write(os.path.join(self.dir, "a-2.ts"), "x" * 20)
+        _write(os.path.join(self.dir, "live.m3u8"), "#EXTM3U\n")
+        os.remove(os.path.join(self.dir, "a-1.ts"))
+        index.refresh()
+
+        self.assertIsNone(index.get("a-1.ts"))
+        self.assertEqual(index.get("a-2.ts")[1], 20)
+        self.assertEqual(index.stats()["total_size"], 20)
+
+    def test_segment_index_polling_fallback(self):
+        watcher = file_watch.FileWatcher([self.dir])
+        watcher.close()
+        index = file_watch.SegmentIndex(self.dir, watcher=watcher)
+
+        _write(os.path.join(self.dir, "a-1.ts"), "x")
+        index.refresh()
+
+        self.assertEqual(index.count(), 1)
+
+    def test_json_file_cache(self):
+        path = os.path.join(self.dir, "index.json")
+        cache = file_watch.JsonFileCache(path)
+        self.assertIsNone(cache.read())
+
+        _write(path, '{"current": {"raw": "A - B"}}')
+        self.assertEqual(cache.read()["current"]["raw"], "A - B")
+
+        # Same content, different size: re-read
+        _write(path, '{"current": {"raw": "A - BC"}}')
+        self.assertEqual(cache.read()["current"]["raw"], "A - BC")
+
+
+if __name__ == "__main__":
+    unittest.main()
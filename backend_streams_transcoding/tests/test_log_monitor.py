@@ -0,0 +1,80 @@
+"""Tests for log_monitor's streaming session aggregation."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "live_streaming", "scripts",
+))
+
+import log_monitor  # noqa: E402
+
+
+def _line(uri, session="abc", time_local="18/Oct/2026:10:00:00 +0000", status=200, size=1000,
+          referer="-", ua="Mozilla/5.0 (X11)", ref="-", real_ip="-", cf_ip="-", addr="10.0.0.1"):
+    return (
+        f'{addr} - - [{time_local}] "GET {uri} HTTP/1.1" {status} {size} '
+        f'"{referer}" "{ua}" session_id="{session}" ref="{ref}" '
+        f'real_ip="{real_ip}" cf_ip="{cf_ip}"'
+    )
+
+
+class SessionAggregatorTests(unittest.TestCase):
+    def setUp(self):
+        self.aggregator = log_monitor.SessionAggregator("test-station")
+
+    def test_aggregates_requests_per_session(self):
+        feed = self.aggregator.feed
+        self.assertTrue(feed(_line("/aac/index.m3u8?s=abc", time_local="18/Oct/2026:10:00:00 +0000", size=300)))
+        self.assertTrue(feed(_line("/aac/seg_1.ts?s=abc", time_local="18/Oct/2026:10:00:06 +0000", size=5000)))
+        self.assertTrue(feed(_line("/aac/seg_2.ts?s=abc", time_local="18/Oct/2026:10:00:12 +0000", size=5000)))
+        self.assertTrue(feed(_line("/aac/index.m3u8?s=xyz", session="xyz")))
+
+        events = {e["anonymous_session_id"]: e for e in self.aggregator.drain()}
+
+        self.assertEqual(set(events), {"abc", "xyz"})
+        abc = events["abc"]
+        self.assertEqual(abc["station_slug"], "test-station")
+        self.assertEqual(abc["request_count"], 3)
+        self.assertEqual(abc["playlist_request_count"], 1)
+        self.assertEqual(abc["segment_request_count"], 2)
+        self.assertEqual(abc["bytes_transferred"], 10300)
+        self.assertEqual(abc["first_timestamp"], "2026-10-18T10:00:00+00:00")
+        self.assertEqual(abc["timestamp"], "2026-10-18T10:00:12+00:00")
+        self.assertEqual(abc["event_type"], "segment_request")
+        self.assertEqual(abc["ip_address"], "10.0.0.1")
+
+    def test_drain_resets_counters(self):
+        self.aggregator.feed(_line("/aac/seg_1.ts?s=abc"))
+        self.assertEqual(len(self.aggregator.drain()), 1)
+        self.assertEqual(self.aggregator.drain(), [])
+
+    def test_rejects_non_hls_and_sessionless_requests(self):
+        self.assertFalse(self.aggregator.feed(_line("/aac/player.html?s=abc")))
+        self.assertFalse(self.aggregator.feed(_line("/aac/seg_1.ts", session="")))
+        self.assertFalse(self.aggregator.feed(_line("/aac/seg_1.ts", session="-")))
+        self.assertFalse(self.aggregator.feed("garbage line"))
+        self.assertEqual(len(self.aggregator), 0)
+
+    def test_client_ip_and_referer_resolution(self):
+        self.aggregator.feed(_line("/aac/seg_1.ts?s=a", session="a", real_ip="1.1.1.1, 10.0.0.2",
+                                   referer="https://site.example/"))
+        self.aggregator.feed(_line("/aac/seg_1.ts?s=b", session="b", real_ip="1.1.1.1", cf_ip="2.2.2.2",
+                                   ref="app"))
+
+        events = {e["anonymous_session_id"]: e for e in self.aggregator.drain()}
+
+        self.assertEqual(events["a"]["ip_address"], "1.1.1.1")
+        self.assertEqual(events["a"]["referer"], "https://site.example/")
+        self.assertEqual(events["b"]["ip_address"], "2.2.2.2")
+        self.assertEqual(events["b"]["referer"], "app")
+
+    def test_user_agent_with_escaped_quotes(self):
+        self.assertTrue(self.aggregator.feed(_line("/aac/seg_1.ts?s=abc", ua=r"Agent \x22quoted\x22")))
+        self.assertEqual(self.aggregator.drain()[0]["user_agent"], r"Agent \x22quoted\x22")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests for parsing the single ingest FFmpeg's stderr in metadata_monitor."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "live_streaming", "scripts",
+))
+
+import metadata_monitor  # noqa: E402
+
+
+class IngestLogParserTests(unittest.TestCase):
+    def test_song_change_uses_open_segment_start(self):
+        parser = metadata_monitor.IngestLogParser()
+
+        self.assertIsNone(parser.feed(
+            "[hls @ 0x55d] [verbose] Opening '/data/hls/aac/s-1-42.ts' for writing", now=1000.0,
+        ))
+        event = parser.feed(
+            "[https @ 0x55e] [verbose] Metadata update for StreamTitle: Artist - Song", now=1004.0,
+        )
+
+        self.assertEqual(event, ("song", "Artist - Song", 1000.0))
+        self.assertEqual(parser.segment, "/data/hls/aac/s-1-42.ts")
+
+    def test_temp_file_segment_open(self):
+        # -hls_flags +temp_file: the muxer opens x.ts.tmp and renames it when done
+        parser = metadata_monitor.IngestLogParser()
+
+        parser.feed(
+            "[hls @ 0x5581c9a3c2c0] [verbose] Opening "
+            "'/data/hls/aac/radio-1760000000-1760000042.ts.tmp' for writing",
+            now=2000.0,
+        )
+
+        self.assertEqual(parser.segment, "/data/hls/aac/radio-1760000000-1760000042.ts")
+        self.assertEqual(parser.segment_opened_at, 2000.0)
+        # The playlist's own temp file is not a segment
+        parser.feed("[hls @ 0x5581c9a3c2c0] [verbose] Opening '/data/hls/aac/live.m3u8.tmp' for writing")
+        self.assertEqual(parser.segment, "/data/hls/aac/radio-1760000000-1760000042.ts")
+
+    def test_repeated_title_is_ignored(self):
+        parser = metadata_monitor.IngestLogParser(last_title="Artist - Song")
+        parser.segment_opened_at = 1.0
+
+        self.assertIsNone(parser.feed("    StreamTitle     : Artist - Song"))
+        self.assertEqual(parser.feed("    StreamTitle     : Other - Song")[:2], ("song", "Other - Song"))
+
+    def test_silence_and_warnings(self):
+        parser = metadata_monitor.IngestLogParser()
+
+        self.assertEqual(
+            parser.feed("[silencedetect @ 0x1] [info] silence_start: 12.5", now=5.0),
+            ("silence", 5.0),
+        )
+        warning = "[aac @ 0x2] [warning] Queue input is backward in time"
+        self.assertEqual(parser.feed(warning), ("log", warning))
+        self.assertIsNone(parser.feed("[hls @ 0x3] [verbose] Stream mapping:"))
+
+
+class TailIngestLogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log = os.path.join(self.tmp.name, "ingest.log")
+        open(self.log, "w").close()
+        self.events = []
+        for target, value in (
+            ("INGEST_LOG", self.log),
+            ("_log_position", (0, 0)),
+            ("_running", True),
+            ("_handle_event", self.events.append),
+        ):
+            patcher = mock.patch.object(metadata_monitor, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _start(self, **kwargs):
+        threading.Thread(
+            target=metadata_monitor._tail_ingest_log,
+            kwargs={"poll_interval": 0.01, **kwargs},
+            daemon=True,
+        ).start()
+
+    def _append(self, text):
+        with open(self.log, "a") as f:
+            f.write(text)
+
+    def _wait_for(self, count):
+        deadline = time.monotonic() + 5
+        while len(self.events) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.events
+
+    def test_reads_complete_lines_and_follows_recreated_log(self):
+        self._start()
+        self._append("[https @ 0x1] [verbose] Metadata update for StreamTitle: A - One\n")
+        self._append("[https @ 0x1] [verbose] Metadata update for StreamTitle: B - ")
+        self.assertEqual([e[1] for e in self._wait_for(1)], ["A - One"])
+        self._append("Two\n")
+        self.assertEqual([e[1] for e in self._wait_for(2)], ["A - One", "B - Two"])
+
+        # ffmpeg restart: entrypoint.sh recreates the log
+        os.remove(self.log)
+        self._append("    StreamTitle     : C - Three\n")
+        self.assertEqual([e[1] for e in self._wait_for(3)], ["A - One", "B - Two", "C - Three"])
+
+    def test_truncates_consumed_log_past_limit(self):
+        self._start(max_bytes=64)
+        self._append("[https @ 0x1] [verbose] Metadata update for StreamTitle: A - One\n" * 2)
+        self._wait_for(1)
+        deadline = time.monotonic() + 5
+        while os.path.getsize(self.log) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(os.path.getsize(self.log), 0)
+
+        self._append("[https @ 0x1] [verbose] Metadata update for StreamTitle: B - Two\n")
+        self.assertEqual([e[1] for e in self._wait_for(2)], ["A - One", "B - Two"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for the sidecar supervisor hosting the pod's Python components."""
+
+import asyncio
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "live_streaming", "scripts",
+))
+
+import log_monitor  # noqa: E402
+import sidecar  # noqa: E402
+
+
+def _component(*outcomes):
+    """Fake component whose main() raises / returns each outcome in turn."""
+    calls = []
+
+    def main():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return types.SimpleNamespace(main=main), calls
+
+
+class SuperviseTests(unittest.TestCase):
+    def _supervise(self, module):
+        async def run():
+            await sidecar._supervise(asyncio.get_running_loop(), "fake", module)
+        with mock.patch.object(sidecar, "BACKOFF_INITIAL", 0.01), \
+                mock.patch.object(sidecar.posthog_reporter, "capture_exception") as capture:
+            asyncio.run(asyncio.wait_for(run(), timeout=5))
+        return capture
+
+    def test_crash_restarts_and_reports(self):
+        module, calls = _component(RuntimeError("boom"), RuntimeError("again"), None)
+
+        capture = self._supervise(module)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(capture.call_count, 2)
+        self.assertEqual(capture.call_args.kwargs["context"], {"component": "fake"})
+
+    def test_system_exit_stops_without_restart(self):
+        module, calls = _component(SystemExit(1))
+
+        capture = self._supervise(module)
+
+        self.assertEqual(len(calls), 1)
+        capture.assert_not_called()
+
+    def test_shutdown_runs_hooks(self):
+        hook = mock.Mock(side_effect=RuntimeError("flush failed"))
+        modules = {"a": types.SimpleNamespace(shutdown=hook), "b": types.SimpleNamespace()}
+
+        with mock.patch.object(sidecar.posthog_reporter, "capture_exception"), \
+                mock.patch.object(sidecar.posthog_reporter, "flush") as flush:
+            sidecar._shutdown(modules)
+
+        hook.assert_called_once()
+        flush.assert_called_once()
+
+
+class LogMonitorRestartTests(unittest.TestCase):
+    def test_restart_after_crash_tails_again(self):
+        runs = []
+
+        def tail_log():
+            runs.append((log_monitor._running, log_monitor._batch_thread))
+            if len(runs) == 1:
+                raise RuntimeError("log file vanished")
+
+        async def run():
+            await sidecar._supervise(asyncio.get_running_loop(), "log_monitor", log_monitor)
+
+        with mock.patch.object(sidecar, "BACKOFF_INITIAL", 0.01), \
+                mock.patch.object(sidecar.posthog_reporter, "capture_exception"), \
+                mock.patch.object(log_monitor, "STATION_SLUG", "test-station"), \
+                mock.patch.object(log_monitor, "STREAMING_API_KEY", "key"), \
+                mock.patch.object(log_monitor, "BATCH_INTERVAL", 1), \
+                mock.patch.object(log_monitor, "_aggregator", None), \
+                mock.patch.object(log_monitor, "_batch_thread", None), \
+                mock.patch.object(log_monitor, "_submit_batch"), \
+                mock.patch.object(log_monitor, "_tail_log", tail_log):
+            asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+        self.assertEqual(len(runs), 2)
+        self.assertTrue(all(running for running, _ in runs))
+        # The batch thread of the crashed run is reused, not started twice
+        self.assertIs(runs[0][1], runs[1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()